@@ -128,12 +128,14 @@ from lib.dsm_analysis import (
     run_differential_analysis_with_baseline,
     run_git_working_tree_analysis,
     run_proactive_improvement_analysis,
+    print_phase_times,
 )
 from lib.dsm_types import DSMAnalysisResults
 from lib.dsm_serialization import save_dsm_results, load_dsm_results
 
 # Import build_include_graph from library
 from lib.clang_utils import build_include_graph, FileType
+from lib.recorded_deps import DEPS_SOURCE_AUTO, DEPS_SOURCES
 
 # Explicitly export functions for testing
 __all__ = [
@@ -393,6 +395,12 @@ Requires: clang-scan-deps (install: sudo apt install clang-19)
 
     parser.add_argument("--cluster-by-directory", action="store_true", help="Group headers by directory in output")
 
+    parser.add_argument(
+        "--redundant-includes",
+        action="store_true",
+        help="List direct includes already pulled in through another include (transitive reduction), ranked by how many TUs parse them",
+    )
+
     parser.add_argument(
         "--show-library-boundaries", action="store_true", help="Show which library each header belongs to and analyze cross-library dependencies"
     )
@@ -405,6 +413,24 @@ Requires: clang-scan-deps (install: sudo apt install clang-19)
 
     parser.add_argument("--verbose", action="store_true", help="Enable verbose debug logging")
 
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        metavar="N",
+        default=1,
+        help="Worker processes for independent analysis phases on large graphs (default: 1, computing each phase only when the report "
+        "reads it). More workers compute every phase up front in parallel. Phase timings are shown with --verbose",
+    )
+
+    parser.add_argument(
+        "--deps-source",
+        choices=DEPS_SOURCES,
+        default=DEPS_SOURCE_AUTO,
+        help="Where per-source dependencies come from (default: auto). auto: ninja's .ninja_deps records, rescanning stale sources "
+        "with clang-scan-deps; ninja: require recorded dependencies; clang-scan-deps: always scan",
+    )
+
     parser.add_argument(
         "--file-scope",
         type=str,
@@ -531,6 +557,7 @@ Requires: clang-scan-deps (install: sudo apt install clang-19)
                 verbose=args.verbose,
                 file_scope=getattr(args, "file_scope", "project"),
                 sensitivity=args.sensitivity,
+                deps_source=args.deps_source,
             )
 
         # Check if git working tree analysis is requested
@@ -545,12 +572,18 @@ Requires: clang-scan-deps (install: sudo apt install clang-19)
                 exclude_patterns=args.exclude if hasattr(args, "exclude") else None,
                 show_layers=args.show_layers,
                 file_scope=getattr(args, "file_scope", "project"),
+                deps_source=args.deps_source,
             )
 
         # Check if differential analysis is requested
         if args.compare_with:
             return run_differential_analysis(
-                build_dir, args.compare_with, project_root, verbose=args.verbose, file_scope=getattr(args, "file_scope", "project")
+                build_dir,
+                args.compare_with,
+                project_root,
+                verbose=args.verbose,
+                file_scope=getattr(args, "file_scope", "project"),
+                deps_source=args.deps_source,
             )
 
         # Phase 2: Build dependency graph
@@ -563,7 +596,7 @@ Requires: clang-scan-deps (install: sudo apt install clang-19)
         elapsed: float
 
         try:
-            scan_result = build_include_graph(build_dir)
+            scan_result = build_include_graph(build_dir, deps_source=args.deps_source)
             header_to_headers = scan_result.include_graph
             all_headers = scan_result.all_headers
             file_types = scan_result.file_types
@@ -603,6 +636,7 @@ Requires: clang-scan-deps (install: sudo apt install clang-19)
             show_progress=True,
             source_to_deps=scan_result.source_to_deps,
             file_types=file_types,
+            workers=args.jobs,
         )
 
         # Phase 6: Display results
@@ -617,6 +651,7 @@ Requires: clang-scan-deps (install: sudo apt install clang-19)
             cluster_by_directory=args.cluster_by_directory,
             sort_by=args.sort_by,
             verbose=args.verbose,
+            show_redundant_includes=args.redundant_includes,
         )
 
         # Phase 7: Export data (if requested)
@@ -628,6 +663,9 @@ Requires: clang-scan-deps (install: sudo apt install clang-19)
                 args.export_graph, results.directed_graph, results.metrics, results.cycles, project_root, header_to_lib, results.header_to_headers
             )
 
+        if args.verbose:
+            print_phase_times(results)
+
         # Save results (if requested)
         if args.save_results:
             save_dsm_results(results, all_files, unfiltered_include_graph, file_types, args.save_results, build_dir, args.filter, args.exclude)
@@ -642,7 +680,12 @@ Requires: clang-scan-deps (install: sudo apt install clang-19)
 
             # Run DSM analysis on filtered baseline
             baseline_results = run_dsm_analysis(
-                baseline_headers, baseline_include_graph, compute_layers=compute_layers_flag, show_progress=False, file_types=baseline_file_types
+                baseline_headers,
+                baseline_include_graph,
+                compute_layers=compute_layers_flag,
+                show_progress=False,
+                file_types=baseline_file_types,
+                workers=args.jobs,
             )
 
             # Display side-by-side filter scope comparison
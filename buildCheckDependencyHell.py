@@ -72,6 +72,8 @@ METRICS EXPLAINED:
     - Transitive Deps: Total headers pulled in (direct + indirect)
     - Build Impact: deps × usage = total header compilations across project
     - Rebuild Cost: usage × (1 + dependents) = sources rebuilt if header changes
+    - Rebuild CPU: summed .ninja_log compile times of the sources using the header
+      (shown when the build directory has a .ninja_log)
     - Reverse Impact: Number of other headers that depend on this one
     - Hub Header: Header with high reverse impact (architectural bottleneck)
     - Max Chain: Longest include path through this header
@@ -127,18 +129,27 @@ import sys
 import argparse
 import time
 import logging
-from typing import Dict, Set, List, Tuple
+from typing import Dict, Set, List, Optional, Tuple
 from pathlib import Path
 
 from lib.constants import EXIT_RUNTIME_ERROR, EXIT_KEYBOARD_INTERRUPT, BuildCheckError
 
 # Import library modules
-from lib.ninja_utils import extract_rebuild_info, parse_ninja_explain_line
+from lib.ninja_log import format_cpu_time, load_compile_times
+from lib.ninja_utils import extract_rebuild_info, list_build_outputs, parse_ninja_explain_line
 from lib.color_utils import Colors, print_warning, print_success
 from lib.file_utils import exclude_headers_by_patterns, filter_by_file_type, FileClassificationStats
 from lib.clang_utils import is_system_header as is_system_header_lib, build_include_graph, FileType, VALID_SOURCE_EXTENSIONS, VALID_HEADER_EXTENSIONS
+from lib.recorded_deps import DEPS_SOURCE_AUTO, DEPS_SOURCES
 from lib.graph_utils import build_dependency_graph, compute_reverse_dependencies, compute_transitive_metrics, compute_chain_lengths
-from lib.dependency_utils import find_dependency_fanout, DependencyAnalysisResult, SourceDependencyMap, compute_header_usage, identify_problematic_headers
+from lib.dependency_utils import (
+    find_dependency_fanout,
+    DependencyAnalysisResult,
+    SourceDependencyMap,
+    compute_header_compile_seconds,
+    compute_header_usage,
+    identify_problematic_headers,
+)
 
 __all__ = ["build_include_graph", "analyze_dependency_hell"]
 
@@ -163,7 +174,7 @@ logger = logging.getLogger(__name__)
 
 
 def analyze_dependency_hell(
-    build_dir: str, rebuild_targets: List[str], threshold: int = DEFAULT_THRESHOLD
+    build_dir: str, rebuild_targets: List[str], threshold: int = DEFAULT_THRESHOLD, deps_source: str = DEPS_SOURCE_AUTO
 ) -> Tuple["DependencyAnalysisResult", Dict[str, FileType]]:
     """Find headers with excessive dependencies using include graph.
 
@@ -171,6 +182,7 @@ def analyze_dependency_hell(
         build_dir: Path to the build directory
         rebuild_targets: List of rebuild target files
         threshold: Minimum transitive dependency count to flag as problematic
+        deps_source: Where per-source dependencies come from (see build_include_graph)
 
     Returns:
         DependencyAnalysisResult containing analysis results
@@ -193,7 +205,7 @@ def analyze_dependency_hell(
 
     # Build complete include graph
     try:
-        scan_result = build_include_graph(build_dir)
+        scan_result = build_include_graph(build_dir, deps_source=deps_source)
         source_to_deps = scan_result.source_to_deps
         include_graph = scan_result.include_graph
         all_headers = scan_result.all_headers
@@ -246,6 +258,12 @@ def analyze_dependency_hell(
     # Identify problematic headers
     problematic = identify_problematic_headers(header_transitive_deps, header_usage_count, header_reverse_impact, header_max_chain_length, threshold)
 
+    # Weight rebuild cost by real compile times when the build has a .ninja_log
+    compile_times = load_compile_times(build_dir)
+    header_compile_seconds = {}
+    if compile_times is not None:
+        header_compile_seconds = compute_header_compile_seconds(source_to_deps, (p[0] for p in problematic), compile_times)
+
     print(f"{Colors.BLUE}Dependency analysis complete.{Colors.RESET}")
 
     return (
@@ -256,6 +274,7 @@ def analyze_dependency_hell(
             header_usage_count=header_usage_count,
             header_reverse_impact=header_reverse_impact,
             header_max_chain_length=header_max_chain_length,
+            header_compile_seconds=header_compile_seconds,
         ),
         file_types,
     )
@@ -328,6 +347,14 @@ Requires: clang-scan-deps, networkx (pip install networkx)
 
     parser.add_argument("--include-system-headers", action="store_true", help="Include system headers in analysis (default: exclude /usr/*, /lib/*, /opt/*)")
 
+    parser.add_argument(
+        "--deps-source",
+        choices=DEPS_SOURCES,
+        default=DEPS_SOURCE_AUTO,
+        help="Where per-source dependencies come from (default: auto). auto: ninja's .ninja_deps records, rescanning stale sources "
+        "with clang-scan-deps; ninja: require recorded dependencies; clang-scan-deps: always scan",
+    )
+
     return parser.parse_args()
 
 
@@ -403,14 +430,9 @@ def collect_rebuild_targets(build_dir: str) -> List[str]:
     # If no rebuilds detected, get all object files instead
     if not rebuild_targets:
         print_warning("No rebuilds detected, analyzing all object files...", prefix=False)
-        try:
-            result = subprocess.run(["ninja", "-t", "targets", "all"], capture_output=True, text=True, check=True, cwd=build_dir, timeout=30)
-            for line in result.stdout.splitlines():
-                target = line.split(":")[0].strip()
-                if any(f"{ext}.o" in target for ext in VALID_SOURCE_EXTENSIONS):
-                    rebuild_targets.append(target)
-        except (subprocess.CalledProcessError, subprocess.TimeoutExpired) as e:
-            logger.warning("Failed to get ninja targets: %s", e)
+        for target in list_build_outputs(build_dir):
+            if any(f"{ext}.o" in target for ext in VALID_SOURCE_EXTENSIONS):
+                rebuild_targets.append(target)
 
     if not rebuild_targets:
         raise RuntimeError("No compilation targets found.")
@@ -418,13 +440,19 @@ def collect_rebuild_targets(build_dir: str) -> List[str]:
     return rebuild_targets
 
 
-def display_detailed_analysis(problematic: List[Tuple[str, int, int, int, int]], cooccurrence: Dict[str, Dict[str, int]], project_root: str) -> None:
+def display_detailed_analysis(
+    problematic: List[Tuple[str, int, int, int, int]],
+    cooccurrence: Dict[str, Dict[str, int]],
+    project_root: str,
+    header_compile_seconds: Optional[Dict[str, float]] = None,
+) -> None:
     """Display detailed per-header analysis.
 
     Args:
         problematic: List of problematic headers with metrics
         cooccurrence: Cooccurrence matrix
         project_root: Path to the project root
+        header_compile_seconds: Optional estimated CPU-seconds to rebuild each header's dependent sources
     """
     print(f"\n{Colors.BRIGHT}Detailed Analysis (showing all {len(problematic)} headers):{Colors.RESET}")
 
@@ -452,6 +480,8 @@ def display_detailed_analysis(problematic: List[Tuple[str, int, int, int, int]],
         print(f"\n  {Colors.MAGENTA}{display_path}{Colors.RESET}")
         print(f"    Transitive deps: {Colors.BRIGHT}{dep_count}{Colors.RESET}, Fanout: {fanout}, Usage: {usage_count} sources")
         print(f"    Reverse impact: {reverse_impact} headers depend on this, Max chain: {chain_length}, Rebuild cost: {rebuild_cost:,}")
+        if header_compile_seconds and header in header_compile_seconds:
+            print(f"    Rebuild CPU time: ~{format_cpu_time(header_compile_seconds[header])} for the {usage_count} sources using it")
         print(f"    Severity: {severity}")
 
         # Show top cooccurring headers
@@ -499,6 +529,7 @@ def display_summary_output(
     top_n: int,
     project_root: str,
     show_detailed_hint: bool,
+    header_compile_seconds: Optional[Dict[str, float]] = None,
 ) -> None:
     """Display summary output with ranked lists.
 
@@ -510,6 +541,7 @@ def display_summary_output(
         top_n: Number of items to show in each list
         project_root: Path to the project root
         show_detailed_hint: Whether to show hint about --detailed flag
+        header_compile_seconds: Optional estimated CPU-seconds to rebuild each header's dependent sources
     """
     critical_count, high_count, moderate_count = calculate_summary_statistics(problematic, cooccurrence)
     total_problematic = len(problematic)
@@ -527,6 +559,8 @@ def display_summary_output(
     print(f"\n{Colors.BRIGHT}Metric Explanations:{Colors.RESET}")
     print(f"  {Colors.BRIGHT}Build Impact{Colors.RESET} = deps × direct usage - measures compilation cost of header's dependencies")
     print(f"  {Colors.BRIGHT}Rebuild Cost{Colors.RESET} = usage × (1 + dependents) - measures rebuild impact if header changes")
+    if header_compile_seconds:
+        print(f"  {Colors.BRIGHT}CPU{Colors.RESET} = summed .ninja_log compile times of the sources using the header")
     print(f"  {Colors.BRIGHT}Hub Headers{Colors.RESET} = reverse dependency count - shows architectural bottlenecks")
 
     # Show top N worst offenders
@@ -588,9 +622,10 @@ def display_summary_output(
             else:
                 cost_color = Colors.CYAN
 
+            cpu_note = f", ~{format_cpu_time(header_compile_seconds[header])} CPU" if header_compile_seconds and header in header_compile_seconds else ""
             print(
                 f"    {Colors.DIM}{i:2}.{Colors.RESET} {cost_color}{display_path}{Colors.RESET} "
-                f"({usage_count} uses × {reverse_impact} dependents = {rebuild_cost:,} source rebuilds)"
+                f"({usage_count} uses × {reverse_impact} dependents = {rebuild_cost:,} source rebuilds{cpu_note})"
             )
 
         # Show top N hub headers (most headers depend on these)
@@ -670,7 +705,7 @@ def main() -> int:
     print(f"\n{Colors.CYAN}Analyzing dependency hell ({len(rebuild_targets)} targets, {mode_desc})...{Colors.RESET}")
 
     try:
-        analysis_result, file_types = analyze_dependency_hell(build_dir, rebuild_targets, args.threshold)
+        analysis_result, file_types = analyze_dependency_hell(build_dir, rebuild_targets, args.threshold, deps_source=args.deps_source)
     except Exception as e:
         logger.error("Analysis failed: %s", e)
         logger.debug("Exception details:", exc_info=True)
@@ -727,11 +762,18 @@ def main() -> int:
 
     # Show detailed analysis if requested
     if args.detailed:
-        display_detailed_analysis(problematic, cooccurrence, project_root)
+        display_detailed_analysis(problematic, cooccurrence, project_root, analysis_result.header_compile_seconds)
 
     # Display summary output
     display_summary_output(
-        problematic, cooccurrence, len(rebuild_targets), args.threshold, args.top, project_root, show_detailed_hint=not args.detailed and len(problematic) > 0
+        problematic,
+        cooccurrence,
+        len(rebuild_targets),
+        args.threshold,
+        args.top,
+        project_root,
+        show_detailed_hint=not args.detailed and len(problematic) > 0,
+        header_compile_seconds=analysis_result.header_compile_seconds,
     )
 
     return 0
@@ -28,8 +28,10 @@ PURPOSE:
 
 WHAT IT DOES:
     - Runs 'ninja -n -d explain' to detect what would rebuild
-    - Uses 'ninja -t deps' to get dependencies for each target
+    - Reads ninja's dependency log (.ninja_deps) once for all targets
     - Creates an impact map showing how many targets depend on each header
+    - Follows each header through the ninja edge graph to the static/shared libraries
+      and executables it relinks, with link time from .ninja_log
     - Highlights changed headers and shows their rebuild impact
     - Can optionally show all high-impact headers (not just changed ones)
 
@@ -40,11 +42,11 @@ USE CASES:
     - Fast baseline analysis (no external dependencies required)
 
 METHOD:
-    Uses Ninja's built-in dependency tracking (ninja -t deps) which is fast but only
+    Uses Ninja's built-in dependency tracking (the .ninja_deps log) which is fast but only
     shows what Ninja already knows from previous builds. Does not parse source files.
 
 OUTPUT:
-    - List of changed headers with their target impact count
+    - List of changed headers with their target impact count and relink fan-out
     - Optional: All high-impact headers sorted by number of affected targets
 
 PERFORMANCE:
@@ -75,16 +77,20 @@ import argparse
 import logging
 from collections import defaultdict
 from pathlib import Path
-from typing import Set, Dict, List, Tuple
+from typing import Set, Dict, List, Tuple, Sequence, Optional
 
 # Import library modules
 from lib.color_utils import Colors, print_error, print_warning
-from lib.ninja_utils import get_dependencies, validate_build_directory_with_feedback
+from lib.ninja_utils import get_dependencies_for_targets, validate_build_directory_with_feedback
+from lib.ninja_log import format_cpu_time
+from lib.build_graph import load_build_graph
+from lib.link_impact import LinkImpact, compute_link_impact
+from lib.constants import NinjaError
 
 # RE_OUTPUT constant (kept for local use)
 RE_OUTPUT = re.compile(r"ninja explain: (.*)")
 
-# get_dependencies moved to lib.ninja_utils
+# get_dependencies_for_targets moved to lib.ninja_utils
 
 
 def build_dependency_impact_map(build_dir: str, rebuild_targets: List[str]) -> Tuple[Dict[str, Set[str]], str, int]:
@@ -107,12 +113,8 @@ def build_dependency_impact_map(build_dir: str, rebuild_targets: List[str]) -> T
 
     logging.info("Analyzing dependencies for %s rebuild targets...", len(rebuild_targets))
 
-    for idx, target in enumerate(rebuild_targets, 1):
-        if idx % 100 == 0:
-            logging.debug("Processing target %s/%s", idx, len(rebuild_targets))
-
-        deps = get_dependencies(build_dir, target)
-
+    # One read of the deps log serves every target
+    for target, deps in get_dependencies_for_targets(build_dir, rebuild_targets).items():
         for dep in deps:
             if dep.endswith((".h", ".hpp", ".hxx")):
                 if not dep.startswith("/usr/") and not dep.startswith("/lib/"):
@@ -121,6 +123,35 @@ def build_dependency_impact_map(build_dir: str, rebuild_targets: List[str]) -> T
     return impact_map, project_root, len(rebuild_targets)
 
 
+def compute_header_link_impact(build_dir: str, headers: Sequence[str]) -> Dict[str, LinkImpact]:
+    """Compute the libraries and executables each header relinks, in one pass over the build graph.
+
+    Args:
+        build_dir: Path to the build directory
+        headers: Headers to analyze
+
+    Returns:
+        Mapping of header -> LinkImpact (empty if the build graph cannot be read)
+    """
+    if not headers:
+        return {}
+    try:
+        return compute_link_impact(load_build_graph(build_dir), headers)
+    except (OSError, NinjaError) as e:
+        logging.warning("Link impact unavailable: %s", e)
+        return {}
+
+
+def format_link_impact(impact: Optional[LinkImpact]) -> str:
+    """Format a header's relink fan-out for a report line (empty if it relinks nothing)."""
+    if impact is None or not impact.relinks:
+        return ""
+    text = f"; relinks {Colors.BRIGHT}{len(impact.libraries)}{Colors.RESET} libraries, {Colors.BRIGHT}{len(impact.executables)}{Colors.RESET} executables"
+    if impact.link_seconds > 0:
+        text += f" ({'~' if impact.estimated else ''}{format_cpu_time(impact.link_seconds)} linking)"
+    return text
+
+
 def main() -> int:
     """Main entry point for the build impact analysis tool.
 
@@ -264,6 +295,12 @@ Typical workflow:
     changed_with_impact = dict(sorted(changed_with_impact.items(), key=lambda x: len(x[1]), reverse=True))
     all_high_impact = dict(sorted(all_high_impact.items(), key=lambda x: len(x[1]), reverse=True))
 
+    # Relink fan-out of every header that will be displayed, in one pass
+    shown_headers = list(changed_with_impact)[: args.limit]
+    if args.all_headers:
+        shown_headers += list(all_high_impact)[: args.limit]
+    link_impact = compute_header_link_impact(build_dir, list(dict.fromkeys(shown_headers)))
+
     # Print changed headers
     if changed_with_impact:
         print(f"\n{Colors.BRIGHT}Changed Headers (impacting multiple targets):{Colors.RESET}")
@@ -284,7 +321,7 @@ Typical workflow:
                 display_path = file_path
 
             count = len(impacted_targets)
-            print_error(f"  {display_path} → impacts {Colors.BRIGHT}{count}{Colors.RESET} targets", prefix=False)
+            print_error(f"  {display_path} → impacts {Colors.BRIGHT}{count}{Colors.RESET} targets{format_link_impact(link_impact.get(file_path))}", prefix=False)
             displayed += 1
     else:
         print_warning("\nNo changed headers with dependencies found", prefix=False)
@@ -310,7 +347,7 @@ Typical workflow:
 
             count = len(impacted_targets)
             marker = f" {Colors.RED}[CHANGED]{Colors.RESET}" if file_path in changed_files else ""
-            print(f"  {Colors.MAGENTA}{display_path}{Colors.RESET} → impacts {Colors.BRIGHT}{count}{Colors.RESET} targets{marker}")
+            print(f"  {Colors.MAGENTA}{display_path}{Colors.RESET} → impacts {Colors.BRIGHT}{count}{Colors.RESET} targets{format_link_impact(link_impact.get(file_path))}{marker}")
             displayed += 1
 
     # Restore original directory
@@ -43,7 +43,7 @@ USE CASES:
 METHOD:
     Analyzes cooccurrence: if headers A and B appear together in many compilation units,
     they likely have a dependency relationship (either direct or transitive).
-    Uses 'ninja -t deps' to get the full dependency list for each target.
+    Reads ninja's dependency log (.ninja_deps) to get the full dependency list for each target.
 
 OUTPUT:
     For each changed header:
@@ -90,7 +90,7 @@ from pathlib import Path
 # Import library modules
 from lib.color_utils import Colors, is_color_supported
 from lib.file_utils import exclude_headers_by_patterns
-from lib.ninja_utils import check_ninja_available, validate_build_directory, get_dependencies, run_ninja_explain, parse_ninja_explain_output
+from lib.ninja_utils import check_ninja_available, validate_build_directory, get_dependencies_for_targets, run_ninja_explain, parse_ninja_explain_output
 from lib.dependency_utils import compute_header_cooccurrence_from_deps_lists, SourceDependencyMap
 
 COLORAMA_AVAILABLE = is_color_supported()
@@ -105,7 +105,7 @@ SYSTEM_PATH_PREFIXES = ("/usr/", "/lib/", "/opt/")
 DEFAULT_THRESHOLD = 5
 DEFAULT_MAX_RESULTS = 10
 
-# check_ninja_available, validate_build_directory, and get_dependencies moved to lib modules
+# check_ninja_available, validate_build_directory, and get_dependencies_for_targets moved to lib modules
 
 
 # Helper functions for local use
@@ -130,9 +130,7 @@ def build_include_graph(build_dir: Path, rebuild_targets: List[str]) -> Dict[str
         Dictionary mapping header -> (header -> cooccurrence_count)
     """
     # Collect dependencies for all targets
-    dependencies_by_target = {}
-    for target in rebuild_targets:
-        dependencies_by_target[target] = get_dependencies(str(build_dir), target)
+    dependencies_by_target = get_dependencies_for_targets(str(build_dir), rebuild_targets)
 
     # Create SourceDependencyMap and use library function to compute cooccurrence
     dependency_map = SourceDependencyMap(dependencies_by_target)
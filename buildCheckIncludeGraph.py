@@ -37,6 +37,7 @@ WHAT IT DOES:
     - Shows which specific .cpp files will rebuild for each changed header
     - Calculates "include cost" (average number of headers pulled in)
     - Provides gateway header rankings
+    - Finds chokepoint headers with a dominator tree over the include graph
 
 USE CASES:
     - "If I change this header, which .cpp files will rebuild?"
@@ -58,13 +59,17 @@ OUTPUT:
        - Average dependencies pulled in
        - Number of unique dependencies
        - Usage count across source files
-    3. Detailed analysis of changed headers' include costs
+    3. Chokepoint headers ranked by the TU-weighted compile cost they control
+    4. Detailed analysis of changed headers' include costs
 
 METRICS EXPLAINED:
     - Include Cost: Average number of other headers pulled in when this header is included
     - Unique Deps: Total number of distinct headers that cooccur with this header
     - Usage Count: Number of source files that include this header
     - Gateway Header: Header with high include cost (pulls in many dependencies)
+    - Chokepoint: Header that every include path to some other headers must go through
+      (it dominates them); its controlled cost sums, over itself and the headers it
+      dominates, the number of .cpp files that include each one
 
 PERFORMANCE:
     Slower than basic tools (3-10 seconds) but provides accurate source-level analysis.
@@ -125,6 +130,9 @@ from lib.clang_utils import (
     FileType,
 )
 from lib.tool_detection import find_clang_scan_deps, find_ninja
+from lib.recorded_deps import DEPS_SOURCE_AUTO, DEPS_SOURCES
+from lib.git_utils import parse_includes_from_content
+from lib.graph_utils import compute_dominator_tree
 
 # Constants
 CLANG_SCAN_DEPS_TIMEOUT: int = 600  # 10 minutes
@@ -133,6 +141,7 @@ FILTERED_COMPILE_DB_FILENAME: str = "compile_commands_filtered.json"
 # SOURCE_FILE_EXTENSIONS, HEADER_FILE_EXTENSIONS moved to lib.clang_utils
 COMPILER_NAMES: Tuple[str, ...] = ("g++", "gcc", "clang++", "clang", "/c++")
 HIGH_COST_THRESHOLD: int = 50  # Headers with average cost above this are optimization targets
+VIRTUAL_ROOT: str = "<all translation units>"  # Dominator-tree entry node that includes every TU
 
 
 @dataclass
@@ -263,6 +272,147 @@ def analyze_gateway_headers(source_to_headers: Dict[str, Set[str]]) -> List[Tupl
     return gateway_headers
 
 
+@dataclass
+class ChokepointHeader:
+    """Header that every include path to its dominated headers must pass through.
+
+    Attributes:
+        header: Header path
+        dominated_headers: Headers reachable from the translation units only through this header
+        tu_count: Translation units that include the header (directly or transitively)
+        controlled_cost: TU-weighted compile cost of the header and its dominated subtree
+            (sum, over those headers, of the number of TUs that include them)
+    """
+
+    header: str
+    dominated_headers: List[str]
+    tu_count: int
+    controlled_cost: int
+
+
+def find_direct_source_includes(source: str, deps: Set[str], include_graph: Dict[str, Set[str]]) -> Set[str]:
+    """Find the headers a translation unit includes directly.
+
+    Parses the source's #include directives and resolves each one against the TU's
+    own dependency list: relative to the TU's directory first, then by a path suffix
+    that exactly one dependency ends with. Includes that match several dependencies
+    are skipped (and logged) rather than guessed. If the source cannot be read,
+    falls back to the dependencies no other dependency includes.
+
+    Args:
+        source: Source file path
+        deps: All (transitive) dependencies of the source reported by clang-scan-deps
+        include_graph: Mapping of headers to the headers they directly include
+
+    Returns:
+        Set of directly included dependency paths
+    """
+    headers = deps - {source}
+    try:
+        with open(source, "r", encoding="utf-8", errors="ignore") as f:
+            includes = parse_includes_from_content(f.read(), skip_system_headers=False)
+    except (IOError, OSError) as e:
+        logging.debug("Could not read %s (%s), approximating its direct includes", source, e)
+        included_by_others: Set[str] = set()
+        for header in headers:
+            included_by_others.update(include_graph.get(header, set()))
+        return headers - included_by_others
+
+    by_basename: DefaultDict[str, List[str]] = defaultdict(list)
+    for header in headers:
+        by_basename[os.path.basename(header)].append(header)
+
+    source_dir = os.path.dirname(source)
+    direct: Set[str] = set()
+    ambiguous: List[str] = []
+    for include in includes:
+        include = os.path.normpath(include)
+        local = os.path.normpath(os.path.join(source_dir, include))
+        if local in headers:
+            direct.add(local)
+            continue
+        matches = [c for c in by_basename.get(os.path.basename(include), []) if c == include or c.endswith(os.path.sep + include)]
+        if len(matches) == 1:
+            direct.add(matches[0])
+        elif matches:
+            ambiguous.append(include)
+    if ambiguous:
+        # Unattached dependencies hang directly off the TU, which never inflates another header's dominance
+        logging.debug("%s: skipped %d ambiguous includes: %s", source, len(ambiguous), ", ".join(ambiguous))
+    return direct
+
+
+def analyze_chokepoint_headers(source_to_headers: Dict[str, Set[str]], include_graph: Dict[str, Set[str]]) -> List[ChokepointHeader]:
+    """Identify chokepoint headers with a dominator tree over the include graph.
+
+    A virtual root includes every translation unit; TUs include their direct headers
+    and headers include theirs. Header h dominates header d if every include path from
+    any TU to d goes through h, so removing or slimming h is the only way to stop
+    paying for d. Unlike the co-occurrence gateway metric, this is exact; besides the
+    near-linear dominator pass it walks each TU's include closure once.
+
+    Args:
+        source_to_headers: Mapping of source files to all headers they pull in
+        include_graph: Mapping of headers to the headers they directly include
+
+    Returns:
+        Headers that dominate at least one other header, sorted by controlled cost (highest first)
+
+    Raises:
+        ValueError: If inputs are invalid
+    """
+    if not source_to_headers:
+        logging.warning("No source-to-header mappings provided")
+        return []
+
+    if not isinstance(source_to_headers, dict):
+        raise ValueError("source_to_headers must be a dictionary")
+
+    tu_count: DefaultDict[str, int] = defaultdict(int)
+    graph: nx.DiGraph[str] = nx.DiGraph()
+    for source, deps in source_to_headers.items():
+        graph.add_edge(VIRTUAL_ROOT, source)
+        for header in deps - {source}:
+            tu_count[header] += 1
+        for header in find_direct_source_includes(source, deps, include_graph):
+            graph.add_edge(source, header)
+    for header, includes in include_graph.items():
+        for included in includes:
+            if included != header:
+                graph.add_edge(header, included)
+
+    # Dependencies a TU does not reach through its parsed includes hang directly off that
+    # TU, so they never make another header look like a chokepoint. Reachability is per TU:
+    # another TU reaching the same header says nothing about how this one gets to it.
+    unattached: List[Tuple[str, Set[str]]] = []
+    for source, deps in source_to_headers.items():
+        reached: Set[str] = nx.descendants(graph, source)
+        unattached.append((source, deps - reached - {source}))
+    for source, headers in unattached:
+        for header in headers:
+            graph.add_edge(source, header)
+
+    weights: Dict[str, float] = {node: float(tu_count.get(node, 0)) for node in graph.nodes()}
+    tree = compute_dominator_tree(graph, VIRTUAL_ROOT, weights)
+
+    chokepoints: List[ChokepointHeader] = []
+    for header, count in tu_count.items():
+        if tree.dominated_count.get(header, 0) == 0:
+            continue
+        chokepoints.append(
+            ChokepointHeader(
+                header=header,
+                dominated_headers=sorted(tree.dominated(header), key=lambda h: (-tu_count.get(h, 0), h)),
+                tu_count=count,
+                controlled_cost=int(tree.subtree_weight[header]),
+            )
+        )
+
+    chokepoints.sort(key=lambda c: (-c.controlled_cost, c.header))
+    logging.info("Identified %s chokepoint headers", len(chokepoints))
+    return chokepoints
+
+
 def build_header_dependency_graph(source_to_headers: Dict[str, Set[str]]) -> Tuple["nx.Graph[Any]", DefaultDict[str, Set[str]]]:
     """Build header-to-header dependency graph by analyzing which headers are commonly included together.
 
@@ -512,6 +662,14 @@ Requires: clang-scan-deps (install: sudo apt install clang-19)
 
     parser.add_argument("--include-system-headers", action="store_true", help="Include system headers in analysis (default: exclude /usr/*, /lib/*, /opt/*)")
 
+    parser.add_argument(
+        "--deps-source",
+        choices=DEPS_SOURCES,
+        default=DEPS_SOURCE_AUTO,
+        help="Where per-source dependencies come from (default: auto). auto: ninja's .ninja_deps records, rescanning stale sources "
+        "with clang-scan-deps; ninja: require recorded dependencies; clang-scan-deps: always scan",
+    )
+
     parser.add_argument(
         "--debug-sanitization", action="store_true", help="Enable detailed logging of compile command sanitization (shows what gets removed and why)"
     )
@@ -605,26 +763,32 @@ def get_changed_headers(build_dir: str, args: argparse.Namespace) -> Set[str]:
     return changed_headers
 
 
-def analyze_dependencies(build_dir: str) -> Tuple["nx.DiGraph[Any]", Dict[str, Set[str]], "nx.Graph[Any]", DefaultDict[str, Set[str]], Dict[str, "FileType"]]:
+def analyze_dependencies(
+    build_dir: str,
+    deps_source: str = DEPS_SOURCE_AUTO,
+) -> Tuple["nx.DiGraph[Any]", Dict[str, Set[str]], "nx.Graph[Any]", DefaultDict[str, Set[str]], Dict[str, "FileType"], DefaultDict[str, Set[str]]]:
     """Build include and header dependency graphs.
 
     Args:
         build_dir: Path to the build directory
+        deps_source: Where per-source dependencies come from (see build_include_graph)
 
     Returns:
-        Tuple of (graph, source_to_headers, header_graph, header_to_headers, file_types)
+        Tuple of (graph, source_to_headers, header_graph, header_to_headers, file_types, include_graph)
+        where include_graph maps each header to the headers it directly includes
 
     Raises:
         SystemExit: If analysis fails
     """
     # Build include graph using lib's build_include_graph
     try:
-        scan_result = build_include_graph(build_dir)
+        scan_result = build_include_graph(build_dir, deps_source=deps_source)
         source_to_headers_lists = scan_result.source_to_deps
         # Convert List[str] to Set[str] for compatibility with build_header_dependency_graph
         source_to_headers: Dict[str, Set[str]] = {src: set(deps) for src, deps in source_to_headers_lists.items()}
         all_headers = scan_result.all_headers
         file_types = scan_result.file_types
+        include_graph = scan_result.include_graph
 
         # Build NetworkX graph from source_to_headers for compatibility with existing code
         graph: nx.DiGraph[str] = nx.DiGraph()
@@ -648,7 +812,7 @@ def analyze_dependencies(build_dir: str) -> Tuple["nx.DiGraph[Any]", Dict[str, S
         print(f"{Colors.RED}Error: Failed to build header dependency graph: {e}{Colors.RESET}")
         sys.exit(1)
 
-    return graph, source_to_headers, header_graph, header_to_headers, file_types
+    return graph, source_to_headers, header_graph, header_to_headers, file_types, include_graph
 
 
 def print_dependency_summary(source_to_headers: Dict[str, Set[str]], header_graph: "nx.Graph[Any]") -> None:
@@ -814,6 +978,45 @@ def print_gateway_analysis(gateway_headers: List[Tuple[str, float, int, int]], c
         print(f"    Avg deps: {avg_cost:.1f} | Unique deps: {unique_deps} | Used by: {usage_count} files{marker}")
 
 
+def print_chokepoint_analysis(chokepoints: List[ChokepointHeader], changed_headers: Set[str], project_root: str, is_full_mode: bool) -> None:
+    """Print dominator-tree chokepoint analysis.
+
+    Args:
+        chokepoints: Chokepoint headers sorted by controlled cost
+        changed_headers: Set of changed header paths
+        project_root: Root directory of the project
+        is_full_mode: Whether in full analysis mode
+    """
+    print(f"\n{Colors.BRIGHT}{'='*80}{Colors.RESET}")
+    print(f"{Colors.BRIGHT}CHOKEPOINT HEADERS (DOMINATOR TREE){Colors.RESET}")
+    print(f"{Colors.BRIGHT}{'='*80}{Colors.RESET}")
+    print("Chokepoint = every include path from a .cpp file to the headers below it goes through this header\n")
+
+    if not chokepoints:
+        print(f"{Colors.DIM}No header exclusively gates other headers{Colors.RESET}")
+        return
+
+    def display(path: str) -> str:
+        return os.path.relpath(path, project_root) if path.startswith(project_root) else path
+
+    top_count: int = 30 if is_full_mode else 20
+    print(f"{Colors.BRIGHT}Top {top_count} chokepoints (highest controlled compile cost):{Colors.RESET}")
+    for chokepoint in chokepoints[:top_count]:
+        is_changed: bool = chokepoint.header in changed_headers
+        color: str = Colors.RED if is_changed else Colors.YELLOW
+        marker: str = " ⚠️ CHANGED" if is_changed else ""
+
+        print(f"  {color}{display(chokepoint.header)}{Colors.RESET}")
+        print(
+            f"    Gates: {len(chokepoint.dominated_headers)} headers | Used by: {chokepoint.tu_count} files | "
+            f"Controlled cost: {chokepoint.controlled_cost} header compilations{marker}"
+        )
+        for dominated in chokepoint.dominated_headers[:3]:
+            print(f"      {Colors.DIM}→ {display(dominated)}{Colors.RESET}")
+        if len(chokepoint.dominated_headers) > 3:
+            print(f"      {Colors.DIM}... and {len(chokepoint.dominated_headers) - 3} more{Colors.RESET}")
+
+
 def print_detailed_header_analysis(
     changed_headers_in_graph: List[str],
     gateway_headers: List[Tuple[str, float, int, int]],
@@ -1007,7 +1210,7 @@ def main() -> int:
     changed_headers: Set[str] = get_changed_headers(build_dir, args)
 
     # Analyze dependencies
-    _, source_to_headers, header_graph, _, file_types = analyze_dependencies(build_dir)
+    _, source_to_headers, header_graph, _, file_types, include_graph = analyze_dependencies(build_dir, args.deps_source)
 
     # Print dependency summary
     print_dependency_summary(source_to_headers, header_graph)
@@ -1020,12 +1223,21 @@ def main() -> int:
         print(f"{Colors.RED}Error: Failed to analyze gateway headers: {e}{Colors.RESET}")
         return 1
 
+    # Dominator-tree chokepoints
+    try:
+        chokepoints: List[ChokepointHeader] = analyze_chokepoint_headers(source_to_headers, include_graph)
+    except Exception as e:
+        logging.error("Failed to analyze chokepoint headers: %s", e)
+        print(f"{Colors.RED}Error: Failed to analyze chokepoint headers: {e}{Colors.RESET}")
+        return 1
+
     # Filter headers to analyze
     changed_headers_in_graph: List[str] = filter_headers_to_analyze(args, changed_headers, gateway_headers, header_graph, project_root, build_dir, file_types)
 
     # Print analyses
     print_header_analysis(changed_headers_in_graph, source_to_headers, project_root, args, args.full)
     print_gateway_analysis(gateway_headers, changed_headers, project_root, args.full)
+    print_chokepoint_analysis(chokepoints, changed_headers, project_root, args.full)
     print_detailed_header_analysis(changed_headers_in_graph, gateway_headers, source_to_headers, project_root, args.full)
     print_rebuild_summary(changed_headers_in_graph, source_to_headers, project_root, args.full)
     print_optimization_opportunities(changed_headers_in_graph, gateway_headers, source_to_headers, project_root, args.full)
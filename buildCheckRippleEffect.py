@@ -82,6 +82,9 @@ EXAMPLES:
 
     # Output as JSON
     ./buildCheckRippleEffect.py ../build/release/ --json results.json
+
+    # Estimate the rebuild wall time on 32 cores
+    ./buildCheckRippleEffect.py ../build/release/ -j 32
 """
 import sys
 import os
@@ -90,10 +93,14 @@ import logging
 import json
 from pathlib import Path
 from typing import Optional, List, Dict, Set
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, field
 
 # Import library modules
 from lib.git_utils import find_git_repo, get_uncommitted_changes, get_working_tree_changes_from_commit, validate_ancestor_relationship, categorize_changed_files
+from lib.ninja_log import CompileTimes, format_cpu_time, load_compile_times
+from lib.build_graph import load_build_graph
+from lib.build_simulator import RebuildSimulation, simulate_change
+from lib.constants import NinjaError
 from lib.ninja_utils import validate_and_prepare_build_dir, validate_build_directory_with_feedback
 from lib.dependency_utils import build_reverse_dependency_map, compute_affected_sources, SourceDependencyMap
 from lib.color_utils import Colors, print_error, print_warning, print_success
@@ -111,6 +118,8 @@ class RippleEffectResult:
         direct_sources: Set of directly changed source files
         source_to_deps: Mapping of source files to their dependencies
         header_to_sources: Mapping of headers to sources that depend on them
+        compile_times: Per-source compile durations from .ninja_log (None if the build has no log)
+        rebuild_simulation: Simulated wall time of the rebuild, archives and links included (None if the build has no log)
     """
 
     affected_sources: Dict[str, List[str]]
@@ -118,6 +127,8 @@ class RippleEffectResult:
     direct_sources: Set[str]
     source_to_deps: Dict[str, List[str]]
     header_to_sources: Dict[str, Set[str]]
+    compile_times: Optional[CompileTimes] = None
+    rebuild_simulation: Optional[RebuildSimulation] = None
 
 
 @dataclass
@@ -131,6 +142,11 @@ class RippleEffectData:
         all_affected_sources: List of all unique affected source file paths
         total_sources: Total number of source files in build
         rebuild_percentage: Percentage of sources affected (0-100)
+        estimated_cpu_seconds: Estimated CPU-seconds to recompile the affected sources (None without .ninja_log)
+        total_cpu_seconds: Estimated CPU-seconds to recompile every source (None without .ninja_log)
+        estimated_wall_seconds: Simulated wall-clock seconds of the rebuild on simulated_jobs (None without .ninja_log)
+        simulated_jobs: Parallel jobs the rebuild was simulated with (None without .ninja_log)
+        critical_path: Outputs of the chain of edges that finishes last in the simulated rebuild
     """
 
     changed_headers: List[str]
@@ -139,10 +155,16 @@ class RippleEffectData:
     all_affected_sources: List[str]
     total_sources: int
     rebuild_percentage: float
+    estimated_cpu_seconds: Optional[float] = None
+    total_cpu_seconds: Optional[float] = None
+    estimated_wall_seconds: Optional[float] = None
+    simulated_jobs: Optional[int] = None
+    critical_path: List[str] = field(default_factory=list)
 
 
 # Import build_include_graph from library
 from lib.clang_utils import build_include_graph
+from lib.recorded_deps import DEPS_SOURCE_AUTO, DEPS_SOURCES
 
 # Explicitly export functions for testing (library functions are imported, not exported)
 __all__ = [
@@ -157,7 +179,14 @@ __all__ = [
 
 
 def analyze_ripple_effect(
-    build_dir: str, changed_headers: List[str], changed_sources: List[str], verbose: bool = False
+    build_dir: str,
+    changed_headers: List[str],
+    changed_sources: List[str],
+    verbose: bool = False,
+    jobs: Optional[int] = None,
+    pool_depths: Optional[Dict[str, int]] = None,
+    deps_source: str = DEPS_SOURCE_AUTO,
+    include_system_headers: bool = True,
 ) -> tuple[RippleEffectResult, Dict[str, "FileType"]]:
     """Analyze which C/C++ files will recompile due to changes.
 
@@ -166,6 +195,11 @@ def analyze_ripple_effect(
         changed_headers: List of changed header files (absolute paths)
         changed_sources: List of changed source files (absolute paths)
         verbose: Whether to print progress messages
+        jobs: Parallel jobs for the rebuild simulation (None: ninja's default)
+        pool_depths: Pool depths overriding build.ninja in the rebuild simulation
+        deps_source: Where per-source dependencies come from (see build_include_graph)
+        include_system_headers: Whether changed system headers count towards the
+            affected sources and the rebuild simulation
 
     Returns:
         Tuple of (RippleEffectResult, file_types_dict):
@@ -189,7 +223,7 @@ def analyze_ripple_effect(
 
     # Build complete include graph
     try:
-        scan_result = build_include_graph(build_dir)
+        scan_result = build_include_graph(build_dir, deps_source=deps_source)
         source_to_deps = scan_result.source_to_deps
         file_types = scan_result.file_types
         scan_time = scan_result.scan_time
@@ -214,6 +248,11 @@ def analyze_ripple_effect(
     if verbose:
         print_success("Reverse dependency map built")
 
+    # Only the headers the report shows may drive the affected set and the simulation
+    if not include_system_headers:
+        filtered_headers, _ = filter_by_file_type(set(changed_headers), file_types, exclude_types={FileType.SYSTEM}, show_progress=False)
+        changed_headers = [header for header in changed_headers if header in filtered_headers]
+
     # Analyze impact of changed headers
     affected_sources = compute_affected_sources(changed_headers, header_to_sources)
     total_affected = set()
@@ -223,6 +262,15 @@ def analyze_ripple_effect(
     # Changed source files are directly affected
     direct_sources = set(changed_sources)
 
+    # Wall time needs durations, so only builds with a .ninja_log get a simulation
+    compile_times = load_compile_times(build_dir)
+    rebuild_simulation = None
+    if compile_times is not None:
+        try:
+            rebuild_simulation = simulate_change(load_build_graph(build_dir), [*changed_headers, *total_affected, *direct_sources], jobs, pool_depths)
+        except (OSError, NinjaError) as e:
+            logging.warning("Cannot simulate the rebuild: %s", e)
+
     if verbose:
         print()
 
@@ -233,6 +281,8 @@ def analyze_ripple_effect(
             direct_sources=direct_sources,
             source_to_deps=source_to_deps,
             header_to_sources=header_to_sources,
+            compile_times=compile_times,
+            rebuild_simulation=rebuild_simulation,
         ),
         file_types,
     )
@@ -276,8 +326,29 @@ def print_ripple_report(changed_headers: List[str], changed_sources: List[str],
     print(f"{Colors.BRIGHT}Summary:{Colors.RESET}")
     print(f"  Changed files: {Colors.CYAN}{total_changed}{Colors.RESET} ({len(changed_headers)} headers, {len(changed_sources)} sources)")
     print(f"  Affected sources: {impact_color}{len(all_affected)}{Colors.RESET} / {total_sources} ({rebuild_pct:.1f}%)")
+    compile_times = analysis_result.compile_times
+    if compile_times is not None:
+        rebuild_seconds = compile_times.total(all_affected)
+        full_seconds = compile_times.total(source_to_deps)
+        print(f"  Estimated CPU time: {impact_color}{format_cpu_time(rebuild_seconds)}{Colors.RESET} / {format_cpu_time(full_seconds)} for a full rebuild (from .ninja_log)")
+    simulation = analysis_result.rebuild_simulation
+    if simulation is not None and simulation.edge_count:
+        steps = ", ".join(f"{count} {kind}" for kind, count in sorted(simulation.edge_counts.items(), key=lambda x: -x[1]))
+        print(
+            f"  Estimated wall time: {impact_color}~{format_cpu_time(simulation.wall_seconds)}{Colors.RESET} on {simulation.jobs} jobs "
+            f"({steps}; critical path {format_cpu_time(simulation.critical_seconds)})"
+        )
     print(f"  Severity: {impact_color}{severity}{Colors.RESET}\n")
 
+    if simulation is not None and simulation.critical_path:
+        shown = simulation.critical_path[-10:]
+        print(f"{Colors.BRIGHT}Rebuild Critical Path ({len(simulation.critical_path)} steps):{Colors.RESET}")
+        if len(simulation.critical_path) > len(shown):
+            print(f"  {Colors.DIM}... {len(simulation.critical_path) - len(shown)} earlier steps{Colors.RESET}")
+        for output in shown:
+            print(f"  {Colors.DIM}{output}{Colors.RESET}")
+        print()
+
     # Show changed files
     if changed_headers:
         print(f"{Colors.BRIGHT}Changed Headers ({len(changed_headers)}):{Colors.RESET}")
@@ -292,7 +363,8 @@ def print_ripple_report(changed_headers: List[str], changed_sources: List[str],
             else:
                 color = Colors.CYAN
 
-            print(f"  {color}{display_path}{Colors.RESET} → affects {num_affected} sources")
+            cpu_note = f" (~{format_cpu_time(compile_times.total(affected_sources.get(header, [])))} CPU)" if compile_times is not None else ""
+            print(f"  {color}{display_path}{Colors.RESET} → affects {num_affected} sources{cpu_note}")
 
     if changed_sources:
         print(f"\n{Colors.BRIGHT}Changed Sources ({len(changed_sources)}):{Colors.RESET}")
@@ -333,7 +405,14 @@ def print_ripple_report(changed_headers: List[str], changed_sources: List[str],
 
 
 def get_ripple_effect_data(
-    build_dir: str, repo_dir: str, from_ref: Optional[str] = None, include_system_headers: bool = False, verbose: bool = False
+    build_dir: str,
+    repo_dir: str,
+    from_ref: Optional[str] = None,
+    include_system_headers: bool = False,
+    verbose: bool = False,
+    jobs: Optional[int] = None,
+    pool_depths: Optional[Dict[str, int]] = None,
+    deps_source: str = DEPS_SOURCE_AUTO,
 ) -> RippleEffectData:
     """
     Get structured ripple effect analysis data without printing.
@@ -344,6 +423,9 @@ def get_ripple_effect_data(
         from_ref: Git reference to compare against (default: None = HEAD, uncommitted only)
         include_system_headers: Include system headers in analysis (default: False)
         verbose: Enable verbose output (default: False)
+        jobs: Parallel jobs for the rebuild simulation (None: ninja's default)
+        pool_depths: Pool depths overriding build.ninja in the rebuild simulation
+        deps_source: Where per-source dependencies come from (see build_include_graph)
 
     Returns:
         dict with keys:
@@ -392,7 +474,16 @@ def get_ripple_effect_data(
         )
 
     # Analyze ripple effect first to get file_types (verbose=False to suppress progress messages)
-    analysis_result, file_types = analyze_ripple_effect(build_dir, changed_headers, changed_sources, verbose=False)
+    analysis_result, file_types = analyze_ripple_effect(
+        build_dir,
+        changed_headers,
+        changed_sources,
+        verbose=False,
+        jobs=jobs,
+        pool_depths=pool_depths,
+        deps_source=deps_source,
+        include_system_headers=include_system_headers,
+    )
 
     # Filter system headers unless explicitly included
     if not include_system_headers:
@@ -419,6 +510,8 @@ def get_ripple_effect_data(
         all_affected.update(sources)
 
     rebuild_pct = (len(all_affected) * 100.0 / total_sources) if total_sources > 0 else 0.0
+    compile_times = analysis_result.compile_times
+    simulation = analysis_result.rebuild_simulation
 
     return RippleEffectData(
         changed_headers=sorted(changed_headers),
@@ -427,6 +520,11 @@ def get_ripple_effect_data(
         all_affected_sources=sorted(all_affected),
         total_sources=total_sources,
         rebuild_percentage=rebuild_pct,
+        estimated_cpu_seconds=compile_times.total(all_affected) if compile_times is not None else None,
+        total_cpu_seconds=compile_times.total(source_to_deps) if compile_times is not None else None,
+        estimated_wall_seconds=simulation.wall_seconds if simulation is not None else None,
+        simulated_jobs=simulation.jobs if simulation is not None else None,
+        critical_path=simulation.critical_path if simulation is not None else [],
     )
 
 
@@ -461,6 +559,9 @@ Examples:
   # Output as JSON
   %(prog)s ../build/release/ --json results.json
 
+  # Estimate the rebuild wall time on 32 cores with at most 2 concurrent links
+  %(prog)s ../build/release/ -j 32 --pool-depth link_pool=2
+
 Requires: git, clang-scan-deps, networkx (pip install networkx)
         """,
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -490,7 +591,34 @@ Requires: git, clang-scan-deps, networkx (pip install networkx)
 
     parser.add_argument("--include-system-headers", action="store_true", help="Include system headers in analysis (default: exclude /usr/*, /lib/*, /opt/*)")
 
-    return parser.parse_args()
+    parser.add_argument(
+        "-j", "--jobs", type=int, metavar="N", default=None, help="Parallel jobs for the rebuild wall-time estimate (default: ninja's default for this machine)"
+    )
+
+    parser.add_argument(
+        "--pool-depth",
+        action="append",
+        default=[],
+        metavar="POOL=DEPTH",
+        help="Override a ninja pool depth in the wall-time estimate (repeatable, e.g. link_pool=2)",
+    )
+
+    parser.add_argument(
+        "--deps-source",
+        choices=DEPS_SOURCES,
+        default=DEPS_SOURCE_AUTO,
+        help="Where per-source dependencies come from (default: auto). auto: ninja's .ninja_deps records, rescanning stale sources "
+        "with clang-scan-deps; ninja: require recorded dependencies; clang-scan-deps: always scan",
+    )
+
+    args = parser.parse_args()
+    if args.jobs is not None and args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+    try:
+        args.pool_depths = {name: int(depth) for name, depth in (item.split("=", 1) for item in args.pool_depth)}
+    except ValueError:
+        parser.error("--pool-depth expects POOL=DEPTH with an integer depth")
+    return args
 
 
 def setup_logging(log_level_str: str) -> None:
@@ -556,7 +684,16 @@ def validate_git_repository_path(repo_path: Optional[str], build_dir: str) -> st
         raise RuntimeError(f"Error validating git repository: {e}") from e
 
 
-def write_json_output_file(json_path: str, build_dir: str, repo_dir: str, from_ref: Optional[str] = None, include_system_headers: bool = False) -> None:
+def write_json_output_file(
+    json_path: str,
+    build_dir: str,
+    repo_dir: str,
+    from_ref: Optional[str] = None,
+    include_system_headers: bool = False,
+    jobs: Optional[int] = None,
+    pool_depths: Optional[Dict[str, int]] = None,
+    deps_source: str = DEPS_SOURCE_AUTO,
+) -> None:
     """Generate and write JSON output to file.
 
     Args:
@@ -565,13 +702,16 @@ def write_json_output_file(json_path: str, build_dir: str, repo_dir: str, from_r
         repo_dir: Repository directory path
         from_ref: Git reference to compare against (default: None = HEAD)
         include_system_headers: Include system headers in analysis (default: False)
+        jobs: Parallel jobs for the rebuild simulation (None: ninja's default)
+        pool_depths: Pool depths overriding build.ninja in the rebuild simulation
+        deps_source: Where per-source dependencies come from (see build_include_graph)
 
     Raises:
         SystemExit: If JSON generation fails
     """
     try:
         logging.info("Generating JSON output to: %s", json_path)
-        ripple_result = get_ripple_effect_data(build_dir, repo_dir, from_ref, include_system_headers)
+        ripple_result = get_ripple_effect_data(build_dir, repo_dir, from_ref, include_system_headers, jobs=jobs, pool_depths=pool_depths, deps_source=deps_source)
         json_output = json.dumps(asdict(ripple_result), indent=2)
 
         # Ensure output directory exists
@@ -589,7 +729,16 @@ def write_json_output_file(json_path: str, build_dir: str, repo_dir: str, from_r
         raise RuntimeError(f"Failed to write JSON output: {e}") from e
 
 
-def run_analysis_workflow(build_dir: str, repo_dir: str, verbose: bool, from_ref: Optional[str] = None, include_system_headers: bool = False) -> None:
+def run_analysis_workflow(
+    build_dir: str,
+    repo_dir: str,
+    verbose: bool,
+    from_ref: Optional[str] = None,
+    include_system_headers: bool = False,
+    jobs: Optional[int] = None,
+    pool_depths: Optional[Dict[str, int]] = None,
+    deps_source: str = DEPS_SOURCE_AUTO,
+) -> None:
     """Execute the main ripple effect analysis workflow.
 
     Args:
@@ -598,6 +747,9 @@ def run_analysis_workflow(build_dir: str, repo_dir: str, verbose: bool, from_ref
         verbose: Whether to show verbose output
         from_ref: Git reference to compare against (default: None = HEAD)
         include_system_headers: Include system headers in analysis (default: False)
+        jobs: Parallel jobs for the rebuild simulation (None: ninja's default)
+        pool_depths: Pool depths overriding build.ninja in the rebuild simulation
+        deps_source: Where per-source dependencies come from (see build_include_graph)
 
     Raises:
         SystemExit: If analysis fails
@@ -631,7 +783,16 @@ def run_analysis_workflow(build_dir: str, repo_dir: str, verbose: bool, from_ref
 
         # Analyze ripple effect first to get file_types
         logging.info("Starting ripple effect analysis")
-        analysis_result, file_types = analyze_ripple_effect(build_dir, changed_headers, changed_sources, verbose=verbose)
+        analysis_result, file_types = analyze_ripple_effect(
+            build_dir,
+            changed_headers,
+            changed_sources,
+            verbose=verbose,
+            jobs=jobs,
+            pool_depths=pool_depths,
+            deps_source=deps_source,
+            include_system_headers=include_system_headers,
+        )
         logging.info("Ripple effect analysis completed")
 
         # Filter system headers unless explicitly included
@@ -688,14 +849,14 @@ def main() -> int:
     # JSON output mode
     if args.json:
         try:
-            write_json_output_file(args.json, build_dir, repo_dir, args.from_ref, args.include_system_headers)
+            write_json_output_file(args.json, build_dir, repo_dir, args.from_ref, args.include_system_headers, args.jobs, args.pool_depths, args.deps_source)
             return 0
         except RuntimeError:
             # Error message already printed
             return 1
 
     # Run main analysis workflow
-    run_analysis_workflow(build_dir, repo_dir, args.verbose, args.from_ref, args.include_system_headers)
+    run_analysis_workflow(build_dir, repo_dir, args.verbose, args.from_ref, args.include_system_headers, args.jobs, args.pool_depths, args.deps_source)
     return 0
 
 
@@ -33,7 +33,7 @@ Requirements:
     - colorama (optional, for colored output): pip install colorama
 
 Usage:
-    buildCheckSummary.py <build_directory> [--detailed] [--format=text|json]
+    buildCheckSummary.py <build_directory> [--detailed] [--critical-path] [--format=text|json]
 
 Exit Codes:
     0: Success
@@ -48,7 +48,7 @@ import argparse
 import signal
 import json
 import traceback
-from typing import List, Tuple, Dict, Any
+from typing import List, Tuple, Dict, Any, Optional
 
 __version__ = "1.0.0"
 __author__ = "Mana Battery"
@@ -56,7 +56,10 @@ __author__ = "Mana Battery"
 # Import library modules
 from lib.color_utils import Colors, print_warning, print_success
 from lib.ninja_utils import extract_rebuild_info, validate_build_directory_with_feedback
-from lib.constants import EXIT_SUCCESS, EXIT_INVALID_ARGS, EXIT_RUNTIME_ERROR, EXIT_KEYBOARD_INTERRUPT
+from lib.ninja_log import format_cpu_time
+from lib.build_graph import load_build_graph
+from lib.build_profile import BuildProfile, compute_build_profile
+from lib.constants import EXIT_SUCCESS, EXIT_INVALID_ARGS, EXIT_RUNTIME_ERROR, EXIT_KEYBOARD_INTERRUPT, NinjaError
 
 # Export for tests
 __all__ = ["EXIT_SUCCESS", "main"]
@@ -81,13 +84,16 @@ def signal_handler(_signum: int, _frame: Any) -> None:
 # extract_rebuild_info and normalize_reason moved to lib.ninja_utils
 
 
-def format_json_output(rebuild_entries: List[Tuple[str, str]], reasons: Dict[str, int], root_causes: Dict[str, int]) -> str:
+def format_json_output(
+    rebuild_entries: List[Tuple[str, str]], reasons: Dict[str, int], root_causes: Dict[str, int], build_profile: Optional[BuildProfile] = None
+) -> str:
     """Format output as JSON.
 
     Args:
         rebuild_entries: List of (output_file, reason) tuples
         reasons: Dictionary of reason counts
         root_causes: Dictionary of root cause counts
+        build_profile: Optional critical path and parallelism profile (added as "build_profile")
 
     Returns:
         JSON formatted string
@@ -108,9 +114,48 @@ def format_json_output(rebuild_entries: List[Tuple[str, str]], reasons: Dict[str
         "root_causes": dict(root_causes),
         "files": [{"output": output, "reason": reason} for output, reason in rebuild_entries],
     }
+    if build_profile is not None:
+        output["build_profile"] = build_profile.to_dict()
     return json.dumps(output, indent=2)
 
 
+def print_build_profile(profile: BuildProfile, max_steps: int = 20) -> None:
+    """Print the critical path and parallelism profile of the full build.
+
+    Args:
+        profile: Profile from compute_build_profile()
+        max_steps: Most critical path steps to list (the ones that delay the build most)
+    """
+    print(f"\n{Colors.BRIGHT}{Colors.CYAN}=== Build Profile (from .ninja_log) ==={Colors.RESET}")
+    if profile.critical_seconds <= 0:
+        print(f"  {Colors.DIM}No edge durations recorded; build once with ninja to profile it{Colors.RESET}")
+        return
+    print(f"Total work:          {Colors.BRIGHT}{format_cpu_time(profile.total_work_seconds)}{Colors.RESET} over {profile.edge_count} edges", end="")
+    if profile.measured_count < profile.edge_count:
+        print(f" {Colors.DIM}({profile.edge_count - profile.measured_count} estimated){Colors.RESET}", end="")
+    print()
+    print(f"Critical path:       {Colors.BRIGHT}{format_cpu_time(profile.critical_seconds)}{Colors.RESET} ({len(profile.critical_path)} steps)")
+    print(f"Average parallelism: {Colors.BRIGHT}{profile.average_parallelism:.1f}{Colors.RESET}", end="")
+    print(f" {Colors.DIM}(more cores than this mostly wait on the critical path){Colors.RESET}")
+
+    if profile.parallelism:
+        peak = max(value for _, _, value in profile.parallelism) or 1.0
+        print(f"\n{Colors.BRIGHT}Parallelism over the build:{Colors.RESET}")
+        for start, end, value in profile.parallelism:
+            bar = "#" * int(round(30 * value / peak))
+            print(f"  {format_cpu_time(start):>8} - {format_cpu_time(end):<8} {value:6.1f}  {Colors.GREEN}{bar}{Colors.RESET}")
+
+    steps = sorted(profile.critical_path, key=lambda step: -step.duration)[:max_steps]
+    print(f"\n{Colors.BRIGHT}Critical path targets (shortening them shortens the build):{Colors.RESET}")
+    for step in sorted(steps, key=lambda step: step.start):
+        savings = f"saves {format_cpu_time(step.savings)}" if step.savings is not None else ""
+        estimated = "" if step.measured else f" {Colors.DIM}(estimated){Colors.RESET}"
+        print(
+            f"  {format_cpu_time(step.start):>8}  {format_cpu_time(step.duration):>8}  {Colors.YELLOW}{savings:<15}{Colors.RESET} "
+            f"{step.kind:<8} {Colors.MAGENTA}{step.output}{Colors.RESET}{estimated}"
+        )
+
+
 def main() -> int:
     """Main entry point for the script.
 
@@ -126,6 +171,7 @@ def main() -> int:
         epilog=f"Version {__version__}\n\nExamples:\n"
         f"  %(prog)s ../build/release/\n"
         f"  %(prog)s ../build/release/ --detailed\n"
+        f"  %(prog)s ../build/release/ --critical-path\n"
         f"  %(prog)s ../build/release/ --format json --output report.json\n",
         formatter_class=argparse.RawDescriptionHelpFormatter,
     )
@@ -134,6 +180,10 @@ def main() -> int:
 
     parser.add_argument("--detailed", action="store_true", help="Show detailed list of all files being rebuilt")
 
+    parser.add_argument(
+        "--critical-path", action="store_true", help="Profile the full build from .ninja_log: critical path, total work and parallelism over time"
+    )
+
     parser.add_argument("--format", choices=["text", "json"], default="text", help="Output format (default: text)")
 
     parser.add_argument("--output", "-o", metavar="FILE", help="Save JSON output to file and print summary to stdout")
@@ -174,15 +224,22 @@ def main() -> int:
             traceback.print_exc(file=sys.stderr)
         return EXIT_RUNTIME_ERROR
 
+    build_profile = None
+    if args.critical_path:
+        try:
+            build_profile = compute_build_profile(load_build_graph(build_dir))
+        except (OSError, NinjaError) as e:
+            print_warning(f"Cannot profile the build: {e}")
+
     # Handle JSON output format (or when --output is specified)
     if args.format == "json" and not args.output:
         # JSON to stdout only
-        print(format_json_output(rebuild_entries, reasons, root_causes))
+        print(format_json_output(rebuild_entries, reasons, root_causes, build_profile))
         return EXIT_SUCCESS
 
     # Save JSON to file if --output is specified
     if args.output:
-        json_output = format_json_output(rebuild_entries, reasons, root_causes)
+        json_output = format_json_output(rebuild_entries, reasons, root_causes, build_profile)
         try:
             with open(args.output, "w", encoding="utf-8") as f:
                 f.write(json_output)
@@ -197,7 +254,7 @@ def main() -> int:
     if not rebuild_entries:
         if args.output:
             # Save empty result as JSON
-            json_output = format_json_output(rebuild_entries, reasons, root_causes)
+            json_output = format_json_output(rebuild_entries, reasons, root_causes, build_profile)
             try:
                 with open(args.output, "w", encoding="utf-8") as f:
                     f.write(json_output)
@@ -207,6 +264,8 @@ def main() -> int:
                 print(f"Error: Cannot write to file '{args.output}': {e}", file=sys.stderr)
                 return EXIT_INVALID_ARGS
         print_success("No files need to be rebuilt. Build is up to date.", prefix=False)
+        if build_profile is not None:
+            print_build_profile(build_profile)
         return EXIT_SUCCESS
 
     # Print detailed list first if requested
@@ -257,6 +316,9 @@ def main() -> int:
             print(f"  {Colors.DIM}(Note: counts may overlap if files include multiple changed headers){Colors.RESET}")
             for rc, count in sorted(root_causes.items(), key=lambda x: -x[1]):
                 print(f"  {Colors.MAGENTA}{rc}{Colors.RESET} → triggered {Colors.BRIGHT}{count}{Colors.RESET} rebuilds")
+
+        if build_profile is not None:
+            print_build_profile(build_profile)
     except BrokenPipeError:
         # Handle broken pipe gracefully
         devnull = os.open(os.devnull, os.O_WRONLY)
@@ -87,8 +87,8 @@ _buildCheckDSM() {
     prev="${COMP_WORDS[COMP_CWORD-1]}"
 
     opts="--version --top --cycles-only --show-layers --export --export-graph --filter --exclude
-          --cluster-by-directory --show-library-boundaries --library-filter --cross-library-only
-          --verbose --file-scope --sort-by --compare-with --save-results --load-baseline
+          --cluster-by-directory --redundant-includes --show-library-boundaries --library-filter --cross-library-only
+          --verbose --jobs -j --file-scope --sort-by --compare-with --save-results --load-baseline
           --git-impact --git-from --git-repo --suggest-improvements --sensitivity --help -h"
 
     case "${prev}" in
@@ -112,7 +112,7 @@ _buildCheckDSM() {
             COMPREPLY=( $(compgen -W "low medium high" -- "${cur}") )
             return 0
             ;;
-        --filter|--exclude|--library-filter|--top|--git-from)
+        --filter|--exclude|--library-filter|--top|--git-from|--jobs|-j)
             # Let user type freely
             return 0
             ;;
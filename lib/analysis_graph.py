@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# ****************************************************************************************************************************************************
+# * BSD 3-Clause License
+# *
+# * Copyright (c) 2025, Mana Battery
+# * All rights reserved.
+# *
+# * Redistribution and use in source and binary forms, with or without modification, are permitted provided that the following conditions are met:
+# *
+# * 1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following disclaimer.
+# * 2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following disclaimer in the
+# *    documentation and/or other materials provided with the distribution.
+# * 3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products derived from this
+# *    software without specific prior written permission.
+# *
+# * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# * THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# * CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# * PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# * LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE,
+# * EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+# ****************************************************************************************************************************************************
+"""Shared, immutable dependency graph for a single analysis run.
+
+Analysis phases (reverse dependencies, cycles, layers, metrics, centrality) used to
+rebuild their own NetworkX graph from the same header mapping. AnalysisGraph builds
+the graph once and lazily caches derived artifacts so every phase reuses them.
+"""
+
+import logging
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Set, Tuple, TypeVar
+
+import networkx as nx
+
+logger = logging.getLogger(__name__)
+
+_T = TypeVar("_T")
+
+
+class AnalysisGraph:
+    """Immutable include graph with cached derived artifacts.
+
+    The underlying NetworkX graph only contains edges between headers in the analysed
+    set (matching the graph historically built by analyze_cycles()). The unfiltered
+    header mapping is kept so fan-in/fan-out metrics still see edges to and from
+    headers outside the filtered scope.
+
+    Derived artifacts (SCC labels, condensation, topological order, reversed view,
+    reverse dependencies) are computed on first access and cached for the lifetime
+    of the object. The graph itself is frozen; mutating it raises NetworkXError.
+
+    Attributes:
+        header_to_headers: Unfiltered forward dependency mapping
+        all_headers: Headers included in the analysis scope
+        graph: Frozen NetworkX DiGraph restricted to all_headers
+    """
+
+    def __init__(self, header_to_headers: Mapping[str, Iterable[str]], all_headers: Set[str]) -> None:
+        """Build the shared graph.
+
+        Args:
+            header_to_headers: Forward dependencies (header -> headers it includes)
+            all_headers: Headers to include as graph nodes
+        """
+        self.header_to_headers = header_to_headers
+        self.all_headers = all_headers
+
+        graph: nx.DiGraph[str] = nx.DiGraph()
+        # Sorted so that order-dependent tie-breaks (e.g. in the feedback arc set) are stable across runs
+        graph.add_nodes_from(sorted(all_headers))
+        graph.add_edges_from(
+            (header, dep) for header, deps in header_to_headers.items() if header in all_headers for dep in deps if dep in all_headers
+        )
+        self.graph: "nx.DiGraph[str]" = nx.freeze(graph)
+        self._cache: Dict[str, Any] = {}
+
+        logger.debug("Built analysis graph with %s nodes and %s edges", graph.number_of_nodes(), graph.number_of_edges())
+
+    @classmethod
+    def from_graph(cls, graph: "nx.DiGraph[Any]") -> "AnalysisGraph":
+        """Wrap an existing graph without copying it.
+
+        The caller must not mutate the graph afterwards, or cached artifacts go stale.
+
+        Args:
+            graph: NetworkX DiGraph
+
+        Returns:
+            AnalysisGraph whose header mapping mirrors the graph's adjacency
+        """
+        instance = cls.__new__(cls)
+        instance.header_to_headers = {node: set(graph.successors(node)) for node in graph.nodes()}
+        instance.all_headers = set(graph.nodes())
+        instance.graph = graph
+        instance._cache = {}
+        return instance
+
+    def _cached(self, key: str, compute: Callable[[], _T]) -> _T:
+        """Return a cached artifact, computing it on first access."""
+        if key not in self._cache:
+            self._cache[key] = compute()
+        result: _T = self._cache[key]
+        return result
+
+    def __len__(self) -> int:
+        return self.graph.number_of_nodes()
+
+    def __contains__(self, node: object) -> bool:
+        return node in self.graph
+
+    @property
+    def reversed_view(self) -> "nx.DiGraph[str]":
+        """Reversed graph view (dependents as successors), shared without copying."""
+        return self._cached("reversed_view", lambda: self.graph.reverse(copy=False))
+
+    @property
+    def reverse_deps(self) -> Dict[str, Set[str]]:
+        """Reverse dependency mapping over the unfiltered header mapping.
+
+        Equivalent to build_reverse_dependencies(): only headers with at least one
+        dependent appear as keys.
+        """
+
+        return self._cached("reverse_deps", lambda: invert_dependencies(self.header_to_headers))
+
+    @property
+    def condensation(self) -> "nx.DiGraph[int]":
+        """SCC condensation DAG (node attribute 'members', graph attribute 'mapping')."""
+        return self._cached("condensation", lambda: nx.condensation(self.graph))
+
+    @property
+    def scc_labels(self) -> Dict[str, int]:
+        """Mapping of header -> condensation component id."""
+        labels: Dict[str, int] = self.condensation.graph["mapping"]
+        return labels
+
+    @property
+    def sccs(self) -> List[Set[str]]:
+        """All strongly connected components, indexed by component id."""
+        return self._cached("sccs", lambda: [set(self.condensation.nodes[c]["members"]) for c in range(len(self.condensation))])
+
+    @property
+    def cycles_and_self_loops(self) -> Tuple[List[Set[str]], List[str]]:
+        """Multi-header cycles and self-including headers (see find_strongly_connected_components)."""
+
+        def compute() -> Tuple[List[Set[str]], List[str]]:
+            cycles = [scc for scc in self.sccs if len(scc) > 1]
+            self_loops = [node for node, _ in nx.selfloop_edges(self.graph)]
+            return cycles, self_loops
+
+        return self._cached("cycles_and_self_loops", compute)
+
+    @property
+    def is_dag(self) -> bool:
+        """True if the graph has no cycles (including self-loops)."""
+        return self._cached("is_dag", lambda: len(self.condensation) == len(self.graph) and next(nx.selfloop_edges(self.graph), None) is None)
+
+    @property
+    def condensation_order(self) -> List[int]:
+        """Topological order of condensation components."""
+        return self._cached("condensation_order", lambda: list(nx.topological_sort(self.condensation)))
+
+    @property
+    def topological_order(self) -> List[str]:
+        """Headers in topological order, cycle members grouped by component."""
+
+        def compute() -> List[str]:
+            order: List[str] = []
+            for component in self.condensation_order:
+                order.extend(sorted(self.condensation.nodes[component]["members"]))
+            return order
+
+        return self._cached("topological_order", compute)
+
+    @property
+    def condensation_generations(self) -> List[List[str]]:
+        """Topological generations of the condensation, expanded to headers.
+
+        Equal to nx.topological_generations() on the graph when it is acyclic
+        (ignoring self-loops); cycle members share their component's generation.
+        """
+
+        def compute() -> List[List[str]]:
+            generations: List[List[str]] = []
+            for components in nx.topological_generations(self.condensation):
+                generations.append([header for component in components for header in self.condensation.nodes[component]["members"]])
+            return generations
+
+        return self._cached("condensation_generations", compute)
+
+    def get_or_compute(self, key: str, compute: Callable[[], _T]) -> _T:
+        """Cache an arbitrary derived artifact on this graph.
+
+        Lets analysis modules attach their own expensive results (e.g. centrality) so
+        later phases of the same run reuse them.
+
+        Args:
+            key: Unique cache key
+            compute: Zero-argument function producing the artifact
+
+        Returns:
+            The cached or freshly computed artifact
+        """
+        return self._cached(key, compute)
+
+    def cached_keys(self) -> List[str]:
+        """Return the names of artifacts computed so far (useful for diagnostics)."""
+        return sorted(self._cache)
+
+
+def invert_dependencies(header_to_headers: Mapping[str, Iterable[str]]) -> Dict[str, Set[str]]:
+    """Invert a forward dependency mapping (header -> headers that include it).
+
+    Args:
+        header_to_headers: Forward dependencies (header -> headers it includes)
+
+    Returns:
+        Reverse dependencies; headers without dependents are omitted
+    """
+    reverse: Dict[str, Set[str]] = {}
+    for header, deps in header_to_headers.items():
+        for dep in deps:
+            reverse.setdefault(dep, set()).add(header)
+    return reverse
+
+
+def ensure_analysis_graph(
+    header_to_headers: Mapping[str, Iterable[str]], all_headers: Set[str], analysis_graph: Optional[AnalysisGraph] = None
+) -> AnalysisGraph:
+    """Return the given analysis graph, or build one from the header mapping.
+
+    Args:
+        header_to_headers: Forward dependencies (header -> headers it includes)
+        all_headers: Headers in scope
+        analysis_graph: Existing shared graph for this run, if any
+
+    Returns:
+        AnalysisGraph for the run
+    """
+    if analysis_graph is not None:
+        return analysis_graph
+    return AnalysisGraph(header_to_headers, all_headers)
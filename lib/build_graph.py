@@ -0,0 +1,379 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# ****************************************************************************************************************************************************
+# * BSD 3-Clause License
+# *
+# * Copyright (c) 2025, Mana Battery
+# * All rights reserved.
+# *
+# * Redistribution and use in source and binary forms, with or without modification, are permitted provided that the following conditions are met:
+# *
+# * 1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following disclaimer.
+# * 2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following disclaimer in the
+# *    documentation and/or other materials provided with the distribution.
+# * 3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products derived from this
+# *    software without specific prior written permission.
+# *
+# * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# * THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# * CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# * PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# * LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE,
+# * EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+# ****************************************************************************************************************************************************
+"""Edge-level build graph with measured durations, for timing analyses.
+
+The include-level tools count translation units; timing questions (how long does
+a build take, what is on its critical path, what does a change cost on N cores)
+need ninja's own graph: one node per build edge (compile, archive, link, custom
+commands, phony aliases), an arc from the edge producing a file to every edge
+that consumes it, and each edge's duration from .ninja_log.
+
+BuildGraph keeps that graph in compressed sparse row form (numpy index arrays)
+so 100k-edge builds stay cheap to traverse. Dependencies come from the explicit,
+implicit and order-only inputs in build.ninja plus the headers .ninja_deps
+recorded for each output (which matters for generated headers). Edges ninja
+never ran get the median duration of their kind.
+"""
+
+import logging
+import os
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from lib.constants import NinjaError
+from lib.edge_kinds import EDGE_ARCHIVE, EDGE_COMPILE, EDGE_LINK, EDGE_OTHER, EDGE_PHONY, classify_edge
+from lib.ninja_deps import NinjaDepsLog, load_ninja_deps
+from lib.ninja_dirty import canonicalize_path
+from lib.ninja_log import NinjaLog, load_ninja_log
+from lib.ninja_manifest import NinjaManifest, load_ninja_manifest
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class BuildGraph:
+    """Build edges and the files they exchange, as a DAG of edges.
+
+    Attributes:
+        outputs: First output of each edge (its display name)
+        rules: Rule of each edge
+        kinds: Kind of each edge (see lib/edge_kinds.py)
+        pools: Pool of each edge ("" for the default pool)
+        durations: Seconds each edge took in the last build that ran it (estimated if never run)
+        measured: True where the duration comes from .ninja_log
+        pred_ptr: CSR row pointers into pred_idx, one row per edge
+        pred_idx: Edges producing each edge's inputs (deduplicated)
+        pool_depths: Pool name -> depth from build.ninja (console is 1)
+        output_index: Every output path (explicit or implicit, canonical) -> edge
+        input_files: Canonical paths of files no edge produces (sources, headers), by id
+        input_ptr: CSR row pointers into input_idx, one row per edge
+        input_idx: Ids of the input_files each edge reads (manifest inputs and recorded deps)
+        root: Build directory the paths are relative to ("" if unknown)
+    """
+
+    outputs: List[str]
+    rules: List[str]
+    kinds: List[str]
+    pools: List[str]
+    durations: np.ndarray
+    measured: np.ndarray
+    pred_ptr: np.ndarray
+    pred_idx: np.ndarray
+    pool_depths: Dict[str, int] = field(default_factory=dict)
+    output_index: Dict[str, int] = field(default_factory=dict)
+    input_files: List[str] = field(default_factory=list)
+    input_ptr: Optional[np.ndarray] = None
+    input_idx: Optional[np.ndarray] = None
+    root: str = ""
+    _input_index: Optional[Dict[str, int]] = field(default=None, repr=False)
+    _succ: Optional[Tuple[np.ndarray, np.ndarray]] = field(default=None, repr=False)
+    _depth: Optional[np.ndarray] = field(default=None, repr=False)
+    _topo: Optional[np.ndarray] = field(default=None, repr=False)
+    _levels: Optional[List[Tuple[np.ndarray, np.ndarray, np.ndarray]]] = field(default=None, repr=False)
+
+    def __len__(self) -> int:
+        return len(self.outputs)
+
+    def edge_of(self, path: str) -> Optional[int]:
+        """Return the edge producing path (build-relative, any spelling ninja accepts), or None."""
+        return self.output_index.get(canonicalize_path(path))
+
+    def input_ids(self, path: str) -> List[int]:
+        """Return the ids in input_files of path (absolute paths are also tried relative to root)."""
+        if self._input_index is None:
+            self._input_index = {name: i for i, name in enumerate(self.input_files)}
+        candidates = [path]
+        if self.root and os.path.isabs(path):
+            candidates.append(os.path.relpath(path, self.root))
+        return list(dict.fromkeys(self._input_index[c] for c in map(canonicalize_path, candidates) if c in self._input_index))
+
+    def edges_reading(self, paths: Iterable[str]) -> np.ndarray:
+        """Return the edges that read any of paths as a source or recorded dependency.
+
+        Args:
+            paths: Build-relative or absolute file paths (absolute paths are also
+                tried relative to root, the way CMake spells in-tree sources)
+        """
+        if self.input_ptr is None or self.input_idx is None:
+            return np.zeros(0, dtype=np.int64)
+        ids = {i for path in paths for i in self.input_ids(path)}
+        if not ids:
+            return np.zeros(0, dtype=np.int64)
+        readers = np.repeat(np.arange(len(self), dtype=np.int64), np.diff(self.input_ptr))
+        return np.unique(readers[np.isin(self.input_idx, np.fromiter(ids, dtype=np.int64))])
+
+    def predecessors(self, edge: int) -> np.ndarray:
+        """Return the edges whose outputs edge consumes."""
+        return self.pred_idx[self.pred_ptr[edge] : self.pred_ptr[edge + 1]]
+
+    def successor_csr(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Return (succ_ptr, succ_idx): the reverse adjacency in CSR form (built once)."""
+        if self._succ is None:
+            counts = np.diff(self.pred_ptr)
+            consumers = np.repeat(np.arange(len(self), dtype=np.int64), counts)
+            order = np.argsort(self.pred_idx, kind="stable")
+            succ_idx = consumers[order]
+            succ_ptr = np.zeros(len(self) + 1, dtype=np.int64)
+            np.cumsum(np.bincount(self.pred_idx, minlength=len(self)), out=succ_ptr[1:])
+            self._succ = (succ_ptr, succ_idx)
+        return self._succ
+
+    def successors(self, edge: int) -> np.ndarray:
+        """Return the edges that consume edge's outputs."""
+        succ_ptr, succ_idx = self.successor_csr()
+        return succ_idx[succ_ptr[edge] : succ_ptr[edge + 1]]
+
+    def _gather(self, ptr: np.ndarray, idx: np.ndarray, rows: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        # Concatenated CSR rows of the given edges and the offset of each row in the result
+        counts = ptr[rows + 1] - ptr[rows]
+        offsets = np.zeros(len(rows), dtype=np.int64)
+        np.cumsum(counts[:-1], out=offsets[1:])
+        return idx[np.repeat(ptr[rows] - offsets, counts) + np.arange(counts.sum())], offsets
+
+    def topological_order(self) -> np.ndarray:
+        """Return edges so that every edge comes after its predecessors.
+
+        One pass of Kahn's algorithm, O(V + E) however deep the graph is; it also
+        records each edge's depth (the longest chain of predecessors above it).
+
+        Raises:
+            NinjaError: If the graph has a dependency cycle
+        """
+        if self._topo is None:
+            succ_ptr, succ_idx = self.successor_csr()
+            start = succ_ptr.tolist()
+            consumers = succ_idx.tolist()
+            indegree = np.diff(self.pred_ptr).tolist()
+            depth = [0] * len(self)
+            order = [edge for edge in range(len(self)) if not indegree[edge]]
+            # The list doubles as the queue: edges are appended as they become ready
+            for edge in order:
+                below = depth[edge] + 1
+                for consumer in consumers[start[edge] : start[edge + 1]]:
+                    if depth[consumer] < below:
+                        depth[consumer] = below
+                    indegree[consumer] -= 1
+                    if not indegree[consumer]:
+                        order.append(consumer)
+            if len(order) < len(self):
+                raise NinjaError(f"Dependency cycle among {len(self) - len(order)} build edges")
+            self._topo = np.array(order, dtype=np.int64)
+            self._depth = np.array(depth, dtype=np.int64)
+        return self._topo
+
+    def _depths(self) -> np.ndarray:
+        # Longest chain of predecessors above each edge (see topological_order())
+        self.topological_order()
+        assert self._depth is not None
+        return self._depth
+
+    def level_plan(self) -> List[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        """Return edges grouped by depth, shallowest first, for level-synchronous sweeps.
+
+        Each group is (edges, their predecessors concatenated, np.*.reduceat offsets
+        into them), so a per-edge reduction over predecessors is one vectorised call
+        per level. Depth-0 edges have no predecessors and are not included.
+
+        Raises:
+            NinjaError: If the graph has a dependency cycle
+        """
+        if self._levels is None:
+            depth = self._depths()
+            order = np.argsort(depth, kind="stable")
+            bounds = np.searchsorted(depth[order], np.arange(1, depth.max(initial=0) + 2))
+            self._levels = []
+            for start, end in zip(bounds[:-1], bounds[1:]):
+                edges = order[start:end]
+                preds, offsets = self._gather(self.pred_ptr, self.pred_idx, edges)
+                self._levels.append((edges, preds, offsets))
+        return self._levels
+
+    def schedule_times(self, durations: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Return (start, finish) of every edge with unlimited parallelism (each edge starts when its inputs exist).
+
+        Args:
+            durations: Per-edge seconds to use instead of self.durations
+        """
+        durations = self.durations if durations is None else durations
+        duration = durations.astype(np.float64).tolist()
+        ptr = self.pred_ptr.tolist()
+        producers = self.pred_idx.tolist()
+        start = [0.0] * len(self)
+        finish = list(duration)
+        for edge in self.topological_order().tolist():
+            row = producers[ptr[edge] : ptr[edge + 1]]
+            if row:
+                start[edge] = max(map(finish.__getitem__, row))
+                finish[edge] = start[edge] + duration[edge]
+        return np.array(start, dtype=np.float64), np.array(finish, dtype=np.float64)
+
+    def remaining_times(self, durations: Optional[np.ndarray] = None) -> np.ndarray:
+        """Return, per edge, its duration plus the longest chain of edges that consume its outputs.
+
+        This is how long the build still takes once the edge starts, with
+        unlimited parallelism; schedulers run the edges with the most remaining
+        time first.
+
+        Args:
+            durations: Per-edge seconds to use instead of self.durations
+        """
+        durations = self.durations if durations is None else durations
+        succ_ptr, succ_idx = self.successor_csr()
+        start = succ_ptr.tolist()
+        consumers = succ_idx.tolist()
+        remaining = durations.astype(np.float64).tolist()
+        # Consumers come later in topological order, so one backwards pass sees them finished
+        for edge in reversed(self.topological_order().tolist()):
+            row = consumers[start[edge] : start[edge + 1]]
+            if row:
+                remaining[edge] += max(map(remaining.__getitem__, row))
+        return np.array(remaining, dtype=np.float64)
+
+    def closure(self, seeds: Iterable[int], downstream: bool = True) -> np.ndarray:
+        """Return a boolean mask of seeds and every edge reachable from them.
+
+        Args:
+            seeds: Starting edges
+            downstream: Follow consumers (True) or producers (False)
+        """
+        ptr, idx = self.successor_csr() if downstream else (self.pred_ptr, self.pred_idx)
+        start = ptr.tolist()
+        neighbours = idx.tolist()
+        reached = [False] * len(self)
+        stack = []
+        for seed in seeds:
+            if not reached[seed]:
+                reached[seed] = True
+                stack.append(seed)
+        # Depth-first, so a long chain costs one visit per edge rather than one step per level
+        while stack:
+            edge = stack.pop()
+            for neighbour in neighbours[start[edge] : start[edge + 1]]:
+                if not reached[neighbour]:
+                    reached[neighbour] = True
+                    stack.append(neighbour)
+        return np.array(reached, dtype=bool)
+
+
+def build_build_graph(manifest: NinjaManifest, build_log: Optional[NinjaLog] = None, deps_log: Optional[NinjaDepsLog] = None) -> BuildGraph:
+    """Build the edge graph of a parsed manifest.
+
+    Args:
+        manifest: Parsed build.ninja
+        build_log: .ninja_log for durations (None: every duration is 0)
+        deps_log: .ninja_deps for discovered dependencies (None: manifest inputs only)
+
+    Returns:
+        BuildGraph over every edge of the manifest except generator edges (the
+        build.ninja regeneration step, which a normal build does not run)
+    """
+    builds = [build for build in manifest.builds if not manifest.is_generator(build)]
+    output_index: Dict[str, int] = {}
+    for edge, build in enumerate(builds):
+        for output in build.all_outputs():
+            output_index.setdefault(canonicalize_path(output), edge)
+
+    outputs: List[str] = []
+    rules: List[str] = []
+    kinds: List[str] = []
+    pools: List[str] = []
+    durations = np.zeros(len(builds), dtype=np.float64)
+    measured = np.zeros(len(builds), dtype=bool)
+    pred_rows: List[List[int]] = []
+    input_index: Dict[str, int] = {}
+    input_rows: List[List[int]] = []
+    deps_paths = deps_log.paths if deps_log is not None else []
+
+    for edge, build in enumerate(builds):
+        all_outputs = build.all_outputs()
+        outputs.append(all_outputs[0])
+        rules.append(build.rule)
+        kind = classify_edge(build.rule, build.outputs, build.inputs)
+        kinds.append(kind)
+        pools.append(manifest.evaluate(build, "pool") if kind != EDGE_PHONY else "")
+
+        inputs = [canonicalize_path(path) for path in build.all_inputs()]
+        if deps_log is not None and kind != EDGE_PHONY:
+            node = deps_log.node_id(canonicalize_path(all_outputs[0]))
+            record = deps_log.deps.get(node) if node is not None else None
+            if record is not None:
+                inputs.extend(deps_paths[i] for i in record[1])
+        row = {output_index[path] for path in inputs if path in output_index}
+        row.discard(edge)
+        pred_rows.append(sorted(row))
+        input_rows.append(sorted({input_index.setdefault(path, len(input_index)) for path in inputs if path not in output_index}))
+
+        if build_log is not None and kind != EDGE_PHONY:
+            for output in all_outputs:
+                entry = build_log.entry(canonicalize_path(output))
+                if entry is not None:
+                    durations[edge] = entry.duration
+                    measured[edge] = True
+                    break
+
+    # Never-run edges cost what their kind typically costs
+    kind_array = np.array(kinds, dtype=object)
+    fallback = float(np.median(durations[measured])) if measured.any() else 0.0
+    for kind in (EDGE_COMPILE, EDGE_ARCHIVE, EDGE_LINK, EDGE_OTHER):
+        of_kind = kind_array == kind
+        known = durations[of_kind & measured]
+        durations[of_kind & ~measured] = float(np.median(known)) if known.size else fallback
+
+    pred_ptr = np.zeros(len(builds) + 1, dtype=np.int64)
+    np.cumsum([len(row) for row in pred_rows], out=pred_ptr[1:])
+    pred_idx = np.fromiter((p for row in pred_rows for p in row), dtype=np.int64, count=int(pred_ptr[-1]))
+    input_ptr = np.zeros(len(builds) + 1, dtype=np.int64)
+    np.cumsum([len(row) for row in input_rows], out=input_ptr[1:])
+    input_idx = np.fromiter((i for row in input_rows for i in row), dtype=np.int64, count=int(input_ptr[-1]))
+
+    graph = BuildGraph(
+        outputs, rules, kinds, pools, durations, measured, pred_ptr, pred_idx, dict(manifest.pools), output_index, list(input_index), input_ptr, input_idx
+    )
+    logger.debug("Build graph: %d edges, %d dependencies, %d with measured durations", len(graph), len(pred_idx), int(measured.sum()))
+    return graph
+
+
+def load_build_graph(build_dir: str) -> BuildGraph:
+    """Build the edge graph of build_dir from build.ninja, .ninja_log and .ninja_deps.
+
+    Args:
+        build_dir: Path to the build directory
+
+    Returns:
+        BuildGraph (durations are all estimates of 0 if ninja never logged a build)
+
+    Raises:
+        OSError: If build.ninja cannot be read
+        NinjaError: If the manifest is invalid
+    """
+    build_dir = os.path.abspath(build_dir)
+    manifest = load_ninja_manifest(os.path.join(build_dir, "build.ninja"))
+    build_log = load_ninja_log(build_dir)
+    if build_log is None:
+        logger.warning("No .ninja_log in %s; build edge durations are unknown", build_dir)
+    graph = build_build_graph(manifest, build_log, load_ninja_deps(build_dir))
+    graph.root = build_dir
+    return graph
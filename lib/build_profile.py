@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# ****************************************************************************************************************************************************
+# * BSD 3-Clause License
+# *
+# * Copyright (c) 2025, Mana Battery
+# * All rights reserved.
+# *
+# * Redistribution and use in source and binary forms, with or without modification, are permitted provided that the following conditions are met:
+# *
+# * 1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following disclaimer.
+# * 2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following disclaimer in the
+# *    documentation and/or other materials provided with the distribution.
+# * 3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products derived from this
+# *    software without specific prior written permission.
+# *
+# * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# * THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# * CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# * PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# * LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE,
+# * EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+# ****************************************************************************************************************************************************
+"""Critical path and parallelism profile of a ninja build.
+
+With unlimited cores every edge starts as soon as its inputs exist, so the build
+takes as long as its longest chain of dependent edges (the critical path) and no
+number of cores can beat that. compute_build_profile() reports:
+
+- total work: the sum of all edge durations (the one-core build time),
+- the critical path, edge by edge, with how much each edge's own time delays
+  the build (the saving if that edge took no time, which is less than its
+  duration when another chain is almost as long),
+- average parallelism (work / critical path) and how it varies over the build,
+  which shows whether a build is starved at the start (generators) or the end
+  (links).
+
+Durations come from .ninja_log through BuildGraph; edges ninja never ran are
+estimated (see lib/build_graph.py).
+"""
+
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from lib.build_graph import BuildGraph
+from lib.edge_kinds import EDGE_PHONY
+
+logger = logging.getLogger(__name__)
+
+# Time slices in the parallelism profile
+PROFILE_BINS = 20
+
+# Each savings estimate reschedules the whole graph; only the longest critical steps get one
+SAVINGS_STEPS = 25
+
+
+@dataclass
+class CriticalStep:
+    """One edge on the critical path.
+
+    Attributes:
+        output: First output of the edge
+        kind: Edge kind (compile, archive, link, other)
+        start: Seconds into the build when it can start
+        duration: Seconds it takes
+        savings: Seconds the whole build would gain if this edge took no time
+            (None if the step is not among the SAVINGS_STEPS longest)
+        measured: True if the duration comes from .ninja_log
+    """
+
+    output: str
+    kind: str
+    start: float
+    duration: float
+    savings: Optional[float]
+    measured: bool
+
+
+@dataclass
+class BuildProfile:
+    """Critical path and parallelism of a build.
+
+    Attributes:
+        critical_path: Edges on the longest dependency chain, first to last (phony edges omitted)
+        critical_seconds: Length of the critical path (the build time on unlimited cores)
+        total_work_seconds: Sum of all edge durations (the build time on one core)
+        edge_count: Edges with a cost in the analysis
+        measured_count: Of those, edges with a duration from .ninja_log
+        parallelism: (slice start, slice end, average number of running edges) over the build
+    """
+
+    critical_path: List[CriticalStep] = field(default_factory=list)
+    critical_seconds: float = 0.0
+    total_work_seconds: float = 0.0
+    edge_count: int = 0
+    measured_count: int = 0
+    parallelism: List[Tuple[float, float, float]] = field(default_factory=list)
+
+    @property
+    def average_parallelism(self) -> float:
+        """Return total work / critical path: the most cores the build can keep busy on average."""
+        return self.total_work_seconds / self.critical_seconds if self.critical_seconds > 0 else 0.0
+
+    def bounds_seconds(self, jobs: int) -> Tuple[float, float]:
+        """Return (lower, upper) bounds of the build time on jobs cores.
+
+        The lower bound is max(critical path, work / jobs); any greedy scheduler
+        such as ninja's stays within work / jobs + critical path (Brent's bound).
+        """
+        share = self.total_work_seconds / max(1, jobs)
+        return max(self.critical_seconds, share), share + self.critical_seconds
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a JSON-serializable dictionary."""
+        return {
+            "critical_seconds": round(self.critical_seconds, 3),
+            "total_work_seconds": round(self.total_work_seconds, 3),
+            "average_parallelism": round(self.average_parallelism, 2),
+            "edge_count": self.edge_count,
+            "measured_count": self.measured_count,
+            "critical_path": [
+                {
+                    "output": step.output,
+                    "kind": step.kind,
+                    "start": round(step.start, 3),
+                    "duration": round(step.duration, 3),
+                    "savings": None if step.savings is None else round(step.savings, 3),
+                    "measured": step.measured,
+                }
+                for step in self.critical_path
+            ],
+            "parallelism": [{"start": round(start, 3), "end": round(end, 3), "parallelism": round(value, 2)} for start, end, value in self.parallelism],
+        }
+
+
+def _parallelism_profile(start: np.ndarray, durations: np.ndarray, length: float, bins: int) -> List[Tuple[float, float, float]]:
+    if length <= 0:
+        return []
+    edges = np.linspace(0.0, length, bins + 1)
+    # Work completed by time t is sum(clip(t - start, 0, duration)); its slope is the parallelism
+    done = np.array([np.clip(t - start, 0.0, durations).sum() for t in edges])
+    width = length / bins
+    return [(float(edges[i]), float(edges[i + 1]), float((done[i + 1] - done[i]) / width)) for i in range(bins)]
+
+
+def compute_build_profile(graph: BuildGraph, scope: Optional[np.ndarray] = None, bins: int = PROFILE_BINS) -> BuildProfile:
+    """Compute the critical path and parallelism profile of graph.
+
+    Args:
+        graph: Build graph with durations
+        scope: Optional boolean mask of edges that run; the others count as
+            already built (zero duration), e.g. to profile a partial rebuild
+        bins: Number of time slices in the parallelism profile
+
+    Returns:
+        BuildProfile
+
+    Raises:
+        NinjaError: If the graph has a dependency cycle
+    """
+    durations = graph.durations if scope is None else np.where(scope, graph.durations, 0.0)
+    costed = durations > 0
+    start, finish = graph.schedule_times(durations)
+    profile = BuildProfile(
+        critical_seconds=float(finish.max(initial=0.0)),
+        total_work_seconds=float(durations.sum()),
+        edge_count=int(costed.sum()),
+        measured_count=int((costed & graph.measured).sum()),
+    )
+    if not len(graph) or profile.critical_seconds <= 0:
+        return profile
+
+    # Walk back from the last edge to finish along the predecessor that finished last
+    path = [int(np.argmax(finish))]
+    while True:
+        preds = graph.predecessors(path[-1])
+        if not preds.size:
+            break
+        path.append(int(preds[np.argmax(finish[preds])]))
+    path.reverse()
+
+    steps = [edge for edge in path if graph.kinds[edge] != EDGE_PHONY and durations[edge] > 0]
+    estimated = set(sorted(steps, key=lambda edge: -durations[edge])[:SAVINGS_STEPS])
+    for edge in steps:
+        savings = None
+        if edge in estimated:
+            shortened = durations.copy()
+            shortened[edge] = 0.0
+            savings = profile.critical_seconds - float(graph.schedule_times(shortened)[1].max())
+        profile.critical_path.append(CriticalStep(graph.outputs[edge], graph.kinds[edge], float(start[edge]), float(durations[edge]), savings, bool(graph.measured[edge])))
+
+    profile.parallelism = _parallelism_profile(start, durations, profile.critical_seconds, bins)
+    logger.info(
+        "Build profile: %.1fs critical path over %d edges, %.1fs total work (parallelism %.1f)",
+        profile.critical_seconds,
+        profile.edge_count,
+        profile.total_work_seconds,
+        profile.average_parallelism,
+    )
+    return profile
@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# ****************************************************************************************************************************************************
+# * BSD 3-Clause License
+# *
+# * Copyright (c) 2025, Mana Battery
+# * All rights reserved.
+# *
+# * Redistribution and use in source and binary forms, with or without modification, are permitted provided that the following conditions are met:
+# *
+# * 1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following disclaimer.
+# * 2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following disclaimer in the
+# *    documentation and/or other materials provided with the distribution.
+# * 3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products derived from this
+# *    software without specific prior written permission.
+# *
+# * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# * THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# * CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# * PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# * LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE,
+# * EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+# ****************************************************************************************************************************************************
+"""Wall-clock estimate of a (partial) rebuild on a given number of cores.
+
+File counts and summed CPU time say how much work a change causes, not how long
+a developer waits for it: 40 TUs spread over 32 cores cost little, while one
+change in front of a long archive -> link chain costs its whole chain.
+simulate_build() replays ninja's scheduling over the build edge graph:
+
+- an edge becomes ready when every edge producing its inputs has finished,
+- up to jobs edges run at once, and edges in a pool also respect the pool depth
+  (the console pool runs one edge at a time),
+- among ready edges the one with the longest remaining chain runs first (ninja
+  1.12+ does the same from .ninja_log), phony edges take no job slot,
+
+using .ninja_log durations for each edge. simulate_change() restricts this to
+the edges downstream of a set of changed files, which is what ninja would run
+after the change.
+"""
+
+import heapq
+import logging
+import os
+from dataclasses import dataclass, field
+from typing import Counter, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from lib.build_graph import BuildGraph
+from lib.edge_kinds import EDGE_PHONY
+
+logger = logging.getLogger(__name__)
+
+
+def default_jobs() -> int:
+    """Return the job count ninja uses without -j (CPU count + 2, at least 2)."""
+    cpus = os.cpu_count() or 1
+    if cpus <= 1:
+        return 2
+    return cpus + 1 if cpus == 2 else cpus + 2
+
+
+@dataclass
+class RebuildSimulation:
+    """Outcome of a simulated build.
+
+    Attributes:
+        jobs: Parallel jobs simulated
+        wall_seconds: Simulated time until the last edge finishes
+        cpu_seconds: Summed duration of the edges that ran
+        critical_seconds: Wall time with unlimited jobs (the longest dependency chain)
+        critical_path: Outputs of the chain that finished last, first to last (phony edges omitted)
+        edge_counts: Edges run per kind (compile, archive, link, other)
+        estimated_count: Edges that ran with an estimated duration (never in .ninja_log)
+    """
+
+    jobs: int
+    wall_seconds: float = 0.0
+    cpu_seconds: float = 0.0
+    critical_seconds: float = 0.0
+    critical_path: List[str] = field(default_factory=list)
+    edge_counts: Dict[str, int] = field(default_factory=dict)
+    estimated_count: int = 0
+
+    @property
+    def edge_count(self) -> int:
+        """Return the number of edges that ran."""
+        return sum(self.edge_counts.values())
+
+    @property
+    def utilization(self) -> float:
+        """Return the fraction of job slots kept busy (0-1)."""
+        return self.cpu_seconds / (self.wall_seconds * self.jobs) if self.wall_seconds > 0 else 0.0
+
+
+def simulate_build(graph: BuildGraph, scope: Optional[np.ndarray] = None, jobs: Optional[int] = None, pool_depths: Optional[Dict[str, int]] = None) -> RebuildSimulation:
+    """Simulate ninja running the edges in scope on jobs parallel slots.
+
+    Edges outside scope count as up to date. Scope is normally closed under
+    consumers (see simulate_change()); an edge whose producers are out of scope
+    starts immediately.
+
+    Args:
+        graph: Build graph with durations
+        scope: Boolean mask of edges to run (None: the whole build)
+        jobs: Parallel jobs (None: ninja's default for this machine)
+        pool_depths: Pool depths overriding the ones declared in build.ninja
+
+    Returns:
+        RebuildSimulation
+
+    Raises:
+        NinjaError: If the graph has a dependency cycle
+    """
+    jobs = max(1, jobs if jobs is not None else default_jobs())
+    scope = np.ones(len(graph), dtype=bool) if scope is None else scope
+    durations = np.where(scope, graph.durations, 0.0)
+    priority = graph.remaining_times(durations).tolist()
+    # The longest remaining chain from any edge is the unlimited-jobs wall time
+    result = RebuildSimulation(jobs=jobs, critical_seconds=max(priority, default=0.0))
+    edges = np.flatnonzero(scope)
+    if not edges.size:
+        return result
+
+    depths = dict(graph.pool_depths)
+    depths.update(pool_depths or {})
+    pools = [pool if depths.get(pool, 0) else "" for pool in graph.pools]  # "" when the pool does not limit
+    phony = [kind == EDGE_PHONY for kind in graph.kinds]
+    duration = durations.tolist()
+    in_scope = scope.tolist()
+    succ_ptr, succ_idx = graph.successor_csr()
+    succ_start = succ_ptr.tolist()
+    consumers = succ_idx.tolist()
+
+    # Producers still to finish, counting only edges that run
+    counts = np.diff(graph.pred_ptr)
+    producer_in_scope = scope[graph.pred_idx] & np.repeat(scope, counts)
+    waiting = np.bincount(np.repeat(np.arange(len(graph)), counts)[producer_in_scope], minlength=len(graph)).tolist()
+
+    finish = [0.0] * len(graph)
+    last_producer = [-1] * len(graph)
+    ready = [(-priority[e], e) for e in edges.tolist() if not waiting[e]]
+    heapq.heapify(ready)
+    running: List[Tuple[float, int]] = []
+    pool_use: Counter[str] = Counter()
+    pool_queue: Dict[str, List[Tuple[float, int]]] = {}
+    free = jobs
+    now = 0.0
+    done = 0
+
+    def complete(edge: int) -> None:
+        for consumer in consumers[succ_start[edge] : succ_start[edge + 1]]:
+            if in_scope[consumer]:
+                last_producer[consumer] = edge  # Edges complete in time order, so the last one is the latest
+                waiting[consumer] -= 1
+                if not waiting[consumer]:
+                    heapq.heappush(ready, (-priority[consumer], consumer))
+
+    while True:
+        while ready and free:
+            _, edge = heapq.heappop(ready)
+            if phony[edge]:
+                finish[edge] = now
+                done += 1
+                complete(edge)
+                continue
+            pool = pools[edge]
+            if pool and pool_use[pool] >= depths[pool]:
+                heapq.heappush(pool_queue.setdefault(pool, []), (-priority[edge], edge))
+                continue
+            pool_use[pool] += 1
+            free -= 1
+            finish[edge] = now + duration[edge]
+            heapq.heappush(running, (finish[edge], edge))
+        # Phony edges complete without a slot even while every job is busy
+        while ready and phony[ready[0][1]]:
+            _, edge = heapq.heappop(ready)
+            finish[edge] = now
+            done += 1
+            complete(edge)
+        if not running:
+            if ready and free:
+                continue
+            break
+        now, edge = heapq.heappop(running)
+        done += 1
+        free += 1
+        pool = pools[edge]
+        pool_use[pool] -= 1
+        if pool and pool_queue.get(pool):
+            heapq.heappush(ready, heapq.heappop(pool_queue[pool]))
+        complete(edge)
+
+    if done != len(edges):
+        logger.warning("Simulation stopped with %d of %d edges unscheduled", len(edges) - done, len(edges))
+
+    ran = [e for e in edges.tolist() if not phony[e]]
+    result.wall_seconds = max((finish[e] for e in ran), default=0.0)
+    result.cpu_seconds = float(durations[ran].sum()) if ran else 0.0
+    result.edge_counts = dict(Counter(graph.kinds[e] for e in ran))
+    result.estimated_count = int((~graph.measured[ran]).sum()) if ran else 0
+    if ran:
+        chain = [max(ran, key=lambda e: finish[e])]
+        while last_producer[chain[-1]] >= 0:
+            chain.append(last_producer[chain[-1]])
+        result.critical_path = [graph.outputs[e] for e in reversed(chain) if not phony[e]]
+    return result
+
+
+def simulate_change(graph: BuildGraph, changed_files: Iterable[str], jobs: Optional[int] = None, pool_depths: Optional[Dict[str, int]] = None) -> RebuildSimulation:
+    """Simulate the rebuild ninja runs after changed_files are modified.
+
+    Every edge reading one of the files (as a source or a recorded header
+    dependency) reruns, and so does everything downstream of it: archives,
+    links, and generated files and their consumers.
+
+    Args:
+        graph: Build graph with durations
+        changed_files: Changed sources and headers (absolute or build-relative)
+        jobs: Parallel jobs (None: ninja's default for this machine)
+        pool_depths: Pool depths overriding the ones declared in build.ninja
+
+    Returns:
+        RebuildSimulation (empty if no edge reads the files)
+    """
+    scope = graph.closure(graph.edges_reading(changed_files).tolist())
+    simulation = simulate_build(graph, scope, jobs, pool_depths)
+    logger.info(
+        "Simulated rebuild: %d edges, %.1fs CPU, %.1fs wall on %d jobs (critical path %.1fs)",
+        simulation.edge_count,
+        simulation.cpu_seconds,
+        simulation.wall_seconds,
+        simulation.jobs,
+        simulation.critical_seconds,
+    )
+    return simulation
@@ -0,0 +1,339 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# ****************************************************************************************************************************************************
+# * BSD 3-Clause License
+# *
+# * Copyright (c) 2025, Mana Battery
+# * All rights reserved.
+# *
+# * Redistribution and use in source and binary forms, with or without modification, are permitted provided that the following conditions are met:
+# *
+# * 1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following disclaimer.
+# * 2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following disclaimer in the
+# *    documentation and/or other materials provided with the distribution.
+# * 3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products derived from this
+# *    software without specific prior written permission.
+# *
+# * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# * THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# * CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# * PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# * LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE,
+# * EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+# ****************************************************************************************************************************************************
+"""Shared centrality service for dependency graphs.
+
+Betweenness centrality is O(V·E) and used to be computed independently by the
+hotspot display, improvement candidate detection, the architectural debt score
+and graph export. This module computes betweenness and PageRank once per graph
+fingerprint and caches the result, with optional pivot sampling (plus an error
+bound) for large graphs and optional parallelism across pivot batches.
+"""
+
+import hashlib
+import logging
+import math
+import os
+import random
+import weakref
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Collection, Dict, Hashable, Iterable, List, Optional, Sequence, Set, Tuple
+
+import networkx as nx
+
+from lib.constants import (
+    BETWEENNESS_DEFAULT_PIVOTS,
+    BETWEENNESS_SAMPLE_THRESHOLD,
+    CENTRALITY_CACHE_SIZE,
+    CYCLE_EDGE_BETWEENNESS_EXACT_THRESHOLD,
+    CYCLE_EDGE_BETWEENNESS_PIVOTS,
+    CYCLE_PARALLEL_MIN_NODES,
+)
+
+logger = logging.getLogger(__name__)
+
+# Default seed so sampled results are reproducible between runs
+DEFAULT_CENTRALITY_SEED = 42
+
+_result_cache: "OrderedDict[Tuple[Hashable, ...], Any]" = OrderedDict()
+# graph -> ((node count, edge count) when fingerprinted, fingerprint)
+_fingerprints: "weakref.WeakKeyDictionary[Any, Tuple[Tuple[int, int], str]]" = weakref.WeakKeyDictionary()
+
+# Graph shared with worker processes (set once per worker by the pool initializer)
+_worker_graph: Optional["nx.DiGraph[Any]"] = None
+
+
+@dataclass
+class CentralityResult:
+    """Betweenness centrality scores plus how they were obtained.
+
+    Attributes:
+        scores: Mapping of node -> normalized betweenness centrality
+        exact: True if every node was used as a source (no sampling)
+        pivots: Number of source nodes (pivots) used
+        total_nodes: Number of nodes in the graph
+        error_bound: Additive error bound on the scores at confidence_level (0.0 when exact)
+        confidence_level: Probability that all reported scores are within error_bound of the exact values
+            at once (a union bound over total_nodes)
+    """
+
+    scores: Dict[Any, float]
+    exact: bool
+    pivots: int
+    total_nodes: int
+    error_bound: float = 0.0
+    confidence_level: float = 1.0
+
+
+def graph_fingerprint(graph: "nx.DiGraph[Any]") -> str:
+    """Compute a content fingerprint of a graph's nodes and edges.
+
+    Each graph is fingerprinted once and remembered. Frozen graphs cannot change;
+    a mutable graph is fingerprinted again when its node or edge count changes, so
+    freeze or copy a graph before editing it in place without changing its size.
+
+    Args:
+        graph: NetworkX graph
+
+    Returns:
+        Hex digest identifying the graph structure
+    """
+    size = (graph.number_of_nodes(), graph.number_of_edges())
+    cached = _fingerprints.get(graph)
+    if cached is not None and (nx.is_frozen(graph) or cached[0] == size):
+        return cached[1]
+
+    digest = hashlib.sha256()
+    for node in sorted(map(str, graph.nodes())):
+        digest.update(node.encode("utf-8", "surrogateescape"))
+        digest.update(b"\0")
+    digest.update(b"\1")
+    for edge in sorted(f"{u}\0{v}" for u, v in graph.edges()):
+        digest.update(edge.encode("utf-8", "surrogateescape"))
+        digest.update(b"\1")
+    fingerprint = digest.hexdigest()
+
+    _fingerprints[graph] = (size, fingerprint)
+    return fingerprint
+
+
+def _cache_get(key: Tuple[Hashable, ...]) -> Any:
+    if key in _result_cache:
+        _result_cache.move_to_end(key)
+        return _result_cache[key]
+    return None
+
+
+def _cache_put(key: Tuple[Hashable, ...], value: Any) -> None:
+    _result_cache[key] = value
+    _result_cache.move_to_end(key)
+    while len(_result_cache) > CENTRALITY_CACHE_SIZE:
+        _result_cache.popitem(last=False)
+
+
+def clear_centrality_cache() -> None:
+    """Drop all cached centrality results."""
+    _result_cache.clear()
+
+
+def hoeffding_error_bound(pivots: int, confidence_level: float = 0.95, nodes: int = 1) -> float:
+    """Additive error bound for pivot-sampled normalized betweenness.
+
+    Each sampled pivot contributes a value in [0, ~1] to the normalized estimate, so by
+    Hoeffding's inequality the estimate of a single node is within
+    sqrt(ln(2 / (1 - confidence)) / (2 * pivots)) of the exact value with the given probability.
+    A union bound over nodes replaces 2 with 2 * nodes, making the bound hold for all of
+    them at once.
+
+    Args:
+        pivots: Number of sampled source nodes
+        confidence_level: Desired confidence (0 < confidence_level < 1)
+        nodes: Number of scores the bound must hold for simultaneously
+
+    Returns:
+        Additive error bound on normalized betweenness
+    """
+    if pivots <= 0:
+        return 1.0
+    return math.sqrt(math.log(2.0 * max(nodes, 1) / (1.0 - confidence_level)) / (2.0 * pivots))
+
+
+def _init_worker(graph: "nx.DiGraph[Any]") -> None:
+    """Process pool initializer: receive the graph once per worker."""
+    global _worker_graph  # pylint: disable=global-statement
+    _worker_graph = graph
+
+
+def _batch_dependencies(sources: Sequence[Any]) -> Dict[Any, float]:
+    """Sum of unnormalized pair dependencies over a batch of source nodes (worker side)."""
+    assert _worker_graph is not None, "worker graph not initialized"
+    result: Dict[Any, float] = nx.betweenness_centrality_subset(_worker_graph, sources, list(_worker_graph.nodes()), normalized=False)
+    return result
+
+
+def _sum_dependencies(graph: "nx.DiGraph[Any]", sources: List[Any], workers: int) -> Dict[Any, float]:
+    """Sum unnormalized dependencies over sources, optionally across worker processes."""
+    if workers <= 1 or len(sources) < 2 * workers:
+        totals: Dict[Any, float] = nx.betweenness_centrality_subset(graph, sources, list(graph.nodes()), normalized=False)
+        return totals
+
+    batch_size = math.ceil(len(sources) / workers)
+    batches = [sources[i : i + batch_size] for i in range(0, len(sources), batch_size)]
+    totals = dict.fromkeys(graph.nodes(), 0.0)
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(graph,)) as executor:
+        for partial in executor.map(_batch_dependencies, batches):
+            for node, value in partial.items():
+                totals[node] += value
+    return totals
+
+
+def get_betweenness_centrality(
+    graph: "nx.DiGraph[Any]",
+    pivots: Optional[int] = None,
+    sample_threshold: int = BETWEENNESS_SAMPLE_THRESHOLD,
+    seed: int = DEFAULT_CENTRALITY_SEED,
+    workers: int = 1,
+    confidence_level: float = 0.95,
+) -> CentralityResult:
+    """Compute (or fetch cached) normalized betweenness centrality.
+
+    Args:
+        graph: NetworkX DiGraph
+        pivots: Number of sampled source nodes; None picks exact computation for graphs up to
+            sample_threshold nodes and BETWEENNESS_DEFAULT_PIVOTS pivots above it
+        sample_threshold: Node count above which sampling is used when pivots is None
+        seed: Random seed for pivot selection (results are reproducible)
+        workers: Number of worker processes for pivot batches (1 = in-process)
+        confidence_level: Confidence level for the reported error bound
+
+    Returns:
+        CentralityResult with scores and accuracy information
+    """
+    n = graph.number_of_nodes()
+    if pivots is None:
+        pivots = BETWEENNESS_DEFAULT_PIVOTS if n > sample_threshold else n
+    pivots = max(0, min(pivots, n))
+    exact = pivots >= n
+
+    key = ("betweenness", graph_fingerprint(graph), pivots, seed if not exact else None, confidence_level)
+    cached = _cache_get(key)
+    if cached is not None:
+        logger.debug("Betweenness cache hit (%s pivots)", pivots)
+        result: CentralityResult = cached
+        return result
+
+    if n <= 2:
+        scores: Dict[Any, float] = dict.fromkeys(graph.nodes(), 0.0)
+    elif exact and workers <= 1:
+        scores = nx.betweenness_centrality(graph)
+    else:
+        nodes = list(graph.nodes())
+        sources = nodes if exact else random.Random(seed).sample(nodes, pivots)
+        totals = _sum_dependencies(graph, sources, workers)
+        # Normalize by ordered node pairs; scale sampled sums up to the full source set
+        scale = (n / len(sources)) / ((n - 1) * (n - 2)) if sources else 0.0
+        scores = {node: value * scale for node, value in totals.items()}
+
+    result = CentralityResult(
+        scores=scores,
+        exact=exact,
+        pivots=pivots,
+        total_nodes=n,
+        error_bound=0.0 if exact else hoeffding_error_bound(pivots, confidence_level, n),
+        confidence_level=1.0 if exact else confidence_level,
+    )
+    if not exact:
+        logger.info("Sampled betweenness with %d/%d pivots (±%.4f at %.0f%% confidence)", pivots, n, result.error_bound, confidence_level * 100)
+
+    _cache_put(key, result)
+    return result
+
+
+def get_pagerank(graph: "nx.DiGraph[Any]", alpha: float = 0.85, max_iter: int = 100, tol: float = 1.0e-6) -> Dict[Any, float]:
+    """Compute (or fetch cached) PageRank scores.
+
+    Args:
+        graph: NetworkX DiGraph
+        alpha: Damping parameter
+        max_iter: Maximum iterations
+        tol: Convergence tolerance
+
+    Returns:
+        Dictionary mapping node -> PageRank score
+    """
+    key = ("pagerank", graph_fingerprint(graph), alpha, max_iter, tol)
+    cached = _cache_get(key)
+    if cached is not None:
+        scores: Dict[Any, float] = cached
+        return scores
+
+    scores = nx.pagerank(graph, alpha=alpha, max_iter=max_iter, tol=tol)
+    _cache_put(key, scores)
+    return scores
+
+
+def _component_edge_betweenness(task: Tuple[List[Any], List[Tuple[Any, Any]], Optional[int], int]) -> Dict[Tuple[Any, Any], float]:
+    """Edge betweenness of one strongly connected component (runs in-process or in a worker)."""
+    nodes, edges, pivots, seed = task
+    subgraph: "nx.DiGraph[Any]" = nx.DiGraph()
+    subgraph.add_nodes_from(nodes)
+    subgraph.add_edges_from(edges)
+    scores: Dict[Tuple[Any, Any], float] = nx.edge_betweenness_centrality(subgraph, k=pivots, seed=seed if pivots is not None else None)
+    return scores
+
+
+def get_cycle_edge_betweenness(
+    graph: "nx.DiGraph[Any]",
+    components: Iterable[Collection[Any]],
+    exact_threshold: int = CYCLE_EDGE_BETWEENNESS_EXACT_THRESHOLD,
+    pivots: int = CYCLE_EDGE_BETWEENNESS_PIVOTS,
+    workers: Optional[int] = None,
+    seed: int = DEFAULT_CENTRALITY_SEED,
+) -> Dict[Tuple[Any, Any], float]:
+    """Compute edge betweenness restricted to each strongly connected component.
+
+    Only shortest paths that stay inside a cycle can be broken by removing one of its
+    edges, so each non-trivial SCC is analyzed on its own induced subgraph. Components
+    up to exact_threshold nodes are computed exactly; larger ones are pivot-sampled.
+    Scores are normalized within each component.
+
+    Args:
+        graph: NetworkX DiGraph containing the components
+        components: Node sets of strongly connected components (singletons are ignored)
+        exact_threshold: Largest component size computed exactly
+        pivots: Pivot count for components above exact_threshold
+        workers: Worker processes (None = CPU count); used only when there are several
+            components totalling at least CYCLE_PARALLEL_MIN_NODES nodes
+        seed: Random seed for pivot selection
+
+    Returns:
+        Dictionary mapping intra-component edge (u, v) -> edge betweenness
+    """
+    tasks: List[Tuple[List[Any], List[Tuple[Any, Any]], Optional[int], int]] = []
+    for component in components:
+        if len(component) < 2:
+            continue
+        members: Set[Any] = set(component)
+        edges = [(u, v) for u in members for v in graph.successors(u) if v in members and u != v]
+        k = None if len(members) <= exact_threshold else min(pivots, len(members))
+        tasks.append((list(members), edges, k, seed))
+
+    if not tasks:
+        return {}
+
+    # Largest components first so the pool is not left waiting on a late giant
+    tasks.sort(key=lambda task: len(task[0]), reverse=True)
+    total_nodes = sum(len(task[0]) for task in tasks)
+    max_workers = workers if workers is not None else (os.cpu_count() or 1)
+
+    scores: Dict[Tuple[Any, Any], float] = {}
+    if max_workers > 1 and len(tasks) > 1 and total_nodes >= CYCLE_PARALLEL_MIN_NODES:
+        with ProcessPoolExecutor(max_workers=min(max_workers, len(tasks))) as executor:
+            for partial in executor.map(_component_edge_betweenness, tasks):
+                scores.update(partial)
+    else:
+        for task in tasks:
+            scores.update(_component_edge_betweenness(task))
+    return scores
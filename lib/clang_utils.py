@@ -35,18 +35,24 @@ import fnmatch
 import enum
 from typing import List, Tuple, Set, Dict, DefaultDict, Optional
 from collections import defaultdict
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
-try:
-    import networkx as nx
-except ImportError:
-    nx = None  # type: ignore
-
-from lib.constants import COMPILE_COMMANDS_JSON, CLANG_SCAN_DEPS_CACHE_FILE, NINJA_COMMANDS_CACHE_FILE, MAX_CACHE_AGE_HOURS
+from lib.constants import COMPILE_COMMANDS_JSON, CLANG_SCAN_DEPS_CACHE_FILE, NINJA_COMMANDS_CACHE_FILE, MAX_CACHE_AGE_HOURS, NinjaError
 from lib.color_utils import print_success, print_info, print_highlight
 from lib.cache_utils import ensure_cache_dir, get_cache_path, load_cache, save_cache, cleanup_old_caches
 from lib.package_verification import PACKAGE_REQUIREMENTS
 from lib.tool_detection import CLANG_SCAN_DEPS_COMMANDS, find_clang_scan_deps, find_ninja
+from lib.ninja_manifest import load_ninja_manifest
+from lib.recorded_deps import (
+    DEPS_SOURCE_AUTO,
+    DEPS_SOURCE_NINJA,
+    DEPS_SOURCE_SCAN,
+    DEPS_SOURCES,
+    RecordedDependencies,
+    collect_recorded_dependencies,
+    recorded_path,
+)
+from lib.source_index import SourceIndex, build_source_index
 
 logger = logging.getLogger(__name__)
 
@@ -356,6 +362,14 @@ class IncludeGraphScanResult:
     all_headers: Set[str]
     scan_time: float
     file_types: Dict[str, FileType]
+    _source_index: Optional[SourceIndex] = field(default=None, init=False, repr=False, compare=False)
+
+    @property
+    def source_index(self) -> SourceIndex:
+        """Inverted header -> source index over source_to_deps, built on first use and shared by every rebuild query."""
+        if self._source_index is None:
+            self._source_index = build_source_index(self.source_to_deps)
+        return self._source_index
 
     def to_tuple(self) -> Tuple[Dict[str, List[str]], DefaultDict[str, Set[str]], Set[str], float]:
         """Convert to tuple for backward compatibility.
@@ -964,15 +978,57 @@ def create_filtered_compile_commands(build_dir: str) -> str:
     return filtered_db
 
 
+def _ninja_commands_from_manifest(build_ninja_path: str) -> Optional[List[str]]:
+    """Return the command of every non-phony edge in build.ninja, or None if it cannot be parsed."""
+    try:
+        manifest = load_ninja_manifest(build_ninja_path)
+        return [command for command in map(manifest.command, manifest.builds) if command]
+    except (IOError, NinjaError) as e:
+        logger.debug("Could not evaluate commands from %s: %s", build_ninja_path, e)
+        return None
+
+
+def _run_ninja_commands_tool(build_dir: str, timeout: int) -> Optional[List[str]]:
+    """Return the output lines of ninja -t commands, or None if ninja fails."""
+    ninja_tool = find_ninja()
+    if not ninja_tool.is_found():
+        logger.warning("ninja not found - cannot extract include paths from ninja")
+        return None
+
+    assert ninja_tool.command is not None, "Tool command should not be None when found"
+
+    logger.info("Running %s -t commands to extract include paths...", ninja_tool.command)
+
+    try:
+        result = subprocess.run([ninja_tool.command, "-t", "commands"], capture_output=True, text=True, cwd=build_dir, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        logger.error("ninja -t commands timed out after %s seconds", timeout)
+        return None
+    except FileNotFoundError:
+        logger.warning("ninja command not found")
+        return None
+    except Exception as e:
+        logger.error("Unexpected error running ninja -t commands: %s", e)
+        return None
+
+    if result.returncode != 0:
+        logger.warning("ninja -t commands failed with code %s", result.returncode)
+        if result.stderr:
+            logger.debug("Stderr: %s", result.stderr[:500])
+        return None
+    return result.stdout.splitlines()
+
+
 def extract_include_paths_from_ninja(build_dir: str, timeout: int = 60) -> Optional[Set[str]]:
-    """Extract include paths from ninja -t commands with persistent caching.
+    """Extract include paths from the build's compile commands with persistent caching.
 
-    This function caches the ninja commands output to avoid redundant parsing.
-    The cache is invalidated when build.ninja is modified or exceeds max age.
+    Commands are evaluated from the parsed build.ninja model (see lib/ninja_manifest.py),
+    falling back to ninja -t commands if the manifest cannot be read. The result is
+    cached; the cache is invalidated when build.ninja is modified or exceeds max age.
 
     Args:
         build_dir: Path to the build directory
-        timeout: Command timeout in seconds (default: 60)
+        timeout: ninja -t commands timeout in seconds (default: 60)
 
     Returns:
         Set of absolute include path directories, or None if ninja fails
@@ -998,37 +1054,15 @@ def extract_include_paths_from_ninja(build_dir: str, timeout: int = 60) -> Optio
         # Cast from Any to the correct return type
         return set(cached_result) if isinstance(cached_result, (set, list)) else cached_result
 
-    # Cache miss - run ninja -t commands
-    ninja_tool = find_ninja()
-    if not ninja_tool.is_found():
-        logger.warning("ninja not found - cannot extract include paths from ninja")
-        return None
-
-    assert ninja_tool.command is not None, "Tool command should not be None when found"
-
-    logger.info("Running %s -t commands to extract include paths...", ninja_tool.command)
-
+    # Cache miss - evaluate compile commands from the parsed manifest (shared with the other build.ninja consumers)
     start_time = time.time()
-    try:
-        result = subprocess.run([ninja_tool.command, "-t", "commands"], capture_output=True, text=True, cwd=build_dir, timeout=timeout)
-    except subprocess.TimeoutExpired:
-        logger.error("ninja -t commands timed out after %s seconds", timeout)
-        return None
-    except FileNotFoundError:
-        logger.warning("ninja command not found")
-        return None
-    except Exception as e:
-        logger.error("Unexpected error running ninja -t commands: %s", e)
-        return None
-
+    commands = _ninja_commands_from_manifest(build_ninja_path)
+    if commands is None:
+        commands = _run_ninja_commands_tool(build_dir, timeout)
+        if commands is None:
+            return None
     elapsed = time.time() - start_time
 
-    if result.returncode != 0:
-        logger.warning("ninja -t commands failed with code %s", result.returncode)
-        if result.stderr:
-            logger.debug("Stderr: %s", result.stderr[:500])
-        return None
-
     # Parse include paths from commands output
     include_paths: Set[str] = set()
 
@@ -1037,7 +1071,7 @@ def extract_include_paths_from_ninja(build_dir: str, timeout: int = 60) -> Optio
     # Also match MSVC: /I<path>, /I <path>, /external:I <path>, /external:I<path>
     include_flag_pattern = re.compile(r"(?:^|\s)(-I|-isystem|-iquote|/I|/external:I)(\S+)?")
 
-    for line in result.stdout.splitlines():
+    for line in commands:
         # Each line is a complete command for a target
         # We only care about compilation commands (containing -c or /c)
         if " -c " not in line and " /c " not in line:
@@ -1217,41 +1251,57 @@ def run_clang_scan_deps(build_dir: str, filtered_db: str, timeout: int = 300) ->
     # Assertion for mypy: if is_found() is True, command is not None
     assert clang_tool.command is not None, "Tool command should not be None when found"
 
-    num_cores = mp.cpu_count()
-    logger.info("Running %s using %s cores...", clang_tool.command, num_cores)
     print_info(f"🔄 Cache miss - running {clang_tool.command} (this may take a while)...")
+    output, elapsed = _invoke_clang_scan_deps(clang_tool.command, filtered_db, build_dir, timeout)
+
+    # Save to cache
+    cache_result = (output, elapsed)
+    if save_cache(cache_path, cache_result, filtered_db, build_ninja_path):
+        logger.debug("Saved cache to: %s (build_dir: %s)", cache_path, build_dir)
+        print_success(f"💾 Saved results to cache ({elapsed:.2f}s scan time)")
+
+    # Periodic cleanup of old caches
+    removed = cleanup_old_caches(build_dir, MAX_CACHE_AGE_HOURS)
+    if removed > 0:
+        print_info(f"🧹 Cleaned up {removed} old cache file(s)")
+
+    return output, elapsed
+
+
+def _invoke_clang_scan_deps(command: str, compile_db: str, build_dir: str, timeout: int) -> Tuple[str, float]:
+    """Run clang-scan-deps over compile_db in make format, without caching.
+
+    Args:
+        command: clang-scan-deps executable
+        compile_db: Compilation database to scan
+        build_dir: Working directory for the scan
+        timeout: Command timeout in seconds
+
+    Returns:
+        Tuple of (stdout output, elapsed time)
+
+    Raises:
+        RuntimeError: If clang-scan-deps fails or times out
+    """
+    num_cores = mp.cpu_count()
+    logger.info("Running %s using %s cores...", command, num_cores)
 
     start_time = time.time()
     try:
         result = subprocess.run(
-            [clang_tool.command, f"-compilation-database={filtered_db}", "-format=make", "-j", str(num_cores)],
-            capture_output=True,
-            text=True,
-            cwd=build_dir,
-            timeout=timeout,
+            [command, f"-compilation-database={compile_db}", "-format=make", "-j", str(num_cores)], capture_output=True, text=True, cwd=build_dir, timeout=timeout
         )
     except subprocess.TimeoutExpired as exc:
-        raise RuntimeError(f"{clang_tool.command} timed out after {timeout} seconds") from exc
+        raise RuntimeError(f"{command} timed out after {timeout} seconds") from exc
 
     elapsed = time.time() - start_time
 
     if result.returncode != 0:
-        error_msg = f"{clang_tool.command} failed with code {result.returncode}"
+        error_msg = f"{command} failed with code {result.returncode}"
         if result.stderr:
             error_msg += f"\nError output: {result.stderr[:1000]}"
         raise RuntimeError(error_msg)
 
-    # Save to cache
-    cache_result = (result.stdout, elapsed)
-    if save_cache(cache_path, cache_result, filtered_db, build_ninja_path):
-        logger.debug("Saved cache to: %s (build_dir: %s)", cache_path, build_dir)
-        print_success(f"💾 Saved results to cache ({elapsed:.2f}s scan time)")
-
-    # Periodic cleanup of old caches
-    removed = cleanup_old_caches(build_dir, MAX_CACHE_AGE_HOURS)
-    if removed > 0:
-        print_info(f"🧹 Cleaned up {removed} old cache file(s)")
-
     return result.stdout, elapsed
 
 
@@ -1380,7 +1430,10 @@ def build_header_to_header_graph(all_headers: Set[str]) -> DefaultDict[str, Set[
 
 
 def compute_transitive_deps(header: str, include_graph: Dict[str, Set[str]], _visited: Optional[Set[str]] = None, _depth: int = 0) -> Set[str]:
-    """Compute all transitive dependencies of a header using NetworkX.
+    """Compute all transitive dependencies of a header.
+
+    Walks the include mapping directly instead of building a graph per call, so
+    the cost is proportional to the reachable part of the graph only.
 
     Args:
         header: Header file path
@@ -1389,39 +1442,157 @@ def compute_transitive_deps(header: str, include_graph: Dict[str, Set[str]], _vi
         _depth: Deprecated parameter, kept for compatibility
 
     Returns:
-        Set of all transitive dependencies
+        Set of all transitive dependencies (excluding the header itself)
+    """
+    if header not in include_graph:
+        return set()
+
+    reachable: Set[str] = set()
+    stack = list(include_graph[header])
+    while stack:
+        node = stack.pop()
+        if node in reachable:
+            continue
+        reachable.add(node)
+        stack.extend(dep for dep in include_graph.get(node, ()) if dep not in reachable)
+
+    reachable.discard(header)
+    return reachable
+
+
+def _make_deps_by_source(output: str) -> Dict[str, List[str]]:
+    """Parse clang-scan-deps make-format output into source -> [source, dependencies...].
+
+    Args:
+        output: clang-scan-deps stdout in makefile format
+
+    Returns:
+        Dictionary keyed by source file (or by target when the source cannot be identified)
+    """
+    # Format is: target.o: source.cpp header1.hpp header2.hpp ...
+    source_to_deps: Dict[str, List[str]] = {}
+
+    current_target = None
+    current_deps: List[str] = []
+
+    for line in output.splitlines():
+        # Check if this is a target line (has colon and is not indented)
+        # Target lines: /path/to/file.o: \
+        # Dependency lines:   /path/to/dep.cpp \
+        if ":" in line and not line.startswith((" ", "\t")):
+            # This is a target line
+            parts = line.split(":", 1)
+            # Save previous target if exists
+            if current_target and current_deps:
+                source_to_deps[current_target] = current_deps
+            # Start new target
+            current_target = parts[0].strip()
+            current_deps = []
+            # Process any deps on the same line
+            if len(parts) > 1:
+                remainder = parts[1].strip()
+                if remainder and remainder != "\\":
+                    # Split by spaces to handle multiple deps on one line
+                    deps_on_line = remainder.rstrip("\\").strip().split()
+                    current_deps.extend(deps_on_line)
+        else:
+            # This is a dependency line
+            line = line.strip()
+            if line and line != "\\":
+                # Remove trailing backslash and split by spaces
+                deps_on_line = line.rstrip("\\").strip().split()
+                current_deps.extend(deps_on_line)
+
+    # Save last target
+    if current_target and current_deps:
+        source_to_deps[current_target] = current_deps
+
+    # Map targets back to source files for clearer output
+    # The first dependency is typically the source file itself
+    remapped_source_to_deps = {}
+    for target, deps in source_to_deps.items():
+        if deps and is_valid_source_file(deps[0]):
+            # Use the source file (first dep) as the key instead of the .o file
+            remapped_source_to_deps[deps[0]] = deps
+        else:
+            # Fallback to original target if we can't identify the source
+            remapped_source_to_deps[target] = deps
+    return remapped_source_to_deps
+
+
+def _merge_recorded_and_scanned_deps(build_dir: str, recorded: RecordedDependencies) -> Tuple[Dict[str, List[str]], float]:
+    """Combine ninja's fresh recorded dependencies with a clang-scan-deps pass over the stale sources.
+
+    Only the stale sources are scanned, through a compile database holding just
+    their entries; the scan is not cached since its input changes with every build.
+    Scanned paths are normalized like the recorded ones, so a rescanned source
+    replaces its recorded entry instead of appearing twice. Without clang-scan-deps
+    the stale sources keep their last recorded dependencies.
+
+    Args:
+        build_dir: Path to the build directory
+        recorded: Result of collect_recorded_dependencies()
+
+    Returns:
+        Tuple of (source -> dependencies, elapsed time)
 
     Raises:
-        ImportError: If networkx is not available
+        RuntimeError: If the compile database cannot be created or clang-scan-deps fails
     """
-    # Note: nx should always be available due to requirements, but check defensively
-    assert nx is not None, "networkx is required but was not imported"
+    source_to_deps = dict(recorded.source_to_deps)
+    elapsed = recorded.elapsed
+    if not recorded.stale:
+        return source_to_deps, elapsed
 
-    # Build a graph for this computation
-    G: nx.DiGraph[str] = nx.DiGraph()
+    clang_tool = find_clang_scan_deps()
+    if not clang_tool.is_found():
+        outdated = {source: deps for source, deps in recorded.stale.items() if deps is not None}
+        logger.warning("clang-scan-deps not found; using outdated recorded dependencies for %d of %d stale sources", len(outdated), len(recorded.stale))
+        source_to_deps.update(outdated)
+        return source_to_deps, elapsed
+    assert clang_tool.command is not None, "Tool command should not be None when found"
 
-    # Add all nodes and edges from include_graph
-    for src, dests in include_graph.items():
-        G.add_node(src)
-        for dest in dests:
-            G.add_edge(src, dest)
+    try:
+        filtered_db = create_filtered_compile_commands(build_dir)
+        with open(filtered_db, "r", encoding="utf-8") as f:
+            entries = json.load(f)
+    except Exception as e:
+        raise RuntimeError(f"Failed to create filtered compile commands: {e}") from e
 
-    # Use NetworkX descendants for efficient transitive closure
-    if header in G:
-        return nx.descendants(G, header)
+    stale = {os.path.realpath(source) for source in recorded.stale}
+    rescan = [entry for entry in entries if os.path.realpath(os.path.join(entry.get("directory", build_dir), entry["file"])) in stale]
+    if not rescan:
+        return source_to_deps, elapsed
 
-    return set()
+    rescan_db = os.path.join(os.path.dirname(filtered_db), "compile_commands_rescan.json")
+    with open(rescan_db, "w", encoding="utf-8") as f:
+        json.dump(rescan, f)
+    logger.info("Rescanning %d stale sources with %s", len(rescan), clang_tool.command)
+    output, scan_elapsed = _invoke_clang_scan_deps(clang_tool.command, rescan_db, build_dir, timeout=300)
+    build_dir = os.path.abspath(build_dir)
+    for source, deps in _make_deps_by_source(output).items():
+        source_to_deps[recorded_path(build_dir, source)] = [recorded_path(build_dir, dep) for dep in deps]
+    return source_to_deps, elapsed + scan_elapsed
 
 
 def build_include_graph(
-    build_dir: str, verbose: bool = True, ninja_sources_override: Optional[List[str]] = None, ninja_headers_override: Optional[List[str]] = None
+    build_dir: str,
+    verbose: bool = True,
+    ninja_sources_override: Optional[List[str]] = None,
+    ninja_headers_override: Optional[List[str]] = None,
+    deps_source: str = DEPS_SOURCE_AUTO,
 ) -> IncludeGraphScanResult:
-    """Build a complete include graph from clang-scan-deps output.
+    """Build a complete include graph from per-source dependency lists.
+
+    The dependency lists come from clang-scan-deps, which reports the full
+    transitive closure of dependencies for every source file. That is more
+    accurate and complete than manually parsing header files.
 
-    This function uses clang-scan-deps to obtain complete dependency information
-    for all source files. The dependency information from clang-scan-deps includes
-    the full transitive closure of dependencies, which is more accurate and complete
-    than manually parsing header files.
+    After a build, ninja has already recorded the same lists in .ninja_deps. With
+    deps_source "auto" (the default) or "ninja" they are reused for every compile
+    edge whose recorded dependencies are still fresh (see lib/recorded_deps.py),
+    and clang-scan-deps only rescans the stale or unrecorded sources. "auto" falls
+    back to a full scan when the build directory has no usable ninja records.
 
     Args:
         build_dir: Path to the build directory
@@ -1430,88 +1601,55 @@ def build_include_graph(
             instead of reading from build.ninja. Used when reconstructing baseline from git.
         ninja_headers_override: Optional list of header files to use for project root calculation
             instead of reading from build.ninja. Used when reconstructing baseline from git.
+        deps_source: "auto", "ninja" (recorded dependencies required) or "clang-scan-deps" (always scan)
 
     Returns:
         IncludeGraphScanResult with source dependencies, include graph, headers, and scan time
 
     Raises:
-        RuntimeError: If clang-scan-deps is not available or fails
+        ValueError: If deps_source is not recognised
+        RuntimeError: If clang-scan-deps is needed but not available or fails, or if
+            deps_source is "ninja" and the build directory has no usable ninja records
         FileNotFoundError: If required files are missing
     """
-    try:
-        # Check if clang-scan-deps is available
-        clang_tool = find_clang_scan_deps()
+    if deps_source not in DEPS_SOURCES:
+        raise ValueError(f"Unknown deps_source {deps_source!r}; expected one of {', '.join(DEPS_SOURCES)}")
 
-        if not clang_tool.is_found():
-            raise RuntimeError("clang-scan-deps not found. Please install clang (e.g., 'sudo apt install clang-19')")
+    try:
+        recorded = None
+        if deps_source != DEPS_SOURCE_SCAN:
+            recorded = collect_recorded_dependencies(build_dir)
+            if recorded is None and deps_source == DEPS_SOURCE_NINJA:
+                raise RuntimeError(f"No usable .ninja_deps/.ninja_log records in {build_dir}; build the tree first or scan with clang-scan-deps")
+
+        if recorded is not None:
+            source_to_deps, elapsed = _merge_recorded_and_scanned_deps(build_dir, recorded)
+            scan_summary = f"Read dependencies of {len(recorded.source_to_deps)} source files from ninja's logs ({len(recorded.stale)} rescanned)"
+        else:
+            # Check if clang-scan-deps is available
+            clang_tool = find_clang_scan_deps()
 
-        # Assertion for mypy: if is_found() is True, command is not None
-        assert clang_tool.command is not None, "Tool command should not be None when found"
+            if not clang_tool.is_found():
+                raise RuntimeError("clang-scan-deps not found. Please install clang (e.g., 'sudo apt install clang-19')")
 
-        try:
-            filtered_db = create_filtered_compile_commands(build_dir)
-        except Exception as e:
-            raise RuntimeError(f"Failed to create filtered compile commands: {e}") from e
+            # Assertion for mypy: if is_found() is True, command is not None
+            assert clang_tool.command is not None, "Tool command should not be None when found"
 
-        if not os.path.exists(filtered_db):
-            raise FileNotFoundError(f"Filtered compile commands not found: {filtered_db}")
+            try:
+                filtered_db = create_filtered_compile_commands(build_dir)
+            except Exception as e:
+                raise RuntimeError(f"Failed to create filtered compile commands: {e}") from e
 
-        # Use cached clang-scan-deps execution
-        logger.info("Running %s using cached execution to build include graph...", clang_tool.command)
-        output, elapsed = run_clang_scan_deps(build_dir, filtered_db, timeout=300)
+            if not os.path.exists(filtered_db):
+                raise FileNotFoundError(f"Filtered compile commands not found: {filtered_db}")
 
-        # Parse makefile-style output to build include graph
-        # Format is: target.o: source.cpp header1.hpp header2.hpp ...
-        source_to_deps = {}
-        header_to_direct_includes: DefaultDict[str, Set[str]] = defaultdict(set)
-        all_headers = set()
-
-        current_target = None
-        current_deps: List[str] = []
-
-        for line in output.splitlines():
-            # Check if this is a target line (has colon and is not indented)
-            # Target lines: /path/to/file.o: \
-            # Dependency lines:   /path/to/dep.cpp \
-            if ":" in line and not line.startswith((" ", "\t")):
-                # This is a target line
-                parts = line.split(":", 1)
-                # Save previous target if exists
-                if current_target and current_deps:
-                    source_to_deps[current_target] = current_deps
-                # Start new target
-                current_target = parts[0].strip()
-                current_deps = []
-                # Process any deps on the same line
-                if len(parts) > 1:
-                    remainder = parts[1].strip()
-                    if remainder and remainder != "\\":
-                        # Split by spaces to handle multiple deps on one line
-                        deps_on_line = remainder.rstrip("\\").strip().split()
-                        current_deps.extend(deps_on_line)
-            else:
-                # This is a dependency line
-                line = line.strip()
-                if line and line != "\\":
-                    # Remove trailing backslash and split by spaces
-                    deps_on_line = line.rstrip("\\").strip().split()
-                    current_deps.extend(deps_on_line)
+            # Use cached clang-scan-deps execution
+            logger.info("Running %s using cached execution to build include graph...", clang_tool.command)
+            output, elapsed = run_clang_scan_deps(build_dir, filtered_db, timeout=300)
+            source_to_deps = _make_deps_by_source(output)
+            scan_summary = f"Scanned {len(source_to_deps)} source files"
 
-        # Save last target
-        if current_target and current_deps:
-            source_to_deps[current_target] = current_deps
-
-        # Map targets back to source files for clearer output
-        # The first dependency is typically the source file itself
-        remapped_source_to_deps = {}
-        for target, deps in source_to_deps.items():
-            if deps and is_valid_source_file(deps[0]):
-                # Use the source file (first dep) as the key instead of the .o file
-                remapped_source_to_deps[deps[0]] = deps
-            else:
-                # Fallback to original target if we can't identify the source
-                remapped_source_to_deps[target] = deps
-        source_to_deps = remapped_source_to_deps
+        all_headers: Set[str] = set()
 
         # Collect all unique project headers from the dependency lists
         for deps in source_to_deps.values():
@@ -1590,7 +1728,7 @@ def build_include_graph(
         )
 
         if verbose:
-            print_success(f"Scanned {len(source_to_deps)} source files in {elapsed:.2f}s")
+            print_success(f"{scan_summary} in {elapsed:.2f}s")
             print_info("Building include graph from clang-scan-deps output...")
             print_highlight(f"Found {len(all_headers)} unique project headers")
             print_success(f"Built dependency graph with {len(all_headers)} headers and {total_edges} dependencies")
@@ -88,17 +88,33 @@ MIN_COOCCURRENCE_THRESHOLD = 2  # Minimum cooccurrence count to consider
 CLANG_SCAN_DEPS_TIMEOUT = 300  # Timeout for clang-scan-deps
 GIT_COMMAND_TIMEOUT = 30  # Timeout for git commands
 NINJA_COMMAND_TIMEOUT = 60  # Timeout for ninja commands
+NINJA_TOOL_MAX_ARGS_BYTES = 24 * 1024  # Command-line budget of one batched `ninja -t <tool> <targets...>` (Windows caps at 32767 chars)
 
 # Parallel processing
 DEFAULT_MAX_WORKERS = None  # None = use all CPU cores
 
+# Centrality computation (see lib/centrality.py)
+BETWEENNESS_SAMPLE_THRESHOLD = 2000  # Graphs with more nodes use sampled betweenness by default
+BETWEENNESS_DEFAULT_PIVOTS = 1000  # Pivot (source) count for sampled betweenness
+CENTRALITY_CACHE_SIZE = 16  # Cached centrality results kept per process
+CYCLE_EDGE_BETWEENNESS_EXACT_THRESHOLD = 1000  # Cycles (SCCs) up to this size get exact edge betweenness
+CYCLE_EDGE_BETWEENNESS_PIVOTS = 500  # Pivot count for edge betweenness inside larger cycles
+CYCLE_PARALLEL_MIN_NODES = 2000  # Total cycle size before per-cycle work is spread across processes
+DSM_PARALLEL_MIN_HEADERS = 5000  # Headers before run_dsm_analysis() runs independent phases in worker processes
+FAS_LOCAL_SEARCH_PASSES = 10  # Adjacent-swap passes refining each feedback arc set ordering
+NINJA_MANIFEST_CACHE_SIZE = 2  # Parsed build.ninja models kept per process (see lib/ninja_manifest.py)
+NINJA_DEPS_CACHE_SIZE = 2  # Loaded .ninja_deps logs kept per process (see lib/ninja_deps.py)
+NINJA_LOG_CACHE_SIZE = 2  # Loaded .ninja_log files kept per process (see lib/ninja_log.py)
+
 # =============================================================================
 # Display Limits
 # =============================================================================
 
 MAX_HEADERS_DISPLAY = 50  # Maximum headers to show in various listings
 MAX_CYCLES_DISPLAY = 20  # Maximum cycles to display
+MAX_CYCLE_WITNESSES = 20  # Maximum example cycles produced by find_cycle_witnesses()
 MAX_LAYERS_DISPLAY = 10  # Maximum layers to display
+MAX_REDUNDANT_INCLUDES_DISPLAY = 30  # Maximum redundant include edges to list
 MAX_RECOMMENDATIONS = 5  # Maximum recommendations to show
 
 # =============================================================================
@@ -121,6 +137,7 @@ COMPILE_COMMANDS_JSON = "compile_commands.json"  # Standard compilation database
 CACHE_DIR = ".buildcheck_cache"  # Cache directory name in build directory
 CLANG_SCAN_DEPS_CACHE_FILE = "clang_scan_deps_output.pickle"  # Cached clang-scan-deps output
 NINJA_COMMANDS_CACHE_FILE = "ninja_commands_cache.pkl"  # Cached ninja -t commands output
+REACHABILITY_INDEX_CACHE_FILE = "reachability_index.pickle"  # Cached reachability index (see lib/reachability.py)
 MAX_CACHE_AGE_HOURS = 168  # Maximum cache age in hours (7 days)
 
 # =============================================================================
@@ -26,10 +26,11 @@
 import logging
 import time
 from collections import defaultdict
-from typing import Dict, List, Set, DefaultDict, Optional, Callable, ItemsView, Tuple, Any
-from dataclasses import dataclass
+from typing import Dict, List, Set, DefaultDict, Optional, Callable, ItemsView, Iterable, Mapping, Tuple, Any
+from dataclasses import dataclass, field
 
 from lib.color_utils import Colors, print_warning
+from lib.ninja_log import CompileTimes
 
 logger = logging.getLogger(__name__)
 
@@ -148,6 +149,26 @@ def compute_header_usage(source_to_deps: Dict[str, Set[str]], file_types: Dict[s
     return dict(header_usage_count)
 
 
+def compute_header_compile_seconds(source_to_deps: Mapping[str, Iterable[str]], headers: Iterable[str], compile_times: CompileTimes) -> Dict[str, float]:
+    """Estimate the CPU-seconds of recompiling every source that depends on each header.
+
+    Args:
+        source_to_deps: Mapping of source files to their dependencies
+        headers: Headers to compute the rebuild cost for
+        compile_times: Per-source compile durations (from .ninja_log)
+
+    Returns:
+        Dictionary mapping each header to the summed compile seconds of its dependent sources
+    """
+    wanted = set(headers)
+    header_seconds: Dict[str, float] = {header: 0.0 for header in wanted}
+    for source, deps in source_to_deps.items():
+        seconds = compile_times.seconds(source)
+        for dep in wanted.intersection(deps):
+            header_seconds[dep] += seconds
+    return header_seconds
+
+
 def identify_problematic_headers(
     header_transitive_deps: Dict[str, int],
     header_usage_count: Dict[str, int],
@@ -194,6 +215,8 @@ class DependencyAnalysisResult:
         header_usage_count: Count of how many sources include each header
         header_reverse_impact: Count of headers that transitively depend on each header (rebuild blast radius)
         header_max_chain_length: Maximum include chain length for each header
+        header_compile_seconds: Estimated CPU-seconds to recompile the sources using each
+            problematic header (empty when the build has no .ninja_log)
     """
 
     problematic: List[Tuple[str, int, int, int, int]]
@@ -202,6 +225,7 @@ class DependencyAnalysisResult:
     header_usage_count: Dict[str, int]
     header_reverse_impact: Dict[str, int]
     header_max_chain_length: Dict[str, int]
+    header_compile_seconds: Dict[str, float] = field(default_factory=dict)
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for backward compatibility and JSON serialization.
@@ -216,6 +240,7 @@ class DependencyAnalysisResult:
             "header_usage_count": self.header_usage_count,
             "header_reverse_impact": self.header_reverse_impact,
             "header_max_chain_length": self.header_max_chain_length,
+            "header_compile_seconds": self.header_compile_seconds,
         }
 
 
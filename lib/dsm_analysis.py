@@ -29,7 +29,8 @@ and reused across the codebase. Extracted from buildCheckDSM.py for better modul
 
 import os
 import logging
-from typing import Dict, Set, List, Tuple, Any, DefaultDict, Optional
+from dataclasses import dataclass, replace
+from typing import Callable, Dict, Set, List, Tuple, Any, DefaultDict, Mapping, Optional
 
 import networkx as nx
 import numpy as np
@@ -42,6 +43,8 @@ from .constants import (
     SPARSITY_MODERATE,
     MAX_CYCLES_DISPLAY,
     MAX_LAYERS_DISPLAY,
+    MAX_REDUNDANT_INCLUDES_DISPLAY,
+    DSM_PARALLEL_MIN_HEADERS,
     CYCLE_HIGHLIGHT,
     DEPENDENCY_MARKER,
     EMPTY_CELL,
@@ -53,6 +56,7 @@ from .file_utils import cluster_headers_by_directory
 from .dsm_types import (
     MatrixStatistics,
     DSMAnalysisResults,
+    LazyDSMAnalysisResults,
     DSMDelta,
     CouplingStatistics,
     CycleComplexityStats,
@@ -63,10 +67,33 @@ from .dsm_types import (
     LayerMovementStats,
     ImprovementCandidate,
 )
-from .graph_utils import DSMMetrics, build_reverse_dependencies, calculate_dsm_metrics, analyze_cycles, compute_layers as compute_layer_structure, visualize_dsm
+from .analysis_graph import AnalysisGraph
+from .centrality import get_betweenness_centrality, get_cycle_edge_betweenness
+from .graph_utils import (
+    DSMMetrics,
+    MetricsTable,
+    as_metrics_table,
+    build_reverse_dependencies,
+    compute_layers as compute_layer_structure,
+    RedundantInclude,
+    compute_transitive_closure,
+    find_cycle_witnesses,
+    find_redundant_include_edges,
+    get_feedback_arc_set,
+    get_reachability_index,
+    visualize_dsm,
+)
+from .feedback_arc_set import FeedbackArcSetResult, solve_feedback_arc_set
 from .library_parser import analyze_cross_library_dependencies
+from .phase_scheduler import run_phases
+from .reachability import ReachabilityIndex
+from .rebuild_impact import RebuildImpactIndex, build_rebuild_impact_index
+from .shared_graph import InternedGraph, SharedGraph, SharedGraphHandle, attach_graph, cleanup_stale_segments, intern_graph
+from .source_index import SourceIndex, build_source_index
+from .ninja_log import CompileTimes, format_cpu_time, load_compile_times
 from .ninja_utils import validate_build_directory_with_feedback
 from .clang_utils import build_include_graph, is_system_header
+from .recorded_deps import DEPS_SOURCE_AUTO
 from .git_utils import find_git_repo, get_working_tree_changes_from_commit, categorize_changed_files
 from .dependency_utils import build_reverse_dependency_map, compute_affected_sources
 from .sensitivity_thresholds import DetectionThresholds, SensitivityLevel
@@ -102,7 +129,7 @@ __all__ = [
 def calculate_matrix_statistics(
     all_headers: Set[str],
     header_to_headers: Dict[str, Set[str]],
-    metrics: Optional[Dict[str, DSMMetrics]] = None,
+    metrics: Optional[Mapping[str, DSMMetrics]] = None,
     headers_in_cycles: Optional[Set[str]] = None,
     num_cycles: Optional[int] = None,
 ) -> MatrixStatistics:
@@ -145,17 +172,12 @@ def calculate_matrix_statistics(
 
     if metrics is not None:
         # Calculate coupling percentiles for quality score
-        couplings = [m.coupling for m in metrics.values()]
-        if couplings:
-            coupling_p95 = float(np.percentile(couplings, 95))
-            coupling_p99 = float(np.percentile(couplings, 99))
-
-            # Count stable interfaces (stability < 0.3)
-            num_stable_interfaces = sum(1 for m in metrics.values() if m.stability < 0.3)
+        table = as_metrics_table(metrics)
+        if len(table):
+            coupling_p95, coupling_p99 = (float(p) for p in np.percentile(table.coupling, [95, 99]))
 
-            # Calculate interface ratio
-            interface_ratio, num_stable_interfaces_calc, _ = calculate_interface_implementation_ratio(metrics, stability_threshold=0.3)
-            num_stable_interfaces = int(num_stable_interfaces_calc)
+            # Calculate interface ratio and count stable interfaces (stability < 0.3)
+            interface_ratio, num_stable_interfaces, _ = calculate_interface_implementation_ratio(table, stability_threshold=0.3)
         else:
             coupling_p95 = 0
             coupling_p99 = 0
@@ -252,7 +274,13 @@ def print_summary_statistics(stats: MatrixStatistics, cycles_count: int, headers
 
 
 def print_circular_dependencies(
-    cycles: List[Set[str]], feedback_edges: List[Tuple[str, str]], project_root: str, cycles_only: bool = False, self_loops: Optional[List[str]] = None
+    cycles: List[Set[str]],
+    feedback_edges: List[Tuple[str, str]],
+    project_root: str,
+    cycles_only: bool = False,
+    self_loops: Optional[List[str]] = None,
+    layers_after_cut: int = 0,
+    graph: Optional["nx.DiGraph[Any]"] = None,
 ) -> None:
     """Print circular dependencies analysis.
 
@@ -262,6 +290,8 @@ def print_circular_dependencies(
         project_root: Root directory for relative paths
         cycles_only: Whether we're in cycles-only mode
         self_loops: Optional list of headers that include themselves
+        layers_after_cut: Dependency layers left once feedback_edges are removed (0 = unknown)
+        graph: Dependency graph the cycles come from, to show one include chain per group (None: members only)
     """
     if not cycles and not self_loops and cycles_only:
         return
@@ -275,11 +305,21 @@ def print_circular_dependencies(
         print()
 
         display_cycles = cycles[:MAX_CYCLES_DISPLAY]
+        # The displayed groups are whole SCCs, so each stays one component of their union
+        witnesses: Dict[str, List[str]] = {}
+        if graph is not None:
+            shown = set().union(*display_cycles)
+            witnesses = {witness[0]: witness for witness in find_cycle_witnesses(graph.subgraph(shown), len(display_cycles))}
+
         for i, cycle in enumerate(sorted(display_cycles, key=len, reverse=True), 1):
             print_error(f"Cycle {i} ({len(cycle)} headers):", prefix=False)
             for header in sorted(cycle):
                 rel_path = os.path.relpath(header, project_root) if header.startswith(project_root) else header
                 print(f"  • {rel_path}")
+            witness = witnesses.get(min(cycle))
+            if witness:
+                chain = [os.path.relpath(header, project_root) if header.startswith(project_root) else header for header in [*witness, witness[0]]]
+                print(f"  {Colors.DIM}e.g. {' → '.join(chain)}{Colors.RESET}")
             print()
 
         if len(cycles) > MAX_CYCLES_DISPLAY:
@@ -287,7 +327,8 @@ def print_circular_dependencies(
 
         if feedback_edges:
             print(f"{Colors.BRIGHT}Suggested edges to remove to break cycles:{Colors.RESET}")
-            print(f"{Colors.DIM}(Breaking these {len(feedback_edges)} dependencies would eliminate all cycles){Colors.RESET}\n")
+            layers_note = f", leaving {layers_after_cut} acyclic layers" if layers_after_cut else ""
+            print(f"{Colors.DIM}(Breaking these {len(feedback_edges)} dependencies would eliminate all cycles{layers_note}){Colors.RESET}\n")
 
             for src, dst in feedback_edges[:10]:  # Show first 10
                 src_rel = os.path.relpath(src, project_root) if src.startswith(project_root) else src
@@ -358,7 +399,7 @@ def print_layered_architecture(layers: List[List[str]], project_root: str, show_
 
 def print_high_coupling_headers(
     sorted_headers: List[str],
-    metrics: Dict[str, "DSMMetrics"],
+    metrics: Mapping[str, "DSMMetrics"],
     headers_in_cycles: Set[str],
     project_root: str,
     max_display: int = 20,
@@ -466,7 +507,7 @@ def print_high_coupling_headers(
         print(f"{Colors.GREEN}✓ No problematic high-coupling headers detected!{Colors.RESET}")
 
 
-def print_architectural_hotspots(directed_graph: Any, metrics: Dict[str, "DSMMetrics"], project_root: str, top_n: int = 15, verbose: bool = False) -> None:
+def print_architectural_hotspots(directed_graph: Any, metrics: Mapping[str, "DSMMetrics"], project_root: str, top_n: int = 15, verbose: bool = False) -> None:
     """Print architectural hotspots: betweenness centrality and hub nodes.
 
     Args:
@@ -476,7 +517,7 @@ def print_architectural_hotspots(directed_graph: Any, metrics: Dict[str, "DSMMet
         top_n: Number of items to show
         verbose: If True, show foundation headers (normally hidden as they're expected/good)
     """
-    from lib.graph_utils import compute_betweenness_centrality, find_hub_nodes, detect_god_objects
+    from lib.graph_utils import find_hub_nodes, detect_god_objects
 
     print(f"\n{Colors.BRIGHT}{'='*80}{Colors.RESET}")
     print(f"{Colors.BRIGHT}ARCHITECTURAL HOTSPOTS{Colors.RESET}")
@@ -487,9 +528,11 @@ def print_architectural_hotspots(directed_graph: Any, metrics: Dict[str, "DSMMet
     print(f"{Colors.DIM}Headers that appear frequently on dependency paths - architectural bottlenecks{Colors.RESET}\n")
 
     try:
-        # Sample for large graphs to keep it fast
-        k = min(1000, len(directed_graph.nodes())) if len(directed_graph.nodes()) > 2000 else None
-        betweenness = compute_betweenness_centrality(directed_graph, k=k)
+        # Shared (cached) centrality; large graphs are sampled automatically
+        centrality = get_betweenness_centrality(directed_graph)
+        betweenness = centrality.scores
+        if not centrality.exact:
+            print(f"  {Colors.DIM}Sampled {centrality.pivots}/{centrality.total_nodes} pivots (±{centrality.error_bound:.3f} at 95% confidence){Colors.RESET}\n")
 
         if betweenness:
             sorted_betweenness = sorted(betweenness.items(), key=lambda x: x[1], reverse=True)[:top_n]
@@ -618,7 +661,7 @@ def print_architectural_hotspots(directed_graph: Any, metrics: Dict[str, "DSMMet
 
 def print_recommendations(
     cycles: List[Set[str]],
-    metrics: Dict[str, "DSMMetrics"],
+    metrics: Mapping[str, "DSMMetrics"],
     all_headers: Set[str],
     stats: "MatrixStatistics",
     feedback_edges: List[Tuple[str, str]],
@@ -683,12 +726,17 @@ def print_recommendations(
         print("  • Architecture appears healthy")
 
 
-def compare_dsm_results(baseline: DSMAnalysisResults, current: DSMAnalysisResults) -> DSMDelta:
+def compare_dsm_results(
+    baseline: DSMAnalysisResults, current: DSMAnalysisResults, compile_times: Optional[CompileTimes] = None, source_index: Optional[SourceIndex] = None
+) -> DSMDelta:
     """Compare two DSM analysis results and compute differences.
 
     Args:
         baseline: DSM analysis results from baseline build
         current: DSM analysis results from current build
+        compile_times: Optional per-source compile durations (see load_compile_times) for
+            CPU-second rebuild estimates alongside the file counts
+        source_index: Optional prebuilt index over current.source_to_deps (e.g. IncludeGraphScanResult.source_index)
 
     Returns:
         DSMDelta containing all differences and architectural insights
@@ -760,7 +808,9 @@ def compare_dsm_results(baseline: DSMAnalysisResults, current: DSMAnalysisResult
         # Detect interface extraction first
         future_savings = compute_future_rebuild_prediction(baseline.metrics, current.metrics, headers_removed, headers_added)
 
-        architectural_insights = compute_architectural_insights(baseline.metrics, current.metrics, baseline, current, future_savings=future_savings)
+        architectural_insights = compute_architectural_insights(
+            baseline.metrics, current.metrics, baseline, current, future_savings=future_savings, compile_times=compile_times, source_index=source_index
+        )
 
         # Compute pre-existing coupling outliers from architectural insights
         if architectural_insights and architectural_insights.coupling_stats:
@@ -794,7 +844,7 @@ def compare_dsm_results(baseline: DSMAnalysisResults, current: DSMAnalysisResult
     )
 
 
-def compute_coupling_trends(baseline_metrics: Dict[str, DSMMetrics], current_metrics: Dict[str, DSMMetrics], common_headers: Set[str]) -> CouplingStatistics:
+def compute_coupling_trends(baseline_metrics: Mapping[str, DSMMetrics], current_metrics: Mapping[str, DSMMetrics], common_headers: Set[str]) -> CouplingStatistics:
     """Analyze coupling distribution shifts and outliers.
 
     Args:
@@ -830,51 +880,49 @@ def compute_coupling_trends(baseline_metrics: Dict[str, DSMMetrics], current_met
             outliers_2sigma=[],
         )
 
-    # Extract coupling values for common headers
-    baseline_couplings = [baseline_metrics[h].coupling for h in common_headers]
-    current_couplings = [current_metrics[h].coupling for h in common_headers]
+    # Extract coupling columns for common headers (one fixed header order for both builds)
+    headers = list(common_headers)
+    baseline_couplings = as_metrics_table(baseline_metrics).coupling_for(headers)
+    current_couplings = as_metrics_table(current_metrics).coupling_for(headers)
 
     # Compute statistics using numpy for accuracy
     mean_baseline = float(np.mean(baseline_couplings))
     mean_current = float(np.mean(current_couplings))
     median_baseline = float(np.median(baseline_couplings))
     median_current = float(np.median(current_couplings))
-    min_baseline = float(np.min(baseline_couplings)) if baseline_couplings else 0
-    min_current = float(np.min(current_couplings)) if current_couplings else 0
-    max_baseline = float(np.max(baseline_couplings)) if baseline_couplings else 0
-    max_current = float(np.max(current_couplings)) if current_couplings else 0
+    min_baseline = float(np.min(baseline_couplings))
+    min_current = float(np.min(current_couplings))
+    max_baseline = float(np.max(baseline_couplings))
+    max_current = float(np.max(current_couplings))
 
     # Standard deviation (need at least 2 values)
-    stddev_baseline = float(np.std(baseline_couplings, ddof=1)) if len(baseline_couplings) > 1 else 0
-    stddev_current = float(np.std(current_couplings, ddof=1)) if len(current_couplings) > 1 else 0
+    stddev_baseline = float(np.std(baseline_couplings, ddof=1)) if len(headers) > 1 else 0
+    stddev_current = float(np.std(current_couplings, ddof=1)) if len(headers) > 1 else 0
 
     # Percentiles using numpy for accurate calculation
-    p95_baseline = float(np.percentile(baseline_couplings, 95))
-    p95_current = float(np.percentile(current_couplings, 95))
-    p99_baseline = float(np.percentile(baseline_couplings, 99))
-    p99_current = float(np.percentile(current_couplings, 99))
+    p95_baseline, p99_baseline = (float(p) for p in np.percentile(baseline_couplings, [95, 99]))
+    p95_current, p99_current = (float(p) for p in np.percentile(current_couplings, [95, 99]))
 
     # Percentage changes
     mean_delta_pct = ((mean_current - mean_baseline) / mean_baseline * 100) if mean_baseline > 0 else 0
     stddev_delta_pct = ((stddev_current - stddev_baseline) / stddev_baseline * 100) if stddev_baseline > 0 else 0
 
     # Identify outliers (>1σ from mean)
-    outliers_baseline = {h for h in common_headers if abs(baseline_metrics[h].coupling - mean_baseline) > stddev_baseline} if stddev_baseline > 0 else set()
+    baseline_deviation = np.abs(baseline_couplings - mean_baseline)
+    current_deviation = np.abs(current_couplings - mean_current)
+    outliers_baseline = {headers[i] for i in np.flatnonzero(baseline_deviation > stddev_baseline)} if stddev_baseline > 0 else set()
 
-    outliers_current = {h for h in common_headers if abs(current_metrics[h].coupling - mean_current) > stddev_current} if stddev_current > 0 else set()
+    outliers_current = {headers[i] for i in np.flatnonzero(current_deviation > stddev_current)} if stddev_current > 0 else set()
 
     # Identify 1σ and 2σ outliers in current with their coupling values
     outliers_1sigma: List[Tuple[str, float]] = []
     outliers_2sigma: List[Tuple[str, float]] = []
 
     if stddev_current > 0:
-        for h in common_headers:
-            coupling = current_metrics[h].coupling
-            deviation = abs(coupling - mean_current)
-            if deviation > 2 * stddev_current:
-                outliers_2sigma.append((h, coupling))
-            elif deviation > stddev_current:
-                outliers_1sigma.append((h, coupling))
+        beyond_2sigma = current_deviation > 2 * stddev_current
+        beyond_1sigma = (current_deviation > stddev_current) & ~beyond_2sigma
+        outliers_2sigma = [(headers[i], int(current_couplings[i])) for i in np.flatnonzero(beyond_2sigma)]
+        outliers_1sigma = [(headers[i], int(current_couplings[i])) for i in np.flatnonzero(beyond_1sigma)]
 
         # Sort by coupling value (descending)
         outliers_1sigma.sort(key=lambda x: x[1], reverse=True)
@@ -952,8 +1000,8 @@ def compute_cycle_insights(baseline_cycles: List[Set[str]], current_cycles: List
             cycle_edges.update(subgraph.edges())
 
         if cycle_edges:
-            # Compute edge betweenness centrality (limited to cycle subgraph for performance)
-            edge_betweenness = nx.edge_betweenness_centrality(current_graph, k=min(100, len(current_graph)))
+            # Edge betweenness within each cycle's own subgraph (exact for small cycles)
+            edge_betweenness = get_cycle_edge_betweenness(current_graph, current_cycles)
 
             # Get top edges by betweenness within cycles
             cycle_edge_betweenness = [(edge, edge_betweenness.get(edge, 0)) for edge in cycle_edges]
@@ -975,16 +1023,21 @@ def compute_cycle_insights(baseline_cycles: List[Set[str]], current_cycles: List
 def compute_ripple_impact(
     baseline_graph: Any,
     current_graph: Any,
-    baseline_metrics: Dict[str, DSMMetrics],
-    current_metrics: Dict[str, DSMMetrics],
+    baseline_metrics: Mapping[str, DSMMetrics],
+    current_metrics: Mapping[str, DSMMetrics],
     changed_headers: Set[str],
     reverse_deps: Dict[str, Set[str]],
     compute_precise: bool = True,
     source_to_deps: Optional[Dict[str, List[str]]] = None,
+    compile_times: Optional[CompileTimes] = None,
+    baseline_index: Optional[ReachabilityIndex] = None,
+    current_index: Optional[ReachabilityIndex] = None,
+    source_index: Optional[SourceIndex] = None,
 ) -> RippleImpactAnalysis:
     """Compute ripple impact with precise transitive closure analysis.
 
     Performs accurate transitive closure analysis for precise rebuild predictions (95% confidence).
+    With reachability indexes for the graphs, each closure is an index lookup instead of a traversal.
 
     Args:
         baseline_graph: NetworkX graph for baseline
@@ -995,6 +1048,11 @@ def compute_ripple_impact(
         reverse_deps: Reverse dependency map (header -> dependents)
         compute_precise: Whether to compute precise transitive closure (default: True, for accurate results)
         source_to_deps: Optional mapping of source files to header dependencies
+        compile_times: Optional per-source compile durations (from .ninja_log) to also
+            report each rebuild count as estimated CPU-seconds
+        baseline_index: Optional reachability index of baseline_graph (see get_reachability_index)
+        current_index: Optional reachability index of current_graph
+        source_index: Optional prebuilt index over source_to_deps (e.g. IncludeGraphScanResult.source_index)
 
     Returns:
         RippleImpactAnalysis with precise impact scores
@@ -1055,15 +1113,13 @@ def compute_ripple_impact(
             for header in changed_headers:
                 if header in current_graph:
                     # Get all transitive dependents
-                    descendants = nx.descendants(current_graph, header)
-                    precise_affected.update(descendants)
+                    precise_affected.update(compute_transitive_closure(current_graph, header, current_index))
 
             # Compare with baseline
             baseline_affected = set()
             for header in changed_headers:
                 if header in baseline_graph:
-                    descendants = nx.descendants(baseline_graph, header)
-                    baseline_affected.update(descendants)
+                    baseline_affected.update(compute_transitive_closure(baseline_graph, header, baseline_index))
 
             precise_score = len(precise_affected)
             baseline_score = len(baseline_affected)
@@ -1090,6 +1146,10 @@ def compute_ripple_impact(
     roi_payback_commits = 0.0
     roi_payback_min = 0.0
     roi_payback_max = 0.0
+    this_commit_rebuild_seconds: Optional[float] = None
+    future_ongoing_rebuild_seconds: Optional[float] = None
+    baseline_ongoing_rebuild_seconds: Optional[float] = None
+    total_compile_seconds: Optional[float] = None
 
     if source_to_deps:
         total_source_files = len(source_to_deps)
@@ -1107,17 +1167,14 @@ def compute_ripple_impact(
                 for header in changed_headers:
                     if header in current_graph:
                         # Get all transitive dependents of this changed header
-                        descendants = nx.descendants(current_graph, header)
-                        all_affected_headers_this_commit.update(descendants)
+                        all_affected_headers_this_commit.update(compute_transitive_closure(current_graph, header, current_index))
             except Exception as e:
                 logger.warning("Transitive closure for this commit rebuild failed: %s", e)
 
         # Count source files that depend on any affected header (direct or transitive)
-        for source_file, deps in source_to_deps.items():
-            deps_set = set(deps)
-            # If source file includes any affected header, it needs rebuild
-            if deps_set & all_affected_headers_this_commit:
-                this_commit_rebuild_count += 1
+        if source_index is None:
+            source_index = build_source_index(source_to_deps)
+        this_commit_rebuild_count = source_index.count_affected(all_affected_headers_this_commit)
 
         # Calculate percentage
         this_commit_rebuild_percentage = (this_commit_rebuild_count / total_source_files * 100) if total_source_files > 0 else 0.0
@@ -1141,7 +1198,7 @@ def compute_ripple_impact(
         }
 
         # Count weighted future impact (CURRENT architecture)
-        future_affected_sources: Set[str] = set()
+        future_volatile_headers: Set[str] = set()
 
         for header in headers_with_increased_coupling:
             if header in reverse_deps:
@@ -1151,20 +1208,17 @@ def compute_ripple_impact(
                 if weight < 0.5:
                     continue  # Interface changes are rare, skip from future ongoing cost
 
-                # Add source files that directly depend on this header
-                for source_file, deps in source_to_deps.items():
-                    deps_set = set(deps)
-                    if header in deps_set:
-                        future_affected_sources.add(source_file)
+                future_volatile_headers.add(header)
 
-        future_ongoing_rebuild_count = len(future_affected_sources)
+        # Source files that directly depend on any volatile header
+        future_ongoing_rebuild_count = source_index.count_affected(future_volatile_headers)
         future_ongoing_rebuild_percentage = (future_ongoing_rebuild_count / total_source_files * 100) if total_source_files > 0 else 0.0
 
         # ========== BASELINE COMPARISON (What Would Baseline Cost Be?) ==========
         # Compute what the ongoing rebuild cost would be if we were still on baseline
         # This allows us to show: "baseline: 80% → current: 70%" (improvement)
 
-        baseline_affected_sources: Set[str] = set()
+        baseline_volatile_headers: Set[str] = set()
         baseline_reverse_deps: Dict[str, Set[str]] = {}
 
         # Build baseline reverse dependency map
@@ -1184,18 +1238,23 @@ def compute_ripple_impact(
                     if weight < 0.5:
                         continue
 
-                    # Add source files that directly depend on this header
-                    for source_file, deps in source_to_deps.items():
-                        deps_set = set(deps)
-                        if header in deps_set:
-                            baseline_affected_sources.add(source_file)
+                    baseline_volatile_headers.add(header)
 
-        baseline_ongoing_rebuild_count = len(baseline_affected_sources)
+        # Source files that directly depend on any volatile baseline header
+        baseline_ongoing_rebuild_count = source_index.count_affected(baseline_volatile_headers)
         baseline_ongoing_rebuild_percentage = (baseline_ongoing_rebuild_count / total_source_files * 100) if total_source_files > 0 else 0.0
 
         # Calculate delta (negative = improvement, positive = regression)
         ongoing_rebuild_delta_percentage = future_ongoing_rebuild_percentage - baseline_ongoing_rebuild_percentage
 
+        # Same three rebuild sets weighted by how long each source takes to compile
+        if compile_times is not None:
+            weights = compile_times.weights(source_index.sources)
+            total_compile_seconds = float(weights.sum())
+            this_commit_rebuild_seconds = source_index.affected_weight(all_affected_headers_this_commit, weights)
+            future_ongoing_rebuild_seconds = source_index.affected_weight(future_volatile_headers, weights)
+            baseline_ongoing_rebuild_seconds = source_index.affected_weight(baseline_volatile_headers, weights)
+
         # ========== ROI CALCULATION ==========
         # Break-even point: commits until refactoring pays for itself
         # Formula: payback = this_commit_cost / (this_commit_cost - future_ongoing_cost)
@@ -1278,11 +1337,15 @@ def compute_ripple_impact(
         roi_payback_min=roi_payback_min,
         roi_payback_max=roi_payback_max,
         future_savings=None,  # Will be computed separately if applicable
+        this_commit_rebuild_seconds=this_commit_rebuild_seconds,
+        future_ongoing_rebuild_seconds=future_ongoing_rebuild_seconds,
+        baseline_ongoing_rebuild_seconds=baseline_ongoing_rebuild_seconds,
+        total_compile_seconds=total_compile_seconds,
     )
 
 
 def compute_future_rebuild_prediction(
-    baseline_metrics: Dict[str, DSMMetrics], current_metrics: Dict[str, DSMMetrics], delta_headers_removed: Set[str], delta_headers_added: Set[str]
+    baseline_metrics: Mapping[str, DSMMetrics], current_metrics: Mapping[str, DSMMetrics], delta_headers_removed: Set[str], delta_headers_added: Set[str]
 ) -> Optional["FutureRebuildPrediction"]:
     """Predict future rebuild reduction from interface extraction patterns.
 
@@ -1562,11 +1625,13 @@ def generate_recommendations(
 
 
 def compute_architectural_insights(
-    baseline_metrics: Dict[str, DSMMetrics],
-    current_metrics: Dict[str, DSMMetrics],
+    baseline_metrics: Mapping[str, DSMMetrics],
+    current_metrics: Mapping[str, DSMMetrics],
     baseline: DSMAnalysisResults,
     current: DSMAnalysisResults,
     future_savings: Optional["FutureRebuildPrediction"] = None,
+    compile_times: Optional[CompileTimes] = None,
+    source_index: Optional[SourceIndex] = None,
 ) -> ArchitecturalInsights:
     """Compute comprehensive architectural insights from differential analysis.
 
@@ -1576,6 +1641,8 @@ def compute_architectural_insights(
         baseline: Baseline analysis results
         current: Current analysis results
         future_savings: Optional interface extraction prediction
+        compile_times: Optional per-source compile durations for CPU-second rebuild estimates
+        source_index: Optional prebuilt index over current.source_to_deps
 
     Returns:
         ArchitecturalInsights with all statistical and impact analysis
@@ -1634,6 +1701,10 @@ def compute_architectural_insights(
         current.reverse_deps,
         compute_precise=True,
         source_to_deps=current.source_to_deps,
+        compile_times=compile_times,
+        baseline_index=get_reachability_index(baseline.analysis_graph) if baseline.analysis_graph is not None else None,
+        current_index=get_reachability_index(current.analysis_graph) if current.analysis_graph is not None else None,
+        source_index=source_index,
     )
 
     # Add interface extraction prediction if detected
@@ -1770,6 +1841,11 @@ def compute_architectural_insights(
     )
 
 
+def _cpu_estimate(seconds: Optional[float]) -> str:
+    """Return ", ~<time> CPU" for a compile-time weighted estimate, or "" without .ninja_log data."""
+    return "" if seconds is None else f", ~{format_cpu_time(seconds)} CPU"
+
+
 def print_dsm_delta(delta: DSMDelta, baseline: DSMAnalysisResults, current: DSMAnalysisResults, project_root: str, verbose: bool = False) -> None:
     """Display DSM differential analysis results.
 
@@ -1993,7 +2069,7 @@ def print_dsm_delta(delta: DSMDelta, baseline: DSMAnalysisResults, current: DSMA
             if ri.total_source_files > 0:
                 print(f"\n{Colors.BRIGHT}Current Build Impact:{Colors.RESET}")
                 print(
-                    f"  • {Colors.BRIGHT}{ri.this_commit_rebuild_count} of {ri.total_source_files} .c/.cpp files{Colors.RESET} must rebuild ({ri.this_commit_rebuild_percentage:.1f}%)"
+                    f"  • {Colors.BRIGHT}{ri.this_commit_rebuild_count} of {ri.total_source_files} .c/.cpp files{Colors.RESET} must rebuild ({ri.this_commit_rebuild_percentage:.1f}%{_cpu_estimate(ri.this_commit_rebuild_seconds)})"
                 )
                 print(f"    {Colors.DIM}Immediate cost for introducing this cycle{Colors.RESET}")
                 print(f"  • {Colors.YELLOW}Note: Other metrics (coupling, rebuild impact) are masked by cycle regression{Colors.RESET}")
@@ -2017,7 +2093,7 @@ def print_dsm_delta(delta: DSMDelta, baseline: DSMAnalysisResults, current: DSMA
             print(f"\n{Colors.BRIGHT}Future Commits (Ongoing Cost):{Colors.RESET}")
             if ri.total_source_files > 0:
                 print(
-                    f"  • {Colors.GREEN}{Colors.BRIGHT}{ri.future_ongoing_rebuild_count} of {ri.total_source_files} .c/.cpp files{Colors.RESET} per change ({ri.future_ongoing_rebuild_percentage:.1f}%)"
+                    f"  • {Colors.GREEN}{Colors.BRIGHT}{ri.future_ongoing_rebuild_count} of {ri.total_source_files} .c/.cpp files{Colors.RESET} per change ({ri.future_ongoing_rebuild_percentage:.1f}%{_cpu_estimate(ri.future_ongoing_rebuild_seconds)})"
                 )
                 if ri.baseline_ongoing_rebuild_count > 0 and ri.baseline_ongoing_rebuild_count != ri.future_ongoing_rebuild_count:
                     files_saved = ri.baseline_ongoing_rebuild_count - ri.future_ongoing_rebuild_count
@@ -2031,7 +2107,7 @@ def print_dsm_delta(delta: DSMDelta, baseline: DSMAnalysisResults, current: DSMA
             print(f"\n{Colors.BRIGHT}This Commit (One-Time Cost):{Colors.RESET}")
             if ri.total_source_files > 0:
                 print(
-                    f"  • {Colors.BRIGHT}{ri.this_commit_rebuild_count} of {ri.total_source_files} .c/.cpp files{Colors.RESET} must rebuild ({ri.this_commit_rebuild_percentage:.1f}%)"
+                    f"  • {Colors.BRIGHT}{ri.this_commit_rebuild_count} of {ri.total_source_files} .c/.cpp files{Colors.RESET} must rebuild ({ri.this_commit_rebuild_percentage:.1f}%{_cpu_estimate(ri.this_commit_rebuild_seconds)})"
                 )
                 print(f"    {Colors.DIM}One-time rebuild for this architectural change{Colors.RESET}")
             print(f"  • {rebuild_impact:.1f}% of headers in blast radius ({ri.unique_downstream_count} unique downstream headers)")
@@ -2060,7 +2136,7 @@ def print_dsm_delta(delta: DSMDelta, baseline: DSMAnalysisResults, current: DSMA
                 savings_pct = ri.this_commit_rebuild_percentage - ri.future_ongoing_rebuild_percentage
                 savings_files = ri.this_commit_rebuild_count - ri.future_ongoing_rebuild_count
                 print(
-                    f"  • One-time cost: {Colors.BRIGHT}{ri.this_commit_rebuild_count} files{Colors.RESET} rebuild now ({ri.this_commit_rebuild_percentage:.1f}%)"
+                    f"  • One-time cost: {Colors.BRIGHT}{ri.this_commit_rebuild_count} files{Colors.RESET} rebuild now ({ri.this_commit_rebuild_percentage:.1f}%{_cpu_estimate(ri.this_commit_rebuild_seconds)})"
                 )
                 print(f"  • Ongoing savings: {Colors.GREEN}{Colors.BRIGHT}{savings_files} fewer files{Colors.RESET} per future commit ({savings_pct:.1f}%)")
                 print(f"  • {roi_color}Break-even: {int(ri.roi_payback_min)}-{int(ri.roi_payback_max)} commits{Colors.RESET}")
@@ -2088,7 +2164,7 @@ def print_dsm_delta(delta: DSMDelta, baseline: DSMAnalysisResults, current: DSMA
                         f"  {Colors.GREEN}{Colors.BRIGHT}✓ {abs(ri.ongoing_rebuild_delta_percentage):.1f}% FEWER FILES REBUILD{Colors.RESET} {Colors.GREEN}— {files_saved} files saved per future commit{Colors.RESET}"
                     )
                     print(
-                        f"    {Colors.BRIGHT}Was:{Colors.RESET} {ri.baseline_ongoing_rebuild_count} files ({ri.baseline_ongoing_rebuild_percentage:.1f}%)  {Colors.GREEN}→{Colors.RESET}  {Colors.BRIGHT}Now:{Colors.RESET} {ri.future_ongoing_rebuild_count} files ({ri.future_ongoing_rebuild_percentage:.1f}%)"
+                        f"    {Colors.BRIGHT}Was:{Colors.RESET} {ri.baseline_ongoing_rebuild_count} files ({ri.baseline_ongoing_rebuild_percentage:.1f}%{_cpu_estimate(ri.baseline_ongoing_rebuild_seconds)})  {Colors.GREEN}→{Colors.RESET}  {Colors.BRIGHT}Now:{Colors.RESET} {ri.future_ongoing_rebuild_count} files ({ri.future_ongoing_rebuild_percentage:.1f}%{_cpu_estimate(ri.future_ongoing_rebuild_seconds)})"
                     )
                     print(
                         f"    {Colors.DIM}Each future change to these headers will trigger {files_saved} fewer files to rebuild (of {ri.total_source_files} total){Colors.RESET}"
@@ -2100,7 +2176,7 @@ def print_dsm_delta(delta: DSMDelta, baseline: DSMAnalysisResults, current: DSMA
                         f"  {Colors.RED}{Colors.BRIGHT}⚠ {abs(ri.ongoing_rebuild_delta_percentage):.1f}% MORE FILES REBUILD{Colors.RESET} {Colors.RED}— {files_added} extra files per future commit{Colors.RESET}"
                     )
                     print(
-                        f"    {Colors.BRIGHT}Was:{Colors.RESET} {ri.baseline_ongoing_rebuild_count} files ({ri.baseline_ongoing_rebuild_percentage:.1f}%)  {Colors.RED}→{Colors.RESET}  {Colors.BRIGHT}Now:{Colors.RESET} {Colors.RED}{ri.future_ongoing_rebuild_count} files ({ri.future_ongoing_rebuild_percentage:.1f}%){Colors.RESET}"
+                        f"    {Colors.BRIGHT}Was:{Colors.RESET} {ri.baseline_ongoing_rebuild_count} files ({ri.baseline_ongoing_rebuild_percentage:.1f}%{_cpu_estimate(ri.baseline_ongoing_rebuild_seconds)})  {Colors.RED}→{Colors.RESET}  {Colors.BRIGHT}Now:{Colors.RESET} {Colors.RED}{ri.future_ongoing_rebuild_count} files ({ri.future_ongoing_rebuild_percentage:.1f}%{_cpu_estimate(ri.future_ongoing_rebuild_seconds)}){Colors.RESET}"
                     )
                     print(
                         f"    {Colors.DIM}Each future change to these headers will trigger {files_added} additional files to rebuild (of {ri.total_source_files} total){Colors.RESET}"
@@ -2128,7 +2204,7 @@ def print_dsm_delta(delta: DSMDelta, baseline: DSMAnalysisResults, current: DSMA
             print(f"\n{Colors.BRIGHT}This Commit (One-Time Cost):{Colors.RESET}")
             if ri.total_source_files > 0:
                 print(
-                    f"  • {Colors.BRIGHT}{ri.this_commit_rebuild_count} of {ri.total_source_files} .c/.cpp files{Colors.RESET} must rebuild ({ri.this_commit_rebuild_percentage:.1f}%)"
+                    f"  • {Colors.BRIGHT}{ri.this_commit_rebuild_count} of {ri.total_source_files} .c/.cpp files{Colors.RESET} must rebuild ({ri.this_commit_rebuild_percentage:.1f}%{_cpu_estimate(ri.this_commit_rebuild_seconds)})"
                 )
                 print(f"    {Colors.DIM}Immediate rebuild cost for this change{Colors.RESET}")
             print(f"  • {rebuild_impact:.1f}% of headers in blast radius")
@@ -2201,7 +2277,7 @@ def print_dsm_delta(delta: DSMDelta, baseline: DSMAnalysisResults, current: DSMA
                 # Show dual metrics for clarity with baseline comparison
                 if ri.total_source_files > 0:
                     print(
-                        f"  • This commit: {ri.this_commit_rebuild_count} of {ri.total_source_files} .c/.cpp files must rebuild ({ri.this_commit_rebuild_percentage:.1f}%)"
+                        f"  • This commit: {ri.this_commit_rebuild_count} of {ri.total_source_files} .c/.cpp files must rebuild ({ri.this_commit_rebuild_percentage:.1f}%{_cpu_estimate(ri.this_commit_rebuild_seconds)})"
                     )
                     if ri.baseline_ongoing_rebuild_percentage > 0:
                         files_delta = ri.baseline_ongoing_rebuild_count - ri.future_ongoing_rebuild_count
@@ -2211,10 +2287,10 @@ def print_dsm_delta(delta: DSMDelta, baseline: DSMAnalysisResults, current: DSMA
                             )
                         else:
                             print(
-                                f"  • Future ongoing: {ri.future_ongoing_rebuild_count} .c/.cpp files per commit ({ri.future_ongoing_rebuild_percentage:.1f}%)"
+                                f"  • Future ongoing: {ri.future_ongoing_rebuild_count} .c/.cpp files per commit ({ri.future_ongoing_rebuild_percentage:.1f}%{_cpu_estimate(ri.future_ongoing_rebuild_seconds)})"
                             )
                     else:
-                        print(f"  • Future ongoing: {ri.future_ongoing_rebuild_count} .c/.cpp files per commit ({ri.future_ongoing_rebuild_percentage:.1f}%)")
+                        print(f"  • Future ongoing: {ri.future_ongoing_rebuild_count} .c/.cpp files per commit ({ri.future_ongoing_rebuild_percentage:.1f}%{_cpu_estimate(ri.future_ongoing_rebuild_seconds)})")
 
                 # SUPPLEMENTARY: Header metrics
                 print(f"  • Header rebuild impact: {rebuild_impact:+.1f}% (ongoing delta: {ri.ongoing_rebuild_delta_percentage:+.1f}%, negligible)")
@@ -2337,7 +2413,7 @@ def print_dsm_delta(delta: DSMDelta, baseline: DSMAnalysisResults, current: DSMA
                 # Show dual metrics
                 if ri.total_source_files > 0:
                     print(
-                        f"  • {Colors.GREEN}Future ongoing: {ri.future_ongoing_rebuild_count} of {ri.total_source_files} .c/.cpp files{Colors.RESET} per change ({ri.future_ongoing_rebuild_percentage:.1f}%)"
+                        f"  • {Colors.GREEN}Future ongoing: {ri.future_ongoing_rebuild_count} of {ri.total_source_files} .c/.cpp files{Colors.RESET} per change ({ri.future_ongoing_rebuild_percentage:.1f}%{_cpu_estimate(ri.future_ongoing_rebuild_seconds)})"
                     )
                     if ri.baseline_ongoing_rebuild_count > 0 and ri.baseline_ongoing_rebuild_count != ri.future_ongoing_rebuild_count:
                         files_saved = ri.baseline_ongoing_rebuild_count - ri.future_ongoing_rebuild_count
@@ -2363,7 +2439,7 @@ def print_dsm_delta(delta: DSMDelta, baseline: DSMAnalysisResults, current: DSMA
 
                     print(f"  {Colors.BRIGHT}One-Time Cost (Today):{Colors.RESET}")
                     print(
-                        f"    • Refactoring commit: {ri.this_commit_rebuild_count} of {ri.total_source_files} .c/.cpp files must rebuild ({ri.this_commit_rebuild_percentage:.1f}%)"
+                        f"    • Refactoring commit: {ri.this_commit_rebuild_count} of {ri.total_source_files} .c/.cpp files must rebuild ({ri.this_commit_rebuild_percentage:.1f}%{_cpu_estimate(ri.this_commit_rebuild_seconds)})"
                     )
                     estimated_time_min = int(ri.this_commit_rebuild_percentage / 100 * 10)  # ~10 min for full rebuild
                     print(f"    • Estimated time: ~{estimated_time_min} minutes for {ri.total_source_files}-file project")
@@ -2376,7 +2452,7 @@ def print_dsm_delta(delta: DSMDelta, baseline: DSMAnalysisResults, current: DSMA
                         file_word = "file" if files_saved == 1 else "files"
                         print(f"    • Implementation changes: {files_saved} {file_word} saved ({savings_pct:.1f}% fewer files rebuild)")
                     print(
-                        f"    • Future cost: {ri.future_ongoing_rebuild_count} of {ri.total_source_files} .c/.cpp files per change ({ri.future_ongoing_rebuild_percentage:.1f}%)"
+                        f"    • Future cost: {ri.future_ongoing_rebuild_count} of {ri.total_source_files} .c/.cpp files per change ({ri.future_ongoing_rebuild_percentage:.1f}%{_cpu_estimate(ri.future_ongoing_rebuild_seconds)})"
                     )
 
                     # Estimate time savings
@@ -2770,7 +2846,7 @@ def print_dsm_delta(delta: DSMDelta, baseline: DSMAnalysisResults, current: DSMA
                         f"\n  {Colors.GREEN}{Colors.BRIGHT}✓ {abs(ri.ongoing_rebuild_delta_percentage):.1f}% FEWER FILES REBUILD{Colors.RESET} {Colors.GREEN}— {files_saved} files saved per future commit{Colors.RESET}"
                     )
                     print(
-                        f"  {Colors.BRIGHT}Before:{Colors.RESET} {ri.baseline_ongoing_rebuild_count} files ({ri.baseline_ongoing_rebuild_percentage:.1f}%)  {Colors.GREEN}→{Colors.RESET}  {Colors.BRIGHT}After:{Colors.RESET} {ri.future_ongoing_rebuild_count} files ({ri.future_ongoing_rebuild_percentage:.1f}%)"
+                        f"  {Colors.BRIGHT}Before:{Colors.RESET} {ri.baseline_ongoing_rebuild_count} files ({ri.baseline_ongoing_rebuild_percentage:.1f}%{_cpu_estimate(ri.baseline_ongoing_rebuild_seconds)})  {Colors.GREEN}→{Colors.RESET}  {Colors.BRIGHT}After:{Colors.RESET} {ri.future_ongoing_rebuild_count} files ({ri.future_ongoing_rebuild_percentage:.1f}%{_cpu_estimate(ri.future_ongoing_rebuild_seconds)})"
                     )
                     print(
                         f"  {Colors.DIM}Each future commit will trigger {files_saved} fewer files to rebuild (of {ri.total_source_files} total .c/.cpp files){Colors.RESET}"
@@ -2782,7 +2858,7 @@ def print_dsm_delta(delta: DSMDelta, baseline: DSMAnalysisResults, current: DSMA
                         f"\n  {Colors.RED}{Colors.BRIGHT}⚠ {abs(ri.ongoing_rebuild_delta_percentage):.1f}% MORE FILES REBUILD{Colors.RESET} {Colors.RED}— {files_added} extra files per future commit{Colors.RESET}"
                     )
                     print(
-                        f"  {Colors.BRIGHT}Before:{Colors.RESET} {ri.baseline_ongoing_rebuild_count} files ({ri.baseline_ongoing_rebuild_percentage:.1f}%)  {Colors.RED}→{Colors.RESET}  {Colors.BRIGHT}After:{Colors.RESET} {Colors.RED}{ri.future_ongoing_rebuild_count} files ({ri.future_ongoing_rebuild_percentage:.1f}%){Colors.RESET}"
+                        f"  {Colors.BRIGHT}Before:{Colors.RESET} {ri.baseline_ongoing_rebuild_count} files ({ri.baseline_ongoing_rebuild_percentage:.1f}%{_cpu_estimate(ri.baseline_ongoing_rebuild_seconds)})  {Colors.RED}→{Colors.RESET}  {Colors.BRIGHT}After:{Colors.RESET} {Colors.RED}{ri.future_ongoing_rebuild_count} files ({ri.future_ongoing_rebuild_percentage:.1f}%{_cpu_estimate(ri.future_ongoing_rebuild_seconds)}){Colors.RESET}"
                     )
                     print(
                         f"  {Colors.DIM}Each future commit will trigger {files_added} additional files to rebuild (of {ri.total_source_files} total .c/.cpp files){Colors.RESET}"
@@ -2792,7 +2868,7 @@ def print_dsm_delta(delta: DSMDelta, baseline: DSMAnalysisResults, current: DSMA
                     files_delta = ri.baseline_ongoing_rebuild_count - ri.future_ongoing_rebuild_count
 
                     print(
-                        f"\n  {Colors.BRIGHT}Build Impact:{Colors.RESET} {Colors.BRIGHT}{ri.future_ongoing_rebuild_count} of {ri.total_source_files} .c/.cpp files{Colors.RESET} must rebuild ({ri.future_ongoing_rebuild_percentage:.1f}%)"
+                        f"\n  {Colors.BRIGHT}Build Impact:{Colors.RESET} {Colors.BRIGHT}{ri.future_ongoing_rebuild_count} of {ri.total_source_files} .c/.cpp files{Colors.RESET} must rebuild ({ri.future_ongoing_rebuild_percentage:.1f}%{_cpu_estimate(ri.future_ongoing_rebuild_seconds)})"
                     )
 
                     if files_delta > 0:
@@ -2815,7 +2891,7 @@ def print_dsm_delta(delta: DSMDelta, baseline: DSMAnalysisResults, current: DSMA
             elif ri.total_source_files > 0:
                 # No baseline - just show current state with file counts prominently
                 print(
-                    f"\n  {Colors.BRIGHT}Precise:{Colors.RESET} {Colors.BRIGHT}{ri.future_ongoing_rebuild_count} of {ri.total_source_files} files{Colors.RESET} rebuild per future change ({ri.future_ongoing_rebuild_percentage:.1f}%)"
+                    f"\n  {Colors.BRIGHT}Precise:{Colors.RESET} {Colors.BRIGHT}{ri.future_ongoing_rebuild_count} of {ri.total_source_files} files{Colors.RESET} rebuild per future change ({ri.future_ongoing_rebuild_percentage:.1f}%{_cpu_estimate(ri.future_ongoing_rebuild_seconds)})"
                 )
                 print(f"  Each commit to these headers triggers rebuilds for these files")
             else:
@@ -3047,6 +3123,133 @@ def display_directory_clusters(all_headers: List[str], header_to_headers: Defaul
             print(f"  Cohesion: {cohesion:.1f}% (higher is better)")
 
 
+@dataclass
+class _DSMPhaseContext:
+    """Read-only inputs for DSM phase workers.
+
+    The include graph travels as a SharedGraphHandle: workers attach to the
+    parent's shared-memory copy instead of unpickling the mapping, and the phases
+    run directly on its CSR arrays. Node IDs 0..header_count-1 are the analyzed
+    headers in the caller's iteration order, so table order matches a sequential run.
+    """
+
+    graph_handle: SharedGraphHandle
+    header_count: int
+    _interned: Optional[InternedGraph] = None
+
+    def interned(self) -> InternedGraph:
+        """Return the attached graph (CSR arrays plus a "project" dependency flag per node)."""
+        if self._interned is None:
+            self._interned = attach_graph(self.graph_handle)
+        return self._interned
+
+    def headers(self) -> List[str]:
+        """Return the analyzed headers."""
+        return self.interned().paths[: self.header_count]
+
+    def scope_edges(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Return (source IDs, target IDs) of the include edges between analyzed headers, sorted by source."""
+        graph = self.interned()
+        count = self.header_count
+        rows = np.repeat(np.arange(count, dtype=np.int64), np.diff(graph.indptr[: count + 1]))
+        cols = graph.indices[: int(graph.indptr[count])].astype(np.int64)
+        inside = cols < count
+        return rows[inside], cols[inside]
+
+
+def _topological_generations(sources: np.ndarray, targets: np.ndarray, count: int) -> np.ndarray:
+    """Return the topological generation of every node of an edge list (-1 for nodes on or behind a cycle).
+
+    Kahn's algorithm, peeling a whole frontier of nodes without remaining
+    predecessors per step.
+    """
+    order = np.argsort(sources, kind="stable")
+    indptr = np.zeros(count + 1, dtype=np.int64)
+    np.cumsum(np.bincount(sources, minlength=count), out=indptr[1:])
+    successors = targets[order]
+    indegree = np.bincount(targets, minlength=count)
+    generation = np.full(count, -1, dtype=np.int64)
+    frontier = np.flatnonzero(indegree == 0)
+    level = 0
+    while frontier.size:
+        generation[frontier] = level
+        counts = indptr[frontier + 1] - indptr[frontier]
+        offsets = np.cumsum(counts) - counts
+        reached, hits = np.unique(successors[np.repeat(indptr[frontier] - offsets, counts) + np.arange(counts.sum())], return_counts=True)
+        indegree[reached] -= hits
+        frontier = reached[indegree[reached] == 0]
+        level += 1
+    return generation
+
+
+def _metrics_phase(context: _DSMPhaseContext) -> MetricsTable:
+    """Worker phase: per-header metrics table, computed directly on the shared arrays."""
+    graph = context.interned()
+    fan_out = graph.out_degree()
+    rows = np.repeat(np.arange(len(graph.paths)), fan_out)
+    fan_out_project = np.bincount(rows, weights=graph.arrays["project"][graph.indices], minlength=len(graph.paths)).astype(np.int64)
+    scope = slice(0, context.header_count)
+    return MetricsTable(context.headers(), fan_out[scope], graph.in_degree()[scope], fan_out_project[scope], (fan_out - fan_out_project)[scope])
+
+
+def _cycles_phase(context: _DSMPhaseContext) -> Tuple[List[Set[str]], Set[str], List[Tuple[str, str]], List[str], Optional[FeedbackArcSetResult]]:
+    """Worker phase: cycles, self-loops and the feedback arc set.
+
+    Peeling sources and sinks off the shared arrays leaves only the headers on or
+    between cycles; the strongly connected components and the feedback arc set are
+    computed on that (usually small) core alone.
+    """
+    rows, cols = context.scope_edges()
+    count = context.header_count
+    core = (_topological_generations(rows, cols, count) < 0) & (_topological_generations(cols, rows, count) < 0)
+    on_core = core[rows] & core[cols]
+
+    headers = context.headers()
+    core_graph: "nx.DiGraph[str]" = nx.DiGraph()
+    core_graph.add_nodes_from(headers[i] for i in np.flatnonzero(core).tolist())
+    core_graph.add_edges_from((headers[u], headers[v]) for u, v in zip(rows[on_core].tolist(), cols[on_core].tolist()))
+    cycles = [scc for scc in nx.strongly_connected_components(core_graph) if len(scc) > 1]
+    self_loops = [node for node, _ in nx.selfloop_edges(core_graph)]
+    headers_in_cycles: Set[str] = set().union(*cycles) if cycles else set()
+    if not cycles:
+        return cycles, headers_in_cycles, [], self_loops, None
+
+    feedback = solve_feedback_arc_set(core_graph, cycles)
+    # The layer count refers to the whole scope once the feedback edges are cut, not just the core
+    core_ids = {headers[i]: i for i in np.flatnonzero(core).tolist()}
+    cut = np.isin(rows * count + cols, [core_ids[u] * count + core_ids[v] for u, v in feedback.edges])
+    layer_count = int(_topological_generations(rows[~cut], cols[~cut], count).max(initial=-1)) + 1
+    feedback = replace(feedback, layer_count=layer_count)
+    return cycles, headers_in_cycles, list(feedback.edges), self_loops, feedback
+
+
+def _layers_phase(context: _DSMPhaseContext) -> Tuple[List[List[str]], Dict[str, int], bool]:
+    """Worker phase: topological layers (none when the headers have a cycle)."""
+    rows, cols = context.scope_edges()
+    generation = _topological_generations(rows, cols, context.header_count)
+    if (generation < 0).any():
+        return [], {}, True
+    headers = context.headers()
+    order = np.argsort(generation, kind="stable")
+    bounds = np.cumsum(np.bincount(generation))[:-1]
+    layers = [[headers[i] for i in layer] for layer in np.split(order, bounds)] if len(generation) else []
+    return layers, dict(zip(headers, generation.tolist())), False
+
+
+def _publish_phase_graph(header_to_headers: Mapping[str, Set[str]], headers: List[str], file_types: Optional[Dict[str, Any]]) -> SharedGraph:
+    """Intern the include graph for DSM phase workers and publish it in shared memory."""
+    cleanup_stale_segments()
+    interned = intern_graph(header_to_headers, headers)
+    if file_types:
+        from .clang_utils import FileType
+
+        interned.arrays["project"] = np.fromiter((file_types.get(path, FileType.PROJECT) == FileType.PROJECT for path in interned.paths), dtype=bool)
+    else:
+        # Fallback: treat all as project dependencies if file_types not provided
+        interned.arrays["project"] = np.ones(len(interned.paths), dtype=bool)
+    return SharedGraph(interned)
+
+
 def run_dsm_analysis(
     all_headers: Set[str],
     header_to_headers: DefaultDict[str, Set[str]],
@@ -3054,8 +3257,15 @@ def run_dsm_analysis(
     show_progress: bool = True,
     source_to_deps: Optional[Dict[str, List[str]]] = None,
     file_types: Optional[Dict[str, Any]] = None,
-) -> DSMAnalysisResults:
-    """Run all DSM analysis phases and return structured results.
+    workers: int = 1,
+) -> LazyDSMAnalysisResults:
+    """Set up DSM analysis phases and return structured results.
+
+    Phases (metrics, cycles, feedback edges, layers, statistics, ...) run lazily the
+    first time the corresponding results field is read, and are memoized. With
+    several workers and a large header set, the independent phases (reverse
+    dependencies, metrics, cycles with feedback edges, layers) instead run up front
+    in parallel worker processes. Per-phase wall times end up in results.phase_times.
 
     Args:
         all_headers: Set of headers to analyze
@@ -3064,66 +3274,96 @@ def run_dsm_analysis(
         show_progress: Whether to print progress messages
         source_to_deps: Optional mapping of source files (.c/.cpp) to header dependencies
         file_types: Optional file type classifications for split fan_out metrics
+        workers: Worker processes for independent phases (1 = lazy, in-process)
 
     Returns:
-        DSMAnalysisResults containing all analysis results
+        LazyDSMAnalysisResults computing each analysis result on first access
     """
-    # Build reverse dependencies
-    reverse_deps: Dict[str, Set[str]] = build_reverse_dependencies(header_to_headers, all_headers)
-
-    # Calculate metrics for all headers
-    if show_progress:
-        print(f"{Colors.CYAN}Calculating dependency metrics...{Colors.RESET}")
-
-    metrics: Dict[str, DSMMetrics] = {}
-    for header in all_headers:
-        metrics[header] = calculate_dsm_metrics(header, header_to_headers, reverse_deps, file_types)
-
-    # Analyze cycles
-    if show_progress:
-        print(f"{Colors.CYAN}Analyzing circular dependencies...{Colors.RESET}")
-
-    cycles: List[Set[str]]
-    headers_in_cycles: Set[str]
-    feedback_edges: List[Tuple[str, str]]
-    directed_graph: Any
-    self_loops: List[str]
-    cycles, headers_in_cycles, feedback_edges, directed_graph, self_loops = analyze_cycles(header_to_headers, all_headers)
-
-    # Compute layers if needed
-    layers: List[List[str]] = []
-    header_to_layer: Dict[str, int] = {}
-    has_cycles: bool = len(cycles) > 0  # Detect multi-header cycles only
-
-    if compute_layers:
+    # Build the dependency graph once; every phase below shares it and its cached artifacts
+    analysis_graph = AnalysisGraph(header_to_headers, all_headers)
+
+    # Each phase runs the first time its field is read, so display modes only pay for what they show
+    def progress(message: str) -> None:
         if show_progress:
-            print(f"{Colors.CYAN}Computing dependency layers...{Colors.RESET}")
-        layers, header_to_layer, has_cycles = compute_layer_structure(header_to_headers, all_headers)
+            print(f"{Colors.CYAN}{message}{Colors.RESET}")
+
+    def metrics_phase(results: DSMAnalysisResults) -> MetricsTable:
+        progress("Calculating dependency metrics...")
+        return MetricsTable.from_dependencies(all_headers, header_to_headers, results.reverse_deps, file_types)
+
+    def cycles_phase(_: DSMAnalysisResults) -> Tuple[List[Set[str]], Set[str], List[str]]:
+        def compute() -> Tuple[List[Set[str]], Set[str], List[str]]:
+            progress("Analyzing circular dependencies...")
+            cycles, self_loops = analysis_graph.cycles_and_self_loops
+            headers_in_cycles: Set[str] = set().union(*cycles) if cycles else set()
+            return list(cycles), headers_in_cycles, list(self_loops)
+
+        return analysis_graph.get_or_compute("dsm_cycles", compute)
+
+    def layers_phase(results: DSMAnalysisResults) -> Tuple[List[List[str]], Dict[str, int], bool]:
+        def compute() -> Tuple[List[List[str]], Dict[str, int], bool]:
+            if not compute_layers:
+                return [], {}, len(results.cycles) > 0  # Detect multi-header cycles only
+            progress("Computing dependency layers...")
+            return compute_layer_structure(header_to_headers, all_headers, analysis_graph=analysis_graph)
+
+        return analysis_graph.get_or_compute("dsm_layers", compute)
+
+    def stats_phase(results: DSMAnalysisResults) -> MatrixStatistics:
+        # Calculate matrix statistics with advanced metrics
+        return calculate_matrix_statistics(
+            all_headers, header_to_headers, metrics=results.metrics, headers_in_cycles=results.headers_in_cycles, num_cycles=len(results.cycles)
+        )
 
-    # Calculate matrix statistics with advanced metrics
-    stats: MatrixStatistics = calculate_matrix_statistics(
-        all_headers, header_to_headers, metrics=metrics, headers_in_cycles=headers_in_cycles, num_cycles=len(cycles)
-    )
-
-    # Sort headers by coupling for display
-    sorted_headers: List[str] = sorted(all_headers, key=lambda h: metrics[h].coupling, reverse=True)
-
-    return DSMAnalysisResults(
-        metrics=metrics,
-        cycles=cycles,
-        headers_in_cycles=headers_in_cycles,
-        feedback_edges=feedback_edges,
-        directed_graph=directed_graph,
-        layers=layers,
-        header_to_layer=header_to_layer,
-        has_cycles=has_cycles,
-        stats=stats,
-        sorted_headers=sorted_headers,
-        reverse_deps=reverse_deps,
-        header_to_headers=header_to_headers,
-        source_to_deps=source_to_deps,
-        self_loops=self_loops,
-    )
+    def sorted_headers_phase(results: DSMAnalysisResults) -> List[str]:
+        # Sort headers by coupling for display
+        metrics = as_metrics_table(results.metrics)
+        return [metrics.headers[i] for i in np.argsort(-metrics.coupling, kind="stable")]
+
+    phases: Dict[str, Callable[[DSMAnalysisResults], Any]] = {
+        "reverse_deps": lambda _: build_reverse_dependencies(header_to_headers, all_headers, analysis_graph=analysis_graph),
+        "metrics": metrics_phase,
+        "directed_graph": lambda _: analysis_graph.graph,
+        "cycles": lambda r: cycles_phase(r)[0],
+        "headers_in_cycles": lambda r: cycles_phase(r)[1],
+        "self_loops": lambda r: cycles_phase(r)[2],
+        "feedback_edges": lambda r: list(get_feedback_arc_set(analysis_graph).edges) if r.cycles else [],
+        "feedback_layer_count": lambda r: get_feedback_arc_set(analysis_graph).layer_count if r.feedback_edges else 0,
+        "layers": lambda r: layers_phase(r)[0],
+        "header_to_layer": lambda r: layers_phase(r)[1],
+        "has_cycles": lambda r: layers_phase(r)[2],
+        "stats": stats_phase,
+        "sorted_headers": sorted_headers_phase,
+    }
+
+    results = LazyDSMAnalysisResults(phases, header_to_headers=header_to_headers, source_to_deps=source_to_deps, analysis_graph=analysis_graph)
+
+    if workers > 1 and len(all_headers) >= DSM_PARALLEL_MIN_HEADERS:
+        progress(f"Running independent DSM phases on {workers} workers...")
+        worker_phases: Dict[str, Callable[[_DSMPhaseContext], Any]] = {"metrics": _metrics_phase, "cycles": _cycles_phase}
+        if compute_layers:
+            worker_phases["layers"] = _layers_phase
+        # Same order as the AnalysisGraph nodes, so order-dependent tie-breaks agree with in-process phases
+        headers = sorted(all_headers)
+        with _publish_phase_graph(header_to_headers, headers, file_types) as shared_graph:
+            outputs, timings = run_phases(worker_phases, _DSMPhaseContext(shared_graph.handle, len(headers)), workers)
+
+        # Reverse dependencies stay lazy and in-process: consumers need them as sets,
+        # and shipping those back from a worker costs more than inverting the mapping here
+        results.metrics = outputs["metrics"]
+        results.cycles, results.headers_in_cycles, results.feedback_edges, results.self_loops, feedback = outputs["cycles"]
+        # Seed the shared graph so display code does not recompute the condensation
+        analysis_graph.get_or_compute("cycles_and_self_loops", lambda: (results.cycles, results.self_loops))
+        if feedback is not None:
+            analysis_graph.get_or_compute("feedback_arc_set", lambda: feedback)
+        if compute_layers:
+            results.layers, results.header_to_layer, results.has_cycles = outputs["layers"]
+            analysis_graph.get_or_compute("is_dag", lambda: not results.has_cycles)
+            if not results.has_cycles:
+                analysis_graph.get_or_compute("condensation_generations", lambda: results.layers)
+        results.phase_times.update((timing.name, timing.wall_time) for timing in timings)
+
+    return results
 
 
 def display_analysis_results(
@@ -3137,6 +3377,7 @@ def display_analysis_results(
     cluster_by_directory: bool = False,
     sort_by: str = "topological",
     verbose: bool = False,
+    show_redundant_includes: bool = False,
 ) -> None:
     """Display all analysis results based on configuration options.
 
@@ -3150,6 +3391,8 @@ def display_analysis_results(
         show_library_boundaries: Show library boundary analysis
         cluster_by_directory: Group headers by directory in output
         sort_by: Sort order for matrix display ("coupling" or "topological")
+        verbose: Show additional detail
+        show_redundant_includes: Show include edges removed by a transitive reduction
     """
     # Print summary statistics
     print_summary_statistics(results.stats, len(results.cycles), len(results.headers_in_cycles), results.layers, results.has_cycles)
@@ -3158,23 +3401,13 @@ def display_analysis_results(
     if not cycles_only and top_n > 0:
         # Compute display order based on sort_by (only affects matrix rendering)
         if sort_by == "topological":
-            # Try topological sort excluding self-loops (for visualization only)
-            import networkx as nx
-
-            graph: nx.DiGraph[str] = nx.DiGraph()
-            all_headers = set(results.metrics.keys())
-            graph.add_nodes_from(all_headers)
-            for header, deps in results.header_to_headers.items():
-                for dep in deps:
-                    if dep in all_headers and dep != header:  # Exclude self-loops
-                        graph.add_edge(header, dep)
+            # Topological generations of the shared graph's condensation ignore self-loops
+            shared = results.analysis_graph if results.analysis_graph is not None else AnalysisGraph(results.header_to_headers, set(results.metrics.keys()))
 
-            try:
-                # Use topological_generations to get layers (excluding self-loops)
-                generations = list(nx.topological_generations(graph))
+            if not shared.cycles_and_self_loops[0]:
                 # Flatten layers into REVERSE topological order (top-level first, foundation last)
-                display_headers = [header for layer in reversed(generations) for header in sorted(layer)]
-            except (nx.NetworkXError, nx.NetworkXUnfeasible):
+                display_headers = [header for layer in reversed(shared.condensation_generations) for header in sorted(layer)]
+            else:
                 # Has multi-header cycles, fall back to coupling sort
                 from .color_utils import Colors
 
@@ -3189,7 +3422,9 @@ def display_analysis_results(
         )
 
     # Circular Dependencies Analysis
-    print_circular_dependencies(results.cycles, results.feedback_edges, project_root, cycles_only, results.self_loops)
+    print_circular_dependencies(
+        results.cycles, results.feedback_edges, project_root, cycles_only, results.self_loops, results.feedback_layer_count, results.directed_graph
+    )
 
     # Layered Architecture Analysis (auto-show if clean, or if explicitly requested)
     show_layers_flag: bool = bool(show_layers or (not results.cycles and results.layers and not cycles_only and len(results.layers) <= 20))
@@ -3206,6 +3441,12 @@ def display_analysis_results(
     if not cycles_only:
         print_architectural_hotspots(results.directed_graph, results.metrics, project_root, top_n=15, verbose=verbose)
 
+    # Redundant include edges (transitive reduction)
+    if show_redundant_includes and not cycles_only:
+        condensation = results.analysis_graph.condensation if results.analysis_graph is not None else None
+        redundant = find_redundant_include_edges(results.directed_graph, results.source_to_deps, condensation)
+        print_redundant_includes(redundant, project_root, results.directed_graph.number_of_edges())
+
     # Library Boundary Analysis
     if show_library_boundaries and header_to_lib and not cycles_only:
         _display_library_boundary_analysis(results.header_to_headers, header_to_lib, project_root)
@@ -3218,6 +3459,52 @@ def display_analysis_results(
     print_recommendations(results.cycles, results.metrics, set(results.sorted_headers), results.stats, results.feedback_edges, results.layers, show_layers_flag)
 
 
+def print_redundant_includes(redundant: List[RedundantInclude], project_root: str, total_edges: int, limit: int = MAX_REDUNDANT_INCLUDES_DISPLAY) -> None:
+    """Print include edges that a transitive reduction would remove.
+
+    Args:
+        redundant: Redundant edges, sorted by TU count
+        project_root: Project root directory for relative paths
+        total_edges: Number of include edges in the analysed graph
+        limit: Maximum number of edges to list
+    """
+    print(f"\n{Colors.BRIGHT}{'='*80}{Colors.RESET}")
+    print(f"{Colors.BRIGHT}REDUNDANT INCLUDES (TRANSITIVE REDUCTION){Colors.RESET}")
+    print(f"{Colors.BRIGHT}{'='*80}{Colors.RESET}")
+
+    if not redundant:
+        print_success("✓ No redundant direct includes found", prefix=False)
+        return
+
+    pct = 100.0 * len(redundant) / total_edges if total_edges else 0.0
+    print(f"{len(redundant)} of {total_edges} direct includes ({pct:.1f}%) are already pulled in through another include.")
+    print(f"{Colors.DIM}(Ranked by the number of translation units that parse the including header){Colors.RESET}\n")
+
+    def rel(path: str) -> str:
+        return os.path.relpath(path, project_root) if path.startswith(project_root) else path
+
+    for edge in redundant[:limit]:
+        print(f"  {Colors.YELLOW}{rel(edge.includer)}{Colors.RESET} → {rel(edge.included)}")
+        print(f"    {Colors.DIM}already via {rel(edge.via)} | {edge.tu_count} TUs{Colors.RESET}")
+
+    if len(redundant) > limit:
+        print(f"  {Colors.DIM}... and {len(redundant) - limit} more{Colors.RESET}")
+
+
+def print_phase_times(results: DSMAnalysisResults) -> None:
+    """Print the wall time of each DSM analysis phase that has run.
+
+    Args:
+        results: DSM analysis results (phase_times is filled as phases run)
+    """
+    if not results.phase_times:
+        return
+
+    print(f"\n{Colors.BRIGHT}DSM phase timings:{Colors.RESET}")
+    for name, seconds in sorted(results.phase_times.items(), key=lambda item: item[1], reverse=True):
+        print(f"  {name:<24} {seconds:8.3f}s")
+
+
 def _display_library_boundary_analysis(header_to_headers: DefaultDict[str, Set[str]], header_to_lib: Dict[str, str], project_root: str) -> None:
     """Display library boundary analysis section.
 
@@ -3282,7 +3569,9 @@ def _display_library_boundary_analysis(header_to_headers: DefaultDict[str, Set[s
                 print(f"    Library: {lib_name} | Cross-library deps: {count}")
 
 
-def run_differential_analysis(current_build_dir: str, baseline_build_dir: str, project_root: str, verbose: bool = False, file_scope: str = "project") -> int:
+def run_differential_analysis(
+    current_build_dir: str, baseline_build_dir: str, project_root: str, verbose: bool = False, file_scope: str = "project", deps_source: str = DEPS_SOURCE_AUTO
+) -> int:
     """Run differential DSM analysis comparing two builds.
 
     Args:
@@ -3291,6 +3580,7 @@ def run_differential_analysis(current_build_dir: str, baseline_build_dir: str, p
         project_root: Project root directory for relative path display
         verbose: Show detailed statistical breakdowns
         file_scope: File scope for analysis ('project', 'thirdparty', 'system')
+        deps_source: Where per-source dependencies come from (see build_include_graph)
 
     Returns:
         Exit code (0 for success, non-zero for errors)
@@ -3326,7 +3616,7 @@ def run_differential_analysis(current_build_dir: str, baseline_build_dir: str, p
     # Analyze baseline build
     print(f"{Colors.BRIGHT}Analyzing baseline build...{Colors.RESET}")
     try:
-        baseline_scan = build_include_graph(validated_baseline_dir)
+        baseline_scan = build_include_graph(validated_baseline_dir, deps_source=deps_source)
         baseline_headers = baseline_scan.all_headers
         print_success(f"Baseline: {len(baseline_headers)} headers in {baseline_scan.scan_time:.1f}s", prefix=False)
     except Exception as e:
@@ -3337,7 +3627,7 @@ def run_differential_analysis(current_build_dir: str, baseline_build_dir: str, p
     # Analyze current build
     print(f"\n{Colors.BRIGHT}Analyzing current build...{Colors.RESET}")
     try:
-        current_scan = build_include_graph(validated_current_dir)
+        current_scan = build_include_graph(validated_current_dir, deps_source=deps_source)
         current_headers = current_scan.all_headers
         current_file_types = current_scan.file_types
         print_success(f"Current: {len(current_headers)} headers in {current_scan.scan_time:.1f}s", prefix=False)
@@ -3374,8 +3664,13 @@ def run_differential_analysis(current_build_dir: str, baseline_build_dir: str, p
 
     current_results = run_dsm_analysis(current_headers, current_scan.include_graph, compute_layers=True, show_progress=True, file_types=current_file_types)
 
+    # Ripple impact queries run against reachability indexes persisted in each build directory's cache
+    for results, build_dir in ((baseline_results, validated_baseline_dir), (current_results, validated_current_dir)):
+        if results.analysis_graph is not None:
+            get_reachability_index(results.analysis_graph, build_dir)
+
     # Compute and display differences with architectural insights
-    delta = compare_dsm_results(baseline_results, current_results)
+    delta = compare_dsm_results(baseline_results, current_results, compile_times=load_compile_times(validated_current_dir))
     print_dsm_delta(delta, baseline_results, current_results, project_root, verbose=verbose)
 
     return EXIT_SUCCESS
@@ -3422,6 +3717,7 @@ def run_git_working_tree_analysis(
     exclude_patterns: Optional[List[str]] = None,
     show_layers: bool = False,
     file_scope: str = "project",
+    deps_source: str = DEPS_SOURCE_AUTO,
 ) -> int:
     """Run git working tree impact analysis using unified baseline comparison workflow.
 
@@ -3441,6 +3737,7 @@ def run_git_working_tree_analysis(
         exclude_patterns: Optional list of glob patterns to exclude headers
         show_layers: Show layer information in output
         file_scope: File scope for analysis ('project', 'thirdparty', 'system')
+        deps_source: Where per-source dependencies come from (see build_include_graph)
 
     Returns:
         Exit code (0 for success, non-zero for errors)
@@ -3530,7 +3827,7 @@ def run_git_working_tree_analysis(
     # Step 4: Build dependency graph from working tree (CURRENT state)
     print(f"{Colors.BRIGHT}Building current state dependency graph (working tree)...{Colors.RESET}")
     try:
-        scan_result = build_include_graph(build_dir)
+        scan_result = build_include_graph(build_dir, deps_source=deps_source)
         current_headers = scan_result.all_headers
         current_graph = scan_result.include_graph
         current_file_types = scan_result.file_types
@@ -3622,7 +3919,7 @@ def run_git_working_tree_analysis(
 
     # Step 8: Compare baseline vs current (unified workflow)
     print(f"\n{Colors.BRIGHT}Computing impact delta (baseline → current)...{Colors.RESET}")
-    delta = compare_dsm_results(baseline_results, current_results)
+    delta = compare_dsm_results(baseline_results, current_results, compile_times=load_compile_times(build_dir), source_index=scan_result.source_index)
     print_success("Computed architectural impact delta", prefix=False)
 
     # Step 9: Display unified impact report (reuses sophisticated baseline reporting)
@@ -3661,8 +3958,8 @@ def identify_improvement_candidates(results: DSMAnalysisResults, project_root: s
     stddev_coupling = float(np.std(couplings, ddof=1)) if len(couplings) > 1 else 0
     outlier_threshold = mean_coupling + thresholds.outlier_sigma * stddev_coupling if stddev_coupling > 0 else mean_coupling * 2
 
-    # Calculate betweenness centrality for hub detection
-    betweenness = nx.betweenness_centrality(results.directed_graph)
+    # Calculate betweenness centrality for hub detection (shared and cached across phases)
+    betweenness = get_betweenness_centrality(results.directed_graph).scores
     sorted_betweenness = sorted(betweenness.items(), key=lambda x: x[1], reverse=True)
     high_betweenness_threshold = sorted_betweenness[min(thresholds.hub_detection_top_n, len(sorted_betweenness) - 1)][1] if sorted_betweenness else 0.0
 
@@ -3753,6 +4050,7 @@ def estimate_improvement_roi(
     results: DSMAnalysisResults,
     source_to_deps: Optional[Dict[str, List[str]]] = None,
     thresholds: Optional[DetectionThresholds] = None,
+    impact_index: Optional[RebuildImpactIndex] = None,
 ) -> "ImprovementCandidate":
     """Estimate ROI for a refactoring candidate using precise transitive closure.
 
@@ -3767,6 +4065,7 @@ def estimate_improvement_roi(
         results: DSM analysis results for context
         source_to_deps: Optional source-to-deps mapping for precise rebuild calculation
         thresholds: Optional detection thresholds (uses MEDIUM defaults if not provided)
+        impact_index: Optional precomputed rebuild impact for all candidates (see build_rebuild_impact_index)
 
     Returns:
         Updated candidate with ROI estimates
@@ -3815,8 +4114,11 @@ def estimate_improvement_roi(
     rebuild_reduction = 0.0
     if source_to_deps and metric.fan_in > 0:
         # Calculate current rebuild cascade
-        affected_headers = compute_transitive_dependents(header, results.reverse_deps)
-        current_rebuild = estimate_affected_sources(affected_headers, source_to_deps)
+        if impact_index is not None and header in impact_index.affected_counts:
+            current_rebuild = impact_index.affected_count(header)
+        else:
+            affected_headers = compute_transitive_dependents(header, results.reverse_deps)
+            current_rebuild = estimate_affected_sources(affected_headers, source_to_deps, impact_index.source_index if impact_index is not None else None)
 
         # Simulate reduced cascade after refactoring
         # Assume interface extraction isolates implementation volatility
@@ -3902,25 +4204,28 @@ def compute_transitive_dependents(header: str, reverse_deps: Dict[str, Set[str]]
     return visited
 
 
-def estimate_affected_sources(affected_headers: Set[str], source_to_deps: Dict[str, List[str]]) -> int:
+def estimate_affected_sources(affected_headers: Set[str], source_to_deps: Dict[str, List[str]], source_index: Optional[SourceIndex] = None) -> int:
     """Estimate number of source files that would rebuild due to header changes.
 
     Args:
         affected_headers: Set of headers that are affected
         source_to_deps: Mapping of source files to their header dependencies
+        source_index: Optional prebuilt index over source_to_deps
 
     Returns:
         Number of source files that would need recompilation
     """
-    affected_sources = 0
-    for source, deps in source_to_deps.items():
-        if any(header in affected_headers for header in deps):
-            affected_sources += 1
-    return affected_sources
+    if source_index is None:
+        source_index = build_source_index(source_to_deps)
+    return source_index.count_affected(affected_headers)
 
 
 def calculate_combined_impact(
-    candidates: List["ImprovementCandidate"], results: DSMAnalysisResults, source_to_deps: Optional[Dict[str, List[str]]] = None, top_n: Optional[int] = None
+    candidates: List["ImprovementCandidate"],
+    results: DSMAnalysisResults,
+    source_to_deps: Optional[Dict[str, List[str]]] = None,
+    top_n: Optional[int] = None,
+    impact_index: Optional[RebuildImpactIndex] = None,
 ) -> Tuple[float, int, int]:
     """Calculate realistic combined rebuild impact accounting for overlaps.
 
@@ -3929,6 +4234,7 @@ def calculate_combined_impact(
         results: DSM analysis results
         source_to_deps: Source file to header dependencies mapping
         top_n: Only consider top N candidates (default: all)
+        impact_index: Optional precomputed rebuild impact covering the candidates
 
     Returns:
         Tuple of (rebuild_reduction_percentage_points, unique_sources_improved, total_sources)
@@ -3939,27 +4245,19 @@ def calculate_combined_impact(
     # Consider only top N candidates if specified
     target_candidates = candidates[:top_n] if top_n else candidates
 
-    # Track which source files are affected by the baseline (before improvements)
-    # and after improvements for each candidate
-    all_sources = set(source_to_deps.keys())
-    total_sources = len(all_sources)
-
-    # For each candidate, track which sources would see reduced rebuilds
-    sources_improved: Set[str] = set()
+    total_sources = len(source_to_deps)
+    target_headers = [candidate.header for candidate in target_candidates]
 
-    for candidate in target_candidates:
-        # Get headers that transitively depend on this candidate's header
-        affected_headers = compute_transitive_dependents(candidate.header, results.reverse_deps)
-
-        # Find source files that include any of these headers
-        for source, deps in source_to_deps.items():
-            if any(header in affected_headers for header in deps):
-                # This source would benefit from fixing this candidate
-                sources_improved.add(source)
+    # Sources that would see reduced rebuilds: those depending on any header in the
+    # union of the candidates' transitive dependents
+    if impact_index is None or not all(header in impact_index.affected_counts for header in target_headers):
+        impact_index = build_rebuild_impact_index(
+            results.reverse_deps, source_to_deps, target_headers, source_index=impact_index.source_index if impact_index is not None else None
+        )
 
     # Calculate percentage point improvement
     # This represents sources that would rebuild less often after fixes
-    unique_sources_improved = len(sources_improved)
+    unique_sources_improved = impact_index.combined_affected(target_headers)
     improvement_percentage = (unique_sources_improved / total_sources * 100) if total_sources > 0 else 0.0
 
     return (improvement_percentage, unique_sources_improved, total_sources)
@@ -4042,7 +4340,7 @@ def calculate_architectural_debt_score(results: DSMAnalysisResults, verbose: boo
     stability_component = min(15.0, avg_stability * 15.0)  # Max at stability=1.0    # Component 4: Hub nodes (10% weight)
     # High betweenness centrality = bottlenecks
     if len(results.directed_graph.nodes()) > 1:
-        betweenness = nx.betweenness_centrality(results.directed_graph)
+        betweenness = get_betweenness_centrality(results.directed_graph).scores
         top_betweenness = sorted(betweenness.values(), reverse=True)[:5]
         avg_top_betweenness = float(np.mean(top_betweenness)) if top_betweenness else 0
         hub_component = min(10.0, avg_top_betweenness * 100.0)  # Betweenness is 0-1
@@ -4078,6 +4376,7 @@ def display_improvement_suggestions(
     source_to_deps: Optional[Dict[str, List[str]]] = None,
     top_n: int = 10,
     verbose: bool = False,
+    impact_index: Optional[RebuildImpactIndex] = None,
 ) -> None:
     """Display ranked improvement suggestions with actionable recommendations.
 
@@ -4088,6 +4387,7 @@ def display_improvement_suggestions(
         source_to_deps: Source file to header dependencies (for precise impact calculation)
         top_n: Number of top candidates to display
         verbose: Show detailed breakdown
+        impact_index: Optional precomputed rebuild impact covering the candidates
     """
     if not candidates:
         print(f"\n{Colors.GREEN}✓ No significant architectural debt detected{Colors.RESET}")
@@ -4106,7 +4406,7 @@ def display_improvement_suggestions(
 
     # Calculate both naive sum and realistic combined impact
     naive_reduction = sum(c.estimated_rebuild_reduction for c in candidates)
-    realistic_reduction, sources_improved, total_sources = calculate_combined_impact(candidates, results, source_to_deps, top_n=top_n)
+    realistic_reduction, sources_improved, total_sources = calculate_combined_impact(candidates, results, source_to_deps, top_n=top_n, impact_index=impact_index)
     avg_break_even = float(np.mean([c.break_even_commits for c in candidates if c.break_even_commits < 900]))
 
     print(f"\n{Colors.BRIGHT}{'='*80}{Colors.RESET}")
@@ -4277,6 +4577,7 @@ def run_proactive_improvement_analysis(
     verbose: bool = False,
     file_scope: str = "project",
     sensitivity: str = "medium",
+    deps_source: str = DEPS_SOURCE_AUTO,
 ) -> int:
     """Run proactive improvement analysis without requiring a baseline.
 
@@ -4294,6 +4595,7 @@ def run_proactive_improvement_analysis(
         verbose: Show detailed breakdown
         file_scope: File scope for analysis ('project', 'thirdparty', 'system')
         sensitivity: Detection sensitivity ('low', 'medium', 'high')
+        deps_source: Where per-source dependencies come from (see build_include_graph)
 
     Returns:
         Exit code (0 for success)
@@ -4318,7 +4620,7 @@ def run_proactive_improvement_analysis(
 
     # Build dependency graph
     try:
-        scan_result = build_include_graph(build_dir)
+        scan_result = build_include_graph(build_dir, deps_source=deps_source)
         header_to_headers = scan_result.include_graph
         all_headers = scan_result.all_headers
         file_types = scan_result.file_types
@@ -4376,10 +4678,14 @@ def run_proactive_improvement_analysis(
 
     # Estimate ROI for each candidate (using precise analysis)
     print(f"\n{Colors.CYAN}Computing ROI estimates (precise transitive closure)...{Colors.RESET}")
+    # Transitive dependents and affected source counts for every candidate in one batch
+    impact_index: Optional[RebuildImpactIndex] = None
+    if source_to_deps:
+        impact_index = build_rebuild_impact_index(results.reverse_deps, source_to_deps, [c.header for c in candidates], source_index=scan_result.source_index)
     for i, candidate in enumerate(candidates, 1):
         if i % 10 == 0 or i == len(candidates):
             print(f"  Progress: {i}/{len(candidates)} candidates analyzed", end="\r")
-        candidates[i - 1] = estimate_improvement_roi(candidate, results, source_to_deps, thresholds)
+        candidates[i - 1] = estimate_improvement_roi(candidate, results, source_to_deps, thresholds, impact_index=impact_index)
     print()
     print_success(f"Completed ROI analysis for {len(candidates)} candidates", prefix=False)
 
@@ -4387,6 +4693,8 @@ def run_proactive_improvement_analysis(
     ranked_candidates = rank_improvements_by_impact(candidates)
 
     # Display results
-    display_improvement_suggestions(ranked_candidates, results, project_root, source_to_deps=source_to_deps, top_n=top_n, verbose=verbose)
+    display_improvement_suggestions(
+        ranked_candidates, results, project_root, source_to_deps=source_to_deps, top_n=top_n, verbose=verbose, impact_index=impact_index
+    )
 
     return EXIT_SUCCESS
@@ -26,11 +26,13 @@
 This module contains dataclasses and type definitions used across DSM analysis modules.
 """
 
-from typing import Dict, Set, List, Tuple, Any, DefaultDict, Optional
-from dataclasses import dataclass, field
+import time
+from typing import Callable, Dict, Set, List, Tuple, Any, DefaultDict, Mapping, Optional
+from dataclasses import MISSING, dataclass, field, fields
 
 import networkx as nx
 from .graph_utils import DSMMetrics
+from .analysis_graph import AnalysisGraph
 
 
 @dataclass
@@ -81,9 +83,12 @@ class DSMAnalysisResults:
         header_to_headers: Forward dependency mapping
         source_to_deps: Optional mapping of source files to header dependencies
         self_loops: List of headers that include themselves (not true cycles)
+        analysis_graph: Shared graph (with cached SCCs, condensation, etc.) built once for this run
+        feedback_layer_count: Topological layers left once feedback_edges are removed (0 if no cycles)
+        phase_times: Wall time in seconds of each analysis phase that has run (phase name -> seconds)
     """
 
-    metrics: Dict[str, "DSMMetrics"]
+    metrics: Mapping[str, "DSMMetrics"]
     cycles: List[Set[str]]
     headers_in_cycles: Set[str]
     feedback_edges: List[Tuple[str, str]]
@@ -97,6 +102,87 @@ class DSMAnalysisResults:
     header_to_headers: DefaultDict[str, Set[str]]
     source_to_deps: Optional[Dict[str, List[str]]] = None
     self_loops: List[str] = field(default_factory=list)
+    analysis_graph: Optional[AnalysisGraph] = None
+    feedback_layer_count: int = 0
+    phase_times: Dict[str, float] = field(default_factory=dict)
+
+
+class _LazyField:
+    """Data descriptor that computes a LazyDSMAnalysisResults field on first access."""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+    def __get__(self, instance: Any, owner: Any = None) -> Any:
+        if instance is None:
+            return self
+        values = instance.__dict__
+        if self.name not in values:
+            phase = values["_phases"].get(self.name)
+            if phase is None:
+                raise AttributeError(f"{type(instance).__name__} has no value or phase for '{self.name}'")
+            start = time.perf_counter()
+            values[self.name] = phase(instance)
+            values["phase_times"][self.name] = time.perf_counter() - start
+            # Dropped only once it succeeded, so a failed phase is retried on the next access
+            del values["_phases"][self.name]
+        return values[self.name]
+
+    def __set__(self, instance: Any, value: Any) -> None:
+        instance.__dict__[self.name] = value
+
+
+class LazyDSMAnalysisResults(DSMAnalysisResults):
+    """DSMAnalysisResults whose fields are computed on first access and then memoized.
+
+    Each field is either given up front or produced by a phase: a callable taking the
+    results object (so phases can read the fields they depend on, which are computed
+    in turn). Phases that are never read never run. Comparison, repr and pickling
+    force every remaining phase; pickling yields a plain DSMAnalysisResults, and lazy
+    and plain results compare equal when their field values are.
+    """
+
+    def __init__(self, phases: Mapping[str, Callable[["DSMAnalysisResults"], Any]], **values: Any) -> None:
+        """Create lazy results.
+
+        Args:
+            phases: Mapping of field name -> phase computing that field
+            **values: Fields known up front
+        """
+        # pylint: disable=super-init-not-called
+        self.__dict__["_phases"] = dict(phases)
+        for name, value in values.items():
+            setattr(self, name, value)
+        for f in fields(DSMAnalysisResults):
+            if f.name in values or f.name in phases:
+                continue
+            if f.default_factory is not MISSING:
+                setattr(self, f.name, f.default_factory())
+            elif f.default is not MISSING:
+                setattr(self, f.name, f.default)
+            else:
+                raise TypeError(f"No value or phase for required field '{f.name}'")
+
+    def computed_fields(self) -> List[str]:
+        """Return the names of fields that have a value so far (useful for diagnostics)."""
+        return sorted(f.name for f in fields(DSMAnalysisResults) if f.name in self.__dict__)
+
+    def materialize(self) -> DSMAnalysisResults:
+        """Run every remaining phase and return the values as a plain DSMAnalysisResults."""
+        return DSMAnalysisResults(**{f.name: getattr(self, f.name) for f in fields(DSMAnalysisResults)})
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, DSMAnalysisResults):
+            return NotImplemented
+        return all(getattr(self, f.name) == getattr(other, f.name) for f in fields(DSMAnalysisResults))
+
+    def __reduce__(self) -> Any:
+        return (DSMAnalysisResults, tuple(getattr(self, f.name) for f in fields(DSMAnalysisResults)))
+
+
+for _field in fields(DSMAnalysisResults):
+    setattr(LazyDSMAnalysisResults, _field.name, _LazyField(_field.name))
+del _field
 
 
 @dataclass
@@ -246,6 +332,10 @@ class RippleImpactAnalysis:
         roi_payback_min: Minimum commits in confidence interval
         roi_payback_max: Maximum commits in confidence interval
         future_savings: Optional prediction of future rebuild reduction
+        this_commit_rebuild_seconds: Estimated CPU-seconds to rebuild this commit's files (None without .ninja_log)
+        future_ongoing_rebuild_seconds: Estimated CPU-seconds per future change (None without .ninja_log)
+        baseline_ongoing_rebuild_seconds: Baseline CPU-seconds per change, for comparison (None without .ninja_log)
+        total_compile_seconds: Estimated CPU-seconds for a full rebuild of all source files (None without .ninja_log)
     """
 
     precise_score: Optional[int]
@@ -266,6 +356,10 @@ class RippleImpactAnalysis:
     roi_payback_min: float = 0.0  # Minimum commits in confidence interval
     roi_payback_max: float = 0.0  # Maximum commits in confidence interval
     future_savings: Optional["FutureRebuildPrediction"] = None
+    this_commit_rebuild_seconds: Optional[float] = None  # CPU-seconds weighted by .ninja_log compile times
+    future_ongoing_rebuild_seconds: Optional[float] = None
+    baseline_ongoing_rebuild_seconds: Optional[float] = None
+    total_compile_seconds: Optional[float] = None
 
 
 @dataclass
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# ****************************************************************************************************************************************************
+# * BSD 3-Clause License
+# *
+# * Copyright (c) 2025, Mana Battery
+# * All rights reserved.
+# *
+# * Redistribution and use in source and binary forms, with or without modification, are permitted provided that the following conditions are met:
+# *
+# * 1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following disclaimer.
+# * 2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following disclaimer in the
+# *    documentation and/or other materials provided with the distribution.
+# * 3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products derived from this
+# *    software without specific prior written permission.
+# *
+# * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# * THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# * CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# * PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# * LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE,
+# * EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+# ****************************************************************************************************************************************************
+"""Kinds of ninja build edges (compile, archive, link, ...) recognized from rule names and files.
+
+Generators name their rules differently (CMake "CXX_STATIC_LIBRARY_LINKER__core_Release",
+Meson "STATIC_LINKER" / "cpp_LINKER", GN "alink" / "solink" / "link"), so edges are
+classified by markers in the rule name, falling back to the output file name.
+Kept free of numpy so build.ninja-only tools can use it.
+"""
+
+import re
+from typing import Sequence
+
+# Edge kinds
+EDGE_COMPILE = "compile"
+EDGE_ARCHIVE = "archive"
+EDGE_LINK = "link"
+EDGE_OTHER = "other"
+EDGE_PHONY = "phony"
+EDGE_KINDS = (EDGE_COMPILE, EDGE_ARCHIVE, EDGE_LINK, EDGE_OTHER, EDGE_PHONY)
+
+# Rule names of static archivers across generators (CMake, Meson, GN), upper-cased
+_ARCHIVE_RULE_MARKERS = ("STATIC_LIBRARY", "STATIC_LINKER", "ALINK")
+_ARCHIVE_RULES = {"AR"}
+_ARCHIVE_SUFFIXES = (".a", ".lib")
+
+# Rule-name tokens of linkers; matched as whole tokens so CMake's CMAKE_SYMLINK_LIBRARY is no link
+_LINK_RULE_TOKENS = {"LINK", "LINKER", "SOLINK"}
+_RULE_TOKEN_RE = re.compile(r"[A-Z0-9]+")
+
+# Rules that only alias a linked file (CMake's libfoo.so -> libfoo.so.1 -> libfoo.so.1.2.3 symlinks)
+_SYMLINK_RULE_MARKER = "SYMLINK"
+
+# Link rules and outputs of shared libraries and loadable modules (the other link edges are executables)
+_SHARED_RULE_MARKERS = ("SHARED_LIBRARY", "MODULE_LIBRARY", "SOLINK")
+_SHARED_LIBRARY_RE = re.compile(r"\.(?:so(?:\.\d+)*|dylib|dll)$")
+_LIBRARY_FILE_RE = re.compile(r"\.(?:a|lib|so(?:\.\d+)*|dylib)$")
+
+
+def classify_edge(rule: str, outputs: Sequence[str], inputs: Sequence[str]) -> str:
+    """Return the kind of a build edge (one of EDGE_KINDS) from its rule name and files.
+
+    Args:
+        rule: Rule name
+        outputs: Explicit outputs
+        inputs: Explicit inputs
+    """
+    from lib.clang_utils import is_valid_source_file
+    from lib.ninja_utils import CXX_RULE_PREFIXES
+
+    if rule == "phony":
+        return EDGE_PHONY
+    upper = rule.upper()
+    if upper in _ARCHIVE_RULES or any(marker in upper for marker in _ARCHIVE_RULE_MARKERS):
+        return EDGE_ARCHIVE
+    if _LINK_RULE_TOKENS.intersection(_RULE_TOKEN_RE.findall(upper)):
+        # Linker rules that write a static library are archivers (e.g. MSVC lib.exe behind a LINK rule)
+        return EDGE_ARCHIVE if outputs and outputs[0].endswith(_ARCHIVE_SUFFIXES) else EDGE_LINK
+    if upper.startswith(CXX_RULE_PREFIXES) and inputs and is_valid_source_file(inputs[0]):
+        return EDGE_COMPILE
+    return EDGE_OTHER
+
+
+def is_shared_library(rule: str, output: str) -> bool:
+    """Return True if a link edge writes a shared library or module rather than an executable."""
+    return any(marker in rule.upper() for marker in _SHARED_RULE_MARKERS) or bool(_SHARED_LIBRARY_RE.search(output))
+
+
+def is_library_file(path: str) -> bool:
+    """Return True if path names a static, import or shared library (what link edges consume)."""
+    return bool(_LIBRARY_FILE_RE.search(path))
+
+
+def is_library_symlink(rule: str) -> bool:
+    """Return True if an edge only creates symlinks to a linked file (its outputs alias its input)."""
+    return _SYMLINK_RULE_MARKER in rule.upper()
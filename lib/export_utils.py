@@ -27,7 +27,7 @@ import os
 import csv
 import json
 import logging
-from typing import Dict, Set, List, DefaultDict, Any, Optional
+from typing import Dict, Set, List, DefaultDict, Any, Mapping, Optional
 
 import networkx as nx
 from networkx.readwrite import json_graph
@@ -39,7 +39,7 @@ logger = logging.getLogger(__name__)
 
 
 def export_dsm_to_csv(
-    filename: str, headers: List[str], header_to_headers: DefaultDict[str, Set[str]], metrics: Dict[str, DSMMetrics], project_root: str
+    filename: str, headers: List[str], header_to_headers: DefaultDict[str, Set[str]], metrics: Mapping[str, DSMMetrics], project_root: str
 ) -> None:
     """Export full DSM (Dependency Structure Matrix) to CSV file.
 
@@ -92,7 +92,7 @@ def export_dsm_to_csv(
 def export_dependency_graph(
     filename: str,
     directed_graph: Any,  # nx.DiGraph
-    metrics: Dict[str, Any],
+    metrics: Mapping[str, DSMMetrics],
     cycles: List[Set[str]],
     project_root: str,
     header_to_lib: Optional[Dict[str, str]] = None,
@@ -128,7 +128,7 @@ def export_dependency_graph(
     Args:
         filename: Output filename (extension determines format)
         directed_graph: NetworkX directed graph
-        metrics: Per-header metrics
+        metrics: Per-header metrics (DSMMetrics)
         cycles: List of circular dependency groups
         project_root: Root directory of the project
         header_to_lib: Optional mapping of headers to library names
@@ -171,19 +171,18 @@ def export_dependency_graph(
             try:
                 from lib.graph_utils import (
                     compute_pagerank_centrality,
-                    compute_betweenness_centrality,
                     find_hub_nodes,
                     detect_god_objects,
                     detect_coupling_outliers,
                 )
+                from lib.centrality import get_betweenness_centrality
 
                 # PageRank (architectural importance)
                 pagerank_scores = compute_pagerank_centrality(G)
 
                 # Betweenness centrality (bottleneck detection)
-                # Sample for large graphs to keep it fast
-                k = min(1000, len(G.nodes())) if len(G.nodes()) > 2000 else None
-                betweenness_scores = compute_betweenness_centrality(G, k=k)
+                # Shared and cached service; large graphs are sampled automatically
+                betweenness_scores = dict(get_betweenness_centrality(G).scores)
 
                 # Hub nodes (high connectivity)
                 hubs = find_hub_nodes(G, threshold=15)
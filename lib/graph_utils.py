@@ -25,18 +25,19 @@
 
 import os
 import logging
-from typing import Dict, Set, List, Tuple, Optional, Any
+from typing import Dict, Set, List, Tuple, Optional, Any, Iterable, Iterator, Mapping
 from dataclasses import dataclass
 from collections import defaultdict
 
 import networkx as nx
+import numpy as np
 
 from lib.color_utils import Colors, print_warning
-
-try:
-    from networkx.algorithms.cycles import minimum_feedback_arc_set  # type: ignore[attr-defined]
-except (ImportError, AttributeError):
-    minimum_feedback_arc_set = None
+from lib.constants import MAX_CYCLE_WITNESSES
+from lib.analysis_graph import AnalysisGraph, ensure_analysis_graph, invert_dependencies
+from lib.centrality import get_betweenness_centrality, get_pagerank
+from lib.feedback_arc_set import FeedbackArcSetResult, solve_feedback_arc_set
+from lib.reachability import ReachabilityIndex, build_reachability_index, load_or_build_reachability_index
 
 try:
     from networkx.drawing.nx_pydot import write_dot
@@ -253,111 +254,88 @@ def find_strongly_connected_components(graph: "nx.DiGraph[Any]") -> Tuple[List[S
     return cycles, self_loops
 
 
-def build_reverse_dependencies(header_to_headers: Dict[str, Set[str]], all_headers: Set[str]) -> Dict[str, Set[str]]:
+def build_reverse_dependencies(
+    header_to_headers: Dict[str, Set[str]], all_headers: Set[str], analysis_graph: Optional[AnalysisGraph] = None
+) -> Dict[str, Set[str]]:
     """Build reverse dependency mapping (who depends on whom).
 
-    Uses NetworkX graph reversal for efficient computation.
+    Inverts the forward mapping directly; when the run's shared AnalysisGraph is
+    given, its cached result is reused.
 
     Args:
         header_to_headers: Forward dependencies (header -> headers it includes)
-        all_headers: Set of all headers
+        all_headers: Set of all headers (unused: headers without dependents are omitted either way)
+        analysis_graph: Optional shared graph for this analysis run
 
     Returns:
         Reverse dependencies (header -> headers that include it)
     """
-    # Build graph and reverse it using NetworkX (more efficient)
-    G: nx.DiGraph[str] = nx.DiGraph()
-    G.add_nodes_from(all_headers)
-
-    edges = [(header, dep) for header, deps in header_to_headers.items() for dep in deps]
-    G.add_edges_from(edges)
-
-    # Reverse the graph
-    G_reversed = G.reverse(copy=False)
-
-    # Extract reverse dependencies
-    reverse_deps: Dict[str, Set[str]] = {}
-    for node in G_reversed.nodes():
-        successors = set(G_reversed.successors(node))
-        if successors:
-            reverse_deps[node] = successors
-
-    return reverse_deps
+    del all_headers
+    if analysis_graph is not None:
+        return analysis_graph.reverse_deps
+    return invert_dependencies(header_to_headers)
 
 
-def compute_layers(header_to_headers: Dict[str, Set[str]], all_headers: Set[str]) -> Tuple[List[List[str]], Dict[str, int], bool]:
+def compute_layers(
+    header_to_headers: Dict[str, Set[str]], all_headers: Set[str], analysis_graph: Optional[AnalysisGraph] = None
+) -> Tuple[List[List[str]], Dict[str, int], bool]:
     """Compute dependency layers using topological sorting.
 
-    Uses NetworkX's topological_generations() which assigns:
+    Uses topological generations, which assign:
     - Layer 0: Sources with NO incoming dependencies from other headers in the set
     - Higher layers: Headers that are depended upon by others (foundation/bottom)
 
     Args:
         header_to_headers: Mapping of headers to their dependencies
         all_headers: Set of all headers
+        analysis_graph: Optional shared graph for this analysis run
 
     Returns:
         Tuple of (layers list, header->layer mapping, has_cycles flag)
     """
-    graph: nx.DiGraph[str] = nx.DiGraph()
-    graph.add_nodes_from(all_headers)
+    shared = ensure_analysis_graph(header_to_headers, all_headers, analysis_graph)
 
-    # Build graph
-    for header, deps in header_to_headers.items():
-        for dep in deps:
-            if dep in all_headers:
-                graph.add_edge(header, dep)
-
-    # Try topological sort
-    try:
-        # Use topological_generations to get layers
-        generations = list(nx.topological_generations(graph))
-
-        # Build layer mapping
-        header_to_layer: Dict[str, int] = {}
-        for layer_num, layer_nodes in enumerate(generations):
-            for node in layer_nodes:
-                header_to_layer[node] = layer_num
-
-        return generations, header_to_layer, False
-
-    except (nx.NetworkXError, nx.NetworkXUnfeasible):
+    if not shared.is_dag:
         # Graph has cycles, can't create layers
         logger.warning("Dependency graph contains cycles - cannot compute layers")
         return [], {}, True
 
+    generations = [list(layer) for layer in shared.condensation_generations]
+
+    # Build layer mapping
+    header_to_layer: Dict[str, int] = {}
+    for layer_num, layer_nodes in enumerate(generations):
+        for node in layer_nodes:
+            header_to_layer[node] = layer_num
+
+    return generations, header_to_layer, False
+
 
 def analyze_cycles(
-    header_to_headers: Dict[str, Set[str]], all_headers: Set[str]
+    header_to_headers: Dict[str, Set[str]], all_headers: Set[str], analysis_graph: Optional[AnalysisGraph] = None
 ) -> Tuple[List[Set[str]], Set[str], List[Tuple[str, str]], "nx.DiGraph[Any]", List[str]]:
     """Detect circular dependencies and self-loops using strongly connected components.
 
     Args:
         header_to_headers: Forward dependencies (header -> headers it includes)
         all_headers: Set of all headers
+        analysis_graph: Optional shared graph for this analysis run
 
     Returns:
         Tuple of (cycles, headers_in_cycles, feedback_edges, directed_graph, self_loops) where:
         - cycles: Multi-header circular dependencies only
         - headers_in_cycles: Headers involved in multi-header cycles
         - feedback_edges: Edges to break to eliminate cycles
-        - directed_graph: NetworkX directed graph
+        - directed_graph: NetworkX directed graph (the shared, frozen graph)
         - self_loops: Headers that include themselves
     """
-    # Build directed graph from include relationships
-    directed_graph: nx.DiGraph[str] = nx.DiGraph()
-    directed_graph.add_nodes_from(all_headers)
-
-    for header, deps in header_to_headers.items():
-        # Only process headers that are in our filtered set
-        if header not in all_headers:
-            continue
-        for dep in deps:
-            if dep in all_headers:
-                directed_graph.add_edge(header, dep)
+    shared = ensure_analysis_graph(header_to_headers, all_headers, analysis_graph)
+    directed_graph = shared.graph
 
-    # Use library function to find cycles and self-loops separately
-    cycles, self_loops = find_strongly_connected_components(directed_graph)
+    # Cycles and self-loops come from the cached SCC decomposition
+    shared_cycles, shared_self_loops = shared.cycles_and_self_loops
+    cycles = list(shared_cycles)
+    self_loops = list(shared_self_loops)
 
     # Build set of headers in cycles (excluding self-loops)
     headers_in_cycles: Set[str] = set()
@@ -367,76 +345,147 @@ def analyze_cycles(
     # Use improved feedback arc set computation (only for real cycles)
     feedback_edges: List[Tuple[str, str]] = []
     if cycles:
-        feedback_edges = compute_minimum_feedback_arc_set(directed_graph)
+        feedback_edges = list(get_feedback_arc_set(shared).edges)
 
     return cycles, headers_in_cycles, feedback_edges, directed_graph, self_loops
 
 
 def compute_topological_layers(graph: "nx.DiGraph[Any]") -> Dict[str, int]:
-    """Compute topological layers for nodes in a DAG.
+    """Compute topological layers for nodes, collapsing cycles into their SCC.
 
     Uses the same convention as compute_layers():
     - Layer 0: Sources with NO incoming edges (top of dependency tree)
     - Higher layers: Nodes that are depended upon by others (foundation/bottom)
 
+    Layering is performed on the SCC condensation of the graph, so every member of a
+    circular dependency shares its component's layer. Runtime is linear in the number of
+    nodes and edges regardless of how many elementary cycles the graph contains.
+    Use find_cycle_witnesses() to obtain concrete example cycles.
+
     Args:
-        graph: NetworkX DiGraph (should be acyclic)
+        graph: NetworkX DiGraph (may contain cycles)
 
     Returns:
         Dictionary mapping node to its layer (0 = sources, higher = more depended upon)
     """
-    # Remove cycles first by finding and breaking them
-    G = graph.copy()
-    try:
-        cycles = list(nx.simple_cycles(G))
-        if cycles:
-            logger.warning("Found %s cycles, breaking them for layer analysis", len(cycles))
-            for cycle in cycles:
-                # Break cycle by removing one edge
-                G.remove_edge(cycle[0], cycle[1])
-    except nx.NetworkXNoCycle:
-        pass
-
-    layers = {}
+    layers: Dict[str, int] = {}
 
     try:
-        # Use topological_generations to get layers (same as compute_layers)
-        generations = list(nx.topological_generations(G))
-        for layer_num, layer_nodes in enumerate(generations):
-            for node in layer_nodes:
-                layers[node] = layer_num
+        condensed = nx.condensation(graph)
+        cyclic_groups = sum(1 for _, data in condensed.nodes(data=True) if len(data["members"]) > 1)
+        if cyclic_groups:
+            logger.warning("Found %s circular dependency groups, collapsing them for layer analysis", cyclic_groups)
+
+        members = condensed.graph["mapping"]
+        component_layer: Dict[int, int] = {}
+        for layer_num, components in enumerate(nx.topological_generations(condensed)):
+            for component in components:
+                component_layer[component] = layer_num
+
+        for node in graph.nodes():
+            layers[node] = component_layer[members[node]]
     except Exception as e:
         logger.error("Error computing topological layers: %s", e)
 
     return layers
 
 
-def compute_transitive_closure(graph: "nx.DiGraph[Any]", node: str) -> Set[str]:
+def find_cycle_witnesses(graph: "nx.DiGraph[Any]", max_witnesses: int = MAX_CYCLE_WITNESSES) -> List[List[str]]:
+    """Find a bounded number of concrete example cycles (witnesses).
+
+    Instead of enumerating every elementary cycle (exponential in dense SCCs), this returns
+    one shortest cycle per non-trivial strongly connected component, largest components
+    first, stopping after max_witnesses cycles. Each witness costs one BFS restricted to its
+    component, so the total runtime is O(V + E).
+
+    Args:
+        graph: NetworkX DiGraph
+        max_witnesses: Maximum number of cycles to return
+
+    Returns:
+        List of cycles, each a list of nodes where every node includes the next and the
+        last node includes the first
+    """
+    witnesses: List[List[str]] = []
+    if max_witnesses <= 0:
+        return witnesses
+
+    sccs = sorted((scc for scc in nx.strongly_connected_components(graph) if len(scc) > 1), key=len, reverse=True)
+    for scc in sccs:
+        if len(witnesses) >= max_witnesses:
+            break
+        start = min(scc)
+        cycle = _shortest_cycle_through(graph, start, scc)
+        if cycle:
+            witnesses.append(cycle)
+
+    return witnesses
+
+
+def _shortest_cycle_through(graph: "nx.DiGraph[Any]", start: str, component: Set[str]) -> List[str]:
+    """Find the shortest cycle through start using BFS restricted to its component.
+
+    Args:
+        graph: NetworkX DiGraph
+        start: Node that must be on the cycle
+        component: Strongly connected component containing start
+
+    Returns:
+        Cycle as list of nodes beginning with start, or empty list if none exists
+    """
+    parent: Dict[str, str] = {}
+    frontier = [start]
+    visited = {start}
+    while frontier:
+        next_frontier: List[str] = []
+        for node in frontier:
+            for succ in graph.successors(node):
+                if succ == start:
+                    path = [node]
+                    while path[-1] != start:
+                        path.append(parent[path[-1]])
+                    path.reverse()
+                    return path
+                if succ in component and succ not in visited:
+                    visited.add(succ)
+                    parent[succ] = node
+                    next_frontier.append(succ)
+        frontier = next_frontier
+    return []
+
+
+def compute_transitive_closure(graph: "nx.DiGraph[Any]", node: str, index: Optional[ReachabilityIndex] = None) -> Set[str]:
     """Compute transitive closure (all reachable nodes) from a given node.
 
     Args:
         graph: NetworkX DiGraph
         node: Starting node
+        index: Optional prebuilt reachability index for graph (avoids a traversal)
 
     Returns:
         Set of all nodes reachable from the starting node
     """
+    if index is not None:
+        return index.descendants(node)
     try:
         return nx.descendants(graph, node)
     except nx.NetworkXError:
         return set()
 
 
-def compute_reverse_transitive_closure(graph: "nx.DiGraph[Any]", node: str) -> Set[str]:
+def compute_reverse_transitive_closure(graph: "nx.DiGraph[Any]", node: str, index: Optional[ReachabilityIndex] = None) -> Set[str]:
     """Compute reverse transitive closure (all nodes that can reach this node).
 
     Args:
         graph: NetworkX DiGraph
         node: Target node
+        index: Optional prebuilt reachability index for graph (avoids a traversal)
 
     Returns:
         Set of all nodes that can reach the target node
     """
+    if index is not None:
+        return index.ancestors(node)
     try:
         return nx.ancestors(graph, node)
     except nx.NetworkXError:
@@ -551,6 +600,9 @@ def identify_critical_headers(graph: "nx.DiGraph[Any]", top_n: int = 20) -> List
 def compute_betweenness_centrality(graph: "nx.DiGraph[Any]", k: Optional[int] = None) -> Dict[str, float]:
     """Compute betweenness centrality for nodes (how often they appear on shortest paths).
 
+    Results are cached per graph fingerprint by lib.centrality, so repeated calls on the
+    same graph are free.
+
     Args:
         graph: NetworkX DiGraph
         k: Number of nodes to sample (None = all nodes, faster with sampling)
@@ -559,7 +611,8 @@ def compute_betweenness_centrality(graph: "nx.DiGraph[Any]", k: Optional[int] =
         Dictionary mapping node → centrality score
     """
     try:
-        return nx.betweenness_centrality(graph, k=k)
+        pivots = k if k is not None else graph.number_of_nodes()
+        return dict(get_betweenness_centrality(graph, pivots=pivots).scores)
     except Exception as e:
         logger.error("Error computing betweenness centrality: %s", e)
         return {}
@@ -572,6 +625,7 @@ def compute_pagerank_centrality(graph: "nx.DiGraph[Any]", alpha: float = 0.85, m
     High PageRank indicates a header that is depended upon by many important headers.
 
     Note: NetworkX will use scipy if available for better performance, but works without it.
+    Results are cached per graph fingerprint by lib.centrality.
 
     Args:
         graph: NetworkX DiGraph
@@ -583,49 +637,325 @@ def compute_pagerank_centrality(graph: "nx.DiGraph[Any]", alpha: float = 0.85, m
     """
     try:
         # NetworkX PageRank (uses scipy if available for better performance)
-        result: Dict[str, float] = nx.pagerank(graph, alpha=alpha, max_iter=max_iter, tol=1.0e-6)
+        result: Dict[str, float] = dict(get_pagerank(graph, alpha=alpha, max_iter=max_iter, tol=1.0e-6))
         return result
     except Exception as e:
         logger.error("Error computing PageRank centrality: %s", e)
         return {}
 
 
+@dataclass
+class LongestPathIndex:
+    """Longest-path DP tables over the SCC condensation of a dependency graph.
+
+    Cycles are collapsed into a single condensation node, so path lengths count
+    edges between components. Predecessor/successor pointers allow the longest
+    chain through any node to be reconstructed without re-traversing the graph.
+
+    Attributes:
+        condensed: Condensation DAG (nodes are component ids)
+        component_of: Mapping of original node -> component id
+        longest_to: Component id -> longest path length (edges) ending at it
+        longest_from: Component id -> longest path length (edges) starting at it
+        to_pred: Component id -> predecessor on its longest incoming path (None at a source)
+        from_succ: Component id -> successor on its longest outgoing path (None at a sink)
+    """
+
+    condensed: "nx.DiGraph[Any]"
+    component_of: Dict[Any, int]
+    longest_to: Dict[int, int]
+    longest_from: Dict[int, int]
+    to_pred: Dict[int, Optional[int]]
+    from_succ: Dict[int, Optional[int]]
+
+    def length_through(self, node: Any) -> int:
+        """Return the length (in edges) of the longest chain passing through node."""
+        component = self.component_of.get(node)
+        if component is None:
+            return 0
+        return self.longest_to[component] + self.longest_from[component]
+
+    def path_through(self, node: Any) -> List[Any]:
+        """Reconstruct the longest chain through node.
+
+        Components other than the node's own are represented by their smallest member.
+
+        Args:
+            node: Node the chain must pass through
+
+        Returns:
+            List of nodes from the chain's source to its sink (empty if node is unknown)
+        """
+        component = self.component_of.get(node)
+        if component is None:
+            return []
+
+        def representative(comp: int) -> Any:
+            return min(self.condensed.nodes[comp]["members"])
+
+        upstream: List[Any] = []
+        current = self.to_pred[component]
+        while current is not None:
+            upstream.append(representative(current))
+            current = self.to_pred[current]
+        upstream.reverse()
+
+        downstream: List[Any] = []
+        current = self.from_succ[component]
+        while current is not None:
+            downstream.append(representative(current))
+            current = self.from_succ[current]
+
+        return upstream + [node] + downstream
+
+
+def compute_longest_path_index(graph: "nx.DiGraph[Any]") -> LongestPathIndex:
+    """Build longest-path-to / longest-path-from tables in O(V + E).
+
+    Two dynamic-programming sweeps over a topological order of the SCC condensation
+    replace per-node enumeration of simple paths.
+
+    Args:
+        graph: NetworkX DiGraph (may contain cycles)
+
+    Returns:
+        LongestPathIndex answering longest-chain queries for every node
+    """
+    condensed = nx.condensation(graph)
+    order = list(nx.topological_sort(condensed))
+
+    longest_to: Dict[int, int] = {}
+    to_pred: Dict[int, Optional[int]] = {}
+    for comp in order:
+        best, best_pred = 0, None
+        for pred in condensed.predecessors(comp):
+            if longest_to[pred] + 1 > best:
+                best, best_pred = longest_to[pred] + 1, pred
+        longest_to[comp] = best
+        to_pred[comp] = best_pred
+
+    longest_from: Dict[int, int] = {}
+    from_succ: Dict[int, Optional[int]] = {}
+    for comp in reversed(order):
+        best, best_succ = 0, None
+        for succ in condensed.successors(comp):
+            if longest_from[succ] + 1 > best:
+                best, best_succ = longest_from[succ] + 1, succ
+        longest_from[comp] = best
+        from_succ[comp] = best_succ
+
+    return LongestPathIndex(
+        condensed=condensed,
+        component_of=condensed.graph["mapping"],
+        longest_to=longest_to,
+        longest_from=longest_from,
+        to_pred=to_pred,
+        from_succ=from_succ,
+    )
+
+
+def compute_longest_paths_through_all_nodes(graph: "nx.DiGraph[Any]") -> Dict[Any, int]:
+    """Compute the longest chain length through every node in one O(V + E) pass.
+
+    Args:
+        graph: NetworkX DiGraph
+
+    Returns:
+        Dictionary mapping node -> longest chain length (edges) through it
+    """
+    index = compute_longest_path_index(graph)
+    return {node: index.length_through(node) for node in graph.nodes()}
+
+
 def find_longest_path_through_node(graph: "nx.DiGraph[Any]", node: str) -> int:
     """Find the length of the longest path through a node.
 
+    The result is the longest path ending at the node plus the longest path starting
+    from it, computed on the SCC condensation (cycles count as a single step).
+    Use compute_longest_paths_through_all_nodes() when querying many nodes.
+
     Args:
         graph: NetworkX DiGraph
         node: Node to analyze
 
     Returns:
-        Maximum path length through the node
+        Maximum path length through the node (0 if it has no predecessors or no successors)
     """
     try:
-        # Find longest path from any predecessor to any successor
-        max_length = 0
-        predecessors = list(graph.predecessors(node))
-        successors = list(graph.successors(node))
-
-        if not predecessors or not successors:
+        if node not in graph or graph.in_degree(node) == 0 or graph.out_degree(node) == 0:
             return 0
-
-        for pred in predecessors:
-            for succ in successors:
-                try:
-                    # Find all simple paths (avoid cycles)
-                    paths = list(nx.all_simple_paths(graph, pred, succ, cutoff=100))
-                    for path in paths:
-                        if node in path:
-                            max_length = max(max_length, len(path) - 1)
-                except (nx.NetworkXNoPath, nx.NodeNotFound):
-                    continue
-
-        return max_length
+        return compute_longest_path_index(graph).length_through(node)
     except Exception as e:
         logger.debug("Error finding longest path through %s: %s", node, e)
         return 0
 
 
+@dataclass
+class DominatorTree:
+    """Dominator tree of a graph rooted at a single entry node.
+
+    Node d dominates n if every path from the root to n passes through d. The
+    immediate dominators form a tree; a node's subtree is everything it gates.
+
+    Attributes:
+        root: Entry node
+        idom: Node -> immediate dominator (the root maps to itself)
+        children: Node -> nodes it immediately dominates
+        dominated_count: Node -> number of nodes it strictly dominates
+        subtree_weight: Node -> summed weight of the node and everything it dominates
+    """
+
+    root: Any
+    idom: Dict[Any, Any]
+    children: Dict[Any, List[Any]]
+    dominated_count: Dict[Any, int]
+    subtree_weight: Dict[Any, float]
+
+    def dominated(self, node: Any) -> List[Any]:
+        """Return every node strictly dominated by node (empty if node is unreachable)."""
+        result: List[Any] = []
+        stack = list(self.children.get(node, []))
+        while stack:
+            current = stack.pop()
+            result.append(current)
+            stack.extend(self.children.get(current, []))
+        return result
+
+    def dominators(self, node: Any) -> List[Any]:
+        """Return the dominator chain of node, from its immediate dominator up to the root."""
+        chain: List[Any] = []
+        current = node
+        while current != self.root and current in self.idom:
+            current = self.idom[current]
+            chain.append(current)
+        return chain
+
+
+def compute_dominator_tree(graph: "nx.DiGraph[Any]", root: Any, weights: Optional[Dict[Any, float]] = None) -> DominatorTree:
+    """Compute the dominator tree of graph from root with subtree aggregates.
+
+    Uses NetworkX's immediate_dominators() (Cooper–Harvey–Kennedy iterative
+    algorithm, near-linear on include graphs), then aggregates subtree sizes and
+    weights bottom-up in O(V). Nodes unreachable from root are not in the tree.
+
+    Args:
+        graph: NetworkX DiGraph
+        root: Entry node
+        weights: Optional node -> weight (missing nodes weigh 1.0)
+
+    Returns:
+        DominatorTree for the nodes reachable from root
+    """
+    idom: Dict[Any, Any] = nx.immediate_dominators(graph, root)
+    idom[root] = root
+
+    children: Dict[Any, List[Any]] = defaultdict(list)
+    for node, parent in idom.items():
+        if node != root:
+            children[parent].append(node)
+
+    # Breadth-first order of the tree; reversed it visits children before parents
+    order = [root]
+    for node in order:
+        order.extend(children.get(node, []))
+
+    dominated_count: Dict[Any, int] = {}
+    subtree_weight: Dict[Any, float] = {}
+    for node in reversed(order):
+        own = weights.get(node, 1.0) if weights is not None else 1.0
+        kids = children.get(node, [])
+        dominated_count[node] = sum(dominated_count[kid] + 1 for kid in kids)
+        subtree_weight[node] = own + sum(subtree_weight[kid] for kid in kids)
+
+    return DominatorTree(root=root, idom=idom, children=dict(children), dominated_count=dominated_count, subtree_weight=subtree_weight)
+
+
+@dataclass
+class RedundantInclude:
+    """Direct include edge already implied by another include path.
+
+    Attributes:
+        includer: Header containing the redundant #include
+        included: Header it includes directly
+        via: Another header directly included by includer that already reaches included
+        tu_count: Translation units that pull in includer (and so parse the edge)
+    """
+
+    includer: str
+    included: str
+    via: str
+    tu_count: int
+
+
+def find_redundant_include_edges(
+    graph: "nx.DiGraph[Any]", source_to_deps: Optional[Dict[str, List[str]]] = None, condensation: Optional["nx.DiGraph[int]"] = None
+) -> List[RedundantInclude]:
+    """Find include edges removed by a transitive reduction of the header graph.
+
+    Edge A -> C is redundant when A also includes some B with B ->* C. Reachability is
+    computed on the SCC condensation as one integer bitset per component (bits are
+    reverse-topological positions, so sets stay small near the leaves), in reverse
+    topological order; a component's bitset is released once all of its predecessors
+    have been processed. Edges inside a cycle group are not reported, and a header in a
+    cycle group is only reported when one of its own includes provides the alternative path.
+
+    Args:
+        graph: Header dependency graph (edge A -> B means A includes B)
+        source_to_deps: Optional source -> dependency list, used to rank edges by TU count
+        condensation: Optional precomputed nx.condensation(graph)
+
+    Returns:
+        Redundant edges sorted by TU count (highest first), then by includer and included
+    """
+    condensed = condensation if condensation is not None else nx.condensation(graph)
+    members: Dict[int, List[Any]] = {c: list(condensed.nodes[c]["members"]) for c in condensed.nodes()}
+    component_of: Dict[Any, int] = condensed.graph["mapping"]
+
+    order = list(reversed(list(nx.topological_sort(condensed))))
+    position = {component: i for i, component in enumerate(order)}
+    pending_preds = {component: condensed.in_degree(component) for component in order}
+
+    reach: Dict[int, int] = {}
+    redundant_components: Dict[int, List[Tuple[int, int]]] = {}
+    for component in order:
+        successors = list(condensed.successors(component))
+        closure = 0
+        for succ in successors:
+            closure |= reach[succ]
+
+        redundant = [succ for succ in successors if (closure >> position[succ]) & 1]
+        if redundant:
+            redundant_components[component] = [(succ, next(t for t in successors if t != succ and (reach[t] >> position[succ]) & 1)) for succ in redundant]
+
+        for succ in successors:
+            closure |= 1 << position[succ]
+            pending_preds[succ] -= 1
+            if pending_preds[succ] == 0:
+                del reach[succ]
+        reach[component] = closure
+
+    tu_count: Dict[str, int] = defaultdict(int)
+    if source_to_deps:
+        for deps in source_to_deps.values():
+            for dep in set(deps):
+                tu_count[dep] += 1
+
+    results: List[RedundantInclude] = []
+    for component, pairs in redundant_components.items():
+        for target, via_component in pairs:
+            for includer in members[component]:
+                via = next((b for b in graph.successors(includer) if component_of.get(b) == via_component), None)
+                if via is None:
+                    continue
+                for included in graph.successors(includer):
+                    if component_of.get(included) == target:
+                        results.append(RedundantInclude(includer=includer, included=included, via=via, tu_count=tu_count.get(includer, 0)))
+
+    results.sort(key=lambda r: (-r.tu_count, r.includer, r.included))
+    logger.info("Found %d redundant include edges", len(results))
+    return results
+
+
 def export_graph_to_graphml(graph: "nx.DiGraph[Any]", output_path: str, node_attributes: Optional[Dict[str, Dict[str, Any]]] = None) -> bool:
     """Export graph to GraphML format for visualization.
 
@@ -704,6 +1034,154 @@ def calculate_dsm_metrics(
     )
 
 
+class MetricsTable(Mapping[str, DSMMetrics]):
+    """Columnar DSM metrics for a set of headers.
+
+    Each metric is a numpy array indexed by header ID (position in headers), so
+    statistics, z-scores and percentiles are whole-array operations. The table is
+    also a read-only Mapping of header -> DSMMetrics; those per-header objects are
+    only materialized (and then cached) when looked up, e.g. for display.
+
+    Attributes:
+        headers: Header paths, indexed by header ID
+        header_ids: Mapping of header path -> header ID
+        fan_out: Total dependencies per header (project + external)
+        fan_in: Dependents per header
+        fan_out_project: Project dependencies per header
+        fan_out_external: External (system/third-party) dependencies per header
+        coupling: fan_out + fan_in per header
+        stability: fan_out / coupling per header (0.5 for isolated headers)
+    """
+
+    def __init__(self, headers: Iterable[str], fan_out: Any, fan_in: Any, fan_out_project: Any, fan_out_external: Any) -> None:
+        """Create a table from per-header degree columns.
+
+        Args:
+            headers: Header paths in column order
+            fan_out: Total dependency counts
+            fan_in: Dependent counts
+            fan_out_project: Project dependency counts
+            fan_out_external: External dependency counts
+
+        Raises:
+            ValueError: If fan_out does not equal fan_out_project + fan_out_external for every header
+        """
+        self.headers: List[str] = list(headers)
+        self.header_ids: Dict[str, int] = {header: i for i, header in enumerate(self.headers)}
+        self.fan_out: np.ndarray = np.asarray(fan_out, dtype=np.int64)
+        self.fan_in: np.ndarray = np.asarray(fan_in, dtype=np.int64)
+        self.fan_out_project: np.ndarray = np.asarray(fan_out_project, dtype=np.int64)
+        self.fan_out_external: np.ndarray = np.asarray(fan_out_external, dtype=np.int64)
+
+        mismatched = np.flatnonzero(self.fan_out != self.fan_out_project + self.fan_out_external)
+        if len(mismatched):
+            i = int(mismatched[0])
+            raise ValueError(
+                f"fan_out ({self.fan_out[i]}) must equal fan_out_project ({self.fan_out_project[i]}) + fan_out_external ({self.fan_out_external[i]})"
+            )
+
+        self.coupling: np.ndarray = self.fan_out + self.fan_in
+        # Stability: 0 = very stable (many dependents, few dependencies), 1 = very unstable; 0.5 if isolated
+        self.stability: np.ndarray = np.divide(self.fan_out, self.coupling, out=np.full(len(self.headers), 0.5), where=self.coupling > 0)
+        self._views: Dict[str, DSMMetrics] = {}
+
+    @classmethod
+    def from_dependencies(
+        cls, all_headers: Iterable[str], header_to_headers: Dict[str, Set[str]], reverse_deps: Dict[str, Set[str]], file_types: Optional[Dict[str, Any]] = None
+    ) -> "MetricsTable":
+        """Compute the table for all_headers; equivalent to calculate_dsm_metrics() per header.
+
+        Dependency edges are flattened once into CSR-style row/column arrays; fan-out and the
+        project/external split are then bincounts over the rows.
+
+        Args:
+            all_headers: Headers to include (table order follows iteration order)
+            header_to_headers: Mapping of headers to headers they depend on
+            reverse_deps: Mapping of headers to headers that depend on them
+            file_types: Optional file type classifications (FileType enum values)
+
+        Returns:
+            MetricsTable for all_headers
+        """
+        headers = list(all_headers)
+        n = len(headers)
+        fan_in = np.fromiter((len(reverse_deps.get(header, ())) for header in headers), dtype=np.int64, count=n)
+
+        dep_ids: Dict[str, int] = {}
+        rows: List[int] = []
+        cols: List[int] = []
+        for row, header in enumerate(headers):
+            for dep in header_to_headers.get(header, ()):
+                rows.append(row)
+                cols.append(dep_ids.setdefault(dep, len(dep_ids)))
+        row_array = np.asarray(rows, dtype=np.int64)
+        fan_out = np.bincount(row_array, minlength=n).astype(np.int64)
+
+        if file_types:
+            # Import FileType for classification (avoid circular import at module level)
+            from .clang_utils import FileType
+
+            is_project = np.fromiter((file_types.get(dep, FileType.PROJECT) == FileType.PROJECT for dep in dep_ids), dtype=bool, count=len(dep_ids))
+            fan_out_project = np.bincount(row_array, weights=is_project[np.asarray(cols, dtype=np.int64)], minlength=n).astype(np.int64)
+        else:
+            # Fallback: treat all as project dependencies if file_types not provided
+            fan_out_project = fan_out.copy()
+
+        return cls(headers, fan_out, fan_in, fan_out_project, fan_out - fan_out_project)
+
+    @classmethod
+    def from_metrics(cls, metrics: Mapping[str, DSMMetrics]) -> "MetricsTable":
+        """Build a table from existing per-header metrics (table order follows metrics order)."""
+        values = list(metrics.values())
+        return cls(
+            metrics.keys(),
+            [m.fan_out for m in values],
+            [m.fan_in for m in values],
+            [m.fan_out_project for m in values],
+            [m.fan_out_external for m in values],
+        )
+
+    def ids(self, headers: Iterable[str]) -> np.ndarray:
+        """Return the header IDs of headers, in the given order."""
+        return np.fromiter((self.header_ids[header] for header in headers), dtype=np.int64)
+
+    def coupling_for(self, headers: Iterable[str]) -> np.ndarray:
+        """Return the coupling column restricted to headers, in the given order."""
+        coupling: np.ndarray = self.coupling[self.ids(headers)]
+        return coupling
+
+    def __getitem__(self, header: str) -> DSMMetrics:
+        view = self._views.get(header)
+        if view is None:
+            i = self.header_ids[header]
+            view = DSMMetrics(
+                fan_out=int(self.fan_out[i]),
+                fan_in=int(self.fan_in[i]),
+                fan_out_project=int(self.fan_out_project[i]),
+                fan_out_external=int(self.fan_out_external[i]),
+                coupling=int(self.coupling[i]),
+                stability=float(self.stability[i]),
+            )
+            self._views[header] = view
+        return view
+
+    def __contains__(self, header: object) -> bool:
+        return header in self.header_ids
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.headers)
+
+    def __len__(self) -> int:
+        return len(self.headers)
+
+
+def as_metrics_table(metrics: Mapping[str, DSMMetrics]) -> MetricsTable:
+    """Return metrics as a MetricsTable, converting a plain mapping if needed."""
+    if isinstance(metrics, MetricsTable):
+        return metrics
+    return MetricsTable.from_metrics(metrics)
+
+
 def calculate_architecture_quality_score(
     sparsity: float,
     num_cycles: int,
@@ -806,7 +1284,7 @@ def calculate_adp_score(total_headers: int, headers_in_cycles: int) -> float:
     return round(100.0 * (total_headers - headers_in_cycles) / total_headers, 1)
 
 
-def detect_god_objects(metrics: Dict[str, DSMMetrics], threshold: int = 50) -> List[Tuple[str, int]]:
+def detect_god_objects(metrics: Mapping[str, DSMMetrics], threshold: int = 50) -> List[Tuple[str, int]]:
     """Detect God Object anti-pattern (extreme fan-out).
 
     God Objects are classes/headers that depend on too many other
@@ -824,7 +1302,7 @@ def detect_god_objects(metrics: Dict[str, DSMMetrics], threshold: int = 50) -> L
     return sorted(god_objects, key=lambda x: x[1], reverse=True)
 
 
-def calculate_interface_implementation_ratio(metrics: Dict[str, DSMMetrics], stability_threshold: float = 0.3) -> Tuple[float, int, int]:
+def calculate_interface_implementation_ratio(metrics: Mapping[str, DSMMetrics], stability_threshold: float = 0.3) -> Tuple[float, int, int]:
     """Calculate interface vs implementation ratio.
 
     Stable interfaces (low stability score) indicate architectural maturity.
@@ -840,14 +1318,15 @@ def calculate_interface_implementation_ratio(metrics: Dict[str, DSMMetrics], sta
     if not metrics:
         return 0.0, 0, 0
 
-    interfaces = sum(1 for m in metrics.values() if m.stability < stability_threshold)
-    total = len(metrics)
+    table = as_metrics_table(metrics)
+    interfaces = int(np.count_nonzero(table.stability < stability_threshold))
+    total = len(table)
     ratio = 100.0 * interfaces / total if total > 0 else 0.0
 
     return round(ratio, 1), interfaces, total
 
 
-def detect_coupling_outliers(metrics: Dict[str, DSMMetrics], z_threshold: float = 2.5) -> Tuple[List[Tuple[str, int, float]], float, float]:
+def detect_coupling_outliers(metrics: Mapping[str, DSMMetrics], z_threshold: float = 2.5) -> Tuple[List[Tuple[str, int, float]], float, float]:
     """Detect coupling outliers using z-score analysis.
 
     Headers with z-score > threshold are statistical anomalies that may
@@ -864,24 +1343,20 @@ def detect_coupling_outliers(metrics: Dict[str, DSMMetrics], z_threshold: float
     if not metrics:
         return [], 0.0, 0.0
 
-    # Calculate mean and standard deviation
-    couplings = [m.coupling for m in metrics.values()]
-    n = len(couplings)
-    mean = sum(couplings) / n
-    variance = sum((c - mean) ** 2 for c in couplings) / n
-    stddev = variance**0.5
+    # Calculate mean and (population) standard deviation
+    table = as_metrics_table(metrics)
+    mean = float(table.coupling.mean())
+    stddev = float(table.coupling.std())
 
     if stddev == 0:
         return [], mean, stddev
 
-    # Find outliers
-    outliers = []
-    for header, m in metrics.items():
-        z_score = (m.coupling - mean) / stddev
-        if abs(z_score) > z_threshold:
-            outliers.append((header, m.coupling, z_score))
+    # Find outliers, ordered by |z| descending (ties keep table order)
+    z_scores = (table.coupling - mean) / stddev
+    outlier_ids = np.flatnonzero(np.abs(z_scores) > z_threshold)
+    outlier_ids = outlier_ids[np.argsort(-np.abs(z_scores[outlier_ids]), kind="stable")]
 
-    return sorted(outliers, key=lambda x: abs(x[2]), reverse=True), mean, stddev
+    return [(table.headers[i], int(table.coupling[i]), float(z_scores[i])) for i in outlier_ids], mean, stddev
 
 
 def visualize_dsm(
@@ -992,8 +1467,8 @@ def visualize_dsm(
 def compute_minimum_feedback_arc_set(graph: "nx.DiGraph[Any]") -> List[Tuple[str, str]]:
     """Compute approximate minimum feedback arc set to break all cycles.
 
-    Uses NetworkX's built-in feedback arc set algorithm if available (NetworkX >= 2.6),
-    otherwise falls back to a greedy approximation algorithm.
+    Each strongly connected component is solved independently with the
+    Eades–Lin–Smyth ordering heuristic plus local search (see lib.feedback_arc_set).
 
     Args:
         graph: NetworkX DiGraph
@@ -1002,44 +1477,56 @@ def compute_minimum_feedback_arc_set(graph: "nx.DiGraph[Any]") -> List[Tuple[str
         List of edges (u, v) to remove to break cycles
     """
     try:
-        # Try using NetworkX's built-in minimum_feedback_arc_set (available in NetworkX >= 2.6)
-        if minimum_feedback_arc_set is not None:
-            feedback_edges_set = minimum_feedback_arc_set(graph)
-            return list(feedback_edges_set)
-
-        # Fall back to greedy approach for older NetworkX versions
-        logger.debug("Using greedy feedback arc set algorithm (NetworkX < 2.6)")
-
-        # Greedy approach: repeatedly find and break cycles
-        feedback_edges: List[Tuple[str, str]] = []
-        G = graph.copy()
-
-        # Pre-compute degrees for efficiency
-        out_degrees = dict(G.out_degree())
-
-        while True:
-            try:
-                # Try to find a cycle
-                cycle = nx.find_cycle(G, orientation="original")
-                if cycle:
-                    # Remove the edge with highest out-degree node (greedy heuristic)
-                    edge_to_remove = max(cycle, key=lambda e: out_degrees.get(e[0], 0))
-                    feedback_edges.append((edge_to_remove[0], edge_to_remove[1]))
-                    G.remove_edge(edge_to_remove[0], edge_to_remove[1])
-                    # Update out-degree for removed edge source
-                    if edge_to_remove[0] in out_degrees:
-                        out_degrees[edge_to_remove[0]] -= 1
-                else:
-                    break
-            except nx.NetworkXNoCycle:
-                break
-
-        return feedback_edges
+        return solve_feedback_arc_set(graph).edges
     except Exception as e:
         logger.warning("Error computing feedback arc set: %s", e)
         return []
 
 
+def get_feedback_arc_set(analysis_graph: AnalysisGraph) -> FeedbackArcSetResult:
+    """Feedback arc set of a shared analysis graph, computed once per run.
+
+    Reuses the graph's cached SCC decomposition.
+
+    Args:
+        analysis_graph: Shared graph for this analysis run
+
+    Returns:
+        FeedbackArcSetResult with the edges to cut and the resulting layer count
+    """
+    return analysis_graph.get_or_compute("feedback_arc_set", lambda: solve_feedback_arc_set(analysis_graph.graph, analysis_graph.sccs))
+
+
+def get_reachability_index(analysis_graph: AnalysisGraph, build_dir: Optional[str] = None) -> ReachabilityIndex:
+    """Reachability index of a shared analysis graph, built once per run.
+
+    Reuses the graph's cached SCC condensation. With build_dir, the index is
+    loaded from (or persisted to) the build directory's cache, so later runs on
+    an unchanged include graph skip building it.
+
+    Args:
+        analysis_graph: Shared graph for this analysis run
+        build_dir: Optional build directory whose cache holds the index
+
+    Returns:
+        ReachabilityIndex answering reaches()/descendants()/ancestors() queries
+    """
+
+    def build() -> ReachabilityIndex:
+        if build_dir is None:
+            return build_reachability_index(analysis_graph.graph, analysis_graph.condensation)
+        return load_or_build_reachability_index(
+            analysis_graph.graph,
+            build_dir,
+            os.path.join(build_dir, "compile_commands_filtered.json"),
+            os.path.join(build_dir, "build.ninja"),
+            # A cache hit needs no condensation, so only hand over one that already exists
+            condensation=analysis_graph.condensation if "condensation" in analysis_graph.cached_keys() else None,
+        )
+
+    return analysis_graph.get_or_compute("reachability_index", build)
+
+
 def export_graph_to_dot(graph: "nx.DiGraph[Any]", output_path: str) -> bool:
     """Export graph to DOT format for Graphviz.
 
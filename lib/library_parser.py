@@ -24,7 +24,6 @@
 """Parser for build.ninja to extract library dependency information."""
 
 import os
-import re
 import logging
 from typing import Dict, Set, Tuple, Any, List
 from collections import defaultdict
@@ -33,6 +32,9 @@ from dataclasses import dataclass
 
 import networkx as nx
 from lib.graph_utils import build_transitive_dependents_map, find_strongly_connected_components
+from lib.edge_kinds import EDGE_ARCHIVE, EDGE_LINK, classify_edge, is_library_file, is_library_symlink, is_shared_library
+from lib.constants import NinjaError
+from lib.ninja_manifest import load_ninja_manifest
 
 logger = logging.getLogger(__name__)
 
@@ -165,6 +167,11 @@ def analyze_cross_library_dependencies(header_to_headers: Dict[str, Set[str]], h
 def parse_ninja_libraries(build_ninja_path: str) -> Tuple[Dict[str, Set[str]], Dict[str, Set[str]], Set[str], Set[str]]:
     """Parse build.ninja to extract library and executable dependencies.
 
+    Static archives, shared libraries and executables are recognized from the
+    rule name and output (see lib/edge_kinds.py), across CMake, Meson and GN
+    rule naming. Dependencies on CMake's version symlinks of a shared library
+    resolve to the library itself.
+
     Args:
         build_ninja_path: Path to build.ninja file
 
@@ -180,56 +187,48 @@ def parse_ninja_libraries(build_ninja_path: str) -> Tuple[Dict[str, Set[str]], D
     all_libs: Set[str] = set()
     all_exes: Set[str] = set()
 
-    # Regex patterns for build rules
-    lib_pattern = re.compile(r"^build\s+(\S+\.a):\s+CXX_STATIC_LIBRARY_LINKER")
-    exe_pattern = re.compile(r"^build\s+(\S+):\s+CXX_EXECUTABLE_LINKER")
-
     logger.info("Parsing %s...", build_ninja_path)
 
     try:
-        with open(build_ninja_path, "r", encoding="utf-8") as f:
-            for _, line in enumerate(f, 1):
-                line = line.rstrip()
-
-                # Check for library build rule
-                lib_match = lib_pattern.match(line)
-                if lib_match:
-                    lib_path = lib_match.group(1)
-                    lib_name = os.path.basename(lib_path)
-                    all_libs.add(lib_name)
-
-                    # Extract dependencies from the || section
-                    if "||" in line:
-                        deps_section = line.split("||")[1]
-                        deps = re.findall(r"(\S+\.a)", deps_section)
-                        for dep_path in deps:
-                            dep_name = os.path.basename(dep_path)
-                            if dep_name != lib_name:  # Avoid self-dependencies
-                                lib_to_libs[lib_name].add(dep_name)
-                                all_libs.add(dep_name)
-                    continue
-
-                # Check for executable build rule
-                exe_match = exe_pattern.match(line)
-                if exe_match:
-                    exe_path = exe_match.group(1)
-                    exe_name = os.path.basename(exe_path)
-                    all_exes.add(exe_name)
-
-                    # Extract library dependencies from the || section
-                    if "||" in line:
-                        deps_section = line.split("||")[1]
-                        deps = re.findall(r"(\S+\.a)", deps_section)
-                        for dep_path in deps:
-                            dep_name = os.path.basename(dep_path)
-                            exe_to_libs[exe_name].add(dep_name)
-                            all_libs.add(dep_name)
-                    continue
-
-    except IOError as e:
+        manifest = load_ninja_manifest(build_ninja_path)
+    except (IOError, NinjaError) as e:
         logger.error("Failed to read %s: %s", build_ninja_path, e)
         raise
 
+    # Consumers of a versioned shared library link its symlinks (libfoo.so -> libfoo.so.1.2.3)
+    aliases = {
+        os.path.basename(output): os.path.basename(build.inputs[0])
+        for build in manifest.builds
+        if build.inputs and is_library_symlink(build.rule)
+        for output in build.all_outputs()
+    }
+
+    for build in manifest.builds:
+        if not build.outputs:
+            continue
+        kind = classify_edge(build.rule, build.outputs, build.inputs)
+        if kind not in (EDGE_ARCHIVE, EDGE_LINK):
+            continue
+        # Library dependencies are the libraries among the inputs (CMake lists them as implicit and order-only)
+        dep_names = list(dict.fromkeys(aliases.get(name, name) for name in (os.path.basename(dep) for dep in build.all_inputs() if is_library_file(dep))))
+
+        # Static archives, shared libraries and modules
+        if kind == EDGE_ARCHIVE or is_shared_library(build.rule, build.outputs[0]):
+            lib_name = os.path.basename(build.outputs[0])
+            all_libs.add(lib_name)
+            for dep_name in dep_names:
+                if dep_name != lib_name:  # Avoid self-dependencies
+                    lib_to_libs[lib_name].add(dep_name)
+                    all_libs.add(dep_name)
+
+        # Everything else that links is an executable
+        else:
+            exe_name = os.path.basename(build.outputs[0])
+            all_exes.add(exe_name)
+            for dep_name in dep_names:
+                exe_to_libs[exe_name].add(dep_name)
+                all_libs.add(dep_name)
+
     logger.info("Found %s libraries and %s executables", len(all_libs), len(all_exes))
     return dict(lib_to_libs), dict(exe_to_libs), all_libs, all_exes
 
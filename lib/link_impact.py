@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# ****************************************************************************************************************************************************
+# * BSD 3-Clause License
+# *
+# * Copyright (c) 2025, Mana Battery
+# * All rights reserved.
+# *
+# * Redistribution and use in source and binary forms, with or without modification, are permitted provided that the following conditions are met:
+# *
+# * 1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following disclaimer.
+# * 2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following disclaimer in the
+# *    documentation and/or other materials provided with the distribution.
+# * 3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products derived from this
+# *    software without specific prior written permission.
+# *
+# * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# * THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# * CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# * PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# * LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE,
+# * EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+# ****************************************************************************************************************************************************
+"""Link fan-out of header changes: libraries and executables relinked per header.
+
+A header change recompiles the translation units that include it, and then every
+archive, shared library and executable downstream of those objects re-links. In
+test-heavy trees the relinks (one per test executable) often cost more than the
+recompiles, and include-level tools never see them.
+
+compute_link_impact() walks the build edge graph (lib/build_graph.py) from the
+compile edges reading each header through archives and shared libraries to the
+executables. All headers are handled in one topological pass: every edge
+carries a bitset of the headers it depends on, OR-ed in from its predecessors
+level by level, so the cost does not grow with the number of headers beyond
+the width of the bitsets.
+"""
+
+import logging
+from dataclasses import dataclass, field
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+from lib.build_graph import BuildGraph
+from lib.edge_kinds import EDGE_ARCHIVE, EDGE_COMPILE, EDGE_LINK, is_shared_library
+
+logger = logging.getLogger(__name__)
+
+# Edges whose bit rows are unpacked at once when counting per header
+_UNPACK_ROWS = 8192
+
+
+@dataclass
+class LinkImpact:
+    """What one header change recompiles and relinks.
+
+    Attributes:
+        header: Header path as given
+        compiles: Compile edges that rerun
+        libraries: Static archives and shared libraries rebuilt (first output of each edge)
+        executables: Executables relinked
+        compile_seconds: Summed .ninja_log duration of the compiles
+        link_seconds: Summed .ninja_log duration of the archive and link steps
+        estimated: True if some durations are estimates (edge never in .ninja_log)
+    """
+
+    header: str
+    compiles: int = 0
+    libraries: List[str] = field(default_factory=list)
+    executables: List[str] = field(default_factory=list)
+    compile_seconds: float = 0.0
+    link_seconds: float = 0.0
+    estimated: bool = False
+
+    @property
+    def relinks(self) -> int:
+        """Return the number of libraries and executables rebuilt."""
+        return len(self.libraries) + len(self.executables)
+
+
+def _header_bits(graph: BuildGraph, headers: Sequence[str]) -> np.ndarray:
+    # (edges, words) uint64 matrix: bit h set where edge depends on headers[h]
+    words = max(1, (len(headers) + 63) // 64)
+    bits = np.zeros((len(graph), words), dtype=np.uint64)
+    if graph.input_ptr is None or graph.input_idx is None:
+        return bits
+    # Seed the edges reading each header, for all headers in one scan of the input lists
+    owner = np.full(len(graph.input_files), -1, dtype=np.int64)
+    for h, header in enumerate(headers):
+        owner[graph.input_ids(header)] = h
+    readers = np.repeat(np.arange(len(graph), dtype=np.int64), np.diff(graph.input_ptr))
+    read = owner[graph.input_idx]
+    hits = read >= 0
+    read = read[hits]
+    np.bitwise_or.at(bits, (readers[hits], read // 64), np.left_shift(np.uint64(1), (read % 64).astype(np.uint64)))
+    for edges, preds, offsets in graph.level_plan():
+        bits[edges] |= np.bitwise_or.reduceat(bits[preds], offsets, axis=0)
+    return bits
+
+
+def _columns(bits: np.ndarray, rows: np.ndarray, count: int) -> np.ndarray:
+    # Boolean (len(rows), count) matrix of the first count bits of the given rows
+    unpacked = np.unpackbits(bits[rows].view(np.uint8), axis=1, bitorder="little")
+    return unpacked[:, :count].astype(bool)
+
+
+def compute_link_impact(graph: BuildGraph, headers: Sequence[str]) -> Dict[str, LinkImpact]:
+    """Compute the compile and link fan-out of each header in one pass over the graph.
+
+    Headers are matched against the sources and recorded dependencies of the
+    edges (.ninja_deps), so only headers the last build saw are found.
+
+    Args:
+        graph: Build graph (see load_build_graph())
+        headers: Changed headers, absolute or build-relative
+
+    Returns:
+        Mapping of header -> LinkImpact (zero counts for headers no edge reads)
+
+    Raises:
+        NinjaError: If the graph has a dependency cycle
+    """
+    headers = list(dict.fromkeys(headers))
+    impacts = {header: LinkImpact(header) for header in headers}
+    if not headers or not len(graph):
+        return impacts
+    bits = _header_bits(graph, headers)
+    kinds = np.array(graph.kinds, dtype=object)
+
+    compiles = np.flatnonzero(kinds == EDGE_COMPILE)
+    compile_counts = np.zeros(len(headers), dtype=np.int64)
+    compile_seconds = np.zeros(len(headers), dtype=np.float64)
+    compile_estimated = np.zeros(len(headers), dtype=bool)
+    for start in range(0, len(compiles), _UNPACK_ROWS):
+        rows = compiles[start : start + _UNPACK_ROWS]
+        hit = _columns(bits, rows, len(headers))
+        compile_counts += hit.sum(axis=0)
+        compile_seconds += graph.durations[rows] @ hit
+        compile_estimated |= (hit & ~graph.measured[rows, None]).any(axis=0)
+
+    links = np.flatnonzero((kinds == EDGE_ARCHIVE) | (kinds == EDGE_LINK))
+    library = np.array([graph.kinds[e] == EDGE_ARCHIVE or is_shared_library(graph.rules[e], graph.outputs[e]) for e in links.tolist()], dtype=bool)
+    hit = _columns(bits, links, len(headers))
+    for h, header in enumerate(headers):
+        impact = impacts[header]
+        impact.compiles = int(compile_counts[h])
+        impact.compile_seconds = float(compile_seconds[h])
+        relinked = links[hit[:, h]]
+        impact.libraries = [graph.outputs[e] for e in links[hit[:, h] & library].tolist()]
+        impact.executables = [graph.outputs[e] for e in links[hit[:, h] & ~library].tolist()]
+        impact.link_seconds = float(graph.durations[relinked].sum())
+        impact.estimated = bool(compile_estimated[h] or not graph.measured[relinked].all())
+
+    logger.info("Link impact of %d headers over %d edges (%d archive/link steps)", len(headers), len(graph), len(links))
+    return impacts
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# ****************************************************************************************************************************************************
+# * BSD 3-Clause License
+# *
+# * Copyright (c) 2025, Mana Battery
+# * All rights reserved.
+# *
+# * Redistribution and use in source and binary forms, with or without modification, are permitted provided that the following conditions are met:
+# *
+# * 1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following disclaimer.
+# * 2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following disclaimer in the
+# *    documentation and/or other materials provided with the distribution.
+# * 3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products derived from this
+# *    software without specific prior written permission.
+# *
+# * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# * THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# * CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# * PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# * LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE,
+# * EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+# ****************************************************************************************************************************************************
+"""In-process reader for ninja's binary dependency log (.ninja_deps).
+
+ninja records the headers each compile step read (from depfiles or /showIncludes)
+in .ninja_deps. `ninja -t deps <target>` prints one target's entry, so tools that
+ask about every target spawned one process per target. read_ninja_deps() instead
+decodes the whole log in one pass.
+
+Format (versions 3 and 4): the signature "# ninjadeps\n", an int32 version, then
+records that each start with a uint32 whose high bit marks a deps record and
+whose low 31 bits give the record size in bytes:
+
+- Path record: the path, NUL-padded to a multiple of 4, then the uint32
+  checksum ~id, where id is the path's index among path records.
+- Deps record: int32 output id, the output's mtime (int32 in v3, int64 in v4),
+  then int32 input ids. A later record for the same output replaces earlier ones.
+
+All integers are little-endian. A truncated or corrupt tail (e.g. after an
+interrupted build) ends the log, as in ninja itself.
+"""
+
+import logging
+import os
+import struct
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from lib.constants import NINJA_DEPS_CACHE_SIZE, NinjaError
+from lib.ninja_manifest import ninja_state_dir
+
+logger = logging.getLogger(__name__)
+
+NINJA_DEPS_FILE = ".ninja_deps"
+NINJA_DEPS_SIGNATURE = b"# ninjadeps\n"
+SUPPORTED_DEPS_VERSIONS = (3, 4)
+
+# Largest record ninja writes; anything bigger means the log is corrupt
+_MAX_RECORD_SIZE = (1 << 19) - 1
+_DEPS_RECORD_FLAG = 0x80000000
+
+# Loaded logs keyed by path: ((mtime_ns, size), log)
+_deps_cache: "OrderedDict[str, Tuple[Tuple[int, int], NinjaDepsLog]]" = OrderedDict()
+
+
+@dataclass
+class NinjaDepsLog:
+    """Decoded .ninja_deps contents.
+
+    Attributes:
+        version: Log format version
+        paths: Node paths, indexed by node id
+        deps: Output node id -> (recorded output mtime, input node ids)
+    """
+
+    version: int
+    paths: List[str]
+    deps: Dict[int, Tuple[int, Tuple[int, ...]]]
+    _ids: Optional[Dict[str, int]] = None
+
+    def node_id(self, path: str) -> Optional[int]:
+        """Return the node id of path, or None if the log does not know it."""
+        if self._ids is None:
+            self._ids = {p: i for i, p in enumerate(self.paths)}
+        return self._ids.get(path)
+
+    def dependencies(self, target: str) -> Optional[List[str]]:
+        """Return the recorded inputs of target, or None if it has no deps record."""
+        node = self.node_id(target)
+        record = self.deps.get(node) if node is not None else None
+        if record is None:
+            return None
+        paths = self.paths
+        return [paths[i] for i in record[1]]
+
+    def targets(self) -> List[str]:
+        """Return every output with a deps record."""
+        return [self.paths[node] for node in self.deps]
+
+    def to_mapping(self) -> Dict[str, List[str]]:
+        """Return output -> recorded inputs for every deps record."""
+        paths = self.paths
+        return {paths[node]: [paths[i] for i in inputs] for node, (_, inputs) in self.deps.items()}
+
+
+def read_ninja_deps(path: str) -> NinjaDepsLog:
+    """Decode a .ninja_deps file in one pass.
+
+    Args:
+        path: Path to .ninja_deps
+
+    Returns:
+        NinjaDepsLog with all path and deps records
+
+    Raises:
+        OSError: If the file cannot be read
+        NinjaError: If the file is not a deps log or its version is not supported
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+
+    header_size = len(NINJA_DEPS_SIGNATURE) + 4
+    if len(data) < header_size or not data.startswith(NINJA_DEPS_SIGNATURE):
+        raise NinjaError(f"{path}: not a ninja deps log")
+    (version,) = struct.unpack_from("<i", data, len(NINJA_DEPS_SIGNATURE))
+    if version not in SUPPORTED_DEPS_VERSIONS:
+        raise NinjaError(f"{path}: unsupported .ninja_deps version {version}")
+
+    mtime_format = "<iq" if version == 4 else "<ii"
+    deps_header = struct.calcsize(mtime_format)
+    paths: List[str] = []
+    deps: Dict[int, Tuple[int, Tuple[int, ...]]] = {}
+    unpack_uint = struct.Struct("<I").unpack_from
+    offset = header_size
+    end = len(data)
+
+    while offset + 4 <= end:
+        (size_and_type,) = unpack_uint(data, offset)
+        size = size_and_type & ~_DEPS_RECORD_FLAG
+        body = offset + 4
+        if size > _MAX_RECORD_SIZE or body + size > end:
+            logger.debug("%s: truncated record at offset %d; ignoring the rest", path, offset)
+            break
+
+        if size_and_type & _DEPS_RECORD_FLAG:
+            if size < deps_header or (size - deps_header) % 4:
+                logger.debug("%s: malformed deps record at offset %d; ignoring the rest", path, offset)
+                break
+            out_id, mtime = struct.unpack_from(mtime_format, data, body)
+            count = (size - deps_header) // 4
+            inputs = struct.unpack_from(f"<{count}i", data, body + deps_header)
+            if not 0 <= out_id < len(paths) or (inputs and not 0 <= min(inputs) <= max(inputs) < len(paths)):
+                logger.debug("%s: deps record at offset %d references unknown nodes; ignoring the rest", path, offset)
+                break
+            deps[out_id] = (mtime, inputs)
+        else:
+            if size < 4:
+                break
+            (checksum,) = unpack_uint(data, body + size - 4)
+            if checksum != (~len(paths) & 0xFFFFFFFF):
+                logger.debug("%s: path record checksum mismatch at offset %d; ignoring the rest", path, offset)
+                break
+            raw = data[body : body + size - 4].rstrip(b"\0")
+            paths.append(raw.decode("utf-8", "surrogateescape"))
+        offset = body + size
+
+    logger.debug("Read %d paths and %d deps records from %s (v%d)", len(paths), len(deps), path, version)
+    return NinjaDepsLog(version, paths, deps)
+
+
+def find_ninja_deps(build_dir: str) -> str:
+    """Return the .ninja_deps path for build_dir, honouring a top-level builddir variable."""
+    return os.path.join(ninja_state_dir(build_dir), NINJA_DEPS_FILE)
+
+
+def load_ninja_deps(build_dir: str) -> Optional[NinjaDepsLog]:
+    """Return build_dir's deps log, reusing this process's copy while the file is unchanged.
+
+    Args:
+        build_dir: Path to the build directory
+
+    Returns:
+        NinjaDepsLog, or None if there is no log or it cannot be decoded
+        (callers then fall back to `ninja -t deps`)
+    """
+    path = find_ninja_deps(build_dir)
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    identity = (stat.st_mtime_ns, stat.st_size)
+
+    key = os.path.realpath(path)
+    cached = _deps_cache.get(key)
+    if cached is not None and cached[0] == identity:
+        _deps_cache.move_to_end(key)
+        return cached[1]
+
+    try:
+        log = read_ninja_deps(path)
+    except (OSError, NinjaError) as e:
+        logger.info("Cannot read %s in-process (%s); using ninja -t deps", path, e)
+        return None
+    _deps_cache[key] = (identity, log)
+    _deps_cache.move_to_end(key)
+    while len(_deps_cache) > NINJA_DEPS_CACHE_SIZE:
+        _deps_cache.popitem(last=False)
+    return log
+
+
+def clear_ninja_deps_cache() -> None:
+    """Drop all cached deps logs."""
+    _deps_cache.clear()
+
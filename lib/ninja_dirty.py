@@ -0,0 +1,648 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# ****************************************************************************************************************************************************
+# * BSD 3-Clause License
+# *
+# * Copyright (c) 2025, Mana Battery
+# * All rights reserved.
+# *
+# * Redistribution and use in source and binary forms, with or without modification, are permitted provided that the following conditions are met:
+# *
+# * 1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following disclaimer.
+# * 2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following disclaimer in the
+# *    documentation and/or other materials provided with the distribution.
+# * 3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products derived from this
+# *    software without specific prior written permission.
+# *
+# * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# * THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# * CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# * PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# * LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE,
+# * EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+# ****************************************************************************************************************************************************
+"""In-process equivalent of `ninja -n -d explain`.
+
+`ninja -n -d explain` reloads the manifest and both logs, stats every node and
+prints why each edge would run. DirtyScan repeats ninja's dirty-state walk
+(DependencyScan::RecomputeDirty) on the shared, cached models instead:
+
+- build.ninja from load_ninja_manifest(), .ninja_log and .ninja_deps from their
+  in-process readers,
+- node mtimes from a StatCache that lists each directory once (a file missing
+  from the listing costs no syscall) and stats directories on a thread pool,
+- command hashes computed in one vectorised MurmurHash64A pass, the hash ninja
+  stores in build logs v5 and v6.
+
+explain_dirty() returns the "ninja explain: ..." lines ninja would print, so the
+result goes through the same parsers as ninja's stderr (parse_ninja_explain_output,
+parse_ninja_explain_line). It returns None whenever the answer could differ from
+ninja's (dyndep edges, dependency cycles, missing inputs ninja reports as errors,
+logs in formats it cannot check), and callers then run ninja itself.
+"""
+
+import logging
+import os
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+from lib.constants import NinjaError
+from lib.ninja_deps import NinjaDepsLog, load_ninja_deps
+from lib.ninja_log import NinjaLog, NinjaLogEntry, load_ninja_log
+from lib.ninja_manifest import NinjaBuild, NinjaManifest, load_ninja_manifest
+
+logger = logging.getLogger(__name__)
+
+EXPLAIN_PREFIX = "ninja explain: "
+
+# Build log versions whose command hashes are MurmurHash64A (v7 switched to rapidhash)
+MURMUR_LOG_VERSIONS = (5, 6)
+# .ninja_deps version with nanosecond mtimes (v3 stores seconds)
+NANOSECOND_DEPS_VERSION = 4
+
+# ninja's MurmurHash64A parameters (build_log.cc)
+_MURMUR_SEED = 0xDECAFBADDECAFBAD
+_MURMUR_M = 0xC6A4A7935BD1E995
+_MURMUR_R = 47
+_MASK64 = 0xFFFFFFFFFFFFFFFF
+
+# Directories with fewer uncached paths than this are stat'ed without the thread pool
+_PARALLEL_STAT_MIN_DIRS = 8
+
+# Edge visit states (Edge::mark_ in ninja)
+_VISIT_NONE, _VISIT_IN_STACK, _VISIT_DONE = 0, 1, 2
+
+
+class DirtyScanError(NinjaError):
+    """The scan reached a state where only ninja itself can give the answer."""
+
+
+def murmur_hash64a(data: bytes) -> int:
+    """Return ninja's MurmurHash64A of data (reference implementation of hash_commands)."""
+    h = (_MURMUR_SEED ^ (len(data) * _MURMUR_M)) & _MASK64
+    body = len(data) - len(data) % 8
+    for offset in range(0, body, 8):
+        k = (int.from_bytes(data[offset : offset + 8], "little") * _MURMUR_M) & _MASK64
+        k = ((k ^ (k >> _MURMUR_R)) * _MURMUR_M) & _MASK64
+        h = ((h ^ k) * _MURMUR_M) & _MASK64
+    if body < len(data):
+        h = ((h ^ int.from_bytes(data[body:], "little")) * _MURMUR_M) & _MASK64
+    h = ((h ^ (h >> _MURMUR_R)) * _MURMUR_M) & _MASK64
+    return h ^ (h >> _MURMUR_R)
+
+
+def hash_commands(commands: Sequence[bytes]) -> List[int]:
+    """Return murmur_hash64a() of every command, vectorised across commands.
+
+    MurmurHash64A is sequential within one input, so the loop runs over 8-byte
+    block positions and each step mixes that block into every command still long
+    enough to have it (commands are sorted by block count, making that a prefix).
+    """
+    count = len(commands)
+    if not count:
+        return []
+    m = np.uint64(_MURMUR_M)
+    r = np.uint64(_MURMUR_R)
+    lengths = np.fromiter(map(len, commands), dtype=np.int64, count=count)
+    blocks = lengths // 8
+    body = np.frombuffer(b"".join(command[: len(command) - len(command) % 8] for command in commands), dtype="<u8")
+    starts = np.zeros(count, dtype=np.int64)
+    np.cumsum(blocks[:-1], out=starts[1:])
+
+    order = np.argsort(-blocks, kind="stable")
+    negated_blocks = -blocks[order]
+    starts = starts[order]
+    h = np.uint64(_MURMUR_SEED) ^ (lengths[order].astype(np.uint64) * m)
+    for position in range(int(-negated_blocks[0])):
+        # Commands with more than `position` blocks form the prefix of the sorted order
+        active = int(np.searchsorted(negated_blocks, -position, side="left"))
+        k = body[starts[:active] + position] * m
+        k ^= k >> r
+        k *= m
+        h[:active] ^= k
+        h[:active] *= m
+
+    tails = np.fromiter((int.from_bytes(commands[i][len(commands[i]) - len(commands[i]) % 8 :], "little") for i in order.tolist()), dtype=np.uint64, count=count)
+    has_tail = (lengths[order] % 8) != 0
+    h[has_tail] = (h[has_tail] ^ tails[has_tail]) * m
+    h ^= h >> r
+    h *= m
+    h ^= h >> r
+
+    result = np.empty(count, dtype=np.uint64)
+    result[order] = h
+    return result.tolist()
+
+
+def canonicalize_path(path: str) -> str:
+    """Collapse ".", ".." and repeated separators the way ninja does when it creates a node."""
+    if "./" not in path and "/." not in path and "//" not in path and not path.endswith("/"):
+        return path
+    canonical = os.path.normpath(path)
+    if canonical.startswith("//"):
+        canonical = "/" + canonical.lstrip("/")
+    return canonical
+
+
+class StatCache:
+    """Node mtimes for dirty checks, read one directory listing at a time.
+
+    Mtimes follow ninja's conventions: nanoseconds, 0 for a missing file and at
+    least 1 for an existing one. Each directory is listed once; names absent from
+    the listing are missing without a stat() call, and prefetch() stats whole
+    directories on a thread pool (stat() releases the GIL, which matters most on
+    network filesystems and cold caches).
+
+    Attributes:
+        root: Directory relative paths are resolved against (ninja's working directory)
+        stat_calls: Number of stat() calls made so far
+    """
+
+    def __init__(self, root: str, workers: Optional[int] = None) -> None:
+        self.root = root
+        self.stat_calls = 0
+        self._workers = workers or min(32, (os.cpu_count() or 1) + 4)
+        self._mtimes: Dict[str, int] = {}
+        self._listings: Dict[str, Optional[Dict[str, "os.DirEntry[str]"]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._mtimes)
+
+    def _split(self, path: str) -> Tuple[str, str]:
+        directory, name = os.path.split(os.path.join(self.root, path))
+        return directory, name
+
+    @staticmethod
+    def _list(directory: str) -> Optional[Dict[str, "os.DirEntry[str]"]]:
+        try:
+            with os.scandir(directory) as entries:
+                return {entry.name: entry for entry in entries}
+        except OSError:
+            return None
+
+    @staticmethod
+    def _entry_mtime(entry: "os.DirEntry[str]") -> int:
+        try:
+            return entry.stat().st_mtime_ns or 1
+        except OSError:
+            # Dangling symlink: ninja's stat() sees a missing file
+            return 0
+
+    def _stat_directory(self, listing: Optional[Dict[str, "os.DirEntry[str]"]], paths: List[Tuple[str, str]]) -> Tuple[Dict[str, int], int]:
+        mtimes: Dict[str, int] = {}
+        calls = 0
+        for path, name in paths:
+            if name in ("", ".", ".."):
+                calls += 1
+                try:
+                    mtimes[path] = os.stat(os.path.join(self.root, path)).st_mtime_ns or 1
+                except OSError:
+                    mtimes[path] = 0
+            elif listing is None or name not in listing:
+                mtimes[path] = 0
+            else:
+                calls += 1
+                mtimes[path] = self._entry_mtime(listing[name])
+        return mtimes, calls
+
+    def _list_and_stat(self, directory: str, paths: List[Tuple[str, str]]) -> Tuple[str, Optional[Dict[str, "os.DirEntry[str]"]], Dict[str, int], int]:
+        listing = self._listings[directory] if directory in self._listings else self._list(directory)
+        mtimes, calls = self._stat_directory(listing, paths)
+        return directory, listing, mtimes, calls
+
+    def prefetch(self, paths: Iterable[str]) -> None:
+        """Stat every path not cached yet, grouped by directory."""
+        by_directory: Dict[str, List[Tuple[str, str]]] = {}
+        for path in paths:
+            if path not in self._mtimes:
+                directory, name = self._split(path)
+                by_directory.setdefault(directory, []).append((path, name))
+        if not by_directory:
+            return
+
+        if len(by_directory) < _PARALLEL_STAT_MIN_DIRS or self._workers <= 1:
+            results = [self._list_and_stat(directory, group) for directory, group in by_directory.items()]
+        else:
+            with ThreadPoolExecutor(max_workers=self._workers) as executor:
+                results = list(executor.map(lambda item: self._list_and_stat(*item), by_directory.items()))
+        for directory, listing, mtimes, calls in results:
+            self._listings[directory] = listing
+            self._mtimes.update(mtimes)
+            self.stat_calls += calls
+
+    def mtime(self, path: str) -> int:
+        """Return the mtime of path (relative to root), stat'ing it if it was not prefetched."""
+        mtime = self._mtimes.get(path)
+        if mtime is None:
+            directory, name = self._split(path)
+            _, listing, mtimes, calls = self._list_and_stat(directory, [(path, name)])
+            self._listings[directory] = listing
+            self.stat_calls += calls
+            mtime = self._mtimes[path] = mtimes[path]
+        return mtime
+
+
+class _Edge:
+    """Scan state of one build edge (or of a phony edge made up for a discovered dependency)."""
+
+    __slots__ = ("build", "outputs", "inputs", "order_only", "validations", "phony", "mark", "outputs_ready", "deps_loaded", "command_hash", "flags")
+
+    def __init__(self, build: Optional[NinjaBuild], outputs: List[str], inputs: List[str], order_only: int, validations: List[str]) -> None:
+        self.build = build
+        self.outputs = outputs
+        # Explicit and implicit inputs, then discovered dependencies, then order-only inputs
+        self.inputs = inputs
+        self.order_only = order_only
+        self.validations = validations
+        self.phony = build is None or build.rule == "phony"
+        self.mark = _VISIT_NONE
+        self.outputs_ready = False
+        self.deps_loaded = build is None
+        self.command_hash: Optional[int] = None
+        # Boolean bindings (generator, restat, ...) evaluated on first use by the scan
+        self.flags: Dict[str, bool] = {}
+
+
+@dataclass
+class DirtyExplanation:
+    """Result of an in-process `ninja -n -d explain`.
+
+    Attributes:
+        lines: The "ninja explain: ..." lines ninja would print, in ninja's order
+        dirty_outputs: Outputs of the edges that would run
+        edges_checked: Build edges visited
+        files_checked: Distinct paths whose mtime was read
+        elapsed: Seconds spent, including loading the manifest and logs
+    """
+
+    lines: List[str] = field(default_factory=list)
+    dirty_outputs: List[str] = field(default_factory=list)
+    edges_checked: int = 0
+    files_checked: int = 0
+    elapsed: float = 0.0
+
+
+class DirtyScan:
+    """Ninja's dirty-state walk over a parsed manifest and its logs.
+
+    Args:
+        manifest: Parsed build.ninja
+        build_log: The build's .ninja_log (None if ninja never finished a command)
+        deps_log: The build's .ninja_deps (None if there is none)
+        stat_cache: Mtime source; defaults to a StatCache rooted at manifest.build_dir
+
+    Raises:
+        DirtyScanError: If the manifest uses dyndep, which the scan does not model
+    """
+
+    def __init__(self, manifest: NinjaManifest, build_log: Optional[NinjaLog], deps_log: Optional[NinjaDepsLog], stat_cache: Optional[StatCache] = None) -> None:
+        self.manifest = manifest
+        self.build_log = build_log
+        self.deps_log = deps_log
+        self.stats = stat_cache or StatCache(manifest.build_dir)
+        self.lines: List[str] = []
+        self.dirty_outputs: List[str] = []
+        self.dirty_edges = 0
+        self._mtime: Dict[str, int] = {}
+        self._exists: Dict[str, bool] = {}
+        self._dirty: Dict[str, bool] = {}
+        self._producers: Dict[str, _Edge] = {}
+        self._consumed: Set[str] = set()
+        self._edges: List[_Edge] = []
+
+        for build in manifest.builds:
+            rule = manifest.rules.get(build.rule)
+            if "dyndep" in build.bindings or (rule is not None and "dyndep" in rule.bindings):
+                raise DirtyScanError("dyndep bindings need ninja's dyndep loader")
+            inputs = [canonicalize_path(path) for path in build.inputs + build.implicit_inputs + build.order_only_inputs]
+            edge = _Edge(
+                build,
+                [canonicalize_path(path) for path in build.all_outputs()],
+                inputs,
+                len(build.order_only_inputs),
+                [canonicalize_path(path) for path in build.validations],
+            )
+            self._edges.append(edge)
+            for output in edge.outputs:
+                # ninja rejects duplicate outputs by default; keep the first producer
+                self._producers.setdefault(output, edge)
+            self._consumed.update(inputs)
+
+    @property
+    def edges_checked(self) -> int:
+        """Number of manifest edges the walk has visited."""
+        return sum(edge.mark == _VISIT_DONE for edge in self._edges)
+
+    def _explain(self, message: str) -> None:
+        self.lines.append(EXPLAIN_PREFIX + message)
+
+    def _flag(self, edge: _Edge, name: str) -> bool:
+        value = edge.flags.get(name)
+        if value is None:
+            value = edge.flags[name] = edge.build is not None and self.manifest.evaluate(edge.build, name) != ""
+        return value
+
+    def _stat(self, path: str) -> None:
+        if path not in self._mtime:
+            mtime = self.stats.mtime(path)
+            self._mtime[path] = mtime
+            self._exists[path] = mtime != 0
+
+    def _hash_edge_commands(self) -> None:
+        """Hash the command of every edge whose outputs the build log knows, in one batch."""
+        if self.build_log is None:
+            return
+        entries = self.build_log.entries
+        edges = []
+        commands = []
+        for edge in self._edges:
+            if edge.phony or not any(output in entries for output in edge.outputs) or self._flag(edge, "generator"):
+                continue
+            assert edge.build is not None
+            command = self.manifest.evaluate(edge.build, "command")
+            rspfile_content = self.manifest.evaluate(edge.build, "rspfile_content")
+            if rspfile_content:
+                command += ";rspfile=" + rspfile_content
+            edges.append(edge)
+            commands.append(command.encode("utf-8", "surrogateescape"))
+        for edge, command_hash in zip(edges, hash_commands(commands)):
+            edge.command_hash = command_hash
+
+    def default_targets(self) -> List[str]:
+        """Return what a bare `ninja` builds: the default statements, else every root output."""
+        if self.manifest.defaults:
+            targets = [canonicalize_path(path) for path in self.manifest.defaults]
+            unknown = [target for target in targets if target not in self._producers and target not in self._consumed]
+            if unknown:
+                raise DirtyScanError(f"unknown default target '{unknown[0]}'")
+            return targets
+        roots = [output for edge in self._edges for output in edge.outputs if output not in self._consumed]
+        if not roots and self._edges:
+            raise DirtyScanError("could not determine root nodes of build graph")
+        return roots
+
+    def scan(self, targets: Optional[List[str]] = None) -> List[str]:
+        """Run the dirty walk as `ninja -n` would and return the explain lines.
+
+        The manifest is checked first; when its own generator edge is dirty ninja
+        stops after that step in a dry run, and so does the scan.
+
+        Raises:
+            DirtyScanError: If only ninja can answer (cycles, missing inputs, ...)
+        """
+        manifest_node = canonicalize_path(os.path.relpath(self.manifest.path, self.manifest.build_dir))
+        self.stats.prefetch(path for edge in self._edges for path in edge.outputs + edge.inputs + edge.validations)
+        if self.deps_log is not None:
+            self.stats.prefetch(self.deps_log.paths)
+        self._hash_edge_commands()
+
+        if manifest_node in self._producers:
+            self._recompute(manifest_node)
+            if self._dirty[manifest_node]:
+                return self.lines
+        for target in targets if targets is not None else self.default_targets():
+            self._recompute(target)
+        return self.lines
+
+    def _recompute(self, node: str) -> None:
+        # Validation inputs are scanned after the node that requested them (DependencyScan::RecomputeDirty)
+        pending = deque([node])
+        while pending:
+            validations: List[str] = []
+            self._visit(pending.popleft(), validations)
+            pending.extend(validations)
+
+    def _visit(self, node: str, validations: List[str]) -> None:
+        edge = self._producers.get(node)
+        if edge is None:
+            if node in self._dirty:
+                return
+            self._stat(node)
+            if not self._exists[node]:
+                # ninja fails the build here ("missing and no known rule to make it")
+                raise DirtyScanError(f"'{node}' is missing and no known rule makes it")
+            self._dirty[node] = False
+            return
+
+        if edge.mark == _VISIT_DONE:
+            return
+        if edge.mark == _VISIT_IN_STACK:
+            raise DirtyScanError(f"dependency cycle through '{node}'")
+        edge.mark = _VISIT_IN_STACK
+        validations.extend(edge.validations)
+
+        dirty = False
+        edge.outputs_ready = True
+        for output in edge.outputs:
+            self._stat(output)
+        if not edge.deps_loaded:
+            edge.deps_loaded = True
+            # Failing to load deps explains itself and forces a rerun to regenerate them
+            dirty = not self._load_deps(edge)
+
+        most_recent: Optional[str] = None
+        first_order_only = len(edge.inputs) - edge.order_only
+        for index, path in enumerate(edge.inputs):
+            self._visit(path, validations)
+            producer = self._producers.get(path)
+            if producer is not None and not producer.outputs_ready:
+                edge.outputs_ready = False
+            if index >= first_order_only:
+                continue
+            if self._dirty[path]:
+                self._explain(f"{path} is dirty")
+                dirty = True
+            elif most_recent is None or self._mtime[path] > self._mtime[most_recent]:
+                most_recent = path
+
+        if not dirty:
+            dirty = any(self._output_dirty(edge, most_recent, output) for output in edge.outputs)
+
+        for output in edge.outputs:
+            self._dirty[output] = dirty
+        if dirty:
+            if not edge.phony:
+                self.dirty_edges += 1
+                self.dirty_outputs.extend(edge.outputs)
+            if not (edge.phony and not edge.inputs):
+                edge.outputs_ready = False
+        edge.mark = _VISIT_DONE
+
+    def _output_dirty(self, edge: _Edge, most_recent: Optional[str], output: str) -> bool:
+        # DependencyScan::RecomputeOutputDirty, message for message
+        if edge.phony:
+            if not edge.inputs and not self._exists[output]:
+                self._explain(f"output {output} of phony edge with no inputs doesn't exist")
+                return True
+            if most_recent is not None and not self._exists[output]:
+                # Dependents compare against the newest input of a phony target
+                self._mtime[output] = max(self._mtime[output], self._mtime[most_recent])
+            return False
+
+        if not self._exists[output]:
+            self._explain(f"output {output} doesn't exist")
+            return True
+
+        entry: Optional[NinjaLogEntry] = self.build_log.entry(output) if self.build_log is not None else None
+        # A restat rule may have left its output untouched; only the recorded mtime counts then
+        used_restat = entry is not None and self._flag(edge, "restat")
+        if not used_restat and most_recent is not None and self._mtime[output] < self._mtime[most_recent]:
+            self._explain(f"output {output} older than most recent input {most_recent} ({self._mtime[output]} vs {self._mtime[most_recent]})")
+            return True
+
+        if self.build_log is None:
+            return False
+        generator = self._flag(edge, "generator")
+        if entry is not None:
+            if not generator and not self._same_command(edge, entry):
+                self._explain(f"command line changed for {output}")
+                return True
+            if most_recent is not None and entry.mtime < self._mtime[most_recent]:
+                self._explain(f"recorded mtime of {output} older than most recent input {most_recent} ({entry.mtime} vs {self._mtime[most_recent]})")
+                return True
+        elif not generator:
+            self._explain(f"command line not found in log for {output}")
+            return True
+        return False
+
+    @staticmethod
+    def _same_command(edge: _Edge, entry: NinjaLogEntry) -> bool:
+        try:
+            return edge.command_hash == int(entry.command_hash, 16)
+        except ValueError:
+            return False
+
+    def _load_deps(self, edge: _Edge) -> bool:
+        # ImplicitDepLoader::LoadDeps: deps log for `deps = ...` rules, else the depfile
+        assert edge.build is not None
+        if self.manifest.evaluate(edge.build, "deps"):
+            output = edge.outputs[0]
+            node = self.deps_log.node_id(output) if self.deps_log is not None else None
+            record = self.deps_log.deps.get(node) if self.deps_log is not None and node is not None else None
+            if record is None:
+                self._explain(f"deps for '{output}' are missing")
+                return False
+            if self._mtime[output] > record[0]:
+                self._explain(f"stored deps info out of date for '{output}' ({record[0]} vs {self._mtime[output]})")
+                return False
+            assert self.deps_log is not None
+            paths = self.deps_log.paths
+            self._add_dependencies(edge, [paths[i] for i in record[1]])
+            return True
+
+        depfile = self.manifest.evaluate(edge.build, "depfile")
+        if depfile:
+            try:
+                with open(os.path.join(self.manifest.build_dir, depfile), "r", encoding="utf-8", errors="surrogateescape") as f:
+                    content = f.read()
+            except FileNotFoundError:
+                content = ""
+            except OSError as e:
+                raise DirtyScanError(f"cannot read depfile '{depfile}': {e}") from e
+            if not content:
+                self._explain(f"depfile '{depfile}' is missing")
+                return False
+            self._add_dependencies(edge, [canonicalize_path(path) for path in parse_depfile(content)])
+        return True
+
+    def _add_dependencies(self, edge: _Edge, dependencies: List[str]) -> None:
+        position = len(edge.inputs) - edge.order_only
+        edge.inputs[position:position] = dependencies
+        for path in dependencies:
+            if path not in self._producers:
+                # Discovered headers get a phony producer so a deleted one means "rebuild", not an error
+                self._producers[path] = _Edge(None, [path], [], 0, [])
+
+
+def parse_depfile(content: str) -> List[str]:
+    """Return the prerequisites of a Makefile-style depfile, in order and without duplicates.
+
+    Rules without prerequisites (the "header.h:" lines of gcc -MP) contribute nothing.
+    """
+    text = content.replace("\\\r\n", " ").replace("\\\n", " ")
+    prerequisites: List[str] = []
+    seen = set()
+    for line in text.splitlines():
+        after_colon = False
+        for token in _split_depfile_line(line):
+            if not after_colon:
+                after_colon = token.endswith(":")
+                continue
+            if token not in seen:
+                seen.add(token)
+                prerequisites.append(token)
+    return prerequisites
+
+
+def _split_depfile_line(line: str) -> List[str]:
+    # Whitespace separates paths unless backslash-escaped; "$$" is a literal "$"
+    tokens: List[str] = []
+    current: List[str] = []
+    index = 0
+    while index < len(line):
+        char = line[index]
+        if char == "\\" and index + 1 < len(line) and line[index + 1] in " #\\":
+            current.append(line[index + 1])
+            index += 2
+            continue
+        if char == "$" and line.startswith("$$", index):
+            current.append("$")
+            index += 2
+            continue
+        if char in " \t":
+            if current:
+                tokens.append("".join(current))
+                current = []
+        else:
+            current.append(char)
+        index += 1
+    if current:
+        tokens.append("".join(current))
+    return tokens
+
+
+def explain_dirty(build_dir: str) -> Optional[DirtyExplanation]:
+    """Compute what `ninja -n -d explain` would print for build_dir, without running ninja.
+
+    Args:
+        build_dir: Path to the build directory
+
+    Returns:
+        DirtyExplanation, or None when the build was never run by ninja (no
+        .ninja_log), the logs are in a format the scan cannot check, or the
+        manifest needs something only ninja handles; callers then run ninja
+    """
+    start_time = time.perf_counter()
+    build_dir = os.path.abspath(build_dir)
+    build_ninja = os.path.join(build_dir, "build.ninja")
+    if not os.path.exists(build_ninja):
+        return None
+    build_log = load_ninja_log(build_dir)
+    if build_log is None:
+        logger.debug("No .ninja_log in %s; deferring the dirty check to ninja", build_dir)
+        return None
+    if build_log.version not in MURMUR_LOG_VERSIONS:
+        logger.info(".ninja_log v%d command hashes cannot be checked in-process; deferring the dirty check to ninja", build_log.version)
+        return None
+    deps_log = load_ninja_deps(build_dir)
+    if deps_log is not None and deps_log.version != NANOSECOND_DEPS_VERSION:
+        logger.info(".ninja_deps v%d mtimes cannot be compared in-process; deferring the dirty check to ninja", deps_log.version)
+        return None
+
+    try:
+        manifest = load_ninja_manifest(build_ninja)
+        scan = DirtyScan(manifest, build_log, deps_log)
+        lines = scan.scan()
+    except (OSError, NinjaError, RecursionError) as e:
+        logger.info("In-process dirty check not possible for %s (%s); deferring to ninja", build_dir, e)
+        return None
+
+    elapsed = time.perf_counter() - start_time
+    checked = scan.edges_checked
+    logger.info("Computed dirty set in-process in %.2fs: %d of %d edges would run (%d files checked)", elapsed, scan.dirty_edges, checked, len(scan.stats))
+    return DirtyExplanation(lines, scan.dirty_outputs, checked, len(scan.stats), elapsed)
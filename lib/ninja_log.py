@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# ****************************************************************************************************************************************************
+# * BSD 3-Clause License
+# *
+# * Copyright (c) 2025, Mana Battery
+# * All rights reserved.
+# *
+# * Redistribution and use in source and binary forms, with or without modification, are permitted provided that the following conditions are met:
+# *
+# * 1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following disclaimer.
+# * 2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following disclaimer in the
+# *    documentation and/or other materials provided with the distribution.
+# * 3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products derived from this
+# *    software without specific prior written permission.
+# *
+# * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# * THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# * CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# * PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# * LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE,
+# * EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+# ****************************************************************************************************************************************************
+"""In-process reader for ninja's build log (.ninja_log).
+
+ninja appends one line per finished command to .ninja_log. Versions 5 to 7 share
+one layout: a "# ninja log vN" header, then tab-separated lines of
+
+    start_ms  end_ms  mtime  output  command_hash
+
+where start/end are milliseconds since the build started, mtime is the output's
+recorded mtime (in ninja's own timestamp units, as in .ninja_deps) and the hash
+identifies the command line. Entries are appended, so the last line for an output
+is the current one.
+
+load_compile_times() maps the compile edges of build.ninja back to their sources
+so rebuild estimates can be weighted by how long each translation unit actually
+takes instead of counting every TU as equally expensive.
+"""
+
+import logging
+import os
+import statistics
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Optional, Sequence, Tuple
+
+import numpy as np
+
+from lib.constants import NINJA_LOG_CACHE_SIZE, NinjaError
+from lib.ninja_manifest import load_ninja_manifest, ninja_state_dir
+
+logger = logging.getLogger(__name__)
+
+NINJA_LOG_FILE = ".ninja_log"
+NINJA_LOG_SIGNATURE = "# ninja log v"
+SUPPORTED_LOG_VERSIONS = (5, 6, 7)
+
+# Loaded logs keyed by path: ((mtime_ns, size), log)
+_log_cache: "OrderedDict[str, Tuple[Tuple[int, int], NinjaLog]]" = OrderedDict()
+
+
+@dataclass(frozen=True)
+class NinjaLogEntry:
+    """One .ninja_log line.
+
+    Attributes:
+        start_ms: Command start, in milliseconds since its build began
+        end_ms: Command end, in milliseconds since its build began
+        mtime: Recorded output mtime
+        output: Output path as written in build.ninja
+        command_hash: Hash of the command line (hex string)
+    """
+
+    start_ms: int
+    end_ms: int
+    mtime: int
+    output: str
+    command_hash: str
+
+    @property
+    def duration(self) -> float:
+        """Return the command's wall time in seconds."""
+        return max(0, self.end_ms - self.start_ms) / 1000.0
+
+
+@dataclass
+class NinjaLog:
+    """Decoded .ninja_log contents.
+
+    Attributes:
+        version: Log format version
+        entries: Output path -> most recent entry for that output
+    """
+
+    version: int
+    entries: Dict[str, NinjaLogEntry]
+
+    def entry(self, output: str) -> Optional[NinjaLogEntry]:
+        """Return the most recent entry for output, or None if it was never built."""
+        return self.entries.get(output)
+
+
+def read_ninja_log(path: str) -> NinjaLog:
+    """Decode a .ninja_log file, keeping the most recent entry per output.
+
+    Args:
+        path: Path to .ninja_log
+
+    Returns:
+        NinjaLog with one entry per output
+
+    Raises:
+        OSError: If the file cannot be read
+        NinjaError: If the file is not a build log or its version is not supported
+    """
+    with open(path, "r", encoding="utf-8", errors="surrogateescape") as f:
+        header = f.readline()
+        if not header.startswith(NINJA_LOG_SIGNATURE):
+            raise NinjaError(f"{path}: not a ninja build log")
+        try:
+            version = int(header[len(NINJA_LOG_SIGNATURE) :])
+        except ValueError as e:
+            raise NinjaError(f"{path}: malformed build log header {header.strip()!r}") from e
+        if version not in SUPPORTED_LOG_VERSIONS:
+            raise NinjaError(f"{path}: unsupported .ninja_log version {version}")
+
+        entries: Dict[str, NinjaLogEntry] = {}
+        skipped = 0
+        for line in f:
+            fields = line.rstrip("\n").split("\t")
+            if len(fields) != 5:
+                # Repeated headers after recompaction, or a line cut short by an interrupted build
+                skipped += not line.startswith(NINJA_LOG_SIGNATURE)
+                continue
+            start, end, mtime, output, command_hash = fields
+            try:
+                entries[output] = NinjaLogEntry(int(start), int(end), int(mtime), output, command_hash)
+            except ValueError:
+                skipped += 1
+
+    if skipped:
+        logger.debug("%s: skipped %d malformed lines", path, skipped)
+    logger.debug("Read %d entries from %s (v%d)", len(entries), path, version)
+    return NinjaLog(version, entries)
+
+
+def find_ninja_log(build_dir: str) -> str:
+    """Return the .ninja_log path for build_dir, honouring a top-level builddir variable."""
+    return os.path.join(ninja_state_dir(build_dir), NINJA_LOG_FILE)
+
+
+def load_ninja_log(build_dir: str) -> Optional[NinjaLog]:
+    """Return build_dir's build log, reusing this process's copy while the file is unchanged.
+
+    Args:
+        build_dir: Path to the build directory
+
+    Returns:
+        NinjaLog, or None if there is no log or it cannot be decoded
+    """
+    path = find_ninja_log(build_dir)
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    identity = (stat.st_mtime_ns, stat.st_size)
+
+    key = os.path.realpath(path)
+    cached = _log_cache.get(key)
+    if cached is not None and cached[0] == identity:
+        _log_cache.move_to_end(key)
+        return cached[1]
+
+    try:
+        log = read_ninja_log(path)
+    except (OSError, NinjaError) as e:
+        logger.info("Cannot read %s (%s)", path, e)
+        return None
+    _log_cache[key] = (identity, log)
+    _log_cache.move_to_end(key)
+    while len(_log_cache) > NINJA_LOG_CACHE_SIZE:
+        _log_cache.popitem(last=False)
+    return log
+
+
+def clear_ninja_log_cache() -> None:
+    """Drop all cached build logs."""
+    _log_cache.clear()
+
+
+@dataclass
+class CompileTimes:
+    """Most recent compile duration of every source, from .ninja_log.
+
+    Sources ninja has no entry for (never built, or built by a command that is no
+    longer in the log) are estimated at the median duration.
+
+    Attributes:
+        by_source: Absolute source path -> compile seconds (keyed by both the
+            normalized and the symlink-resolved path when they differ)
+        default: Seconds assumed for sources without a log entry
+    """
+
+    by_source: Dict[str, float]
+    default: float = 0.0
+    _resolved: Dict[str, Optional[float]] = field(default_factory=dict, repr=False)
+
+    def lookup(self, source: str) -> Optional[float]:
+        """Return the recorded compile seconds of source, or None if it has no entry."""
+        seconds = self.by_source.get(source)
+        if seconds is None:
+            if source not in self._resolved:
+                self._resolved[source] = self.by_source.get(os.path.realpath(source))
+            seconds = self._resolved[source]
+        return seconds
+
+    def seconds(self, source: str) -> float:
+        """Return the compile seconds of source, estimating unknown sources."""
+        seconds = self.lookup(source)
+        return self.default if seconds is None else seconds
+
+    def total(self, sources: Iterable[str]) -> float:
+        """Return the estimated CPU-seconds to compile all of sources."""
+        return sum(self.seconds(source) for source in sources)
+
+    def weights(self, sources: Sequence[str]) -> np.ndarray:
+        """Return compile seconds for sources as a float array in the same order."""
+        return np.fromiter((self.seconds(source) for source in sources), dtype=np.float64, count=len(sources))
+
+
+def load_compile_times(build_dir: str) -> Optional[CompileTimes]:
+    """Return the compile seconds of every source compiled by build_dir, from .ninja_log.
+
+    Compile edges are found as in extract_source_and_header_files_from_ninja(): a
+    C/C++ compiler rule whose first input is a source file. Each source gets the
+    duration of the latest log entry for the edge's first output.
+
+    Args:
+        build_dir: Path to the build directory
+
+    Returns:
+        CompileTimes, or None if there is no usable log or no compile edge was ever built
+    """
+    from lib.clang_utils import is_valid_source_file
+    from lib.ninja_utils import CXX_RULE_PREFIXES
+
+    build_dir = os.path.abspath(build_dir)
+    build_ninja = os.path.join(build_dir, "build.ninja")
+    log = load_ninja_log(build_dir)
+    if log is None or not os.path.exists(build_ninja):
+        return None
+    try:
+        manifest = load_ninja_manifest(build_ninja)
+    except (OSError, NinjaError) as e:
+        logger.warning("Failed to read %s: %s", build_ninja, e)
+        return None
+
+    by_source: Dict[str, float] = {}
+    durations = []
+    for build in manifest.builds:
+        if not build.rule.upper().startswith(CXX_RULE_PREFIXES) or not build.inputs or not build.outputs:
+            continue
+        if not is_valid_source_file(build.inputs[0]):
+            continue
+        entry = log.entry(build.outputs[0])
+        if entry is None:
+            continue
+        source = os.path.normpath(os.path.join(build_dir, build.inputs[0]))
+        by_source[source] = entry.duration
+        durations.append(entry.duration)
+        resolved = os.path.realpath(source)
+        if resolved != source:
+            by_source[resolved] = entry.duration
+
+    if not by_source:
+        logger.debug("No compile edges of %s appear in %s", build_ninja, find_ninja_log(build_dir))
+        return None
+    default = statistics.median(durations)
+    logger.info("Loaded compile times for %d sources from .ninja_log (median %.2fs)", len(durations), default)
+    return CompileTimes(by_source, default)
+
+
+def format_cpu_time(seconds: float) -> str:
+    """Format a CPU-time estimate compactly (e.g. "42.0s", "12m 05s", "3h 20m")."""
+    if seconds < 60:
+        return f"{seconds:.1f}s"
+    minutes, secs = divmod(int(round(seconds)), 60)
+    if minutes < 60:
+        return f"{minutes}m {secs:02d}s"
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}h {minutes:02d}m"
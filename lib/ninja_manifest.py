@@ -0,0 +1,493 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# ****************************************************************************************************************************************************
+# * BSD 3-Clause License
+# *
+# * Copyright (c) 2025, Mana Battery
+# * All rights reserved.
+# *
+# * Redistribution and use in source and binary forms, with or without modification, are permitted provided that the following conditions are met:
+# *
+# * 1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following disclaimer.
+# * 2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following disclaimer in the
+# *    documentation and/or other materials provided with the distribution.
+# * 3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products derived from this
+# *    software without specific prior written permission.
+# *
+# * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# * THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# * CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# * PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# * LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE,
+# * EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+# ****************************************************************************************************************************************************
+"""Single-pass parser for ninja manifests (build.ninja) with a parsed-model cache.
+
+Several analyses need different views of build.ninja (compile edges, generated
+files, link edges, compile commands). Instead of each re-reading the manifest
+with line regexes, parse_ninja_manifest() reads it once into a NinjaManifest:
+rules, pools, defaults, top-level variables and every build edge with its
+explicit/implicit/order-only inputs and outputs. It follows the ninja manifest
+language: $-continuations and escapes, include (same scope) and subninja (child
+scope), edge-scoped variables and rule variables that are expanded lazily per
+edge ($in, $out, edge bindings, rule bindings, then the enclosing file scope).
+Statements ninja would reject (undeclared rules, stray indents) are skipped or
+kept with a debug log rather than failing the whole analysis.
+
+load_ninja_manifest() caches the model per process, keyed by the identity
+(mtime, size, inode) of every file the manifest read, so all consumers in a run
+share one parse and any regenerated manifest is re-read.
+"""
+
+import functools
+import gc
+import logging
+import os
+import re
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+from lib.constants import NINJA_MANIFEST_CACHE_SIZE, NinjaError
+
+logger = logging.getLogger(__name__)
+
+# $-escapes inside evaluated strings: $$, $:, "$ ", ${name} and $name
+RE_DOLLAR = re.compile(r"\$(?:(\$)|(:)|( )|\{([a-zA-Z0-9_.-]+)\}|([a-zA-Z0-9_-]+))")
+# Tokens on a build line: separators (|@, ||, |, :) or a path with $-escapes
+RE_BUILD_TOKEN = re.compile(r"\|@|\|\||\||:|(?:[^\s$:|]+|\$.)+")
+# $-newline continuation (an odd number of $ before the newline) and the next line's indentation
+RE_CONTINUATION = re.compile(r"((?:^|[^$])(?:\$\$)*)\$\r?\n *", re.MULTILINE)
+RE_BINDING = re.compile(r"([a-zA-Z0-9_.-]+)\s*=\s*(.*)")
+# A top-level statement (not a comment) and the indented lines directly below it
+RE_STATEMENT = re.compile(r"^([^\s#][^\n]*)((?:\n +[^\n]*)*)", re.MULTILINE)
+# One "  name = value" line inside a statement's block (indented comments do not match)
+RE_BLOCK_BINDING = re.compile(r"\n +([a-zA-Z0-9_.-]+) *= *([^\n]*)")
+
+# Build line separators -> index into (inputs, implicit, order-only, validations)
+_INPUT_SECTIONS = {"|": 1, "||": 2, "|@": 3}
+
+# Characters that never need quoting in $in/$out (mirrors ninja's POSIX shell escaping)
+RE_SHELL_SAFE = re.compile(r"[A-Za-z0-9_+\-./:@%=,]*")
+
+# Parsed manifests keyed by real path: (file identities, manifest)
+_manifest_cache: "OrderedDict[str, Tuple[Tuple[Tuple[str, int, int, int], ...], NinjaManifest]]" = OrderedDict()
+
+
+class NinjaScope:
+    """Variable scope of a manifest file; subninja files get a child scope."""
+
+    __slots__ = ("bindings", "parent")
+
+    def __init__(self, parent: Optional["NinjaScope"] = None) -> None:
+        self.bindings: Dict[str, str] = {}
+        self.parent = parent
+
+    def lookup(self, name: str) -> str:
+        """Return the value of name in this scope or its parents ("" if unset)."""
+        scope: Optional[NinjaScope] = self
+        while scope is not None:
+            value = scope.bindings.get(name)
+            if value is not None:
+                return value
+            scope = scope.parent
+        return ""
+
+
+@dataclass
+class NinjaRule:
+    """A rule declaration.
+
+    Attributes:
+        name: Rule name
+        bindings: Rule variables, unevaluated (expanded per edge by NinjaManifest.evaluate())
+    """
+
+    name: str
+    bindings: Dict[str, str] = field(default_factory=dict)
+
+
+class NinjaBuild:
+    """One build edge, with all paths evaluated.
+
+    Attributes:
+        rule: Rule name ("phony" for phony edges)
+        outputs: Explicit outputs
+        implicit_outputs: Implicit outputs (after |)
+        inputs: Explicit inputs ($in)
+        implicit_inputs: Implicit inputs (after |)
+        order_only_inputs: Order-only inputs (after ||)
+        validations: Validation inputs (after |@)
+        scope: Scope of the manifest file that declared the edge
+    """
+
+    __slots__ = ("rule", "outputs", "implicit_outputs", "inputs", "implicit_inputs", "order_only_inputs", "validations", "scope", "_bindings")
+
+    def __init__(
+        self,
+        rule: str,
+        outputs: List[str],
+        implicit_outputs: List[str],
+        inputs: List[str],
+        implicit_inputs: List[str],
+        order_only_inputs: List[str],
+        validations: List[str],
+        bindings: Union[Dict[str, str], str],
+        scope: NinjaScope,
+    ) -> None:
+        self.rule = rule
+        self.outputs = outputs
+        self.implicit_outputs = implicit_outputs
+        self.inputs = inputs
+        self.implicit_inputs = implicit_inputs
+        self.order_only_inputs = order_only_inputs
+        self.validations = validations
+        self.scope = scope
+        self._bindings = bindings
+
+    @property
+    def bindings(self) -> Dict[str, str]:
+        """Edge-scoped variables, evaluated in the enclosing scope."""
+        if isinstance(self._bindings, str):
+            # Blocks without any $ are kept as text until first use; their values are literal
+            self._bindings = dict(RE_BLOCK_BINDING.findall(self._bindings))
+        return self._bindings
+
+    def __repr__(self) -> str:
+        return f"NinjaBuild(rule={self.rule!r}, outputs={self.outputs!r}, inputs={self.inputs!r})"
+
+    def all_outputs(self) -> List[str]:
+        """Return explicit and implicit outputs."""
+        return self.outputs + self.implicit_outputs
+
+    def all_inputs(self) -> List[str]:
+        """Return explicit, implicit and order-only inputs."""
+        return self.inputs + self.implicit_inputs + self.order_only_inputs
+
+
+@dataclass
+class NinjaManifest:
+    """Parsed ninja manifest.
+
+    Attributes:
+        path: Path of the top-level manifest
+        build_dir: Directory ninja runs in (relative paths are relative to it)
+        rules: Rule name -> NinjaRule (includes the built-in phony rule)
+        builds: Build edges in declaration order
+        pools: Pool name -> depth (includes the built-in console pool)
+        defaults: Default targets
+        scope: Top-level variable scope
+        files: Every manifest file read (top level, includes and subninjas)
+    """
+
+    path: str
+    build_dir: str
+    rules: Dict[str, NinjaRule]
+    builds: List[NinjaBuild]
+    pools: Dict[str, int]
+    defaults: List[str]
+    scope: NinjaScope
+    files: List[str]
+    _producers: Optional[Dict[str, NinjaBuild]] = field(default=None, repr=False)
+
+    def evaluate(self, build: NinjaBuild, name: str) -> str:
+        """Evaluate variable name for a build edge, as ninja does when running it.
+
+        Lookup order: $in/$out, edge bindings, rule bindings (expanded for this
+        edge), then the scope the edge was declared in.
+
+        Raises:
+            NinjaError: If rule variables reference each other cyclically
+        """
+        rule = self.rules.get(build.rule)
+        rule_bindings = rule.bindings if rule is not None else {}
+        edge_bindings = build.bindings
+
+        def lookup(var: str, active: Tuple[str, ...]) -> str:
+            if var == "in":
+                return " ".join(map(_shell_escape, build.inputs))
+            if var == "out":
+                return " ".join(map(_shell_escape, build.outputs))
+            if var == "in_newline":
+                return "\n".join(map(_shell_escape, build.inputs))
+            value = edge_bindings.get(var)
+            if value is not None:
+                return value
+            raw = rule_bindings.get(var)
+            if raw is None:
+                return build.scope.lookup(var)
+            if var in active:
+                raise NinjaError(f"Cycle in rule variables: {' -> '.join(active + (var,))}")
+            inner = active + (var,)
+            return "".join(part if is_literal else lookup(part, inner) for is_literal, part in _template(raw))
+
+        return lookup(name, ())
+
+    def command(self, build: NinjaBuild) -> str:
+        """Return the command ninja would run for build ("" for phony edges)."""
+        return "" if build.rule == "phony" else self.evaluate(build, "command")
+
+    def is_generator(self, build: NinjaBuild) -> bool:
+        """Return True if the edge (or its rule) sets a non-empty generator variable."""
+        return self.evaluate(build, "generator") != ""
+
+    def producers(self) -> Dict[str, NinjaBuild]:
+        """Return a mapping of every output (explicit and implicit) to the edge producing it (built once)."""
+        if self._producers is None:
+            self._producers = {output: build for build in self.builds for output in build.outputs + build.implicit_outputs}
+        return self._producers
+
+
+def _shell_escape(path: str) -> str:
+    """Quote path for a POSIX shell if needed (like ninja's $in/$out expansion)."""
+    if RE_SHELL_SAFE.fullmatch(path):
+        return path
+    return "'" + path.replace("'", "'\\''") + "'"
+
+
+def _evaluate(text: str, lookup: Callable[[str], str]) -> str:
+    """Expand $-escapes and variable references in text."""
+    if "$" not in text:
+        return text
+
+    def replace(match: "re.Match[str]") -> str:
+        literal = match.group(1) or match.group(2) or match.group(3)
+        if literal:
+            return literal
+        return lookup(match.group(4) or match.group(5))
+
+    return RE_DOLLAR.sub(replace, text)
+
+
+@functools.lru_cache(maxsize=None)
+def _template(text: str) -> Tuple[Tuple[bool, str], ...]:
+    """Split text into (is_literal, literal text or variable name) parts, so rule variables are scanned once."""
+    parts: List[Tuple[bool, str]] = []
+    position = 0
+    for match in RE_DOLLAR.finditer(text):
+        literal = text[position : match.start()] + (match.group(1) or match.group(2) or match.group(3) or "")
+        if literal:
+            parts.append((True, literal))
+        name = match.group(4) or match.group(5)
+        if name:
+            parts.append((False, name))
+        position = match.end()
+    if position < len(text):
+        parts.append((True, text[position:]))
+    return tuple(parts)
+
+
+def _split_build_line(text: str) -> List[str]:
+    """Split the part of a build line after "build" into paths and separators (|@, ||, |, :)."""
+    if "$" not in text:
+        outputs, colon, inputs = text.partition(":")
+        if colon:
+            tokens = outputs.split()
+            tokens.append(":")
+            tokens += inputs.split()
+            # Fast path holds unless a separator is glued to a path (e.g. "a|b")
+            if "|" not in text or all(token in _INPUT_SECTIONS or "|" not in token for token in tokens):
+                return tokens
+    return RE_BUILD_TOKEN.findall(text)
+
+
+def _read_manifest(path: str) -> str:
+    """Read a manifest file with $-continuations joined and "\\n" line endings."""
+    with open(path, "r", encoding="utf-8", errors="surrogateescape") as f:
+        text = f.read()
+    if "$\n" in text or "$\r\n" in text:
+        text = RE_CONTINUATION.sub(r"\1", text)
+    return text.replace("\r\n", "\n")
+
+
+class _ManifestParser:
+    """Builds a NinjaManifest from a top-level manifest and everything it includes."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.build_dir = os.path.dirname(os.path.abspath(path))
+        self.rules: Dict[str, NinjaRule] = {"phony": NinjaRule("phony")}
+        self.builds: List[NinjaBuild] = []
+        self.pools: Dict[str, int] = {"console": 1}
+        self.defaults: List[str] = []
+        self.files: List[str] = []
+
+    def parse(self) -> NinjaManifest:
+        scope = NinjaScope()
+        self._parse_file(self.path, scope)
+        return NinjaManifest(self.path, self.build_dir, self.rules, self.builds, self.pools, self.defaults, scope, self.files)
+
+    def _resolve(self, path: str) -> str:
+        return path if os.path.isabs(path) else os.path.join(self.build_dir, path)
+
+    @staticmethod
+    def _skip(path: str, statement: str, message: str) -> None:
+        # Analysis tolerates manifest fragments ninja itself would reject (e.g. edges using undeclared rules)
+        logger.debug("%s: %s; ignored statement: %.200s", path, message, statement)
+
+    def _parse_file(self, path: str, scope: NinjaScope) -> None:
+        self.files.append(path)
+        # Each match is one top-level statement plus the indented binding lines that follow it
+        for match in RE_STATEMENT.finditer(_read_manifest(path)):
+            line, block = match.group(1), match.group(2)
+            keyword, _, rest = line.partition(" ")
+            rest = rest.lstrip(" ")
+            if keyword == "build":
+                self._add_build(path, line, rest, block, scope)
+            elif keyword == "rule":
+                if rest in self.rules:
+                    self._skip(path, line, f"duplicate rule '{rest}'")
+                # Rule variables stay unevaluated; they are expanded per edge
+                self.rules[rest] = NinjaRule(rest, dict(RE_BLOCK_BINDING.findall(block)))
+            elif keyword == "pool":
+                depth = dict(RE_BLOCK_BINDING.findall(block)).get("depth", "")
+                depth = _evaluate(depth, scope.lookup)
+                if depth.isdigit():
+                    self.pools[rest] = int(depth)
+                else:
+                    self._skip(path, line, f"expected 'depth =' line for pool '{rest}'")
+            elif keyword == "default":
+                self.defaults.extend(_evaluate(token, scope.lookup) for token in RE_BUILD_TOKEN.findall(rest))
+            elif keyword in ("include", "subninja"):
+                target = self._resolve(_evaluate(rest, scope.lookup))
+                if not os.path.exists(target):
+                    logger.warning("%s: %s '%s' not found", path, keyword, rest)
+                    continue
+                self._parse_file(target, scope if keyword == "include" else NinjaScope(scope))
+            else:
+                binding = RE_BINDING.match(line)
+                if binding is None:
+                    self._skip(path, line, f"unexpected '{keyword}'")
+                    continue
+                scope.bindings[binding.group(1)] = _evaluate(binding.group(2), scope.lookup)
+
+    def _add_build(self, path: str, statement: str, rest: str, block: str, scope: NinjaScope) -> None:
+        bindings: Union[Dict[str, str], str] = block
+        if "$" in block:
+            bindings = {name: _evaluate(value, scope.lookup) if "$" in value else value for name, value in RE_BLOCK_BINDING.findall(block)}
+        tokens = _split_build_line(rest)
+        try:
+            colon = tokens.index(":")
+        except ValueError:
+            self._skip(path, statement, "expected ':' in build statement")
+            return
+        if colon + 1 >= len(tokens):
+            self._skip(path, statement, "expected build command name")
+            return
+
+        def lookup(name: str) -> str:
+            nonlocal bindings
+            if isinstance(bindings, str):
+                # A $-free block still binds literal values that paths may reference
+                bindings = dict(RE_BLOCK_BINDING.findall(bindings))
+            value = bindings.get(name)
+            return value if value is not None else scope.lookup(name)
+
+        # Paths are evaluated with the edge's own bindings visible
+        outputs: List[List[str]] = [[], []]
+        section = outputs[0]
+        for token in tokens[:colon]:
+            if token == "|":
+                section = outputs[1]
+            else:
+                section.append(_evaluate(token, lookup) if "$" in token else token)
+
+        inputs: List[List[str]] = [[], [], [], []]
+        section = inputs[0]
+        for token in tokens[colon + 2 :]:
+            if token[0] == "|" and token in _INPUT_SECTIONS:
+                section = inputs[_INPUT_SECTIONS[token]]
+            else:
+                section.append(_evaluate(token, lookup) if "$" in token else token)
+
+        rule = tokens[colon + 1]
+        if rule not in self.rules:
+            logger.debug("%s: unknown build rule '%s'", path, rule)
+        if not outputs[0] and not outputs[1]:
+            self._skip(path, statement, "expected path")
+            return
+        self.builds.append(NinjaBuild(rule, outputs[0], outputs[1], inputs[0], inputs[1], inputs[2], inputs[3], bindings, scope))
+
+
+def parse_ninja_manifest(build_ninja_path: str) -> NinjaManifest:
+    """Parse a ninja manifest and everything it includes.
+
+    Args:
+        build_ninja_path: Path to build.ninja
+
+    Returns:
+        Parsed NinjaManifest
+
+    Raises:
+        OSError: If the top-level manifest cannot be read
+    """
+    logger.debug("Parsing ninja manifest %s", build_ninja_path)
+    # The parse allocates millions of small containers and no cycles; pausing the
+    # cyclic collector avoids repeated full-heap scans (about a third of the time)
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        manifest = _ManifestParser(build_ninja_path).parse()
+    finally:
+        if gc_enabled:
+            gc.enable()
+    logger.debug("Parsed %d build edges and %d rules from %d manifest file(s)", len(manifest.builds), len(manifest.rules), len(manifest.files))
+    return manifest
+
+
+def _file_identity(path: str) -> Tuple[str, int, int, int]:
+    stat = os.stat(path)
+    return path, stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+
+def load_ninja_manifest(build_ninja_path: str) -> NinjaManifest:
+    """Return the parsed manifest, reusing this process's cached parse if no manifest file changed.
+
+    Args:
+        build_ninja_path: Path to build.ninja
+
+    Returns:
+        NinjaManifest (shared between callers; treat as read-only)
+
+    Raises:
+        OSError: If the top-level manifest cannot be read
+    """
+    key = os.path.realpath(build_ninja_path)
+    cached = _manifest_cache.get(key)
+    if cached is not None:
+        try:
+            if tuple(_file_identity(path) for path, *_ in cached[0]) == cached[0]:
+                _manifest_cache.move_to_end(key)
+                return cached[1]
+        except OSError:
+            pass
+
+    identity_before = _file_identity(build_ninja_path)
+    manifest = parse_ninja_manifest(build_ninja_path)
+    identities = (identity_before,) + tuple(_file_identity(path) for path in manifest.files[1:])
+    _manifest_cache[key] = (identities, manifest)
+    _manifest_cache.move_to_end(key)
+    while len(_manifest_cache) > NINJA_MANIFEST_CACHE_SIZE:
+        _manifest_cache.popitem(last=False)
+    return manifest
+
+
+def ninja_state_dir(build_dir: str) -> str:
+    """Return the directory holding ninja's state files (.ninja_log, .ninja_deps).
+
+    That is build_dir, or $builddir when the manifest sets a top-level builddir.
+    """
+    build_ninja = os.path.join(build_dir, "build.ninja")
+    if os.path.exists(build_ninja):
+        try:
+            builddir = load_ninja_manifest(build_ninja).scope.lookup("builddir")
+        except (OSError, NinjaError):
+            builddir = ""
+        if builddir:
+            return os.path.join(build_dir, builddir)
+    return build_dir
+
+
+def clear_ninja_manifest_cache() -> None:
+    """Drop all cached manifests."""
+    _manifest_cache.clear()
@@ -30,12 +30,17 @@ import subprocess
 import logging
 import json
 import hashlib
+import time
 from pathlib import Path
-from typing import List, Tuple, Dict, Set, Optional, Any
+from typing import List, Tuple, Dict, Set, Optional, Any, Iterable, Sequence, Callable
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 
-from lib.constants import COMPILE_COMMANDS_JSON, BuildDirectoryError, NinjaError
+from lib.constants import COMPILE_COMMANDS_JSON, NINJA_TOOL_MAX_ARGS_BYTES, BuildDirectoryError, NinjaError
+from lib.ninja_deps import load_ninja_deps
+from lib.ninja_dirty import canonicalize_path, explain_dirty
+from lib.ninja_manifest import load_ninja_manifest
 from lib.color_utils import Colors, print_error, print_warning, print_success
 from lib.tool_detection import find_ninja
 
@@ -43,6 +48,14 @@ logger = logging.getLogger(__name__)
 
 # Cache file for tracking generated file hashes
 GENERATED_FILES_CACHE = ".buildcheck_generated_cache.json"
+# Files younger than this keep being verified by hash (their mtime may not change on the next write)
+_RACY_STAT_WINDOW_NS = 2 * 10**9
+# Hash batches smaller than this run without a thread pool
+_PARALLEL_HASH_MIN_FILES = 16
+_HASH_CHUNK_SIZE = 1 << 20
+
+# Common C/C++ compiler rule names in CMake/Ninja builds (matched case-insensitively as prefixes)
+CXX_RULE_PREFIXES = ("CXX_COMPILER__", "C_COMPILER__", "CC", "CXX", "C")
 
 RE_NINJA_EXPLAIN = re.compile(r"ninja explain: (.*)")
 RE_RECENT_INPUT = re.compile(r"most recent input\s+([^\s\(]+)")
@@ -194,10 +207,6 @@ def extract_source_and_header_files_from_ninja(build_ninja_path: str) -> Tuple[L
 
     source_files: List[str] = []
     header_files: Set[str] = set()
-    build_pattern = re.compile(r"^build\s+([^:]+):\s+(\S+)(?:\s+(.+))?$")
-
-    # Common C/C++ compiler rule names in CMake/Ninja builds
-    cxx_rules = {"CXX_COMPILER__", "C_COMPILER__", "CC", "CXX", "C"}
 
     # Get build directory (directory containing build.ninja) for resolving relative paths
     build_dir = os.path.dirname(os.path.abspath(build_ninja_path))
@@ -205,53 +214,31 @@ def extract_source_and_header_files_from_ninja(build_ninja_path: str) -> Tuple[L
     logger.debug("Extracting source and header files from %s", build_ninja_path)
 
     try:
-        with open(build_ninja_path, "r", encoding="utf-8") as f:
-            for line in f:
-                line = line.rstrip()
-                build_match = build_pattern.match(line)
-
-                if build_match:
-                    rule_name = build_match.group(2)
-                    inputs_str = build_match.group(3) if build_match.group(3) is not None else ""
-
-                    # Check if this is a C/C++ compilation rule (case-insensitive)
-                    rule_name_upper = rule_name.upper()
-                    is_cxx_rule = any(rule_name_upper.startswith(cxx_rule) for cxx_rule in cxx_rules)
-
-                    if is_cxx_rule and inputs_str:
-                        # Parse input files
-                        # Format: "explicit [| implicit] [|| order-only]"
-                        deps_part = inputs_str.split("||")[0].strip()  # Remove order-only deps
-                        dep_sections = deps_part.split("|")
-                        explicit_str = dep_sections[0].strip()  # Get explicit inputs
-                        implicit_str = dep_sections[1].strip() if len(dep_sections) > 1 else ""  # Get implicit inputs (headers)
-
-                        # Extract source file (first explicit input)
-                        if explicit_str:
-                            first_input = explicit_str.split()[0]
-                            if is_valid_source_file(first_input):
-                                # Make absolute and resolve symlinks
-                                if not os.path.isabs(first_input):
-                                    first_input = os.path.join(build_dir, first_input)
-                                first_input = os.path.realpath(first_input)
-                                source_files.append(first_input)
-                                logger.debug("Found source file: %s (rule: %s)", first_input, rule_name)
-
-                        # Extract header dependencies (implicit inputs)
-                        if implicit_str:
-                            for dep in implicit_str.split():
-                                if is_valid_header_file(dep) and not is_system_header(dep):
-                                    # Make absolute and resolve symlinks
-                                    if not os.path.isabs(dep):
-                                        dep = os.path.join(build_dir, dep)
-                                    dep = os.path.realpath(dep)
-                                    header_files.add(dep)
-                                    logger.debug("Found header file: %s", dep)
-
-    except IOError as e:
+        manifest = load_ninja_manifest(build_ninja_path)
+    except (IOError, NinjaError) as e:
         logger.warning("Failed to read %s: %s", build_ninja_path, e)
         return [], []
 
+    for build in manifest.builds:
+        # Check if this is a C/C++ compilation rule (case-insensitive)
+        if not build.rule.upper().startswith(CXX_RULE_PREFIXES):
+            continue
+
+        # Extract source file (first explicit input)
+        if build.inputs and is_valid_source_file(build.inputs[0]):
+            # Make absolute and resolve symlinks
+            source_file = os.path.realpath(os.path.join(build_dir, build.inputs[0]))
+            source_files.append(source_file)
+            logger.debug("Found source file: %s (rule: %s)", source_file, build.rule)
+
+        # Extract header dependencies (implicit inputs)
+        for dep in build.implicit_inputs:
+            if is_valid_header_file(dep) and not is_system_header(dep):
+                # Make absolute and resolve symlinks
+                dep = os.path.realpath(os.path.join(build_dir, dep))
+                header_files.add(dep)
+                logger.debug("Found header file: %s", dep)
+
     logger.info("Extracted %d source files and %d header files from build.ninja", len(source_files), len(header_files))
     return source_files, list(header_files)
 
@@ -277,114 +264,58 @@ def parse_ninja_generated_files(build_ninja_path: str) -> Tuple[Set[str], Dict[s
     all_tracked_files: Set[str] = set()
     output_to_info: Dict[str, GeneratedFileInfo] = {}
 
-    # Track generator rules (rules with generator = 1)
-    generator_rules: Set[str] = set()
-    current_rule: Optional[str] = None
-
-    # Regex patterns - enhanced to capture inputs
-    rule_pattern = re.compile(r"^rule\s+(\S+)")
-    generator_pattern = re.compile(r"^\s+generator\s*=\s*1")
-    build_pattern = re.compile(r"^build\s+([^:]+):\s+(\S+)(?:\s+(.+))?$")
-
     logger.debug("Parsing %s to identify generated files and dependencies...", build_ninja_path)
 
     try:
-        with open(build_ninja_path, "r", encoding="utf-8") as f:
-            for line in f:
-                line = line.rstrip()
-
-                # Check for rule definition
-                rule_match = rule_pattern.match(line)
-                if rule_match:
-                    current_rule = rule_match.group(1)
-                    continue
+        manifest = load_ninja_manifest(build_ninja_path)
+    except (IOError, NinjaError) as e:
+        logger.warning("Failed to read %s: %s", build_ninja_path, e)
+        return set(), {}
 
-                # Check if current rule is a generator rule
-                if current_rule and generator_pattern.match(line):
-                    generator_rules.add(current_rule)
-                    logger.debug("Found generator rule: %s", current_rule)
-                    continue
+    # Track generator rules (rules with generator = 1)
+    generator_rules = {name for name, rule in manifest.rules.items() if rule.bindings.get("generator", "").strip() not in ("", "0")}
 
-                # Check for build statements
-                build_match = build_pattern.match(line)
-                if build_match:
-                    outputs_str = build_match.group(1)
-                    rule_name = build_match.group(2)
-                    inputs_str = build_match.group(3) if build_match.group(3) is not None else ""
-
-                    # Mark outputs as generated if:
-                    # 1. Rule is a generator rule
-                    # 2. Rule is CUSTOM_COMMAND (CMake generated files)
-                    # 3. Rule is not a C/C++ compilation rule
-                    if rule_name in generator_rules or "CUSTOM_COMMAND" in rule_name or rule_name in {"phony", "RERUN_CMAKE"}:
-
-                        # Parse output files (handle | for implicit outputs)
-                        outputs = outputs_str.split("|")[0].strip().split()
-
-                        # Parse input dependencies: format is "explicit [| implicit] [|| order-only]"
-                        explicit_inputs_list: List[str] = []
-                        implicit_inputs_list: List[str] = []
-                        order_only_inputs_list: List[str] = []
-
-                        if inputs_str:
-                            # Split by || for order-only deps
-                            parts = inputs_str.split("||")
-                            deps_part = parts[0].strip()
-                            order_only_part = parts[1].strip() if len(parts) > 1 else ""
-
-                            # Split deps by | for implicit deps
-                            dep_sections = deps_part.split("|")
-                            explicit_str = dep_sections[0].strip()
-                            implicit_str = dep_sections[1].strip() if len(dep_sections) > 1 else ""
-
-                            # Parse explicit inputs
-                            if explicit_str:
-                                explicit_inputs_list = [inp.strip() for inp in explicit_str.split() if inp.strip()]
-
-                            # Parse implicit inputs
-                            if implicit_str:
-                                implicit_inputs_list = [inp.strip() for inp in implicit_str.split() if inp.strip()]
-
-                            # Parse order-only inputs
-                            if order_only_part:
-                                order_only_inputs_list = [inp.strip() for inp in order_only_part.split() if inp.strip()]
-
-                        # Track outputs and create GeneratedFileInfo for each
-                        for output in outputs:
-                            output = output.strip()
-                            if output and not output.endswith(".stamp"):
-                                # Check if output is trackable
-                                is_trackable, category = is_trackable_file(output)
-
-                                # For phony/RERUN_CMAKE targets, track even if extension not recognized
-                                if is_trackable or rule_name in {"phony", "RERUN_CMAKE"}:
-                                    all_tracked_files.add(output)
-                                    if is_trackable:
-                                        logger.debug("Identified generated file: %s (rule: %s, category: %s)", output, rule_name, category)
-                                    else:
-                                        logger.debug("Identified generated file: %s (rule: %s, no extension)", output, rule_name)
-
-                                # Track inputs (templates, scripts, configs)
-                                trackable_inputs: List[str] = []
-                                for inp in explicit_inputs_list + implicit_inputs_list:
-                                    inp_trackable, inp_category = is_trackable_file(inp)
-                                    if inp_trackable:
-                                        all_tracked_files.add(inp)
-                                        trackable_inputs.append(inp)
-                                        logger.debug("  Input dependency: %s (category: %s)", inp, inp_category)
-
-                                # Store GeneratedFileInfo
-                                output_to_info[output] = GeneratedFileInfo(
-                                    outputs={output},
-                                    explicit_inputs=set(explicit_inputs_list),
-                                    implicit_inputs=set(implicit_inputs_list),
-                                    order_only_inputs=set(order_only_inputs_list),
-                                    rule_name=rule_name,
-                                )
+    for build in manifest.builds:
+        rule_name = build.rule
 
-    except IOError as e:
-        logger.warning("Failed to read %s: %s", build_ninja_path, e)
-        return set(), {}
+        # Mark outputs as generated if:
+        # 1. Rule is a generator rule
+        # 2. Rule is CUSTOM_COMMAND (CMake generated files)
+        # 3. Rule is phony or RERUN_CMAKE
+        if not (rule_name in generator_rules or "CUSTOM_COMMAND" in rule_name or rule_name in {"phony", "RERUN_CMAKE"}):
+            continue
+
+        # Track outputs and create GeneratedFileInfo for each
+        for output in build.outputs:
+            if output.endswith(".stamp"):
+                continue
+
+            # Check if output is trackable
+            is_trackable, category = is_trackable_file(output)
+
+            # For phony/RERUN_CMAKE targets, track even if extension not recognized
+            if is_trackable or rule_name in {"phony", "RERUN_CMAKE"}:
+                all_tracked_files.add(output)
+                if is_trackable:
+                    logger.debug("Identified generated file: %s (rule: %s, category: %s)", output, rule_name, category)
+                else:
+                    logger.debug("Identified generated file: %s (rule: %s, no extension)", output, rule_name)
+
+            # Track inputs (templates, scripts, configs)
+            for inp in build.inputs + build.implicit_inputs:
+                inp_trackable, inp_category = is_trackable_file(inp)
+                if inp_trackable:
+                    all_tracked_files.add(inp)
+                    logger.debug("  Input dependency: %s (category: %s)", inp, inp_category)
+
+            # Store GeneratedFileInfo
+            output_to_info[output] = GeneratedFileInfo(
+                outputs={output},
+                explicit_inputs=set(build.inputs),
+                implicit_inputs=set(build.implicit_inputs),
+                order_only_inputs=set(build.order_only_inputs),
+                rule_name=rule_name,
+            )
 
     logger.info("Found %d generated files (%d total tracked files including inputs) in build.ninja", len(output_to_info), len(all_tracked_files))
     return all_tracked_files, output_to_info
@@ -402,7 +333,7 @@ def compute_file_hash(file_path: str) -> str:
     sha256 = hashlib.sha256()
     try:
         with open(file_path, "rb") as f:
-            for chunk in iter(lambda: f.read(8192), b""):
+            for chunk in iter(lambda: f.read(_HASH_CHUNK_SIZE), b""):
                 sha256.update(chunk)
         return sha256.hexdigest()
     except IOError as e:
@@ -410,6 +341,46 @@ def compute_file_hash(file_path: str) -> str:
         return ""
 
 
+def hash_files(file_paths: List[str]) -> Dict[str, str]:
+    """Compute compute_file_hash() for several files, on a thread pool for larger batches.
+
+    hashlib releases the GIL while hashing and reads block in the kernel, so
+    threads overlap I/O and hashing without extra processes.
+
+    Args:
+        file_paths: Paths to hash
+
+    Returns:
+        Dict mapping each path to its hash ("" if it could not be read)
+    """
+    if len(file_paths) < _PARALLEL_HASH_MIN_FILES:
+        return {path: compute_file_hash(path) for path in file_paths}
+    workers = min(32, (os.cpu_count() or 1) + 4)
+    # Batches keep per-task overhead small when most generated files are tiny
+    batch_size = max(_PARALLEL_HASH_MIN_FILES, len(file_paths) // (workers * 4))
+    batches = [file_paths[i : i + batch_size] for i in range(0, len(file_paths), batch_size)]
+    hashes: Dict[str, str] = {}
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for batch, batch_hashes in zip(batches, executor.map(lambda batch: [compute_file_hash(path) for path in batch], batches)):
+            hashes.update(zip(batch, batch_hashes))
+    return hashes
+
+
+def file_stat_key(file_path: str) -> Optional[List[int]]:
+    """Return [mtime_ns, size, inode] of a file, or None if it does not exist."""
+    try:
+        st = os.stat(file_path)
+    except OSError:
+        return None
+    return [st.st_mtime_ns, st.st_size, st.st_ino]
+
+
+def _stat_is_settled(stat_key: List[int]) -> bool:
+    # A file written within the timestamp granularity could change again without its
+    # stat changing; such files are only trusted by hash until they are old enough
+    return time.time_ns() - stat_key[0] > _RACY_STAT_WINDOW_NS
+
+
 def load_generated_files_cache(cache_path: str) -> Dict[str, Any]:
     """Load the cache of generated file hashes and metadata.
 
@@ -417,9 +388,13 @@ def load_generated_files_cache(cache_path: str) -> Dict[str, Any]:
     {
         "build_ninja_mtime": float,
         "files": {path: hash, ...},
+        "stats": {path: [mtime_ns, size, inode], ...},
         "dependencies": {output: [inputs], ...}
     }
 
+    "stats" records each file's stat at the time it was hashed; a file whose stat
+    still matches is not hashed again. Caches without it are upgraded on use.
+
     Args:
         cache_path: Path to the cache file
 
@@ -457,16 +432,44 @@ def save_generated_files_cache(cache_path: str, cache: Dict[str, Any]) -> None:
         logger.warning("Failed to save generated files cache: %s", e)
 
 
+def build_input_index(build_dir: str, output_to_info: Dict[str, GeneratedFileInfo]) -> Dict[str, List[str]]:
+    """Invert output_to_info: absolute input path -> outputs generated from it.
+
+    Args:
+        build_dir: Path to the build directory
+        output_to_info: Mapping of outputs to their GeneratedFileInfo
+
+    Returns:
+        Dict mapping each explicit/implicit input (absolute) to its outputs, in manifest order
+    """
+    input_to_outputs: Dict[str, List[str]] = defaultdict(list)
+    for output_path, file_info in output_to_info.items():
+        for input_file in list(file_info.explicit_inputs) + list(file_info.implicit_inputs):
+            full_input_path = os.path.join(build_dir, input_file) if not os.path.isabs(input_file) else input_file
+            input_to_outputs[full_input_path].append(output_path)
+    return input_to_outputs
+
+
 def check_generated_files_changed(
-    build_dir: str, generated_files: Set[str], cache: Dict[str, Any], output_to_info: Optional[Dict[str, GeneratedFileInfo]] = None
+    build_dir: str,
+    generated_files: Set[str],
+    cache: Dict[str, Any],
+    output_to_info: Optional[Dict[str, GeneratedFileInfo]] = None,
+    refreshed_stats: Optional[List[str]] = None,
 ) -> Tuple[List[str], List[str], Dict[str, str]]:
     """Check if generated files or their inputs are missing or have changed since last cache.
 
+    Files whose (mtime_ns, size, inode) still match the cached stat are unchanged
+    without being read; the others are hashed in parallel and compared with the
+    cached hash.
+
     Args:
         build_dir: Path to the build directory
         generated_files: Set of generated file paths (relative to build_dir)
         cache: Cache dictionary with metadata and file path -> hash mappings
         output_to_info: Optional mapping of outputs to their GeneratedFileInfo for input tracking
+        refreshed_stats: If given, receives files whose content was unchanged but whose
+            cached stat was updated in cache (the caller should save the cache)
 
     Returns:
         Tuple of (missing_files, changed_files, change_reasons)
@@ -478,20 +481,25 @@ def check_generated_files_changed(
 
     # Extract file hashes from new cache structure
     file_hashes = cache.get("files", {}) if isinstance(cache, dict) else cache
+    # Old-format caches are a bare path -> hash dict with nowhere to keep stats
+    file_stats: Dict[str, List[int]] = cache.setdefault("stats", {}) if isinstance(cache, dict) and "files" in cache else {}
 
     # Track which inputs changed (for better error messages)
     changed_inputs: Dict[str, str] = {}  # Maps input path -> change type
 
-    # First pass: Check all tracked files for changes
+    # First pass: stat every tracked file; only cached files whose stat moved need hashing
+    to_hash: List[Tuple[str, str, List[int]]] = []
+    build_prefix = os.path.join(build_dir, "")
     for gen_file in generated_files:
         # Check all trackable files now (not just C/C++ sources)
         is_trackable, category = is_trackable_file(gen_file)
         if not is_trackable:
             continue
 
-        full_path = os.path.join(build_dir, gen_file) if not os.path.isabs(gen_file) else gen_file
+        full_path = gen_file if os.path.isabs(gen_file) else build_prefix + gen_file
 
-        if not os.path.exists(full_path):
+        stat_key = file_stat_key(full_path)
+        if stat_key is None:
             missing_files.append(full_path)
             change_reasons[full_path] = f"missing {category}"
             logger.debug("Missing generated file: %s (%s)", full_path, category)
@@ -499,45 +507,44 @@ def check_generated_files_changed(
             # If this is an input file that's missing, track it
             if category in {"template", "script"}:
                 changed_inputs[full_path] = "missing"
-        else:
-            # Check if hash has changed (only if file was previously cached)
-            cached_hash = file_hashes.get(full_path)
-
-            if cached_hash is not None:
-                # File was in cache, check if it changed
-                current_hash = compute_file_hash(full_path)
-                if current_hash != cached_hash:
-                    changed_files.append(full_path)
-                    change_reasons[full_path] = f"modified {category}"
-                    logger.debug("Generated file changed: %s (%s)", full_path, category)
-
-                    # If this is an input file that changed, track it
-                    if category in {"template", "script"}:
-                        changed_inputs[full_path] = "modified"
-            # File not in cache - new file that doesn't need rebuild (cache is valid in this path)
+        elif full_path in file_hashes and file_stats.get(full_path) != stat_key:
+            to_hash.append((full_path, category, stat_key))
+        # File not in cache - new file that doesn't need rebuild (cache is valid in this path)
+
+    current_hashes = hash_files([full_path for full_path, _, _ in to_hash])
+    logger.debug("Hashed %d of %d tracked files (stat changed or unknown)", len(to_hash), len(generated_files))
+    for full_path, category, stat_key in to_hash:
+        if current_hashes[full_path] != file_hashes[full_path]:
+            changed_files.append(full_path)
+            change_reasons[full_path] = f"modified {category}"
+            logger.debug("Generated file changed: %s (%s)", full_path, category)
+
+            # If this is an input file that changed, track it
+            if category in {"template", "script"}:
+                changed_inputs[full_path] = "modified"
+        elif _stat_is_settled(stat_key):
+            # Touched or rewritten with identical content: trust the new stat from now on
+            file_stats[full_path] = stat_key
+            if refreshed_stats is not None:
+                refreshed_stats.append(full_path)
 
     # Second pass: Check if any outputs depend on changed inputs
     if output_to_info and changed_inputs:
-        for output_path, file_info in output_to_info.items():
-            full_output_path = os.path.join(build_dir, output_path) if not os.path.isabs(output_path) else output_path
-
-            # Skip if already marked for rebuild
-            if full_output_path in missing_files or full_output_path in changed_files:
-                continue
-
-            # Check all input dependencies
-            all_inputs = list(file_info.explicit_inputs) + list(file_info.implicit_inputs)
-
-            for input_file in all_inputs:
-                full_input_path = os.path.join(build_dir, input_file) if not os.path.isabs(input_file) else input_file
-
-                if full_input_path in changed_inputs:
-                    changed_files.append(full_output_path)
-                    change_type = changed_inputs[full_input_path]
-                    input_basename = os.path.basename(input_file)
-                    change_reasons[full_output_path] = f"input {change_type}: {input_basename}"
-                    logger.info("Output %s needs rebuild: input %s %s", os.path.basename(output_path), input_basename, change_type)
-                    break  # Only need one reason per output
+        flagged = set(missing_files)
+        flagged.update(changed_files)
+        input_to_outputs = build_input_index(build_dir, output_to_info)
+        for full_input_path, change_type in changed_inputs.items():
+            input_basename = os.path.basename(full_input_path)
+            for output_path in input_to_outputs.get(full_input_path, ()):
+                full_output_path = os.path.join(build_dir, output_path) if not os.path.isabs(output_path) else output_path
+
+                # Skip if already marked for rebuild (only need one reason per output)
+                if full_output_path in flagged:
+                    continue
+                flagged.add(full_output_path)
+                changed_files.append(full_output_path)
+                change_reasons[full_output_path] = f"input {change_type}: {input_basename}"
+                logger.info("Output %s needs rebuild: input %s %s", os.path.basename(output_path), input_basename, change_type)
 
     return missing_files, changed_files, change_reasons
 
@@ -555,10 +562,21 @@ def update_generated_files_cache(cache: Dict[str, Any], files_to_update: List[st
         cache["files"] = {}
 
     file_hashes = cache["files"]
+    file_stats = cache.setdefault("stats", {})
 
+    # Stat before hashing: a file modified while being hashed then fails the stat check next time
+    stat_keys = {}
     for full_path in files_to_update:
-        if os.path.exists(full_path):
-            file_hashes[full_path] = compute_file_hash(full_path)
+        stat_key = file_stat_key(full_path)
+        if stat_key is not None:
+            stat_keys[full_path] = stat_key
+
+    for full_path, file_hash in hash_files(list(stat_keys)).items():
+        file_hashes[full_path] = file_hash
+        if _stat_is_settled(stat_keys[full_path]):
+            file_stats[full_path] = stat_keys[full_path]
+        else:
+            file_stats.pop(full_path, None)
 
     save_generated_files_cache(cache_path, cache)
 
@@ -606,6 +624,8 @@ def clean_stale_cache_entries(cache: Dict[str, Any], current_generated_files: Se
 
     # Update cache with cleaned files
     cache["files"] = cleaned_file_hashes
+    if "stats" in cache:
+        cache["stats"] = {file_path: stat_key for file_path, stat_key in cache["stats"].items() if file_path in cleaned_file_hashes}
     return cache
 
 
@@ -861,7 +881,8 @@ def validate_and_prepare_build_dir(build_dir: str, verbose: bool = False, skip_g
     else:
         # Cache is valid - use incremental hash-based change detection
         # Check if generated files are missing or changed (including input dependencies)
-        missing_generated, changed_generated, change_reasons = check_generated_files_changed(build_dir, all_tracked_files, cache, output_to_info)
+        refreshed_stats: List[str] = []
+        missing_generated, changed_generated, change_reasons = check_generated_files_changed(build_dir, all_tracked_files, cache, output_to_info, refreshed_stats)
 
         # If any generated files are missing or changed, build only those files
         files_to_build = list(set(missing_generated + changed_generated))
@@ -915,6 +936,9 @@ def validate_and_prepare_build_dir(build_dir: str, verbose: bool = False, skip_g
                 update_generated_files_cache(cache, files_to_build, cache_path)
         else:
             logger.info("No changes detected in generated files")
+            if refreshed_stats:
+                # Remember the new stats so the unchanged files are not hashed again next time
+                save_generated_files_cache(cache_path, cache)
             if verbose:
                 print_success("Autogenerated files are up to date")
 
@@ -1070,27 +1094,14 @@ def parse_ninja_explain_output(stderr_lines: List[str]) -> Tuple[List[str], Set[
     return rebuild_targets, changed_files
 
 
-def extract_rebuild_info(build_dir: str, verbose: bool = False) -> Tuple[List[Tuple[str, str]], Dict[str, int], Dict[str, int]]:
-    """Extract rebuild information from ninja explain output.
-
-    Args:
-        build_dir: Path to the ninja build directory
-        verbose: If True, print detailed progress information
-
-    Returns:
-        tuple: (rebuild_entries, reasons, root_causes) where:
-            - rebuild_entries: list of (output_file, reason) tuples
-            - reasons: dict mapping normalized reason to count
-            - root_causes: dict mapping changed file to rebuild count
+def _ninja_explain_lines(build_dir: str) -> List[str]:
+    """Run `ninja -n -d explain` in build_dir and return its stderr lines.
 
     Raises:
         BuildDirectoryError: If build directory is invalid or inaccessible
         NinjaError: If ninja command fails, times out, or is not found
         RuntimeError: If an unexpected error occurs
     """
-    if verbose:
-        print(f"Analyzing build directory: {build_dir}", file=sys.stderr)
-
     # Save current directory and change to build directory
     original_dir = os.getcwd()
     try:
@@ -1118,7 +1129,45 @@ def extract_rebuild_info(build_dir: str, verbose: bool = False) -> Tuple[List[Tu
     finally:
         os.chdir(original_dir)
 
-    lines = result.stderr.splitlines()
+    return result.stderr.splitlines()
+
+
+def extract_rebuild_info(build_dir: str, verbose: bool = False, in_process: bool = True) -> Tuple[List[Tuple[str, str]], Dict[str, int], Dict[str, int]]:
+    """Extract rebuild information from ninja explain output.
+
+    The explain lines are computed in-process from build.ninja, .ninja_log,
+    .ninja_deps and file mtimes (see lib/ninja_dirty.py) when possible; otherwise
+    `ninja -n -d explain` is run.
+
+    Args:
+        build_dir: Path to the ninja build directory
+        verbose: If True, print detailed progress information
+        in_process: If False, always run ninja
+
+    Returns:
+        tuple: (rebuild_entries, reasons, root_causes) where:
+            - rebuild_entries: list of (output_file, reason) tuples
+            - reasons: dict mapping normalized reason to count
+            - root_causes: dict mapping changed file to rebuild count
+
+    Raises:
+        BuildDirectoryError: If build directory is invalid or inaccessible
+        NinjaError: If ninja command fails, times out, or is not found
+        RuntimeError: If an unexpected error occurs
+    """
+    if verbose:
+        print(f"Analyzing build directory: {build_dir}", file=sys.stderr)
+
+    explanation = explain_dirty(build_dir) if in_process and os.path.isdir(build_dir) else None
+    if explanation is not None:
+        lines = explanation.lines
+        if verbose:
+            print(
+                f"Computed rebuild set in-process in {explanation.elapsed:.2f}s ({explanation.edges_checked} edges, {explanation.files_checked} files checked)",
+                file=sys.stderr,
+            )
+    else:
+        lines = _ninja_explain_lines(build_dir)
 
     if verbose:
         print(f"Processing {len(lines)} lines of ninja output", file=sys.stderr)
@@ -1180,45 +1229,204 @@ def normalize_reason(msg: str) -> str:
 
 
 def get_dependencies(build_dir: str, target: str, timeout: int = 30) -> List[str]:
-    """Get dependencies for a target using ninja -t deps.
+    """Get dependencies for a target from ninja's deps log.
+
+    The .ninja_deps log is decoded in-process (and cached, see lib/ninja_deps.py);
+    ninja -t deps is only run when the log is missing or in an unsupported format.
 
     Args:
         build_dir: Path to the build directory
         target: The build target to get dependencies for
-        timeout: Command timeout in seconds (default: 30)
+        timeout: Command timeout in seconds for the ninja -t deps fallback (default: 30)
 
     Returns:
-        List of dependency file paths
+        List of dependency file paths (empty if the target has no recorded deps)
+    """
+    deps_log = load_ninja_deps(build_dir)
+    if deps_log is not None:
+        # The log stores canonical paths; ninja -t deps canonicalizes its arguments the same way
+        return deps_log.dependencies(canonicalize_path(target)) or []
+    return _run_ninja_deps_tool(build_dir, target, timeout)
 
-    Raises:
-        RuntimeError: If ninja command fails or times out
+
+def get_dependencies_for_targets(build_dir: str, targets: Iterable[str], timeout: int = 30) -> Dict[str, List[str]]:
+    """Get dependencies for many targets with a single read of the deps log.
+
+    Args:
+        build_dir: Path to the build directory
+        targets: Build targets to get dependencies for
+        timeout: Timeout in seconds per ninja -t deps invocation of the fallback (default: 30)
+
+    Returns:
+        Mapping of target -> dependency file paths
     """
-    try:
-        result = subprocess.run(["ninja", "-t", "deps", target], capture_output=True, text=True, cwd=build_dir, timeout=timeout)
+    targets = list(targets)
+    deps_log = load_ninja_deps(build_dir)
+    if deps_log is not None:
+        return {target: deps_log.dependencies(canonicalize_path(target)) or [] for target in targets}
+    found = run_ninja_tool_batched(build_dir, "deps", targets, split_ninja_deps_output, timeout)
+    return {target: found.get(target, []) for target in targets}
+
+
+def chunk_arguments(arguments: Sequence[str], max_bytes: int = NINJA_TOOL_MAX_ARGS_BYTES) -> List[List[str]]:
+    """Split arguments into consecutive chunks whose joined length stays within max_bytes.
+
+    An argument longer than max_bytes on its own gets a chunk of its own.
 
+    Args:
+        arguments: Command-line arguments, in order
+        max_bytes: Budget per chunk, counting one separator per argument
+
+    Returns:
+        Chunks covering arguments in order
+    """
+    chunks: List[List[str]] = []
+    size = 0
+    for argument in arguments:
+        length = len(argument.encode("utf-8", "surrogateescape")) + 1
+        if not chunks or size + length > max_bytes:
+            chunks.append([])
+            size = 0
+        chunks[-1].append(argument)
+        size += length
+    return chunks
+
+
+def run_ninja_tool_batched(
+    build_dir: str,
+    tool: str,
+    targets: Sequence[str],
+    split_output: Callable[[str, Sequence[str]], Dict[str, Any]],
+    timeout: int = 30,
+    max_workers: Optional[int] = None,
+) -> Dict[str, Any]:
+    """Run `ninja -t <tool>` for many targets with as few processes as the command-line limit allows.
+
+    Targets are grouped into chunks of at most NINJA_TOOL_MAX_ARGS_BYTES, the
+    chunks run concurrently, and split_output maps each chunk's stdout back to
+    its targets. ninja rejects a whole invocation if one target is unknown, so a
+    failing chunk is retried in halves down to the offending targets, which are
+    left out of the result. The first chunk runs alone: ninja may recompact
+    .ninja_deps when it opens it, and that must not happen in parallel.
+
+    Args:
+        build_dir: Path to the build directory
+        tool: ninja tool accepting target arguments (e.g. "deps")
+        targets: Targets to query
+        split_output: (stdout, chunk targets) -> result per target
+        timeout: Timeout in seconds per ninja invocation
+        max_workers: Concurrent ninja processes (default: CPU count)
+
+    Returns:
+        Mapping of target -> parsed result for every target ninja answered
+    """
+    ninja_tool = find_ninja()
+    if not ninja_tool.is_found():
+        logger.warning("ninja not found - cannot run ninja -t %s", tool)
+        return {}
+    assert ninja_tool.command is not None, "Tool command should not be None when found"
+    ninja = ninja_tool.command
+    invocations: List[int] = []  # list.append is atomic across the worker threads
+
+    def run(chunk: List[str]) -> Dict[str, Any]:
+        invocations.append(len(chunk))
+        try:
+            result = subprocess.run([ninja, "-t", tool, *chunk], capture_output=True, text=True, cwd=build_dir, timeout=timeout)
+        except subprocess.TimeoutExpired:
+            logger.error("ninja -t %s timed out for %d targets", tool, len(chunk))
+            return {}
+        except OSError as e:
+            logger.error("ninja -t %s failed: %s", tool, e)
+            return {}
         if result.returncode != 0:
-            logger.warning("ninja -t deps failed for %s: %s", target, result.stderr)
-            return []
+            if len(chunk) == 1:
+                logger.warning("ninja -t %s failed for %s: %s", tool, chunk[0], result.stderr.strip())
+                return {}
+            middle = len(chunk) // 2
+            return {**run(chunk[:middle]), **run(chunk[middle:])}
+        return split_output(result.stdout, chunk)
+
+    prefix = len(f"{ninja} -t {tool} ")
+    chunks = chunk_arguments(list(dict.fromkeys(targets)), NINJA_TOOL_MAX_ARGS_BYTES - prefix)
+    if not chunks:
+        return {}
+    results = run(chunks[0])
+    if len(chunks) > 1:
+        workers = min(len(chunks) - 1, max_workers or os.cpu_count() or 1)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for part in executor.map(run, chunks[1:]):
+                results.update(part)
+    logger.info("ninja -t %s: %d targets in %d invocations", tool, len(targets), len(invocations))
+    return results
+
+
+def split_ninja_deps_output(stdout: str, targets: Sequence[str]) -> Dict[str, List[str]]:
+    """Split `ninja -t deps <targets...>` output into each target's dependencies.
+
+    ninja prints one section per target, in argument order: a header line
+    ("out.o: #deps N, deps mtime M (VALID)" or "out.o: deps not found")
+    followed by indented dependency paths.
 
-        # Parse the output
-        deps = []
-        for line in result.stdout.splitlines():
-            line = line.strip()
-            # Skip target line (ends with :), empty lines, and comments
-            if line and not line.endswith(":") and not line.startswith("#"):
-                deps.append(line)
+    Args:
+        stdout: Output of one ninja -t deps invocation
+        targets: Targets passed to that invocation, in order
 
-        return deps
+    Returns:
+        Mapping of target -> dependency file paths
+    """
+    sections: List[Tuple[str, List[str]]] = []
+    for line in stdout.splitlines():
+        if not line.strip():
+            continue
+        if line[0].isspace():
+            if sections:
+                sections[-1][1].append(line.strip())
+            continue
+        if ": #deps " in line:
+            path = line.split(": #deps ", 1)[0]
+        elif line.endswith(": deps not found"):
+            path = line[: -len(": deps not found")]
+        else:
+            path = line.rstrip().rstrip(":")
+        sections.append((path, []))
 
-    except subprocess.TimeoutExpired:
-        logger.error("ninja -t deps timed out for %s", target)
-        return []
-    except subprocess.CalledProcessError as e:
-        logger.error("ninja -t deps failed for %s: %s", target, e)
-        return []
-    except Exception as e:
-        logger.error("Unexpected error getting dependencies for %s: %s", target, e)
+    if len(sections) == len(targets):
+        # ninja prints the node's canonical path; argument order maps it back to the caller's spelling
+        return {target: deps for target, (_, deps) in zip(targets, sections)}
+    by_path = {canonicalize_path(target): target for target in targets}
+    return {by_path[canonicalize_path(path)]: deps for path, deps in sections if canonicalize_path(path) in by_path}
+
+
+def _run_ninja_deps_tool(build_dir: str, target: str, timeout: int) -> List[str]:
+    """Get dependencies for a target by running ninja -t deps."""
+    found: Dict[str, List[str]] = run_ninja_tool_batched(build_dir, "deps", [target], split_ninja_deps_output, timeout)
+    return found.get(target, [])
+
+
+def list_build_outputs(build_dir: str, timeout: int = 30) -> List[str]:
+    """Return every output build.ninja declares, like `ninja -t targets all`.
+
+    The cached manifest is used; ninja only runs if build.ninja cannot be read.
+
+    Args:
+        build_dir: Path to the build directory
+        timeout: Timeout in seconds for the ninja fallback
+
+    Returns:
+        Output paths in manifest order (empty if neither source works)
+    """
+    try:
+        manifest = load_ninja_manifest(os.path.join(build_dir, "build.ninja"))
+        return [output for build in manifest.builds for output in build.all_outputs()]
+    except (OSError, NinjaError) as e:
+        logger.info("Cannot read build.ninja in-process (%s); using ninja -t targets all", e)
+    try:
+        result = subprocess.run(["ninja", "-t", "targets", "all"], capture_output=True, text=True, check=True, cwd=build_dir, timeout=timeout)
+    except (OSError, subprocess.CalledProcessError, subprocess.TimeoutExpired) as e:
+        logger.warning("Failed to get ninja targets: %s", e)
         return []
+    # Lines read "<output>: <rule>"
+    return [line.rsplit(": ", 1)[0] for line in result.stdout.splitlines() if ": " in line]
 
 
 def generate_compile_commands(build_dir: str, timeout: int = 60) -> bool:
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# ****************************************************************************************************************************************************
+# * BSD 3-Clause License
+# *
+# * Copyright (c) 2025, Mana Battery
+# * All rights reserved.
+# *
+# * Redistribution and use in source and binary forms, with or without modification, are permitted provided that the following conditions are met:
+# *
+# * 1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following disclaimer.
+# * 2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following disclaimer in the
+# *    documentation and/or other materials provided with the distribution.
+# * 3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products derived from this
+# *    software without specific prior written permission.
+# *
+# * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# * THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# * CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# * PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# * LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE,
+# * EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+# ****************************************************************************************************************************************************
+"""Concurrent execution of independent analysis phases.
+
+Phases that only read a shared, read-only context (for DSM analysis: the include
+mapping and header set) can run side by side in worker processes. The context is
+handed to each worker once by the pool initializer instead of being pickled with
+every phase, and each phase's wall time is measured where it runs.
+"""
+
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Context shared with worker processes (set once per worker by the pool initializer)
+_worker_context: Any = None
+
+
+@dataclass
+class PhaseTiming:
+    """Wall time of one analysis phase.
+
+    Attributes:
+        name: Phase name
+        wall_time: Seconds spent running the phase (inclusive of any phases it triggered)
+        in_worker: True if the phase ran in a worker process
+    """
+
+    name: str
+    wall_time: float
+    in_worker: bool
+
+
+def _init_worker(context: Any) -> None:
+    """Process pool initializer: receive the shared context once per worker."""
+    global _worker_context  # pylint: disable=global-statement
+    _worker_context = context
+
+
+def _run_phase(task: Tuple[str, Callable[[Any], Any]]) -> Tuple[str, Any, float]:
+    """Run one phase against the worker's context (worker side)."""
+    name, phase = task
+    start = time.perf_counter()
+    result = phase(_worker_context)
+    return name, result, time.perf_counter() - start
+
+
+def run_phases(phases: Mapping[str, Callable[[Any], Any]], context: Any, workers: Optional[int] = None) -> Tuple[Dict[str, Any], List[PhaseTiming]]:
+    """Run independent phases, concurrently when more than one worker is available.
+
+    Phases must not depend on each other's results. In worker mode they must be
+    picklable (module-level functions) and so must their results.
+
+    Args:
+        phases: Mapping of phase name -> function taking the shared context
+        context: Read-only data every phase works on
+        workers: Worker processes (None = CPU count); 1 runs every phase in this process
+
+    Returns:
+        Tuple of (phase name -> result, timings in completion order)
+    """
+    max_workers = min(workers if workers is not None else (os.cpu_count() or 1), len(phases))
+    results: Dict[str, Any] = {}
+    timings: List[PhaseTiming] = []
+
+    if max_workers <= 1:
+        for name, phase in phases.items():
+            start = time.perf_counter()
+            results[name] = phase(context)
+            timings.append(PhaseTiming(name, time.perf_counter() - start, in_worker=False))
+            logger.debug("Phase %s finished in %.3fs", name, timings[-1].wall_time)
+        return results, timings
+
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker, initargs=(context,)) as executor:
+        futures = [executor.submit(_run_phase, (name, phase)) for name, phase in phases.items()]
+        for future in as_completed(futures):
+            name, result, wall_time = future.result()
+            results[name] = result
+            timings.append(PhaseTiming(name, wall_time, in_worker=True))
+            logger.debug("Phase %s finished in %.3fs (worker)", name, wall_time)
+    return results, timings
@@ -0,0 +1,335 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# ****************************************************************************************************************************************************
+# * BSD 3-Clause License
+# *
+# * Copyright (c) 2025, Mana Battery
+# * All rights reserved.
+# *
+# * Redistribution and use in source and binary forms, with or without modification, are permitted provided that the following conditions are met:
+# *
+# * 1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following disclaimer.
+# * 2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following disclaimer in the
+# *    documentation and/or other materials provided with the distribution.
+# * 3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products derived from this
+# *    software without specific prior written permission.
+# *
+# * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# * THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# * CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# * PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# * LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE,
+# * EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+# ****************************************************************************************************************************************************
+"""Precomputed reachability index for "does header A transitively include B" queries.
+
+Every point query used to run a fresh nx.descendants()/nx.ancestors() traversal.
+ReachabilityIndex collapses cycles (SCC condensation), numbers a spanning forest
+of the condensed DAG in post-order and labels each component with the merged
+post-order intervals it can reach (Agrawal, Borgida & Jagadish interval
+labeling). A query is one dictionary lookup plus a binary search over a short
+interval list; components whose reachable set is too scattered for intervals
+fall back to a bitset label.
+
+The index can be persisted next to the clang-scan-deps cache in the build
+directory; it stores a fingerprint of the graph it was built from and is only
+reused for an identical graph.
+"""
+
+import logging
+import math
+import os
+import time
+from bisect import bisect_right
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple, Union
+
+import networkx as nx
+
+from lib.cache_utils import ensure_cache_dir, get_cache_path, load_cache, save_cache
+from lib.centrality import graph_fingerprint
+from lib.constants import REACHABILITY_INDEX_CACHE_FILE
+
+logger = logging.getLogger(__name__)
+
+Interval = Tuple[int, int]
+# Sorted disjoint post-order intervals, or a bitset over post-order numbers
+Label = Union[List[Interval], int]
+
+# Interval lists longer than this (or n / 256) are stored as bitsets
+MIN_INTERVALS_PER_LABEL = 32
+
+
+@dataclass
+class ReachabilityStats:
+    """Build statistics of a reachability index.
+
+    Attributes:
+        nodes: Nodes in the indexed graph
+        components: Strongly connected components (condensed DAG nodes)
+        intervals: Total number of stored intervals (both directions)
+        bitsets: Number of labels stored as bitsets (both directions)
+        size_bytes: Approximate memory used by the labels
+        build_time: Seconds spent building the index
+    """
+
+    nodes: int
+    components: int
+    intervals: int
+    bitsets: int
+    size_bytes: int
+    build_time: float
+
+
+def _to_bitset(label: Label) -> int:
+    """Convert an interval list (or pass through a bitset) to a post-order bitset."""
+    if isinstance(label, int):
+        return label
+    bits = 0
+    for lo, hi in label:
+        bits |= ((1 << (hi - lo + 1)) - 1) << lo
+    return bits
+
+
+def _label_intervals(dag: "nx.DiGraph[int]", order: List[int]) -> Tuple[List[int], List[Label]]:
+    """Label each node of a DAG with the post-order numbers it can reach.
+
+    Labels are merged interval lists while they stay short; once a label would need
+    more than max(MIN_INTERVALS_PER_LABEL, n / 256) intervals (dense, scattered
+    reachability) it is stored as a bitset over post-order numbers instead, which
+    bounds the worst case at n bits per node.
+
+    Args:
+        dag: Condensed DAG with integer nodes 0..n-1
+        order: Topological order of dag
+
+    Returns:
+        Tuple of (post-order number per node, label per node); a node's own number is
+        part of its label
+    """
+    n = len(order)
+    # Spanning forest: each node hangs below its first predecessor in topological order
+    rank = {node: i for i, node in enumerate(order)}
+    children: List[List[int]] = [[] for _ in range(n)]
+    roots: List[int] = []
+    for node in order:
+        preds = list(dag.predecessors(node))
+        if preds:
+            children[min(preds, key=rank.__getitem__)].append(node)
+        else:
+            roots.append(node)
+
+    post = [0] * n
+    counter = 0
+    for root in roots:
+        stack: List[Tuple[int, int]] = [(root, 0)]
+        while stack:
+            node, child_idx = stack[-1]
+            if child_idx < len(children[node]):
+                stack[-1] = (node, child_idx + 1)
+                stack.append((children[node][child_idx], 0))
+            else:
+                stack.pop()
+                post[node] = counter
+                counter += 1
+
+    limit = max(MIN_INTERVALS_PER_LABEL, n // 256)
+    labels: List[Label] = [[] for _ in range(n)]
+    for node in reversed(order):
+        succ_labels = [labels[succ] for succ in dag.successors(node)]
+        if any(isinstance(label, int) for label in succ_labels) or sum(len(label) for label in succ_labels if isinstance(label, list)) > 4 * limit:
+            bits = 1 << post[node]
+            for label in succ_labels:
+                bits |= _to_bitset(label)
+            labels[node] = bits
+            continue
+
+        intervals = [(post[node], post[node])]
+        for label in succ_labels:
+            intervals.extend(label)  # type: ignore[arg-type]
+        intervals.sort()
+        merged: List[Interval] = [intervals[0]]
+        for lo, hi in intervals[1:]:
+            last_lo, last_hi = merged[-1]
+            if lo <= last_hi + 1:
+                if hi > last_hi:
+                    merged[-1] = (last_lo, hi)
+            else:
+                merged.append((lo, hi))
+        labels[node] = merged if len(merged) <= limit else _to_bitset(merged)
+    return post, labels
+
+
+def _covers(label: Label, value: int) -> bool:
+    """Check whether a label (sorted disjoint intervals or bitset) contains value."""
+    if isinstance(label, int):
+        return (label >> value) & 1 == 1
+    i = bisect_right(label, (value, math.inf)) - 1
+    return i >= 0 and label[i][0] <= value <= label[i][1]
+
+
+def _label_numbers(label: Label) -> Iterator[int]:
+    """Iterate the post-order numbers contained in a label."""
+    if isinstance(label, int):
+        digits = bin(label)[:1:-1]
+        return (i for i, digit in enumerate(digits) if digit == "1")
+    return (number for lo, hi in label for number in range(lo, hi + 1))
+
+
+def _label_size(label: Label) -> Tuple[int, int]:
+    """Return (interval count, approximate bytes) of a label."""
+    if isinstance(label, int):
+        return 0, (label.bit_length() + 7) // 8
+    return len(label), len(label) * 2 * 8
+
+
+class ReachabilityIndex:
+    """Constant-time-ish reachability queries over a dependency graph.
+
+    reaches(a, b) is True iff a non-empty path a -> b exists, so for a != b it agrees
+    with b in nx.descendants(graph, a) and a node reaches itself only through a cycle.
+    descendants()/ancestors() return exactly what NetworkX returns (never the node itself).
+
+    Attributes:
+        fingerprint: graph_fingerprint() of the indexed graph
+        stats: Build statistics (time, size)
+    """
+
+    def __init__(self, graph: "nx.DiGraph[Any]", condensation: Optional["nx.DiGraph[int]"] = None) -> None:
+        start = time.perf_counter()
+        dag = condensation if condensation is not None else nx.condensation(graph)
+        order = list(nx.topological_sort(dag))
+
+        self.fingerprint = graph_fingerprint(graph)
+        self._component: Dict[Any, int] = dict(dag.graph["mapping"])
+        self._members: List[List[Any]] = [list(dag.nodes[c]["members"]) for c in range(len(dag))]
+        self._cyclic: List[bool] = [len(members) > 1 for members in self._members]
+        for node, _ in nx.selfloop_edges(graph):
+            self._cyclic[self._component[node]] = True
+
+        self._post, self._forward = _label_intervals(dag, order)
+        self._post_rev, self._backward = _label_intervals(dag.reverse(copy=False), list(reversed(order)))
+        self._by_post: List[int] = [0] * len(order)
+        self._by_post_rev: List[int] = [0] * len(order)
+        for c in range(len(order)):
+            self._by_post[self._post[c]] = c
+            self._by_post_rev[self._post_rev[c]] = c
+
+        sizes = [_label_size(label) for label in self._forward + self._backward]
+        self.stats = ReachabilityStats(
+            nodes=graph.number_of_nodes(),
+            components=len(order),
+            intervals=sum(count for count, _ in sizes),
+            bitsets=sum(1 for label in self._forward + self._backward if isinstance(label, int)),
+            # Labels plus per-component post numbers and lookup tables
+            size_bytes=sum(size for _, size in sizes) + len(order) * 4 * 8,
+            build_time=time.perf_counter() - start,
+        )
+        logger.debug(
+            "Built reachability index: %d nodes, %d components, %d intervals, %d bitsets (~%d KiB) in %.3fs",
+            self.stats.nodes,
+            self.stats.components,
+            self.stats.intervals,
+            self.stats.bitsets,
+            self.stats.size_bytes // 1024,
+            self.stats.build_time,
+        )
+
+    def __contains__(self, node: object) -> bool:
+        return node in self._component
+
+    def reaches(self, source: Any, target: Any) -> bool:
+        """Check whether target is transitively reachable from source.
+
+        Args:
+            source: Starting node
+            target: Node to look for
+
+        Returns:
+            True if a non-empty path source -> target exists (False for unknown nodes)
+        """
+        cs = self._component.get(source)
+        ct = self._component.get(target)
+        if cs is None or ct is None:
+            return False
+        if cs == ct:
+            return self._cyclic[cs]
+        return _covers(self._forward[cs], self._post[ct])
+
+    def _expand(self, node: Any, labels: List[Label], by_post: List[int]) -> Set[Any]:
+        component = self._component.get(node)
+        if component is None:
+            return set()
+        result: Set[Any] = set()
+        for number in _label_numbers(labels[component]):
+            result.update(self._members[by_post[number]])
+        result.discard(node)
+        return result
+
+    def descendants(self, node: Any) -> Set[Any]:
+        """All nodes reachable from node (same result as nx.descendants)."""
+        return self._expand(node, self._forward, self._by_post)
+
+    def ancestors(self, node: Any) -> Set[Any]:
+        """All nodes that can reach node (same result as nx.ancestors)."""
+        return self._expand(node, self._backward, self._by_post_rev)
+
+
+def build_reachability_index(graph: "nx.DiGraph[Any]", condensation: Optional["nx.DiGraph[int]"] = None) -> ReachabilityIndex:
+    """Build a reachability index for a graph.
+
+    Args:
+        graph: NetworkX DiGraph
+        condensation: Optional precomputed nx.condensation(graph)
+
+    Returns:
+        ReachabilityIndex for graph
+    """
+    return ReachabilityIndex(graph, condensation)
+
+
+def load_or_build_reachability_index(
+    graph: "nx.DiGraph[Any]",
+    build_dir: str,
+    filtered_db_path: Optional[str] = None,
+    build_ninja_path: Optional[str] = None,
+    max_age_hours: Optional[float] = None,
+    condensation: Optional["nx.DiGraph[int]"] = None,
+) -> ReachabilityIndex:
+    """Load a persisted reachability index for graph, or build and persist one.
+
+    The index is stored in the build directory's cache next to the clang-scan-deps
+    output and validated the same way, plus a fingerprint check against graph.
+    When there is no filtered compilation database (dependencies read from
+    .ninja_deps), build.ninja stands in for it.
+
+    Args:
+        graph: Graph the index must describe
+        build_dir: Build directory holding the cache
+        filtered_db_path: Filtered compile_commands.json used for cache validation
+        build_ninja_path: Optional build.ninja used for cache validation
+        max_age_hours: Maximum cache age in hours (None = no age limit)
+        condensation: Optional precomputed nx.condensation(graph), used when building
+
+    Returns:
+        ReachabilityIndex for graph
+    """
+    if filtered_db_path is None or not os.path.exists(filtered_db_path):
+        filtered_db_path = os.path.join(build_dir, "build.ninja")
+    cache_path = get_cache_path(build_dir, REACHABILITY_INDEX_CACHE_FILE)
+    cached = load_cache(cache_path, filtered_db_path, build_ninja_path, max_age_hours)
+    if isinstance(cached, ReachabilityIndex) and cached.fingerprint == graph_fingerprint(graph):
+        logger.info("Loaded reachability index from cache (%d intervals)", cached.stats.intervals)
+        return cached
+
+    index = build_reachability_index(graph, condensation)
+    ensure_cache_dir(build_dir)
+    save_cache(cache_path, index, filtered_db_path, build_ninja_path)
+    logger.info(
+        "Built reachability index in %.3fs (%d components, %d intervals, ~%d KiB)",
+        index.stats.build_time,
+        index.stats.components,
+        index.stats.intervals,
+        index.stats.size_bytes // 1024,
+    )
+    return index
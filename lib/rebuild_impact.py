@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# ****************************************************************************************************************************************************
+# * BSD 3-Clause License
+# *
+# * Copyright (c) 2025, Mana Battery
+# * All rights reserved.
+# *
+# * Redistribution and use in source and binary forms, with or without modification, are permitted provided that the following conditions are met:
+# *
+# * 1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following disclaimer.
+# * 2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following disclaimer in the
+# *    documentation and/or other materials provided with the distribution.
+# * 3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products derived from this
+# *    software without specific prior written permission.
+# *
+# * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# * THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# * CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# * PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# * LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE,
+# * EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+# ****************************************************************************************************************************************************
+"""Batched rebuild impact for improvement candidates.
+
+ROI estimation asks, for every candidate header, how many translation units
+depend on the header or on anything that transitively includes it. Answering
+that with one BFS plus one source scan per candidate is O(candidates × sources
+× deps). This module computes every candidate's transitive dependents once as
+integer bitsets over the SCC condensation of the reverse dependency graph, then
+gets all affected-source counts from a single sparse candidate×header by
+header×source product. Combined impact of several candidates is the union of
+their bitsets.
+"""
+
+import logging
+import time
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Set
+
+import networkx as nx
+import numpy as np
+
+from lib.source_index import SourceIndex, build_source_index
+
+try:
+    from scipy import sparse
+except ImportError:
+    sparse = None  # type: ignore
+
+SCIPY_AVAILABLE = sparse is not None
+
+logger = logging.getLogger(__name__)
+
+
+def _bit_positions(bits: int) -> np.ndarray:
+    """Return the positions of the set bits of a non-negative integer, ascending."""
+    if not bits:
+        return np.zeros(0, dtype=np.int64)
+    raw = np.frombuffer(bits.to_bytes((bits.bit_length() + 7) // 8, "little"), dtype=np.uint8)
+    return np.flatnonzero(np.unpackbits(raw, bitorder="little"))
+
+
+class DependentsClosure:
+    """Transitive dependents of a set of root headers, stored as integer bitsets.
+
+    Bit i of a closure stands for nodes[i]. Each closure contains its root, matching
+    a traversal of reverse_deps that starts at the root. Only the roots' bitsets are
+    retained; intermediate component bitsets are released once every component that
+    feeds from them has been processed.
+
+    Attributes:
+        nodes: Every header in the reverse dependency graph, indexed by bit position
+        node_ids: Mapping of header -> bit position
+        closures: Mapping of root header -> bitset of its transitive dependents
+    """
+
+    def __init__(self, reverse_deps: Mapping[str, Iterable[str]], roots: Iterable[str]) -> None:
+        """Compute the closures of roots over reverse_deps.
+
+        Args:
+            reverse_deps: Reverse dependency mapping (header -> headers that include it)
+            roots: Headers whose transitive dependents are needed
+        """
+        graph: "nx.DiGraph[str]" = nx.DiGraph()
+        graph.add_nodes_from(reverse_deps)
+        graph.add_edges_from((header, dependent) for header, dependents in reverse_deps.items() for dependent in dependents)
+        root_set = set(roots)
+        graph.add_nodes_from(root_set)
+
+        self.nodes: List[str] = list(graph.nodes())
+        self.node_ids: Dict[str, int] = {node: i for i, node in enumerate(self.nodes)}
+        self.closures: Dict[str, int] = {}
+
+        condensation = nx.condensation(graph)
+        mapping = condensation.graph["mapping"]
+        members = nx.get_node_attributes(condensation, "members")
+        keep = {mapping[root] for root in root_set}
+        pending_preds = {c: condensation.in_degree(c) for c in condensation.nodes()}
+
+        reach: Dict[int, int] = {}
+        for component in reversed(list(nx.topological_sort(condensation))):
+            bits = 0
+            for node in members[component]:
+                bits |= 1 << self.node_ids[node]
+            for succ in condensation.successors(component):
+                bits |= reach[succ]
+                pending_preds[succ] -= 1
+                if pending_preds[succ] == 0 and succ not in keep:
+                    del reach[succ]
+            if pending_preds[component] or component in keep:
+                reach[component] = bits
+
+        for root in root_set:
+            self.closures[root] = reach[mapping[root]]
+
+    def dependents(self, header: str) -> Set[str]:
+        """Return the root header plus every header that transitively depends on it."""
+        return {self.nodes[i] for i in _bit_positions(self.closures[header])}
+
+    def union(self, headers: Iterable[str]) -> int:
+        """Return the bitset union of the closures of headers."""
+        bits = 0
+        for header in headers:
+            bits |= self.closures.get(header, 0)
+        return bits
+
+
+class RebuildImpactIndex:
+    """Affected translation unit counts for a batch of candidate headers.
+
+    Attributes:
+        closure: Transitive dependents of every candidate header
+        source_index: Header -> source index the counts are taken from
+        affected_counts: Mapping of candidate header -> number of sources that rebuild when it changes
+    """
+
+    def __init__(self, reverse_deps: Mapping[str, Iterable[str]], source_index: SourceIndex, headers: Iterable[str]) -> None:
+        """Compute closures and affected source counts for headers.
+
+        Args:
+            reverse_deps: Reverse dependency mapping (header -> headers that include it)
+            source_index: Header -> source index over source_to_deps
+            headers: Candidate headers to evaluate
+        """
+        self.closure = DependentsClosure(reverse_deps, headers)
+        self.source_index = source_index
+        # Source index row for every closure bit (-1 when no source depends on that header)
+        self._rows = np.fromiter((source_index.header_ids.get(node, -1) for node in self.closure.nodes), dtype=np.int64, count=len(self.closure.nodes))
+        self.affected_counts: Dict[str, int] = self._count_affected(list(self.closure.closures))
+
+    def _header_rows(self, bits: int) -> np.ndarray:
+        """Convert a closure bitset to the source index rows of its headers."""
+        rows: np.ndarray = self._rows[_bit_positions(bits)]
+        valid: np.ndarray = rows[rows >= 0]
+        return valid
+
+    def _count_affected(self, headers: Sequence[str]) -> Dict[str, int]:
+        """Count affected sources for every header with one sparse product."""
+        if not headers:
+            return {}
+        row_lists = [self._header_rows(self.closure.closures[header]) for header in headers]
+
+        if not SCIPY_AVAILABLE:
+            counts = [int(np.count_nonzero(self._mask_for_rows(rows))) for rows in row_lists]
+            return dict(zip(headers, counts))
+
+        indptr = np.zeros(len(headers) + 1, dtype=np.int64)
+        np.cumsum([len(rows) for rows in row_lists], out=indptr[1:])
+        indices = np.concatenate(row_lists) if row_lists else np.zeros(0, dtype=np.int64)
+        candidate_to_header = sparse.csr_matrix(
+            (np.ones(len(indices), dtype=np.int32), indices, indptr), shape=(len(headers), len(self.source_index.header_ids))
+        )
+        candidate_to_source = candidate_to_header @ self.source_index.incidence_matrix()
+        counts = np.diff(candidate_to_source.indptr)
+        return {header: int(count) for header, count in zip(headers, counts)}
+
+    def _mask_for_rows(self, rows: np.ndarray) -> np.ndarray:
+        """Return the boolean source mask for a set of source index rows."""
+        index = self.source_index
+        mask = np.zeros(index.num_sources, dtype=bool)
+        for row in rows:
+            mask[index.indices[index.indptr[row] : index.indptr[row + 1]]] = True
+        return mask
+
+    def affected_count(self, header: str) -> int:
+        """Return the number of sources that rebuild when header changes."""
+        return self.affected_counts[header]
+
+    def combined_affected(self, headers: Iterable[str]) -> int:
+        """Return the number of sources that depend on any header in the union of the closures of headers."""
+        return int(np.count_nonzero(self._mask_for_rows(self._header_rows(self.closure.union(headers)))))
+
+
+def build_rebuild_impact_index(
+    reverse_deps: Mapping[str, Iterable[str]],
+    source_to_deps: Mapping[str, Sequence[str]],
+    headers: Iterable[str],
+    source_index: Optional[SourceIndex] = None,
+) -> RebuildImpactIndex:
+    """Build a RebuildImpactIndex, logging how long it took.
+
+    Args:
+        reverse_deps: Reverse dependency mapping (header -> headers that include it)
+        source_to_deps: Mapping of source files to the files they depend on
+        headers: Candidate headers to evaluate
+        source_index: Optional prebuilt index over source_to_deps (e.g. IncludeGraphScanResult.source_index)
+
+    Returns:
+        RebuildImpactIndex over headers
+    """
+    start = time.perf_counter()
+    if source_index is None:
+        source_index = build_source_index(source_to_deps)
+    index = RebuildImpactIndex(reverse_deps, source_index, headers)
+    logger.debug("Computed rebuild impact for %d headers in %.3fs", len(index.affected_counts), time.perf_counter() - start)
+    return index
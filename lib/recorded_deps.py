@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# ****************************************************************************************************************************************************
+# * BSD 3-Clause License
+# *
+# * Copyright (c) 2025, Mana Battery
+# * All rights reserved.
+# *
+# * Redistribution and use in source and binary forms, with or without modification, are permitted provided that the following conditions are met:
+# *
+# * 1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following disclaimer.
+# * 2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following disclaimer in the
+# *    documentation and/or other materials provided with the distribution.
+# * 3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products derived from this
+# *    software without specific prior written permission.
+# *
+# * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# * THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# * CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# * PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# * LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE,
+# * EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+# ****************************************************************************************************************************************************
+"""Source -> dependency lists read from ninja's own records instead of a rescan.
+
+After a build, .ninja_deps holds the headers every compile step actually read and
+.ninja_log holds the outputs ninja considers built. For each compile edge in
+build.ninja, the recorded inputs are reused when they still describe the object
+on disk:
+
+- the object has a .ninja_log entry and a .ninja_deps record,
+- the deps record is at least as new as the log entry (ninja rewrites both when
+  it reruns the command, so an older record belongs to an earlier build),
+- the object exists and neither the source nor any recorded input is newer.
+
+Everything else is reported as stale for clang-scan-deps to rescan.
+"""
+
+import logging
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from lib.constants import NinjaError
+from lib.ninja_deps import load_ninja_deps
+from lib.ninja_log import load_ninja_log
+from lib.ninja_manifest import load_ninja_manifest
+
+logger = logging.getLogger(__name__)
+
+# Values accepted by build_include_graph(deps_source=...)
+DEPS_SOURCE_AUTO = "auto"
+DEPS_SOURCE_NINJA = "ninja"
+DEPS_SOURCE_SCAN = "clang-scan-deps"
+DEPS_SOURCES = (DEPS_SOURCE_AUTO, DEPS_SOURCE_NINJA, DEPS_SOURCE_SCAN)
+
+
+@dataclass
+class RecordedDependencies:
+    """Dependencies of compiled sources taken from ninja's logs.
+
+    Attributes:
+        source_to_deps: Fresh sources -> [source, dependencies...], paths absolute
+        stale: Sources that need rescanning -> their last recorded dependencies
+            (None if ninja never recorded any)
+        elapsed: Seconds spent reading and validating the logs
+    """
+
+    source_to_deps: Dict[str, List[str]] = field(default_factory=dict)
+    stale: Dict[str, Optional[List[str]]] = field(default_factory=dict)
+    elapsed: float = 0.0
+
+
+def recorded_path(build_dir: str, path: str) -> str:
+    """Return path (absolute, or relative to build_dir) in the form used for recorded dependencies."""
+    return os.path.normpath(os.path.join(build_dir, path))
+
+
+def collect_recorded_dependencies(build_dir: str) -> Optional[RecordedDependencies]:
+    """Read per-source dependencies from build_dir's .ninja_deps, checked against .ninja_log.
+
+    Args:
+        build_dir: Path to the build directory
+
+    Returns:
+        RecordedDependencies, or None when build.ninja, .ninja_deps or .ninja_log is
+        missing or no compile edge has fresh recorded dependencies
+    """
+    from lib.clang_utils import is_valid_source_file
+    from lib.ninja_utils import CXX_RULE_PREFIXES
+
+    start_time = time.perf_counter()
+    build_dir = os.path.abspath(build_dir)
+    build_ninja = os.path.join(build_dir, "build.ninja")
+    if not os.path.exists(build_ninja):
+        return None
+    deps_log = load_ninja_deps(build_dir)
+    build_log = load_ninja_log(build_dir)
+    if deps_log is None or build_log is None:
+        logger.debug("No .ninja_deps/.ninja_log in %s; recorded dependencies unavailable", build_dir)
+        return None
+    try:
+        manifest = load_ninja_manifest(build_ninja)
+    except (OSError, NinjaError) as e:
+        logger.warning("Failed to read %s: %s", build_ninja, e)
+        return None
+
+    mtimes: Dict[str, Optional[int]] = {}
+
+    def mtime_ns(path: str) -> Optional[int]:
+        if path not in mtimes:
+            try:
+                mtimes[path] = os.stat(path).st_mtime_ns
+            except OSError:
+                mtimes[path] = None
+        return mtimes[path]
+
+    def absolute(path: str) -> str:
+        return recorded_path(build_dir, path)
+
+    result = RecordedDependencies()
+    paths = deps_log.paths
+    for build in manifest.builds:
+        if not build.rule.upper().startswith(CXX_RULE_PREFIXES) or not build.inputs or not build.outputs:
+            continue
+        if not is_valid_source_file(build.inputs[0]):
+            continue
+        source = absolute(build.inputs[0])
+        obj = build.outputs[0]
+
+        node = deps_log.node_id(obj)
+        record = deps_log.deps.get(node) if node is not None else None
+        if record is None:
+            result.stale[source] = None
+            continue
+        recorded = [source] + [dep for dep in (absolute(paths[i]) for i in record[1]) if dep != source]
+
+        entry = build_log.entry(obj)
+        fresh = entry is not None and record[0] >= entry.mtime
+        if fresh:
+            obj_mtime = mtime_ns(absolute(obj))
+            # A missing input (deleted header) makes the edge stale, as it would for ninja
+            fresh = obj_mtime is not None and all(m is not None and m <= obj_mtime for m in map(mtime_ns, recorded))
+
+        if fresh:
+            result.source_to_deps[source] = recorded
+        else:
+            result.stale[source] = recorded
+
+    result.elapsed = time.perf_counter() - start_time
+    if not result.source_to_deps:
+        logger.debug("No fresh recorded dependencies in %s (%d stale compile edges)", build_dir, len(result.stale))
+        return None
+    logger.info(
+        "Read recorded dependencies for %d sources in %.2fs (%d stale, %d files checked)",
+        len(result.source_to_deps),
+        result.elapsed,
+        len(result.stale),
+        len(mtimes),
+    )
+    return result
@@ -0,0 +1,355 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# ****************************************************************************************************************************************************
+# * BSD 3-Clause License
+# *
+# * Copyright (c) 2025, Mana Battery
+# * All rights reserved.
+# *
+# * Redistribution and use in source and binary forms, with or without modification, are permitted provided that the following conditions are met:
+# *
+# * 1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following disclaimer.
+# * 2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following disclaimer in the
+# *    documentation and/or other materials provided with the distribution.
+# * 3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products derived from this
+# *    software without specific prior written permission.
+# *
+# * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# * THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# * CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# * PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# * LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE,
+# * EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+# ****************************************************************************************************************************************************
+"""Shared-memory transport of interned graphs to worker processes.
+
+Handing a worker a Dict[str, Set[str]] means pickling every path and set in the
+parent and rebuilding them in the child, once per worker. An InternedGraph
+instead holds its structure in flat numpy arrays (CSR indptr/indices plus any
+per-node columns) and its string tables as one UTF-8 blob with offsets. A
+SharedGraph copies those buffers into a single multiprocessing.shared_memory
+segment once; workers receive only a small SharedGraphHandle and attach to the
+segment, so their arrays are zero-copy views of the parent's memory.
+
+Lifecycle: the SharedGraph that created a segment owns it and unlinks it on
+close() / context exit, on garbage collection and at interpreter exit. Workers
+never take ownership. If the owner is killed before it can clean up, the
+multiprocessing resource tracker unlinks the segment, and cleanup_stale_segments()
+removes segments left behind by owners that no longer exist (e.g. after SIGKILL
+of the whole process group).
+
+On Python 3.7 (no multiprocessing.shared_memory) the handle carries the interned
+arrays inline, which still pickles far faster than nested dicts of sets.
+"""
+
+import logging
+import os
+import secrets
+import weakref
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+try:
+    from multiprocessing import resource_tracker, shared_memory
+except ImportError:  # Python 3.7
+    resource_tracker = None  # type: ignore
+    shared_memory = None  # type: ignore
+
+logger = logging.getLogger(__name__)
+
+SHARED_MEMORY_AVAILABLE = shared_memory is not None
+
+# Segment names are "<prefix><owner pid>_<random>", so stale segments can be traced to their owner
+SEGMENT_PREFIX = "buildcheck_"
+
+# Offsets of arrays inside a segment are rounded up to this many bytes
+_ALIGNMENT = 64
+
+
+@dataclass
+class InternedGraph:
+    """Graph (or any CSR structure) stored as flat arrays and interned string tables.
+
+    Attributes:
+        tables: Named string tables; "paths" holds the node names, indexed by node ID
+        arrays: Named numpy arrays; "indptr"/"indices" hold the CSR adjacency
+            (successors of node i are indices[indptr[i]:indptr[i + 1]])
+    """
+
+    tables: Dict[str, List[str]]
+    arrays: Dict[str, np.ndarray]
+    _segment: Any = field(default=None, repr=False, compare=False)
+
+    @property
+    def paths(self) -> List[str]:
+        """Node names, indexed by node ID."""
+        return self.tables["paths"]
+
+    @property
+    def indptr(self) -> np.ndarray:
+        """CSR row offsets."""
+        return self.arrays["indptr"]
+
+    @property
+    def indices(self) -> np.ndarray:
+        """CSR column (successor) IDs."""
+        return self.arrays["indices"]
+
+    def node_ids(self) -> Dict[str, int]:
+        """Return a mapping of node name -> node ID."""
+        return {path: i for i, path in enumerate(self.paths)}
+
+    def successors(self, node_id: int) -> np.ndarray:
+        """Return the successor IDs of node_id."""
+        return self.indices[self.indptr[node_id] : self.indptr[node_id + 1]]
+
+    def out_degree(self) -> np.ndarray:
+        """Return the out-degree of every node."""
+        return np.diff(self.indptr)
+
+    def in_degree(self) -> np.ndarray:
+        """Return the in-degree of every node."""
+        return np.bincount(self.indices, minlength=len(self.paths))
+
+    def to_mapping(self) -> Dict[str, Set[str]]:
+        """Rebuild the node -> successors mapping (only nodes with successors are keys)."""
+        paths = self.paths
+        indptr = self.indptr.tolist()
+        indices = self.indices.tolist()
+        return {paths[i]: {paths[j] for j in indices[indptr[i] : indptr[i + 1]]} for i in range(len(paths)) if indptr[i] != indptr[i + 1]}
+
+    def close(self) -> None:
+        """Detach from the shared-memory segment backing this graph (if any).
+
+        The arrays must not be used afterwards.
+        """
+        if self._segment is not None:
+            self.arrays = {}
+            self._segment.close()
+            self._segment = None
+
+
+def intern_graph(header_to_headers: Mapping[str, Iterable[str]], nodes: Iterable[str] = ()) -> InternedGraph:
+    """Intern a dependency mapping into CSR arrays.
+
+    Node IDs follow first appearance: the given nodes first, then mapping keys,
+    then dependencies that are not keys.
+
+    Args:
+        header_to_headers: Mapping of node -> dependencies
+        nodes: Nodes to intern first (e.g. the analyzed headers, in display order)
+
+    Returns:
+        InternedGraph with "indptr"/"indices" arrays; per-node columns can be added to arrays
+    """
+    node_ids: Dict[str, int] = {}
+    for node in nodes:
+        node_ids.setdefault(node, len(node_ids))
+    for node in header_to_headers:
+        node_ids.setdefault(node, len(node_ids))
+
+    rows: List[int] = []
+    cols: List[int] = []
+    for node, deps in header_to_headers.items():
+        row = node_ids[node]
+        for dep in deps:
+            rows.append(row)
+            cols.append(node_ids.setdefault(dep, len(node_ids)))
+
+    row_array = np.asarray(rows, dtype=np.int64)
+    order = np.argsort(row_array, kind="stable")
+    indptr = np.zeros(len(node_ids) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(row_array, minlength=len(node_ids)), out=indptr[1:])
+    return InternedGraph({"paths": list(node_ids)}, {"indptr": indptr, "indices": np.asarray(cols, dtype=np.int32)[order]})
+
+
+def _encode_table(strings: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """Encode strings as one UTF-8 blob plus offsets (string i is blob[offsets[i]:offsets[i + 1]])."""
+    encoded = [s.encode("utf-8", "surrogateescape") for s in strings]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(b) for b in encoded], out=offsets[1:])
+    return np.frombuffer(b"".join(encoded), dtype=np.uint8), offsets
+
+
+def _decode_table(blob: np.ndarray, offsets: np.ndarray) -> List[str]:
+    """Inverse of _encode_table."""
+    data = blob.tobytes()
+    bounds = offsets.tolist()
+    return [data[bounds[i] : bounds[i + 1]].decode("utf-8", "surrogateescape") for i in range(len(bounds) - 1)]
+
+
+@dataclass(frozen=True)
+class SharedGraphHandle:
+    """Picklable reference to a published InternedGraph.
+
+    Attributes:
+        segment: Shared-memory segment name (None when the graph is carried inline)
+        layout: (array name, dtype, shape, byte offset) for every array in the segment
+        tables: Names of the string tables stored in the segment
+        inline: The graph itself when shared memory is not available
+    """
+
+    segment: Optional[str]
+    layout: Tuple[Tuple[str, str, Tuple[int, ...], int], ...] = ()
+    tables: Tuple[str, ...] = ()
+    inline: Optional[InternedGraph] = None
+
+
+def _unlink_segment(segment: Any) -> None:
+    """Close and unlink an owned segment, tolerating one that is already gone."""
+    try:
+        segment.close()
+        segment.unlink()
+    except FileNotFoundError:
+        pass
+
+
+class SharedGraph:
+    """Owner of a shared-memory copy of an InternedGraph.
+
+    Use as a context manager around the worker pool; pass handle to the workers
+    and attach_graph() it there.
+
+    Attributes:
+        handle: Picklable handle for attach_graph()
+    """
+
+    def __init__(self, graph: InternedGraph) -> None:
+        """Publish graph in a new shared-memory segment.
+
+        Args:
+            graph: Graph to publish (copied; later changes are not visible to workers)
+        """
+        self._segment: Any = None
+        self._finalizer: Any = None
+        if not SHARED_MEMORY_AVAILABLE:
+            self.handle = SharedGraphHandle(None, inline=graph)
+            return
+
+        arrays = dict(graph.arrays)
+        for table, strings in graph.tables.items():
+            arrays[f"{table}.blob"], arrays[f"{table}.offsets"] = _encode_table(strings)
+
+        layout: List[Tuple[str, str, Tuple[int, ...], int]] = []
+        size = 0
+        for name, array in arrays.items():
+            layout.append((name, array.dtype.str, array.shape, size))
+            size += -(-array.nbytes // _ALIGNMENT) * _ALIGNMENT
+
+        name = f"{SEGMENT_PREFIX}{os.getpid()}_{secrets.token_hex(6)}"
+        self._segment = shared_memory.SharedMemory(name=name, create=True, size=max(size, 1))
+        self._finalizer = weakref.finalize(self, _unlink_segment, self._segment)
+        for (_, dtype, shape, offset), array in zip(layout, arrays.values()):
+            np.ndarray(shape, dtype=dtype, buffer=self._segment.buf, offset=offset)[...] = array
+        self.handle = SharedGraphHandle(name, tuple(layout), tuple(graph.tables))
+        logger.debug("Published graph in shared memory segment %s (%d bytes)", name, size)
+
+    def close(self) -> None:
+        """Unlink the segment; workers that are still attached keep their mapping."""
+        if self._finalizer is not None:
+            self._finalizer()
+
+    def __enter__(self) -> "SharedGraph":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+def _shares_owner_tracker() -> bool:
+    """Return True if this process talks to an already running resource tracker.
+
+    Processes started by multiprocessing (fork or spawn) inherit the owner's
+    tracker connection; an unrelated process has none until it registers something.
+    """
+    tracker = getattr(resource_tracker, "_resource_tracker", None)
+    return getattr(tracker, "_fd", None) is not None
+
+
+def _attach_segment(name: str) -> Any:
+    """Attach to an existing segment without leaving it registered with a tracker of its own.
+
+    Python < 3.13 registers attachments as well as creations. In a worker sharing
+    the owner's tracker that only repeats the owner's registration (dropping it
+    would lose the owner's crash cleanup); any other process unregisters right
+    after attaching, so its own tracker does not unlink the segment when it exits.
+    """
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)  # type: ignore[call-arg]
+    except TypeError:  # Python < 3.13
+        pass
+    shared_tracker = _shares_owner_tracker()
+    segment = shared_memory.SharedMemory(name=name)
+    if not shared_tracker and os.name == "posix":
+        # Only POSIX segments are tracked, under the name with the leading slash SharedMemory.name strips
+        resource_tracker.unregister(f"/{segment.name}", "shared_memory")
+    return segment
+
+
+def attach_graph(handle: SharedGraphHandle) -> InternedGraph:
+    """Attach to a published graph.
+
+    The returned arrays are read-only, zero-copy views of the shared segment;
+    string tables are decoded into lists. Call close() on the result when done.
+
+    Args:
+        handle: SharedGraph.handle from the owning process
+
+    Returns:
+        InternedGraph backed by the shared segment
+
+    Raises:
+        FileNotFoundError: If the owner has already unlinked the segment
+    """
+    if handle.segment is None:
+        assert handle.inline is not None
+        return handle.inline
+
+    segment = _attach_segment(handle.segment)
+    arrays: Dict[str, np.ndarray] = {}
+    for name, dtype, shape, offset in handle.layout:
+        array = np.ndarray(shape, dtype=dtype, buffer=segment.buf, offset=offset)
+        array.flags.writeable = False
+        arrays[name] = array
+    tables = {table: _decode_table(arrays.pop(f"{table}.blob"), arrays.pop(f"{table}.offsets")) for table in handle.tables}
+    return InternedGraph(tables, arrays, segment)
+
+
+def cleanup_stale_segments(shm_dir: str = "/dev/shm") -> int:
+    """Unlink segments whose owning process no longer exists.
+
+    Args:
+        shm_dir: Directory where the platform exposes POSIX shared memory
+
+    Returns:
+        Number of segments removed (0 where segments are not visible as files)
+    """
+    if not os.path.isdir(shm_dir):
+        return 0
+    removed = 0
+    for entry in os.listdir(shm_dir):
+        if not entry.startswith(SEGMENT_PREFIX):
+            continue
+        pid_text = entry[len(SEGMENT_PREFIX) :].split("_", 1)[0]
+        if not pid_text.isdigit() or _process_exists(int(pid_text)):
+            continue
+        try:
+            os.unlink(os.path.join(shm_dir, entry))
+            removed += 1
+            logger.debug("Removed stale shared memory segment %s", entry)
+        except OSError:
+            pass
+    return removed
+
+
+def _process_exists(pid: int) -> bool:
+    """Return True if a process with pid exists."""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# ****************************************************************************************************************************************************
+# * BSD 3-Clause License
+# *
+# * Copyright (c) 2025, Mana Battery
+# * All rights reserved.
+# *
+# * Redistribution and use in source and binary forms, with or without modification, are permitted provided that the following conditions are met:
+# *
+# * 1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following disclaimer.
+# * 2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following disclaimer in the
+# *    documentation and/or other materials provided with the distribution.
+# * 3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products derived from this
+# *    software without specific prior written permission.
+# *
+# * THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO,
+# * THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR
+# * CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# * PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF
+# * LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE,
+# * EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+# ****************************************************************************************************************************************************
+"""Inverted header -> source index for rebuild impact queries.
+
+Rebuild estimates ask "which translation units depend on any of these
+headers?" many times per run. Scanning source_to_deps for every query is
+O(headers × sources × deps); this module inverts the mapping once into CSR
+arrays over interned source IDs, so each query becomes a numpy boolean mask
+union over the affected headers' source lists.
+"""
+
+import logging
+import time
+from typing import Any, Dict, Iterable, List, Mapping, Sequence, Set
+
+import numpy as np
+
+try:
+    from scipy import sparse
+except ImportError:
+    sparse = None  # type: ignore
+
+logger = logging.getLogger(__name__)
+
+
+class SourceIndex:
+    """Inverted index from header to the translation units that depend on it.
+
+    Sources are interned to dense integer IDs (sorted by path) and each header's
+    dependent sources are stored as one slice of a CSR indices array.
+
+    Attributes:
+        sources: Source file paths, indexed by source ID
+        source_ids: Mapping of source file path -> source ID
+        header_ids: Mapping of header path -> row in the CSR arrays
+        indptr: Row offsets; sources of header row r are indices[indptr[r]:indptr[r + 1]]
+        indices: Concatenated, sorted source IDs for every header row
+    """
+
+    def __init__(self, source_to_deps: Mapping[str, Sequence[str]]) -> None:
+        """Build the index from a source -> dependencies mapping.
+
+        Args:
+            source_to_deps: Mapping of source files to the files they depend on
+        """
+        self.sources: List[str] = sorted(source_to_deps)
+        self.source_ids: Dict[str, int] = {source: i for i, source in enumerate(self.sources)}
+        self.header_ids: Dict[str, int] = {}
+
+        header_rows: List[int] = []
+        source_cols: List[int] = []
+        for source_id, source in enumerate(self.sources):
+            for dep in set(source_to_deps[source]):
+                row = self.header_ids.setdefault(dep, len(self.header_ids))
+                header_rows.append(row)
+                source_cols.append(source_id)
+
+        rows = np.asarray(header_rows, dtype=np.int64)
+        cols = np.asarray(source_cols, dtype=np.int32)
+        # Stable sort keeps source IDs ascending within each header row
+        order = np.argsort(rows, kind="stable")
+        self.indices: np.ndarray = cols[order]
+        self.indptr: np.ndarray = np.zeros(len(self.header_ids) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=len(self.header_ids)), out=self.indptr[1:])
+        self._incidence: Any = None
+
+    @property
+    def num_sources(self) -> int:
+        """Number of interned source files."""
+        return len(self.sources)
+
+    def sources_of(self, header: str) -> np.ndarray:
+        """Return the IDs of sources that depend on header (empty if unknown)."""
+        row = self.header_ids.get(header)
+        if row is None:
+            return self.indices[:0]
+        return self.indices[self.indptr[row] : self.indptr[row + 1]]
+
+    def affected_mask(self, headers: Iterable[str]) -> np.ndarray:
+        """Return a boolean mask over source IDs of sources depending on any of headers."""
+        mask = np.zeros(self.num_sources, dtype=bool)
+        for header in headers:
+            row = self.header_ids.get(header)
+            if row is not None:
+                mask[self.indices[self.indptr[row] : self.indptr[row + 1]]] = True
+        return mask
+
+    def count_affected(self, headers: Iterable[str]) -> int:
+        """Return the number of sources depending on any of headers."""
+        return int(np.count_nonzero(self.affected_mask(headers)))
+
+    def affected_weight(self, headers: Iterable[str], weights: np.ndarray) -> float:
+        """Return the summed weights (indexed by source ID) of sources depending on any of headers."""
+        return float(weights[self.affected_mask(headers)].sum())
+
+    def affected_sources(self, headers: Iterable[str]) -> Set[str]:
+        """Return the paths of sources depending on any of headers."""
+        return self.mask_to_sources(self.affected_mask(headers))
+
+    def incidence_matrix(self) -> Any:
+        """Return the header×source incidence matrix as a scipy.sparse CSR matrix (built once).
+
+        Row r corresponds to the header with header_ids value r and column c to sources[c].
+
+        Raises:
+            ImportError: If scipy is not installed
+        """
+        if sparse is None:
+            raise ImportError("scipy is required for the sparse incidence matrix")
+        if self._incidence is None:
+            data = np.ones(len(self.indices), dtype=np.int32)
+            self._incidence = sparse.csr_matrix((data, self.indices, self.indptr), shape=(len(self.header_ids), self.num_sources))
+        return self._incidence
+
+    def mask_to_sources(self, mask: np.ndarray) -> Set[str]:
+        """Convert a boolean mask over source IDs back to source paths."""
+        return {self.sources[i] for i in np.flatnonzero(mask)}
+
+
+def build_source_index(source_to_deps: Mapping[str, Sequence[str]]) -> SourceIndex:
+    """Build a SourceIndex, logging its size and build time.
+
+    Args:
+        source_to_deps: Mapping of source files to the files they depend on
+
+    Returns:
+        SourceIndex over the mapping
+    """
+    start = time.perf_counter()
+    index = SourceIndex(source_to_deps)
+    logger.debug(
+        "Built source index: %d sources, %d headers, %d entries in %.3fs",
+        index.num_sources,
+        len(index.header_ids),
+        len(index.indices),
+        time.perf_counter() - start,
+    )
+    return index
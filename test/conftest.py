@@ -223,6 +223,19 @@ int subtract(int a, int b);  // Added function
         pytest.skip(f"Git not available or failed: {e}")
 
 
+@pytest.fixture
+def ninja_found(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Make lib.ninja_utils resolve ninja as "ninja" whether or not it is installed.
+
+    Scope: function
+    Use for: Tests that mock subprocess.run for ninja invocations
+    """
+    import lib.ninja_utils as ninja_utils
+    from lib.tool_detection import ToolInfo
+
+    monkeypatch.setattr(ninja_utils, "find_ninja", lambda: ToolInfo(command="ninja", full_command="ninja", version="1.12.1"))
+
+
 @pytest.fixture
 def mock_ninja_explain_output() -> str:
     """Mock output from ninja -n -d explain.
@@ -80,6 +80,22 @@ class TestCycleInsights:
         assert insights.max_cycle_size_baseline == 3
         assert insights.max_cycle_size_current == 3
 
+    def test_critical_edges_ranked_within_cycles(self) -> None:
+        """Test that breaking edges come from the cycle subgraphs only."""
+        current_cycles = [{"a.h", "b.h", "c.h"}]
+        G: "nx.DiGraph[str]" = nx.DiGraph()
+        # a->b->c->a cycle with a shortcut b->a; x/y are acyclic noise
+        G.add_edges_from([("a.h", "b.h"), ("b.h", "c.h"), ("c.h", "a.h"), ("b.h", "a.h"), ("x.h", "a.h"), ("c.h", "y.h")])
+
+        insights = compute_cycle_insights([], current_cycles, G)
+
+        assert insights is not None
+        edges = [edge for edge, _ in insights.critical_breaking_edges]
+        assert set(edges) == {("a.h", "b.h"), ("b.h", "c.h"), ("c.h", "a.h"), ("b.h", "a.h")}
+        expected = nx.edge_betweenness_centrality(G.subgraph(current_cycles[0]))
+        for edge, score in insights.critical_breaking_edges:
+            assert score == pytest.approx(expected[edge])
+
     def test_cycle_insights_no_cycles(self) -> None:
         """Test cycle insights returns None when no cycles exist."""
         baseline_cycles = [{"a.h", "b.h"}]
@@ -147,6 +163,29 @@ class TestRippleImpact:
         assert impact.total_downstream_impact >= 0
         assert impact.unique_downstream_count >= 0
 
+    def test_ripple_impact_with_compile_times(self) -> None:
+        """Test that rebuild counts are also reported as compile-time weighted CPU-seconds."""
+        from lib.ninja_log import CompileTimes
+
+        current_graph: "nx.DiGraph[str]" = nx.DiGraph()
+        current_graph.add_edges_from([("b.h", "a.h")])
+        metrics = {"a.h": DSMMetrics(fan_out=0, fan_in=1, fan_out_project=0, fan_out_external=0, coupling=1, stability=0.0)}
+        current_metrics = {"a.h": DSMMetrics(fan_out=1, fan_in=1, fan_out_project=1, fan_out_external=0, coupling=2, stability=0.5)}
+        source_to_deps = {"slow.cpp": ["slow.cpp", "b.h"], "fast.cpp": ["fast.cpp", "a.h"], "other.cpp": ["other.cpp"]}
+        compile_times = CompileTimes({"slow.cpp": 60.0, "fast.cpp": 1.0}, default=2.0)
+
+        impact = compute_ripple_impact(
+            nx.DiGraph(), current_graph, metrics, current_metrics, {"a.h"}, {"a.h": {"b.h"}}, source_to_deps=source_to_deps, compile_times=compile_times
+        )
+
+        assert impact.this_commit_rebuild_count == 2
+        assert impact.this_commit_rebuild_seconds == pytest.approx(61.0)
+        assert impact.future_ongoing_rebuild_seconds == pytest.approx(1.0)
+        assert impact.total_compile_seconds == pytest.approx(63.0)
+
+        unweighted = compute_ripple_impact(nx.DiGraph(), current_graph, metrics, current_metrics, {"a.h"}, {"a.h": {"b.h"}}, source_to_deps=source_to_deps)
+        assert unweighted.this_commit_rebuild_seconds is None
+
 
 class TestArchitecturalInsights:
     """Test compute_architectural_insights integration."""
@@ -35,6 +35,7 @@ import buildCheckImpact
 class TestBuildCheckImpact:
     """Test suite for buildCheckImpact main script functionality."""
 
+    @pytest.mark.usefixtures("ninja_found")
     def test_build_dependency_impact_map(self, mock_build_dir: Any, monkeypatch: Any) -> None:
         """Test building dependency impact map."""
         mock_deps_output = """main.cpp.o:
@@ -110,6 +111,26 @@ utils.cpp.o:
         assert result == 1
 
 
+class TestLinkImpactReport:
+    """Tests for the relink fan-out in the report."""
+
+    def test_format_link_impact(self) -> None:
+        """Test that relinks are reported with link time only when it is known."""
+        from lib.link_impact import LinkImpact
+
+        assert buildCheckImpact.format_link_impact(None) == ""
+        assert buildCheckImpact.format_link_impact(LinkImpact("a.h", compiles=3)) == ""
+
+        text = buildCheckImpact.format_link_impact(LinkImpact("a.h", libraries=["libcore.a"], executables=["t1", "t2"], link_seconds=75.0, estimated=True))
+        assert "libraries" in text and "executables" in text
+        assert "~1m 15s linking" in text
+        assert "linking" not in buildCheckImpact.format_link_impact(LinkImpact("a.h", executables=["t1"]))
+
+    def test_header_link_impact_without_build_graph(self, tmp_path: Path) -> None:
+        """Test that an unreadable build graph gives no link impact instead of failing."""
+        assert buildCheckImpact.compute_header_link_impact(str(tmp_path), ["a.h"]) == {}
+
+
 class TestBuildCheckImpactEdgeCases:
     """Test edge cases and error handling."""
 
@@ -120,6 +141,7 @@ class TestBuildCheckImpactEdgeCases:
         assert count == 0
         assert len(impact_map) == 0
 
+    @pytest.mark.usefixtures("ninja_found")
     def test_changed_files_filter(self, mock_build_dir: Any, monkeypatch: Any) -> None:
         """Test filtering by changed files."""
         mock_output = """target.o:
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""Tests for buildCheckIncludeGraph.py chokepoint analysis"""
+
+from pathlib import Path
+from typing import Dict, Set, Tuple
+
+import pytest
+
+from buildCheckIncludeGraph import analyze_chokepoint_headers, find_direct_source_includes
+
+
+@pytest.fixture
+def project(tmp_path: Path) -> Dict[str, Path]:
+    """Two TUs that reach core.hpp and detail.hpp only through api.hpp."""
+    files = {
+        "a.cpp": '#include "api.hpp"\n#include "util.hpp"\n',
+        "b.cpp": '#include "api.hpp"\n',
+        "api.hpp": '#include "core.hpp"\n',
+        "core.hpp": '#include "detail.hpp"\n#include "util.hpp"\n',
+        "detail.hpp": "",
+        "util.hpp": "",
+    }
+    paths = {}
+    for name, content in files.items():
+        path = tmp_path / name
+        path.write_text(content)
+        paths[name] = path
+    return paths
+
+
+def _mappings(project: Dict[str, Path]) -> Tuple[Dict[str, str], Dict[str, Set[str]], Dict[str, Set[str]]]:
+    p = {name: str(path) for name, path in project.items()}
+    source_to_headers: Dict[str, Set[str]] = {
+        p["a.cpp"]: {p["a.cpp"], p["api.hpp"], p["core.hpp"], p["detail.hpp"], p["util.hpp"]},
+        p["b.cpp"]: {p["b.cpp"], p["api.hpp"], p["core.hpp"], p["detail.hpp"], p["util.hpp"]},
+    }
+    include_graph: Dict[str, Set[str]] = {p["api.hpp"]: {p["core.hpp"]}, p["core.hpp"]: {p["detail.hpp"], p["util.hpp"]}}
+    return p, source_to_headers, include_graph
+
+
+class TestChokepointHeaders:
+    """Tests for dominator-based chokepoint detection."""
+
+    def test_direct_includes_parsed(self, project: Dict[str, Path]) -> None:
+        """Test that a TU's direct includes are resolved against its dependencies."""
+        p, source_to_headers, include_graph = _mappings(project)
+
+        direct = find_direct_source_includes(p["a.cpp"], source_to_headers[p["a.cpp"]], include_graph)
+
+        assert direct == {p["api.hpp"], p["util.hpp"]}
+
+    def test_ambiguous_includes_skipped(self, tmp_path: Path) -> None:
+        """Test that an include several dependencies could satisfy is skipped unless the TU's directory resolves it."""
+        for name in ("src/a.cpp", "src/config.h", "x/config.h", "y/config.h"):
+            (tmp_path / name).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / "src" / "a.cpp").write_text('#include "config.h"\n')
+        (tmp_path / "src" / "b.cpp").write_text('#include "config.h"\n#include "x/config.h"\n')
+        source_a, source_b = str(tmp_path / "src" / "a.cpp"), str(tmp_path / "src" / "b.cpp")
+        local, x_config, y_config = (str(tmp_path / name) for name in ("src/config.h", "x/config.h", "y/config.h"))
+
+        assert find_direct_source_includes(source_a, {source_a, local, x_config}, {}) == {local}
+        assert find_direct_source_includes(source_b, {source_b, x_config, y_config}, {}) == {x_config}
+
+    def test_unreadable_source_falls_back(self, project: Dict[str, Path]) -> None:
+        """Test the fallback when a source cannot be read."""
+        p, _, include_graph = _mappings(project)
+        missing = str(project["a.cpp"].parent / "missing.cpp")
+
+        direct = find_direct_source_includes(missing, {missing, p["api.hpp"], p["core.hpp"]}, include_graph)
+
+        assert direct == {p["api.hpp"]}
+
+    def test_dominated_subtree_and_cost(self, project: Dict[str, Path]) -> None:
+        """Test that api.hpp gates core/detail but not util, which a.cpp includes directly."""
+        p, source_to_headers, include_graph = _mappings(project)
+
+        chokepoints = {c.header: c for c in analyze_chokepoint_headers(source_to_headers, include_graph)}
+
+        assert set(chokepoints) == {p["api.hpp"], p["core.hpp"]}
+        api = chokepoints[p["api.hpp"]]
+        assert set(api.dominated_headers) == {p["core.hpp"], p["detail.hpp"]}
+        assert api.tu_count == 2
+        assert api.controlled_cost == 6
+        assert chokepoints[p["core.hpp"]].dominated_headers == [p["detail.hpp"]]
+
+    def test_unresolved_dependency_shared_with_another_tu(self, tmp_path: Path) -> None:
+        """Test that a header another TU reaches through a gate is not dominated by it when this TU reaches it otherwise."""
+        for name in ("x/config.h", "y/config.h"):
+            (tmp_path / name).parent.mkdir(parents=True, exist_ok=True)
+            (tmp_path / name).write_text("")
+        (tmp_path / "a.cpp").write_text('#include "config.h"\n')
+        (tmp_path / "b.cpp").write_text('#include "gate.h"\n')
+        (tmp_path / "gate.h").write_text('#include "x/config.h"\n')
+        a_cpp, b_cpp, gate, x_config, y_config = (str(tmp_path / name) for name in ("a.cpp", "b.cpp", "gate.h", "x/config.h", "y/config.h"))
+        source_to_headers = {a_cpp: {a_cpp, x_config, y_config}, b_cpp: {b_cpp, gate, x_config}}
+
+        chokepoints = analyze_chokepoint_headers(source_to_headers, {gate: {x_config}})
+
+        assert gate not in {c.header for c in chokepoints}
+
+    def test_empty_input(self) -> None:
+        """Test that no input yields no chokepoints."""
+        assert analyze_chokepoint_headers({}, {}) == []
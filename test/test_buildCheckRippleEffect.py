@@ -127,6 +127,31 @@ class TestBuildCheckRippleEffect:
         with pytest.raises(RuntimeError, match="Failed to generate compile_commands.json"):
             buildCheckRippleEffect.analyze_ripple_effect(str(build_dir), [], [])
 
+    def test_analyze_ripple_effect_excludes_system_headers(self, monkeypatch: Any) -> None:
+        """Test that filtered system headers drive neither the affected sources nor the simulation."""
+        from collections import defaultdict
+
+        from lib.clang_utils import FileType, IncludeGraphScanResult
+
+        scan_result = IncludeGraphScanResult(
+            source_to_deps={"/p/a.cpp": ["/p/a.hpp", "/usr/include/vector"], "/p/b.cpp": ["/usr/include/vector"]},
+            include_graph=defaultdict(set),
+            all_headers={"/p/a.hpp", "/usr/include/vector"},
+            scan_time=0.0,
+            file_types={"/p/a.hpp": FileType.PROJECT, "/usr/include/vector": FileType.SYSTEM},
+        )
+        simulated: List[List[str]] = []
+        monkeypatch.setattr(buildCheckRippleEffect, "validate_and_prepare_build_dir", lambda build_dir, verbose: (build_dir, None))
+        monkeypatch.setattr(buildCheckRippleEffect, "build_include_graph", lambda build_dir, deps_source: scan_result)
+        monkeypatch.setattr(buildCheckRippleEffect, "load_compile_times", lambda build_dir: object())
+        monkeypatch.setattr(buildCheckRippleEffect, "load_build_graph", lambda build_dir: None)
+        monkeypatch.setattr(buildCheckRippleEffect, "simulate_change", lambda graph, changed, jobs, pool_depths: simulated.append(sorted(changed)))
+
+        result, _ = buildCheckRippleEffect.analyze_ripple_effect("/build", ["/p/a.hpp", "/usr/include/vector"], [], include_system_headers=False)
+
+        assert result.total_affected == {"/p/a.cpp"}
+        assert simulated == [["/p/a.cpp", "/p/a.hpp"]]
+
     def test_get_ripple_effect_data_no_changes(self, mock_build_dir: Any, mock_git_repo: Any, monkeypatch: Any) -> None:
         """Test getting ripple effect data when no files changed."""
 
@@ -151,6 +176,25 @@ class TestBuildCheckRippleEffect:
         # Just test that it works without errors
         buildCheckRippleEffect.print_ripple_report([], [], valid_result, temp_dir)
 
+    def test_print_ripple_report_wall_time(self, temp_dir: Any, capsys: Any) -> None:
+        """Test that a rebuild simulation is reported as wall time and critical path."""
+        from buildCheckRippleEffect import RippleEffectResult
+        from lib.build_simulator import RebuildSimulation
+
+        simulation = RebuildSimulation(
+            jobs=32, wall_seconds=462.0, cpu_seconds=9000.0, critical_seconds=70.0, critical_path=["a.o", "libcore.a", "app"], edge_counts={"compile": 120, "link": 5}
+        )
+        result = RippleEffectResult(
+            affected_sources={}, total_affected={"a.cpp"}, direct_sources=set(), source_to_deps={"a.cpp": []}, header_to_sources={}, rebuild_simulation=simulation
+        )
+
+        buildCheckRippleEffect.print_ripple_report([], [], result, temp_dir)
+
+        output = capsys.readouterr().out
+        assert "~7m 42s" in output
+        assert "on 32 jobs (120 compile, 5 link; critical path 1m 10s)" in output
+        assert "Rebuild Critical Path (3 steps)" in output
+
 
 class TestBuildCheckRippleEffectIntegration:
     """Integration tests with mocked dependencies."""
@@ -393,6 +437,18 @@ class TestBuildCheckRippleEffectFromParameter:
         # This is a basic smoke test
         assert callable(buildCheckRippleEffect.parse_arguments)
 
+    def test_parse_arguments_deps_source(self, monkeypatch: Any) -> None:
+        """Test that --deps-source defaults to auto and only accepts known sources."""
+        monkeypatch.setattr(sys, "argv", ["buildCheckRippleEffect.py", "build"])
+        assert buildCheckRippleEffect.parse_arguments().deps_source == "auto"
+
+        monkeypatch.setattr(sys, "argv", ["buildCheckRippleEffect.py", "build", "--deps-source", "clang-scan-deps"])
+        assert buildCheckRippleEffect.parse_arguments().deps_source == "clang-scan-deps"
+
+        monkeypatch.setattr(sys, "argv", ["buildCheckRippleEffect.py", "build", "--deps-source", "make"])
+        with pytest.raises(SystemExit):
+            buildCheckRippleEffect.parse_arguments()
+
     def test_write_json_output_with_from_ref(self, mock_build_dir: Any, mock_git_repo: Any, temp_dir: Any, monkeypatch: Any) -> None:
         """Test JSON output includes data when using from_ref."""
         json_path = os.path.join(temp_dir, "output.json")
@@ -83,3 +83,30 @@ ninja: no work to do.
         except SystemExit as e:
             # Expected for successful completion
             assert e.code == buildCheckSummary.EXIT_SUCCESS
+
+
+class TestBuildProfileOption:
+    """Tests for --critical-path."""
+
+    def test_critical_path_text_and_json(self, tmp_path: Path, monkeypatch: Any, capsys: Any) -> None:
+        """Test that the profile is printed even when nothing needs rebuilding, and added to JSON."""
+        from test.test_lib_build_graph import MANIFEST
+        from test.test_lib_ninja_log import write_ninja_log
+
+        (tmp_path / "build.ninja").write_text(MANIFEST)
+        (tmp_path / "compile_commands.json").write_text("[]")
+        write_ninja_log(tmp_path / ".ninja_log", [(0, 500, 1, "gen/version.h"), (500, 2500, 2, "a.o"), (500, 4500, 2, "b.o"), (4500, 4800, 3, "libcore.a"), (4800, 6800, 4, "app")])
+        monkeypatch.setattr(buildCheckSummary, "extract_rebuild_info", lambda *args: ([], {}, {}))
+
+        monkeypatch.setattr(sys, "argv", ["buildCheckSummary.py", str(tmp_path), "--critical-path", "--no-color"])
+        assert buildCheckSummary.main() == buildCheckSummary.EXIT_SUCCESS
+        text = capsys.readouterr().out
+        assert "Build Profile" in text
+        assert "Critical path:       6.8s (4 steps)" in text
+
+        monkeypatch.setattr(sys, "argv", ["buildCheckSummary.py", str(tmp_path), "--critical-path", "--format", "json"])
+        assert buildCheckSummary.main() == buildCheckSummary.EXIT_SUCCESS
+        profile = json.loads(capsys.readouterr().out)["build_profile"]
+        assert profile["critical_seconds"] == 6.8
+        assert [step["output"] for step in profile["critical_path"]] == ["gen/version.h", "b.o", "libcore.a", "app"]
+        assert profile["critical_path"][1]["savings"] == 1.8
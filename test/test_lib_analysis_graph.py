@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""Tests for lib/analysis_graph.py"""
+
+from collections import defaultdict
+from typing import Dict, List, Set
+
+import networkx as nx
+import pytest
+
+from lib.analysis_graph import AnalysisGraph, ensure_analysis_graph, invert_dependencies
+from lib.graph_utils import analyze_cycles, build_reverse_dependencies, compute_layers
+from lib.dsm_analysis import run_dsm_analysis
+
+
+@pytest.fixture
+def cyclic_mapping() -> Dict[str, Set[str]]:
+    """Mapping with a 2-cycle, a self-loop and an out-of-scope dependency."""
+    return {"a.hpp": {"b.hpp"}, "b.hpp": {"a.hpp", "c.hpp"}, "c.hpp": {"c.hpp", "ext.hpp"}, "outside.hpp": {"a.hpp"}}
+
+
+class TestAnalysisGraph:
+    """Tests for the AnalysisGraph container."""
+
+    def test_graph_is_filtered_and_frozen(self, cyclic_mapping: Dict[str, Set[str]]) -> None:
+        """Test that only in-scope edges are kept and the graph cannot be mutated."""
+        shared = AnalysisGraph(cyclic_mapping, {"a.hpp", "b.hpp", "c.hpp"})
+
+        assert set(shared.graph.nodes()) == {"a.hpp", "b.hpp", "c.hpp"}
+        assert not shared.graph.has_node("ext.hpp")
+        assert nx.is_frozen(shared.graph)
+        with pytest.raises(nx.NetworkXError):
+            shared.graph.add_edge("a.hpp", "z.hpp")
+
+    def test_reverse_deps_use_unfiltered_mapping(self, cyclic_mapping: Dict[str, Set[str]]) -> None:
+        """Test that reverse dependencies see dependents outside the scope."""
+        shared = AnalysisGraph(cyclic_mapping, {"a.hpp", "b.hpp", "c.hpp"})
+
+        assert shared.reverse_deps["a.hpp"] == {"b.hpp", "outside.hpp"}
+        assert shared.reverse_deps["ext.hpp"] == {"c.hpp"}
+        assert shared.reverse_deps == invert_dependencies(cyclic_mapping)
+
+    def test_derived_artifacts_are_cached(self, cyclic_mapping: Dict[str, Set[str]]) -> None:
+        """Test that derived artifacts are computed once and reused."""
+        shared = AnalysisGraph(cyclic_mapping, {"a.hpp", "b.hpp", "c.hpp"})
+
+        assert shared.condensation is shared.condensation
+        assert shared.scc_labels["a.hpp"] == shared.scc_labels["b.hpp"]
+        assert shared.scc_labels["a.hpp"] != shared.scc_labels["c.hpp"]
+        assert "condensation" in shared.cached_keys()
+
+        cycles, self_loops = shared.cycles_and_self_loops
+        assert cycles == [{"a.hpp", "b.hpp"}]
+        assert self_loops == ["c.hpp"]
+        assert not shared.is_dag
+
+    def test_topological_order_and_reversed_view(self) -> None:
+        """Test topological order and the reversed view on a DAG."""
+        shared = AnalysisGraph({"a.hpp": {"b.hpp"}, "b.hpp": {"c.hpp"}}, {"a.hpp", "b.hpp", "c.hpp"})
+
+        assert shared.is_dag
+        assert shared.topological_order == ["a.hpp", "b.hpp", "c.hpp"]
+        assert shared.condensation_generations == [["a.hpp"], ["b.hpp"], ["c.hpp"]]
+        assert list(shared.reversed_view.successors("c.hpp")) == ["b.hpp"]
+
+    def test_ensure_reuses_existing_graph(self) -> None:
+        """Test that ensure_analysis_graph does not rebuild a provided graph."""
+        shared = AnalysisGraph({}, {"a.hpp"})
+
+        assert ensure_analysis_graph({}, {"a.hpp"}, shared) is shared
+        assert ensure_analysis_graph({}, {"a.hpp"}) is not shared
+
+
+class TestSharedGraphPhases:
+    """Tests that analysis phases share one graph instance."""
+
+    def test_phases_accept_shared_graph(self, cyclic_mapping: Dict[str, Set[str]]) -> None:
+        """Test that graph_utils phases reuse the provided graph."""
+        headers = {"a.hpp", "b.hpp", "c.hpp"}
+        shared = AnalysisGraph(cyclic_mapping, headers)
+
+        cycles, headers_in_cycles, _, directed_graph, self_loops = analyze_cycles(cyclic_mapping, headers, analysis_graph=shared)
+        assert directed_graph is shared.graph
+        assert headers_in_cycles == {"a.hpp", "b.hpp"}
+        assert self_loops == ["c.hpp"]
+        assert build_reverse_dependencies(cyclic_mapping, headers, analysis_graph=shared) is shared.reverse_deps
+        assert compute_layers(cyclic_mapping, headers, analysis_graph=shared) == ([], {}, True)
+
+    def test_run_dsm_analysis_attaches_graph(self) -> None:
+        """Test that run_dsm_analysis builds the graph once and exposes it."""
+        mapping = defaultdict(set, {"a.hpp": {"b.hpp"}, "b.hpp": {"c.hpp"}})
+        headers = {"a.hpp", "b.hpp", "c.hpp"}
+
+        results = run_dsm_analysis(headers, mapping, compute_layers=True, show_progress=False)
+
+        assert results.analysis_graph is not None
+        assert results.directed_graph is results.analysis_graph.graph
+        assert results.reverse_deps is results.analysis_graph.reverse_deps
+        assert results.header_to_layer == {"a.hpp": 0, "b.hpp": 1, "c.hpp": 2}
+
+
+class TestLazyResults:
+    """Tests that run_dsm_analysis phases run on demand."""
+
+    def test_phases_run_on_first_access(self, cyclic_mapping: Dict[str, Set[str]]) -> None:
+        """Test that only the fields that were read (and their inputs) get computed."""
+        results = run_dsm_analysis({"a.hpp", "b.hpp", "c.hpp"}, defaultdict(set, cyclic_mapping), show_progress=False)
+
+        assert results.computed_fields() == ["analysis_graph", "header_to_headers", "phase_times", "source_to_deps"]
+        assert results.analysis_graph is not None
+
+        assert results.stats.total_headers == 3
+        assert {"metrics", "reverse_deps", "cycles", "headers_in_cycles"} <= set(results.computed_fields())
+        assert "feedback_edges" not in results.computed_fields()
+        assert "feedback_arc_set" not in results.analysis_graph.cached_keys()
+
+        assert len(results.feedback_edges) == 2  # One edge of the 2-cycle plus the self-loop
+        assert "feedback_arc_set" in results.analysis_graph.cached_keys()
+        assert results.metrics is results.metrics
+        assert {"stats", "metrics", "feedback_edges"} <= set(results.phase_times)
+
+    def test_explicit_values_and_pickling(self, cyclic_mapping: Dict[str, Set[str]]) -> None:
+        """Test that assigned fields override phases and pickling yields plain results."""
+        import pickle
+
+        from lib.dsm_types import DSMAnalysisResults
+
+        results = run_dsm_analysis({"a.hpp", "b.hpp", "c.hpp"}, defaultdict(set, cyclic_mapping), compute_layers=False, show_progress=False)
+        results.sorted_headers = ["c.hpp"]
+
+        restored = pickle.loads(pickle.dumps(results))
+
+        assert type(restored) is DSMAnalysisResults
+        assert restored.sorted_headers == ["c.hpp"]
+        assert restored.cycles == [{"a.hpp", "b.hpp"}]
+        assert restored.layers == [] and restored.has_cycles
+
+    def test_equal_to_plain_results(self, cyclic_mapping: Dict[str, Set[str]]) -> None:
+        """Test that lazy and plain results with the same field values compare equal either way round."""
+        results = run_dsm_analysis({"a.hpp", "b.hpp", "c.hpp"}, defaultdict(set, cyclic_mapping), show_progress=False)
+        plain = results.materialize()
+
+        assert results == plain and plain == results
+        plain.sorted_headers = []
+        assert results != plain
+
+    def test_failed_phase_is_retried(self) -> None:
+        """Test that a phase that raised stays pending and runs again on the next access."""
+        from dataclasses import MISSING, fields
+
+        from lib.dsm_types import DSMAnalysisResults, LazyDSMAnalysisResults
+
+        attempts = []
+
+        def flaky_phase(_: DSMAnalysisResults) -> List[str]:
+            attempts.append(1)
+            if len(attempts) == 1:
+                raise RuntimeError("transient")
+            return ["a.hpp"]
+
+        required = [f.name for f in fields(DSMAnalysisResults) if f.default is MISSING and f.default_factory is MISSING]
+        results = LazyDSMAnalysisResults({"sorted_headers": flaky_phase}, **{name: None for name in required if name != "sorted_headers"})
+
+        with pytest.raises(RuntimeError):
+            _ = results.sorted_headers
+        assert results.sorted_headers == ["a.hpp"]
+        assert len(attempts) == 2
+
+
+class TestParallelPhases:
+    """Tests for running independent DSM phases in worker processes."""
+
+    def test_parallel_matches_sequential(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that worker phases give the same results as the lazy in-process run."""
+        import lib.dsm_analysis as dsm_analysis
+
+        monkeypatch.setattr(dsm_analysis, "DSM_PARALLEL_MIN_HEADERS", 1)
+        mapping = defaultdict(set, {"a.hpp": {"b.hpp"}, "b.hpp": {"a.hpp", "c.hpp"}, "c.hpp": {"d.hpp"}, "e.hpp": {"c.hpp"}})
+        headers = {"a.hpp", "b.hpp", "c.hpp", "d.hpp", "e.hpp"}
+
+        sequential = run_dsm_analysis(headers, mapping, show_progress=False)
+        parallel = run_dsm_analysis(headers, mapping, show_progress=False, workers=2)
+
+        assert {"metrics", "cycles", "layers"} <= set(parallel.phase_times)
+        assert parallel.analysis_graph is not None and "condensation" not in parallel.analysis_graph.cached_keys()
+        assert dict(parallel.metrics) == dict(sequential.metrics)
+        assert parallel.cycles == sequential.cycles
+        assert parallel.headers_in_cycles == sequential.headers_in_cycles
+        assert parallel.feedback_edges == sequential.feedback_edges
+        assert parallel.feedback_layer_count == sequential.feedback_layer_count
+        assert (parallel.layers, parallel.has_cycles) == (sequential.layers, sequential.has_cycles)
+        assert parallel.reverse_deps is parallel.analysis_graph.reverse_deps
+        assert parallel.stats == sequential.stats
+
+    def test_parallel_layers_on_a_dag(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that worker layering matches topological generations and seeds the shared graph."""
+        import lib.dsm_analysis as dsm_analysis
+
+        monkeypatch.setattr(dsm_analysis, "DSM_PARALLEL_MIN_HEADERS", 1)
+        mapping = defaultdict(set, {"a.hpp": {"b.hpp", "c.hpp", "ext.hpp"}, "b.hpp": {"d.hpp"}, "c.hpp": {"d.hpp"}, "e.hpp": {"d.hpp"}})
+        headers = {"a.hpp", "b.hpp", "c.hpp", "d.hpp", "e.hpp"}
+
+        sequential = run_dsm_analysis(headers, mapping, show_progress=False)
+        parallel = run_dsm_analysis(headers, mapping, show_progress=False, workers=2)
+
+        assert [set(layer) for layer in parallel.layers] == [set(layer) for layer in sequential.layers] == [{"a.hpp", "e.hpp"}, {"b.hpp", "c.hpp"}, {"d.hpp"}]
+        assert parallel.header_to_layer == sequential.header_to_layer
+        assert (parallel.cycles, parallel.feedback_edges, parallel.has_cycles) == ([], [], False)
+        assert parallel.analysis_graph is not None
+        assert parallel.analysis_graph.is_dag
+        assert parallel.analysis_graph.condensation_generations is parallel.layers
+        assert "condensation" not in parallel.analysis_graph.cached_keys()
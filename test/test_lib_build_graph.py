@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""Tests for lib/build_graph.py"""
+
+from pathlib import Path
+from typing import List, Sequence
+
+import numpy as np
+import pytest
+
+from lib.build_graph import BuildGraph, load_build_graph
+from lib.edge_kinds import EDGE_ARCHIVE, EDGE_COMPILE, EDGE_LINK, EDGE_OTHER, EDGE_PHONY
+from lib.constants import NinjaError
+from lib.ninja_deps import clear_ninja_deps_cache
+from lib.ninja_log import clear_ninja_log_cache
+from lib.ninja_manifest import clear_ninja_manifest_cache
+from test.test_lib_ninja_deps import write_ninja_deps
+from test.test_lib_ninja_log import write_ninja_log
+
+MANIFEST = """rule gen
+  command = python gen.py $out
+rule CXX_COMPILER__core_Release
+  command = c++ -c $in -o $out
+  deps = gcc
+  depfile = $out.d
+rule CXX_STATIC_LIBRARY_LINKER__core_Release
+  command = ar qc $out $in
+rule CXX_EXECUTABLE_LINKER__app_Release
+  command = c++ $in -o $out
+  pool = link_pool
+rule RERUN_CMAKE
+  command = cmake .
+  generator = 1
+pool link_pool
+  depth = 1
+build gen/version.h: gen gen.py
+build a.o: CXX_COMPILER__core_Release src/a.cpp || gen/version.h
+build b.o: CXX_COMPILER__core_Release src/b.cpp || gen/version.h
+build libcore.a: CXX_STATIC_LIBRARY_LINKER__core_Release a.o b.o
+build main.o: CXX_COMPILER__core_Release src/main.cpp
+build app: CXX_EXECUTABLE_LINKER__app_Release main.o libcore.a
+build all: phony app
+build build.ninja: RERUN_CMAKE CMakeLists.txt
+default all
+"""
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache() -> None:
+    """Each test starts without cached manifests or logs."""
+    clear_ninja_manifest_cache()
+    clear_ninja_log_cache()
+    clear_ninja_deps_cache()
+
+
+def make_graph(durations: Sequence[float], preds: List[List[int]]) -> BuildGraph:
+    """Build a graph of compile edges named e0, e1, ... from per-edge predecessor lists."""
+    count = len(durations)
+    pred_ptr = np.zeros(count + 1, dtype=np.int64)
+    np.cumsum([len(p) for p in preds], out=pred_ptr[1:])
+    pred_idx = np.array([p for edge_preds in preds for p in edge_preds], dtype=np.int64)
+    return BuildGraph(
+        [f"e{i}" for i in range(count)],
+        ["cc"] * count,
+        [EDGE_COMPILE] * count,
+        [""] * count,
+        np.asarray(durations, dtype=float),
+        np.ones(count, dtype=bool),
+        pred_ptr,
+        pred_idx,
+    )
+
+
+@pytest.fixture
+def build_tree(tmp_path: Path) -> Path:
+    """A built tree whose log records every edge but main.o."""
+    (tmp_path / "build.ninja").write_text(MANIFEST)
+    entries = [(0, 500, 1, "gen/version.h"), (500, 2500, 2, "a.o"), (500, 4500, 2, "b.o"), (4500, 4800, 3, "libcore.a"), (4800, 6800, 4, "app")]
+    write_ninja_log(tmp_path / ".ninja_log", entries)
+    write_ninja_deps(tmp_path / ".ninja_deps", [("main.o", 2, ["src/main.cpp", "gen/version.h"])])
+    return tmp_path
+
+
+class TestBuildGraph:
+    """Tests for graph queries on hand-built graphs."""
+
+    def test_successors_and_topological_order(self) -> None:
+        """Test that the successor CSR inverts the predecessors and the order respects them."""
+        graph = make_graph([1, 5, 4, 2], [[], [0], [0], [1, 2]])
+
+        assert list(graph.successors(0)) == [1, 2]
+        assert list(graph.successors(3)) == []
+        position = {edge: i for i, edge in enumerate(graph.topological_order())}
+        assert all(position[p] < position[e] for e in range(4) for p in graph.predecessors(e))
+
+    def test_cycle_raises(self) -> None:
+        """Test that a dependency cycle is reported instead of looping."""
+        graph = make_graph([1, 1], [[1], [0]])
+
+        with pytest.raises(NinjaError, match="cycle"):
+            graph.topological_order()
+
+    def test_level_plan(self) -> None:
+        """Test that non-root edges are grouped by depth with reduceat-ready predecessor arrays."""
+        graph = make_graph([1, 5, 4, 2], [[], [0], [0], [1, 2]])
+
+        levels = graph.level_plan()
+
+        assert [edges.tolist() for edges, _, _ in levels] == [[1, 2], [3]]
+        assert levels[0][1].tolist() == [0, 0] and levels[0][2].tolist() == [0, 1]
+        assert levels[1][1].tolist() == [1, 2] and levels[1][2].tolist() == [0]
+
+    def test_schedule_times(self) -> None:
+        """Test earliest start and finish times on unlimited cores."""
+        graph = make_graph([1, 5, 4, 2], [[], [0], [0], [1, 2]])
+
+        start, finish = graph.schedule_times()
+
+        assert list(start) == [0, 1, 1, 6]
+        assert list(finish) == [1, 6, 5, 8]
+        assert graph.schedule_times(np.array([1.0, 0.0, 4.0, 2.0]))[1].max() == 7
+
+    def test_remaining_times(self) -> None:
+        """Test each edge's duration plus its longest chain of consumers."""
+        graph = make_graph([1, 5, 4, 2], [[], [0], [0], [1, 2]])
+
+        assert list(graph.remaining_times()) == [8, 7, 6, 2]
+
+    def test_deep_chain(self) -> None:
+        """Test that a long chain of single-edge levels is scheduled in one pass."""
+        count = 20000
+        graph = make_graph([1.0] * count, [[]] + [[i - 1] for i in range(1, count)])
+
+        assert graph.topological_order().tolist() == list(range(count))
+        assert graph.schedule_times()[1][-1] == count
+        assert graph.remaining_times()[0] == count
+
+    def test_closure(self) -> None:
+        """Test downstream and upstream reachability masks."""
+        graph = make_graph([1, 1, 1, 1, 1], [[], [0], [], [1, 2], []])
+
+        assert list(np.flatnonzero(graph.closure([1]))) == [1, 3]
+        assert list(np.flatnonzero(graph.closure([3], downstream=False))) == [0, 1, 2, 3]
+        assert not graph.closure([]).any()
+
+
+class TestLoadBuildGraph:
+    """Tests for building the graph from a build directory."""
+
+    def test_edges_kinds_and_dependencies(self, build_tree: Path) -> None:
+        """Test that edges, kinds and predecessors (including recorded deps) come from the manifest."""
+        graph = load_build_graph(str(build_tree))
+
+        assert graph.edge_of("build.ninja") is None  # Generator edges are not part of the build
+
+        def edge(output: str) -> int:
+            found = graph.edge_of(output)
+            assert found is not None, output
+            return found
+
+        kinds = {output: graph.kinds[edge(output)] for output in ("gen/version.h", "a.o", "libcore.a", "app", "all")}
+        assert kinds == {"gen/version.h": EDGE_OTHER, "a.o": EDGE_COMPILE, "libcore.a": EDGE_ARCHIVE, "app": EDGE_LINK, "all": EDGE_PHONY}
+        assert graph.pools[edge("app")] == "link_pool"
+        assert graph.pool_depths["link_pool"] == 1
+
+        def preds(output: str) -> List[str]:
+            return sorted(graph.outputs[p] for p in graph.predecessors(edge(output)))
+
+        assert preds("a.o") == ["gen/version.h"]
+        assert preds("main.o") == ["gen/version.h"]  # Only known from .ninja_deps
+        assert preds("app") == ["libcore.a", "main.o"]
+
+    def test_edges_reading(self, build_tree: Path) -> None:
+        """Test that sources and recorded headers map to the edges reading them, absolute or relative."""
+        graph = load_build_graph(str(build_tree))
+
+        def readers(*paths: str) -> List[str]:
+            return sorted(graph.outputs[e] for e in graph.edges_reading(paths))
+
+        assert readers("src/a.cpp") == ["a.o"]
+        assert readers(str(build_tree / "src" / "main.cpp"), "./src/b.cpp") == ["b.o", "main.o"]
+        assert readers("gen.py") == ["gen/version.h"]
+        assert readers("gen/version.h") == []  # Generated: consumers are found through predecessors
+        assert readers("unknown.h") == []
+
+    def test_durations_from_log(self, build_tree: Path) -> None:
+        """Test that logged durations are used and unlogged edges get their kind's median."""
+        graph = load_build_graph(str(build_tree))
+
+        def duration(output: str) -> float:
+            return float(graph.durations[graph.edge_of(output)])
+
+        assert duration("a.o") == 2.0 and duration("b.o") == 4.0 and duration("app") == 2.0
+        assert duration("main.o") == 3.0 and not graph.measured[graph.edge_of("main.o")]
+        assert duration("all") == 0.0
+
+    def test_without_log(self, build_tree: Path) -> None:
+        """Test that a never-built tree gives a graph without measured durations."""
+        (build_tree / ".ninja_log").unlink()
+
+        graph = load_build_graph(str(build_tree))
+
+        assert not graph.measured.any()
+        assert not graph.durations.any()
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""Tests for lib/build_profile.py"""
+
+import numpy as np
+import pytest
+
+from lib.build_profile import compute_build_profile
+from test.test_lib_build_graph import make_graph
+
+
+class TestComputeBuildProfile:
+    """Tests for the critical path and parallelism profile."""
+
+    def test_critical_path_and_savings(self) -> None:
+        """Test the longest chain and how much each of its edges delays the build."""
+        graph = make_graph([1, 5, 4, 2], [[], [0], [0], [1, 2]])
+
+        profile = compute_build_profile(graph, bins=4)
+
+        assert profile.critical_seconds == 8.0
+        assert profile.total_work_seconds == 12.0
+        assert profile.average_parallelism == pytest.approx(1.5)
+        assert [step.output for step in profile.critical_path] == ["e0", "e1", "e3"]
+        # e1 could shrink by only 1s before e2 becomes critical
+        assert [step.savings for step in profile.critical_path] == [1.0, 1.0, 2.0]
+        assert profile.bounds_seconds(1) == (12.0, 20.0)
+        assert profile.bounds_seconds(64)[0] == 8.0
+
+    def test_parallelism_profile(self) -> None:
+        """Test that the profile integrates to the total work."""
+        graph = make_graph([1, 5, 4, 2], [[], [0], [0], [1, 2]])
+
+        profile = compute_build_profile(graph, bins=4)
+
+        assert [value for _, _, value in profile.parallelism] == [1.5, 2.0, 1.5, 1.0]
+        assert sum((end - start) * value for start, end, value in profile.parallelism) == pytest.approx(profile.total_work_seconds)
+
+    def test_scope(self) -> None:
+        """Test that edges outside the scope count as already built."""
+        graph = make_graph([1, 5, 4, 2], [[], [0], [0], [1, 2]])
+
+        profile = compute_build_profile(graph, scope=np.array([False, False, True, True]))
+
+        assert profile.critical_seconds == 6.0
+        assert profile.edge_count == 2
+        assert [step.output for step in profile.critical_path] == ["e2", "e3"]
+
+    def test_empty_graph(self) -> None:
+        """Test that an unmeasured graph yields an empty profile."""
+        profile = compute_build_profile(make_graph([0, 0], [[], [0]]))
+
+        assert profile.critical_seconds == 0.0
+        assert profile.critical_path == [] and profile.parallelism == []
+        assert profile.to_dict()["average_parallelism"] == 0.0
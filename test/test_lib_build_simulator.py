@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""Tests for lib/build_simulator.py"""
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from lib.build_graph import load_build_graph
+from lib.edge_kinds import EDGE_LINK, EDGE_PHONY
+from lib.build_simulator import default_jobs, simulate_build, simulate_change
+from test.test_lib_build_graph import build_tree, fresh_cache, make_graph  # noqa: F401 (fixtures)
+
+
+class TestSimulateBuild:
+    """Tests for list scheduling on hand-built graphs."""
+
+    @pytest.mark.parametrize("jobs,wall", [(1, 12.0), (2, 8.0), (8, 8.0)])
+    def test_wall_time_by_jobs(self, jobs: int, wall: float) -> None:
+        """Test that one job sums the work and enough jobs reach the critical path."""
+        graph = make_graph([1, 5, 4, 2], [[], [0], [0], [1, 2]])
+
+        simulation = simulate_build(graph, jobs=jobs)
+
+        assert simulation.wall_seconds == wall
+        assert simulation.cpu_seconds == 12.0
+        assert simulation.critical_seconds == 8.0
+        assert simulation.edge_counts == {"compile": 4}
+
+    def test_longest_chain_runs_first(self) -> None:
+        """Test that the ready edge with the most remaining work is started first."""
+        # e0 (1s) feeds a 10s edge; e1 and e2 (3s each) feed nothing
+        graph = make_graph([1, 3, 3, 10], [[], [], [], [0]])
+
+        simulation = simulate_build(graph, jobs=2)
+
+        assert simulation.wall_seconds == 11.0
+        assert simulation.critical_path == ["e0", "e3"]
+
+    def test_pool_depth(self) -> None:
+        """Test that edges in a pool never exceed its depth, and overrides apply."""
+        graph = make_graph([2, 2, 2, 1], [[], [], [], []])
+        graph.kinds[:3] = [EDGE_LINK] * 3
+        graph.pools[:3] = ["link_pool"] * 3
+        graph.pool_depths["link_pool"] = 1
+
+        assert simulate_build(graph, jobs=4).wall_seconds == 6.0
+        assert simulate_build(graph, jobs=4, pool_depths={"link_pool": 3}).wall_seconds == 2.0
+
+    def test_phony_edges_take_no_slot(self) -> None:
+        """Test that phony aliases neither cost time nor occupy a job."""
+        graph = make_graph([2, 0, 2], [[], [0], [1]])
+        graph.kinds[1] = EDGE_PHONY
+
+        simulation = simulate_build(graph, jobs=1)
+
+        assert simulation.wall_seconds == 4.0
+        assert simulation.edge_count == 2
+        assert simulation.critical_path == ["e0", "e2"]
+
+    def test_scope(self) -> None:
+        """Test that edges outside the scope count as up to date."""
+        graph = make_graph([1, 5, 4, 2], [[], [0], [0], [1, 2]])
+
+        simulation = simulate_build(graph, scope=np.array([False, False, True, True]), jobs=4)
+
+        assert simulation.wall_seconds == 6.0
+        assert simulation.edge_count == 2
+        assert simulation.utilization == pytest.approx(6.0 / 24.0)
+
+    def test_default_jobs(self) -> None:
+        """Test that the default matches ninja's (at least two jobs)."""
+        assert default_jobs() >= 2
+
+
+class TestSimulateChange:
+    """Tests for simulating the rebuild after changed files."""
+
+    def test_header_change_relinks(self, build_tree: Path) -> None:
+        """Test that a recorded header dependency pulls in the compile and the link."""
+        graph = load_build_graph(str(build_tree))
+
+        simulation = simulate_change(graph, ["gen/version.h", str(build_tree / "src" / "main.cpp")], jobs=4)
+
+        assert simulation.edge_counts == {"compile": 1, "link": 1}
+        assert simulation.wall_seconds == 5.0  # main.o never built (3s estimate) + app (2s)
+        assert simulation.estimated_count == 1
+        assert simulation.critical_path == ["main.o", "app"]
+
+    def test_unknown_files(self, build_tree: Path) -> None:
+        """Test that files no edge reads give an empty simulation."""
+        simulation = simulate_change(load_build_graph(str(build_tree)), ["docs/readme.md"], jobs=4)
+
+        assert simulation.edge_count == 0
+        assert simulation.wall_seconds == 0.0
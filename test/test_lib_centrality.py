@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""Tests for lib/centrality.py"""
+
+import networkx as nx
+import pytest
+
+from lib.centrality import (
+    clear_centrality_cache,
+    get_betweenness_centrality,
+    get_cycle_edge_betweenness,
+    get_pagerank,
+    graph_fingerprint,
+    hoeffding_error_bound,
+)
+
+
+@pytest.fixture(autouse=True)
+def _fresh_cache() -> None:
+    clear_centrality_cache()
+
+
+@pytest.fixture
+def random_graph() -> "nx.DiGraph[int]":
+    graph: "nx.DiGraph[int]" = nx.gnp_random_graph(60, 0.08, seed=7, directed=True)
+    return graph
+
+
+class TestBetweenness:
+    """Tests for get_betweenness_centrality."""
+
+    def test_exact_matches_networkx(self, random_graph: "nx.DiGraph[int]") -> None:
+        """Test that small graphs get exact scores identical to networkx."""
+        result = get_betweenness_centrality(random_graph)
+        expected = nx.betweenness_centrality(random_graph)
+
+        assert result.exact
+        assert result.error_bound == 0.0
+        for node, value in expected.items():
+            assert result.scores[node] == pytest.approx(value)
+
+    def test_parallel_exact_matches_networkx(self, random_graph: "nx.DiGraph[int]") -> None:
+        """Test that pivot batches summed across workers give the exact result."""
+        result = get_betweenness_centrality(random_graph, workers=2)
+        expected = nx.betweenness_centrality(random_graph)
+
+        for node, value in expected.items():
+            assert result.scores[node] == pytest.approx(value, abs=1e-12)
+
+    def test_sampling_reports_error_bound(self, random_graph: "nx.DiGraph[int]") -> None:
+        """Test that sampled scores carry a bound and stay within it."""
+        result = get_betweenness_centrality(random_graph, pivots=40)
+        expected = nx.betweenness_centrality(random_graph)
+
+        assert not result.exact
+        assert result.pivots == 40
+        assert result.error_bound == pytest.approx(hoeffding_error_bound(40, nodes=60))
+        assert result.error_bound > hoeffding_error_bound(40)
+        assert max(abs(result.scores[n] - expected[n]) for n in expected) <= result.error_bound
+
+    def test_pivots_clamped_to_node_count(self, random_graph: "nx.DiGraph[int]") -> None:
+        """Test that asking for more pivots than nodes falls back to the exact result."""
+        result = get_betweenness_centrality(random_graph, sample_threshold=10)
+
+        assert result.exact
+        assert result.pivots == random_graph.number_of_nodes() == result.total_nodes
+
+    def test_results_are_cached(self, random_graph: "nx.DiGraph[int]") -> None:
+        """Test that identical graphs reuse the cached result."""
+        first = get_betweenness_centrality(random_graph)
+        second = get_betweenness_centrality(random_graph.copy())
+
+        assert second is first
+        clear_centrality_cache()
+        assert get_betweenness_centrality(random_graph) is not first
+
+    def test_tiny_graph(self) -> None:
+        """Test that graphs with two or fewer nodes yield zeros."""
+        graph: "nx.DiGraph[str]" = nx.DiGraph([("a", "b")])
+
+        assert get_betweenness_centrality(graph).scores == {"a": 0.0, "b": 0.0}
+
+
+class TestFingerprintAndPagerank:
+    """Tests for graph_fingerprint and get_pagerank."""
+
+    def test_fingerprint_tracks_structure(self) -> None:
+        """Test that the fingerprint ignores insertion order but not edges."""
+        g1: "nx.DiGraph[str]" = nx.DiGraph([("a", "b"), ("b", "c")])
+        g2: "nx.DiGraph[str]" = nx.DiGraph([("b", "c"), ("a", "b")])
+        g3: "nx.DiGraph[str]" = nx.DiGraph([("a", "b"), ("c", "b")])
+
+        assert graph_fingerprint(g1) == graph_fingerprint(g2)
+        assert graph_fingerprint(g1) != graph_fingerprint(g3)
+        assert graph_fingerprint(nx.freeze(g1)) == graph_fingerprint(g2)
+
+    def test_fingerprint_follows_mutation(self) -> None:
+        """Test that a mutable graph's remembered fingerprint is refreshed when it grows."""
+        graph: "nx.DiGraph[str]" = nx.DiGraph([("a", "b")])
+        before = graph_fingerprint(graph)
+
+        assert graph_fingerprint(graph) == before
+        graph.add_edge("b", "c")
+        assert graph_fingerprint(graph) == graph_fingerprint(nx.DiGraph([("a", "b"), ("b", "c")])) != before
+
+    def test_pagerank_cached(self, random_graph: "nx.DiGraph[int]") -> None:
+        """Test that PageRank matches networkx and is cached."""
+        scores = get_pagerank(random_graph)
+        expected = nx.pagerank(random_graph, tol=1.0e-6)
+
+        assert get_pagerank(random_graph) is scores
+        for node, value in expected.items():
+            assert scores[node] == pytest.approx(value)
+
+
+class TestCycleEdgeBetweenness:
+    """Tests for get_cycle_edge_betweenness."""
+
+    def test_exact_per_component(self) -> None:
+        """Test that small components match networkx on the induced subgraph."""
+        graph: "nx.DiGraph[int]" = nx.DiGraph([(0, 1), (1, 2), (2, 0), (2, 3), (3, 4), (4, 3), (5, 0)])
+        components = [c for c in nx.strongly_connected_components(graph) if len(c) > 1]
+
+        scores = get_cycle_edge_betweenness(graph, components)
+
+        expected = nx.edge_betweenness_centrality(graph.subgraph({0, 1, 2}))
+        expected.update(nx.edge_betweenness_centrality(graph.subgraph({3, 4})))
+        assert set(scores) == set(expected)
+        for edge, value in expected.items():
+            assert scores[edge] == pytest.approx(value)
+
+    def test_large_components_sampled_and_parallel(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that sampled, multi-process results cover every intra-cycle edge."""
+        monkeypatch.setattr("lib.centrality.CYCLE_PARALLEL_MIN_NODES", 0)
+        graph: "nx.DiGraph[int]" = nx.DiGraph()
+        nx.add_cycle(graph, range(0, 30))
+        nx.add_cycle(graph, range(100, 120))
+
+        scores = get_cycle_edge_betweenness(graph, nx.strongly_connected_components(graph), exact_threshold=10, pivots=5, workers=2)
+
+        assert set(scores) == set(graph.edges())
+        assert all(value > 0 for value in scores.values())
+
+    def test_singletons_ignored(self) -> None:
+        """Test that acyclic components produce no scores."""
+        graph: "nx.DiGraph[str]" = nx.DiGraph([("a", "b")])
+
+        assert get_cycle_edge_betweenness(graph, [{"a"}, {"b"}]) == {}
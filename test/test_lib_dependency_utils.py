@@ -9,8 +9,10 @@ from lib.dependency_utils import (
     find_dependency_fanout,
     build_reverse_dependency_map,
     compute_affected_sources,
+    compute_header_compile_seconds,
     SourceDependencyMap,
 )
+from lib.ninja_log import CompileTimes
 
 
 class TestComputeHeaderCooccurrence:
@@ -412,5 +414,16 @@ class TestComputeAffectedSources:
         assert result["baz.h"] == sorted(result["baz.h"])
 
 
+class TestComputeHeaderCompileSeconds:
+    def test_weights_by_compile_time(self) -> None:
+        """Test that each header's rebuild cost sums its dependent sources' compile times."""
+        source_to_deps = {"a.cpp": ["a.cpp", "x.h", "y.h", "x.h"], "b.cpp": ["b.cpp", "x.h"], "c.cpp": ["c.cpp"]}
+        compile_times = CompileTimes({"a.cpp": 30.0, "b.cpp": 2.0}, default=5.0)
+
+        result = compute_header_compile_seconds(source_to_deps, ["x.h", "y.h", "z.h"], compile_times)
+
+        assert result == {"x.h": 32.0, "y.h": 30.0, "z.h": 0.0}
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
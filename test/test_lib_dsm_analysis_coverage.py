@@ -91,6 +91,18 @@ class TestPrintCircularDependencies:
         assert "Cycle 2" in captured.err
         assert "Suggested edges to remove" in captured.out
 
+    @pytest.mark.unit
+    def test_print_cycle_witness(self, capsys: Any, tmp_path: Path) -> None:
+        """Test that each group shows an example include chain when the graph is given."""
+        import networkx as nx
+
+        a, b, c = (str(tmp_path / name) for name in ("A.hpp", "B.hpp", "C.hpp"))
+        graph = nx.DiGraph([(a, b), (b, c), (c, a), (a, c)])
+
+        print_circular_dependencies(cycles=[{a, b, c}], feedback_edges=[], project_root=str(tmp_path), cycles_only=False, graph=graph)
+
+        assert "e.g. A.hpp → C.hpp → A.hpp" in capsys.readouterr().out
+
     @pytest.mark.unit
     def test_print_no_cycles(self, capsys: Any, tmp_path: Path) -> None:
         """Test printing when no cycles exist."""
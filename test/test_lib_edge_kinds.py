@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""Tests for lib/edge_kinds.py"""
+
+from typing import List
+
+import pytest
+
+from lib.edge_kinds import EDGE_ARCHIVE, EDGE_COMPILE, EDGE_LINK, EDGE_OTHER, EDGE_PHONY, classify_edge, is_library_file, is_shared_library
+
+
+class TestClassifyEdge:
+    """Tests for edge kind detection."""
+
+    @pytest.mark.parametrize(
+        "rule,outputs,inputs,kind",
+        [
+            ("phony", ["all"], ["app"], EDGE_PHONY),
+            ("CXX_COMPILER__core_Release", ["a.o"], ["src/a.cpp"], EDGE_COMPILE),
+            ("CXX_STATIC_LIBRARY_LINKER__core_Release", ["libcore.a"], ["a.o"], EDGE_ARCHIVE),
+            ("CXX_SHARED_LIBRARY_LINKER__core_Release", ["libcore.so"], ["a.o"], EDGE_LINK),
+            ("CXX_EXECUTABLE_LINKER__app_Release", ["app"], ["main.o"], EDGE_LINK),
+            ("link", ["core.lib"], ["a.obj"], EDGE_ARCHIVE),
+            ("AR", ["libz.a"], ["z.o"], EDGE_ARCHIVE),
+            ("CUSTOM_COMMAND", ["gen.h"], ["gen.py"], EDGE_OTHER),
+            ("CMAKE_SYMLINK_LIBRARY", ["libcore.so.1", "libcore.so"], ["libcore.so.1.2.3"], EDGE_OTHER),
+            ("CMAKE_SYMLINK_EXECUTABLE", ["app"], ["app-1.2"], EDGE_OTHER),
+            ("cpp_LINKER", ["tool"], ["tool.o"], EDGE_LINK),
+            ("solink_module", ["plugin.so"], ["plugin.o"], EDGE_LINK),
+        ],
+    )
+    def test_kinds(self, rule: str, outputs: List[str], inputs: List[str], kind: str) -> None:
+        """Test classification of CMake and hand-written rules."""
+        assert classify_edge(rule, outputs, inputs) == kind
+
+    @pytest.mark.parametrize(
+        "rule,output,shared",
+        [
+            ("CXX_SHARED_LIBRARY_LINKER__core_Release", "libcore.so", True),
+            ("CXX_MODULE_LIBRARY_LINKER__plugin_Release", "plugin.so", True),
+            ("solink", "libbase.dylib", True),
+            ("cpp_LINKER", "libmeson.so.1.2.3", True),
+            ("CXX_EXECUTABLE_LINKER__app_Release", "app", False),
+        ],
+    )
+    def test_shared_libraries(self, rule: str, output: str, shared: bool) -> None:
+        """Test that shared libraries are told apart from executables by rule name or file name."""
+        assert is_shared_library(rule, output) == shared
+
+    def test_library_files(self) -> None:
+        """Test recognition of library files among link inputs."""
+        assert [is_library_file(path) for path in ("libz.a", "z.lib", "libz.so", "libz.so.1.2", "libz.dylib", "main.o", "z.dll")] == [
+            True,
+            True,
+            True,
+            True,
+            True,
+            False,
+            False,
+        ]
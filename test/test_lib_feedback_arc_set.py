@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""Tests for lib/feedback_arc_set.py"""
+
+from collections import defaultdict
+from typing import Any, List, Tuple
+
+import networkx as nx
+import pytest
+
+from lib.analysis_graph import AnalysisGraph
+from lib.dsm_analysis import run_dsm_analysis
+from lib.feedback_arc_set import eades_lin_smyth_order, refine_order, solve_feedback_arc_set
+from lib.graph_utils import get_feedback_arc_set
+
+
+def _is_acyclic_without(graph: "nx.DiGraph[Any]", edges: List[Tuple[Any, Any]]) -> bool:
+    remaining = graph.copy()
+    remaining.remove_edges_from(edges)
+    acyclic: bool = nx.is_directed_acyclic_graph(remaining)
+    return acyclic
+
+
+class TestOrdering:
+    """Tests for the ordering heuristic and local search."""
+
+    def test_dag_order_has_no_backward_edges(self) -> None:
+        """Test that a DAG is ordered topologically."""
+        succ = [[1, 2], [3], [3], []]
+        pred = [[], [0], [0], [1, 2]]
+
+        order = eades_lin_smyth_order(4, succ, pred)
+        position = {v: i for i, v in enumerate(order)}
+
+        assert sorted(order) == [0, 1, 2, 3]
+        assert all(position[u] < position[v] for u in range(4) for v in succ[u])
+
+    def test_refine_swaps_backward_neighbours(self) -> None:
+        """Test that an adjacent backward edge is fixed by a swap."""
+        succ_sets = [set(), {0}]
+
+        assert refine_order([0, 1], succ_sets) == [1, 0]
+
+
+class TestSolveFeedbackArcSet:
+    """Tests for solve_feedback_arc_set."""
+
+    def test_two_cycle_needs_one_edge(self) -> None:
+        """Test that a 2-cycle is broken by cutting one edge."""
+        graph: "nx.DiGraph[str]" = nx.DiGraph([("a", "b"), ("b", "a"), ("b", "c")])
+
+        result = solve_feedback_arc_set(graph)
+
+        assert len(result.edges) == 1
+        assert result.component_count == 1
+        assert result.layer_count == 3
+        assert _is_acyclic_without(graph, result.edges)
+
+    def test_self_loops_included(self) -> None:
+        """Test that self-loops are part of the cut set."""
+        graph: "nx.DiGraph[str]" = nx.DiGraph([("a", "a"), ("a", "b")])
+
+        result = solve_feedback_arc_set(graph)
+
+        assert result.edges == [("a", "a")]
+        assert result.component_count == 0
+
+    @pytest.mark.parametrize("seed", [1, 2, 3])
+    def test_random_graphs_become_acyclic(self, seed: int) -> None:
+        """Test acyclicity and that the cut beats removing every other edge."""
+        random_graph: "nx.DiGraph[int]" = nx.gnp_random_graph(200, 0.03, seed=seed, directed=True)
+        graph = nx.relabel_nodes(random_graph, {node: str(node) for node in random_graph})
+
+        result = solve_feedback_arc_set(graph)
+
+        assert _is_acyclic_without(graph, result.edges)
+        assert len(result.edges) < graph.number_of_edges() / 2
+        remaining = graph.copy()
+        remaining.remove_edges_from(result.edges)
+        assert result.layer_count == sum(1 for _ in nx.topological_generations(remaining))
+
+    def test_unorderable_nodes(self) -> None:
+        """Test that nodes of mixed types are handled, in graph order."""
+        graph: "nx.DiGraph[object]" = nx.DiGraph([("a", 1), (1, ("t",)), (("t",), "a"), (1, 1)])
+
+        result = solve_feedback_arc_set(graph)
+
+        assert len(result.edges) == 2 and (1, 1) in result.edges
+        assert _is_acyclic_without(graph, result.edges)
+
+    def test_parallel_matches_serial(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that solving components in worker processes gives the same cut."""
+        graph: "nx.DiGraph[str]" = nx.DiGraph()
+        nx.add_cycle(graph, [f"a{i}" for i in range(20)])
+        nx.add_cycle(graph, [f"b{i}" for i in range(10)])
+        graph.add_edge("a0", "b0")
+
+        serial = solve_feedback_arc_set(graph, workers=1)
+        monkeypatch.setattr("lib.feedback_arc_set.CYCLE_PARALLEL_MIN_NODES", 0)
+        parallel = solve_feedback_arc_set(graph, workers=2)
+
+        assert parallel.edges == serial.edges
+        assert len(serial.edges) == 2
+        assert serial.component_sizes == [20, 10]
+
+
+class TestSharedFeedbackArcSet:
+    """Tests for the shared-graph integration."""
+
+    def test_cached_on_analysis_graph(self) -> None:
+        """Test that the result is computed once per analysis graph."""
+        shared = AnalysisGraph({"a.hpp": {"b.hpp"}, "b.hpp": {"a.hpp"}}, {"a.hpp", "b.hpp"})
+
+        assert get_feedback_arc_set(shared) is get_feedback_arc_set(shared)
+
+    def test_run_dsm_analysis_reports_layers(self) -> None:
+        """Test that run_dsm_analysis records the layers left after cutting."""
+        mapping = defaultdict(set, {"a.hpp": {"b.hpp"}, "b.hpp": {"a.hpp", "c.hpp"}})
+
+        results = run_dsm_analysis({"a.hpp", "b.hpp", "c.hpp"}, mapping, compute_layers=False, show_progress=False)
+
+        assert len(results.feedback_edges) == 1
+        assert results.feedback_layer_count == 3
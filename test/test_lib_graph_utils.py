@@ -13,6 +13,7 @@ try:
 except ImportError:
     NETWORKX_AVAILABLE = False
 
+from lib.analysis_graph import invert_dependencies
 from lib.graph_utils import (
     build_dependency_graph,
     find_strongly_connected_components,
@@ -20,6 +21,7 @@ from lib.graph_utils import (
     compute_layers,
     analyze_cycles,
     compute_topological_layers,
+    find_cycle_witnesses,
     compute_transitive_closure,
     compute_reverse_transitive_closure,
     build_transitive_dependents_map,
@@ -27,6 +29,14 @@ from lib.graph_utils import (
     find_hub_nodes,
     compute_betweenness_centrality,
     find_longest_path_through_node,
+    compute_longest_path_index,
+    compute_longest_paths_through_all_nodes,
+    compute_dominator_tree,
+    find_redundant_include_edges,
+    MetricsTable,
+    calculate_dsm_metrics,
+    calculate_interface_implementation_ratio,
+    detect_coupling_outliers,
     export_graph_to_graphml,
     export_graph_to_dot,
 )
@@ -186,6 +196,60 @@ class TestComputeTopologicalLayers:
         assert "a" in layers
         assert "b" in layers
 
+    def test_cycle_members_share_layer(self) -> None:
+        """Test that cycle members collapse into their component's layer."""
+        G: Any = nx.DiGraph()
+        G.add_edges_from([("top", "a"), ("a", "b"), ("b", "c"), ("c", "a"), ("c", "base")])
+
+        layers = compute_topological_layers(G)
+
+        assert layers["a"] == layers["b"] == layers["c"]
+        assert layers["top"] < layers["a"] < layers["base"]
+
+    def test_dense_scc_is_linear(self) -> None:
+        """Test that a complete digraph (factorially many cycles) is layered quickly."""
+        nodes = [f"h{i}.hpp" for i in range(60)]
+        G: "nx.DiGraph[str]" = nx.DiGraph((u, v) for u in nodes for v in nodes if u != v)
+        G.add_edge(nodes[0], "leaf")
+
+        layers = compute_topological_layers(G)
+
+        assert len(set(layers[n] for n in nodes)) == 1
+        assert layers["leaf"] == layers[nodes[0]] + 1
+
+
+@pytest.mark.skipif(not NETWORKX_AVAILABLE, reason="networkx not available")
+class TestFindCycleWitnesses:
+    """Tests for find_cycle_witnesses function."""
+
+    def test_one_witness_per_scc(self) -> None:
+        """Test that each non-trivial SCC yields one valid cycle."""
+        G: Any = nx.DiGraph()
+        G.add_edges_from([("a", "b"), ("b", "a"), ("c", "d"), ("d", "e"), ("e", "c"), ("e", "a")])
+
+        witnesses = find_cycle_witnesses(G)
+
+        assert len(witnesses) == 2
+        for cycle in witnesses:
+            for i, node in enumerate(cycle):
+                assert G.has_edge(node, cycle[(i + 1) % len(cycle)])
+
+    def test_budget_is_respected(self) -> None:
+        """Test that the number of witnesses is bounded."""
+        G: Any = nx.DiGraph()
+        for i in range(10):
+            G.add_edges_from([(f"x{i}", f"y{i}"), (f"y{i}", f"x{i}")])
+
+        assert len(find_cycle_witnesses(G, max_witnesses=3)) == 3
+        assert find_cycle_witnesses(G, max_witnesses=0) == []
+
+    def test_acyclic_graph(self) -> None:
+        """Test that a DAG has no witnesses."""
+        G: Any = nx.DiGraph()
+        G.add_edges_from([("a", "b"), ("b", "c")])
+
+        assert find_cycle_witnesses(G) == []
+
 
 @pytest.mark.skipif(not NETWORKX_AVAILABLE, reason="networkx not available")
 class TestTransitiveClosure:
@@ -292,6 +356,148 @@ class TestLongestPath:
 
         assert length > 0
 
+    def test_longest_path_counts_full_chain(self) -> None:
+        """Test that the longest chain through a node spans both directions."""
+        G: Any = nx.DiGraph()
+        G.add_edges_from([("a", "b"), ("b", "c"), ("c", "d"), ("x", "b")])
+
+        assert find_longest_path_through_node(G, "b") == 3
+        assert find_longest_path_through_node(G, "a") == 0
+
+    def test_dense_graph_does_not_enumerate_paths(self) -> None:
+        """Test a layered graph with exponentially many simple paths."""
+        G: "nx.DiGraph[str]" = nx.DiGraph()
+        width, depth = 8, 30
+        for layer in range(depth - 1):
+            for i in range(width):
+                for j in range(width):
+                    G.add_edge(f"l{layer}_{i}.hpp", f"l{layer + 1}_{j}.hpp")
+
+        assert find_longest_path_through_node(G, f"l{depth // 2}_0.hpp") == depth - 1
+
+    def test_path_reconstruction_and_cycles(self) -> None:
+        """Test path reconstruction with a cycle collapsed into one step."""
+        G: Any = nx.DiGraph()
+        G.add_edges_from([("top", "a"), ("a", "b"), ("b", "a"), ("b", "mid"), ("mid", "base")])
+
+        index = compute_longest_path_index(G)
+
+        assert index.length_through("mid") == 3
+        path = index.path_through("mid")
+        assert path[0] == "top" and path[-1] == "base" and "mid" in path
+        assert index.path_through("unknown") == []
+
+    def test_batch_query(self) -> None:
+        """Test computing the longest chain through every node at once."""
+        G: Any = nx.DiGraph()
+        G.add_edges_from([("a", "b"), ("b", "c"), ("d", "c")])
+
+        lengths = compute_longest_paths_through_all_nodes(G)
+
+        assert lengths == {"a": 2, "b": 2, "c": 2, "d": 1}
+
+
+@pytest.mark.skipif(not NETWORKX_AVAILABLE, reason="networkx not available")
+class TestDominatorTree:
+    """Tests for compute_dominator_tree function."""
+
+    def test_diamond_and_chain(self) -> None:
+        """Test dominators on a diamond followed by a chain."""
+        G: Any = nx.DiGraph()
+        G.add_edges_from([("r", "a"), ("r", "b"), ("a", "c"), ("b", "c"), ("c", "d"), ("d", "e")])
+
+        tree = compute_dominator_tree(G, "r")
+
+        assert tree.idom["c"] == "r"
+        assert tree.idom["e"] == "d"
+        assert sorted(tree.dominated("c")) == ["d", "e"]
+        assert tree.dominated_count["c"] == 2
+        assert tree.dominated_count["a"] == 0
+        assert tree.dominators("e") == ["d", "c", "r"]
+        assert tree.dominators("r") == []
+
+    def test_weights_and_unreachable_nodes(self) -> None:
+        """Test weighted subtree aggregation and that unreachable nodes are excluded."""
+        G: Any = nx.DiGraph()
+        G.add_edges_from([("r", "a"), ("a", "b"), ("b", "a"), ("x", "a")])
+
+        tree = compute_dominator_tree(G, "r", weights={"r": 0.0, "a": 2.0, "b": 3.0})
+
+        assert "x" not in tree.idom
+        assert tree.subtree_weight["a"] == 5.0
+        assert tree.subtree_weight["r"] == 5.0
+        assert tree.dominated("x") == []
+
+
+@pytest.mark.skipif(not NETWORKX_AVAILABLE, reason="networkx not available")
+class TestRedundantIncludeEdges:
+    """Tests for find_redundant_include_edges function."""
+
+    def test_matches_transitive_reduction(self) -> None:
+        """Test that reported edges are exactly those a transitive reduction removes."""
+        G: Any = nx.gnp_random_graph(80, 0.08, seed=5, directed=True)
+        G = nx.DiGraph([(str(u), str(v)) for u, v in G.edges() if u < v])
+
+        redundant = find_redundant_include_edges(G)
+
+        reduced = nx.transitive_reduction(G)
+        assert {(r.includer, r.included) for r in redundant} == {e for e in G.edges() if not reduced.has_edge(*e)}
+        assert all(G.has_edge(r.includer, r.via) and nx.has_path(G, r.via, r.included) for r in redundant)
+
+    def test_ranked_by_tu_count(self) -> None:
+        """Test that edges are ranked by how many TUs pull in the includer."""
+        G: Any = nx.DiGraph([("a.h", "b.h"), ("b.h", "c.h"), ("a.h", "c.h"), ("x.h", "y.h"), ("y.h", "c.h"), ("x.h", "c.h")])
+        source_to_deps = {"1.cpp": ["1.cpp", "x.h", "y.h", "c.h"], "2.cpp": ["2.cpp", "x.h", "y.h", "c.h"], "3.cpp": ["3.cpp", "a.h", "b.h", "c.h"]}
+
+        redundant = find_redundant_include_edges(G, source_to_deps)
+
+        assert [(r.includer, r.included, r.via, r.tu_count) for r in redundant] == [("x.h", "c.h", "y.h", 2), ("a.h", "c.h", "b.h", 1)]
+
+    def test_cycle_edges_not_reported(self) -> None:
+        """Test that edges inside a cycle group are never reported."""
+        G: Any = nx.DiGraph([("a.h", "b.h"), ("b.h", "c.h"), ("c.h", "a.h"), ("a.h", "c.h")])
+
+        assert find_redundant_include_edges(G) == []
+
+
+class TestMetricsTable:
+    """Tests for the columnar MetricsTable."""
+
+    def test_matches_per_header_metrics(self) -> None:
+        """Test that table rows equal calculate_dsm_metrics for every header."""
+        from lib.clang_utils import FileType
+
+        header_to_headers = {"a.hpp": {"b.hpp", "vector"}, "b.hpp": {"c.hpp"}, "c.hpp": set(), "d.hpp": {"a.hpp", "c.hpp"}}
+        reverse_deps = invert_dependencies(header_to_headers)
+        file_types = {"vector": FileType.SYSTEM}
+        headers = ["a.hpp", "b.hpp", "c.hpp", "d.hpp", "lonely.hpp"]
+
+        table = MetricsTable.from_dependencies(headers, header_to_headers, reverse_deps, file_types)
+
+        assert dict(table) == {h: calculate_dsm_metrics(h, header_to_headers, reverse_deps, file_types) for h in headers}
+        assert table.fan_out_external.tolist() == [1, 0, 0, 0, 0]
+        assert table["lonely.hpp"].stability == 0.5
+        assert "missing.hpp" not in table
+
+    def test_inconsistent_fan_out_rejected(self) -> None:
+        """Test that the fan_out split is validated for every row."""
+        with pytest.raises(ValueError):
+            MetricsTable(["a.hpp", "b.hpp"], [1, 2], [0, 0], [1, 1], [0, 0])
+
+    def test_statistics_accept_table_or_dict(self) -> None:
+        """Test that outliers and interface ratio agree for a table and a plain dict."""
+        header_to_headers = {f"h{i}.hpp": {"hub.hpp"} for i in range(20)}
+        header_to_headers["hub.hpp"] = set()
+        reverse_deps = invert_dependencies(header_to_headers)
+        table = MetricsTable.from_dependencies(sorted(header_to_headers), header_to_headers, reverse_deps)
+        as_dict = dict(table.items())
+
+        outliers, mean, stddev = detect_coupling_outliers(table, z_threshold=2.0)
+
+        assert [o[0] for o in outliers] == ["hub.hpp"]
+        assert detect_coupling_outliers(as_dict, z_threshold=2.0) == (outliers, mean, stddev)
+        assert calculate_interface_implementation_ratio(table) == calculate_interface_implementation_ratio(as_dict) == (4.8, 1, 21)
+
 
 @pytest.mark.skipif(not NETWORKX_AVAILABLE, reason="networkx not available")
 class TestGraphExport:
@@ -95,6 +95,49 @@ build app: CXX_EXECUTABLE_LINKER main.cpp.o | || libUI.a libNetwork.a libCore.a
         assert len(exe_to_libs.get("app", set())) == 4
 
 
+    def test_parse_shared_libraries_and_implicit_inputs(self, temp_dir: Any) -> None:
+        """Test that shared libraries, implicit library inputs and non-CMake rule names are recognized."""
+        build_ninja = Path(temp_dir) / "build.ninja"
+        build_ninja.write_text(
+            """rule CXX_STATIC_LIBRARY_LINKER__core_Release
+  command = ar qc $out $in
+rule CXX_SHARED_LIBRARY_LINKER__plugin_Release
+  command = c++ -shared $in -o $out
+rule cpp_LINKER
+  command = c++ $in -o $out
+
+build lib/libcore.a: CXX_STATIC_LIBRARY_LINKER__core_Release core.cpp.o
+build lib/libplugin.so: CXX_SHARED_LIBRARY_LINKER__plugin_Release plugin.cpp.o | lib/libcore.a
+build bin/tool: cpp_LINKER tool.cpp.o lib/libplugin.so
+"""
+        )
+
+        lib_to_libs, exe_to_libs, all_libs, all_exes = parse_ninja_libraries(str(build_ninja))
+
+        assert all_libs == {"libcore.a", "libplugin.so"}
+        assert all_exes == {"tool"}
+        assert lib_to_libs["libplugin.so"] == {"libcore.a"}
+        assert exe_to_libs["tool"] == {"libplugin.so"}
+
+
+    def test_parse_versioned_shared_library(self, temp_dir: Any) -> None:
+        """Test that CMake's version symlinks resolve to the shared library they alias."""
+        build_ninja = Path(temp_dir) / "build.ninja"
+        build_ninja.write_text(
+            """build lib/libfoo.so.1.2.3: CXX_SHARED_LIBRARY_LINKER__foo_Release foo.cpp.o
+build lib/libfoo.so.1 lib/libfoo.so: CMAKE_SYMLINK_LIBRARY lib/libfoo.so.1.2.3
+build bin/app: CXX_EXECUTABLE_LINKER__app_Release main.cpp.o lib/libfoo.so || lib/libfoo.so
+"""
+        )
+
+        lib_to_libs, exe_to_libs, all_libs, all_exes = parse_ninja_libraries(str(build_ninja))
+
+        assert all_libs == {"libfoo.so.1.2.3"}
+        assert all_exes == {"app"}
+        assert lib_to_libs == {}
+        assert exe_to_libs == {"app": {"libfoo.so.1.2.3"}}
+
+
 class TestComputeLibraryMetrics:
     """Test the compute_library_metrics function."""
 
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""Tests for lib/link_impact.py"""
+
+from pathlib import Path
+
+import pytest
+
+from lib.build_graph import load_build_graph
+from lib.link_impact import compute_link_impact
+from test.test_lib_build_graph import fresh_cache  # noqa: F401 (autouse fixture)
+from test.test_lib_ninja_deps import write_ninja_deps
+from test.test_lib_ninja_log import write_ninja_log
+
+MANIFEST = """rule CXX_COMPILER__core_Release
+  command = c++ -c $in -o $out
+  deps = gcc
+  depfile = $out.d
+rule CXX_STATIC_LIBRARY_LINKER__core_Release
+  command = ar qc $out $in
+rule CXX_SHARED_LIBRARY_LINKER__plugin_Release
+  command = c++ -shared $in -o $out
+rule CXX_EXECUTABLE_LINKER__tests_Release
+  command = c++ $in -o $out
+build core.o: CXX_COMPILER__core_Release src/core.cpp
+build plugin.o: CXX_COMPILER__core_Release src/plugin.cpp
+build t1.o: CXX_COMPILER__core_Release src/t1.cpp
+build t2.o: CXX_COMPILER__core_Release src/t2.cpp
+build libcore.a: CXX_STATIC_LIBRARY_LINKER__core_Release core.o
+build libplugin.so: CXX_SHARED_LIBRARY_LINKER__plugin_Release plugin.o | libcore.a
+build test1: CXX_EXECUTABLE_LINKER__tests_Release t1.o | libcore.a
+build test2: CXX_EXECUTABLE_LINKER__tests_Release t2.o | libplugin.so
+"""
+
+DEPS = {
+    "core.o": ["src/core.cpp", "inc/core.h"],
+    "plugin.o": ["src/plugin.cpp", "inc/plugin.h"],
+    "t1.o": ["src/t1.cpp", "inc/core.h"],
+    "t2.o": ["src/t2.cpp", "inc/plugin.h"],
+}
+
+
+@pytest.fixture
+def linked_tree(tmp_path: Path) -> Path:
+    """A built tree with an archive, a shared library and two test executables (test2 never logged)."""
+    (tmp_path / "build.ninja").write_text(MANIFEST)
+    write_ninja_deps(tmp_path / ".ninja_deps", [(output, 1, inputs) for output, inputs in DEPS.items()])
+    entries = [(0, 1000, 1, "core.o"), (0, 1000, 1, "plugin.o"), (0, 1000, 1, "t1.o"), (0, 1000, 1, "t2.o")]
+    entries += [(1000, 1500, 2, "libcore.a"), (1500, 3500, 3, "libplugin.so"), (1500, 4500, 3, "test1")]
+    write_ninja_log(tmp_path / ".ninja_log", entries)
+    return tmp_path
+
+
+class TestComputeLinkImpact:
+    """Tests for the header -> library -> executable fan-out."""
+
+    def test_fan_out_through_libraries(self, linked_tree: Path) -> None:
+        """Test that a header reaches executables through static and shared libraries."""
+        impacts = compute_link_impact(load_build_graph(str(linked_tree)), ["inc/core.h", "inc/plugin.h"])
+
+        core = impacts["inc/core.h"]
+        assert core.compiles == 2
+        assert sorted(core.libraries) == ["libcore.a", "libplugin.so"]
+        assert sorted(core.executables) == ["test1", "test2"]
+        assert core.relinks == 4
+        assert core.compile_seconds == 2.0
+        # test2 never linked: estimated at the median link (2s and 3s)
+        assert core.link_seconds == pytest.approx(0.5 + 2.0 + 3.0 + 2.5)
+        assert core.estimated
+
+        plugin = impacts["inc/plugin.h"]
+        assert plugin.libraries == ["libplugin.so"]
+        assert plugin.executables == ["test2"]
+        assert plugin.link_seconds == pytest.approx(4.5)
+
+    def test_absolute_and_unknown_headers(self, linked_tree: Path) -> None:
+        """Test that absolute paths resolve against the build directory and unknown headers relink nothing."""
+        impacts = compute_link_impact(load_build_graph(str(linked_tree)), [str(linked_tree / "inc" / "plugin.h"), "inc/other.h"])
+
+        assert impacts[str(linked_tree / "inc" / "plugin.h")].executables == ["test2"]
+        assert impacts["inc/other.h"].relinks == 0
+        assert impacts["inc/other.h"].compiles == 0
+
+    def test_many_headers_in_one_pass(self, linked_tree: Path) -> None:
+        """Test that more headers than one bitset word still map to the right edges."""
+        headers = [f"inc/unused{i}.h" for i in range(70)] + ["inc/plugin.h"]
+
+        impacts = compute_link_impact(load_build_graph(str(linked_tree)), headers)
+
+        assert impacts["inc/plugin.h"].executables == ["test2"]
+        assert sum(impact.relinks for impact in impacts.values()) == 2
+
+    def test_versioned_shared_library_counted_once(self, tmp_path: Path) -> None:
+        """Test that CMake's version symlinks of a shared library are no extra relinks."""
+        (tmp_path / "build.ninja").write_text(
+            """rule CXX_COMPILER__foo_Release
+  command = c++ -c $in -o $out
+rule CXX_SHARED_LIBRARY_LINKER__foo_Release
+  command = c++ -shared $in -o $out
+rule CMAKE_SYMLINK_LIBRARY
+  command = ln -sf $in $out
+rule CXX_EXECUTABLE_LINKER__app_Release
+  command = c++ $in -o $out
+build foo.o: CXX_COMPILER__foo_Release src/foo.cpp
+build main.o: CXX_COMPILER__foo_Release src/main.cpp
+build libfoo.so.1.2.3: CXX_SHARED_LIBRARY_LINKER__foo_Release foo.o
+build libfoo.so.1 libfoo.so: CMAKE_SYMLINK_LIBRARY libfoo.so.1.2.3
+build app: CXX_EXECUTABLE_LINKER__app_Release main.o libfoo.so
+"""
+        )
+        write_ninja_deps(tmp_path / ".ninja_deps", [("foo.o", 1, ["src/foo.cpp", "inc/foo.h"]), ("main.o", 1, ["src/main.cpp"])])
+
+        impact = compute_link_impact(load_build_graph(str(tmp_path)), ["inc/foo.h"])["inc/foo.h"]
+
+        assert impact.libraries == ["libfoo.so.1.2.3"]
+        assert impact.executables == ["app"]
+        assert impact.relinks == 2
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""Tests for lib/ninja_deps.py"""
+
+import struct
+import subprocess
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Tuple
+
+import pytest
+
+from lib.constants import NinjaError
+from lib.ninja_deps import NINJA_DEPS_SIGNATURE, clear_ninja_deps_cache, find_ninja_deps, load_ninja_deps, read_ninja_deps
+from lib.ninja_utils import get_dependencies, get_dependencies_for_targets
+
+
+def write_ninja_deps(path: Path, records: Iterable[Tuple[str, int, List[str]]], version: int = 4) -> None:
+    """Write a deps log the way ninja does: path records on first use, then the deps record."""
+    ids: Dict[str, int] = {}
+    chunks = [NINJA_DEPS_SIGNATURE, struct.pack("<i", version)]
+
+    def node(name: str) -> int:
+        if name not in ids:
+            ids[name] = len(ids)
+            encoded = name.encode()
+            encoded += b"\0" * (-len(encoded) % 4)
+            chunks.append(struct.pack("<I", len(encoded) + 4) + encoded + struct.pack("<I", ~ids[name] & 0xFFFFFFFF))
+        return ids[name]
+
+    for output, mtime, inputs in records:
+        input_ids = [node(name) for name in inputs]
+        body = struct.pack("<iq" if version == 4 else "<ii", node(output), mtime) + struct.pack(f"<{len(input_ids)}i", *input_ids)
+        chunks.append(struct.pack("<I", len(body) | 0x80000000) + body)
+    path.write_bytes(b"".join(chunks))
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache() -> None:
+    """Each test starts without cached logs."""
+    clear_ninja_deps_cache()
+
+
+class TestReadNinjaDeps:
+    """Tests for decoding the binary log."""
+
+    @pytest.mark.parametrize("version", [3, 4])
+    def test_versions(self, tmp_path: Path, version: int) -> None:
+        """Test that both supported versions decode, with later records replacing earlier ones."""
+        log_path = tmp_path / ".ninja_deps"
+        write_ninja_deps(
+            log_path,
+            [("a.o", 1, ["../src/a.cpp", "../src/a.h"]), ("b.o", 2, ["../src/b.cpp", "../src/a.h"]), ("a.o", 3, ["../src/a.cpp"])],
+            version,
+        )
+
+        log = read_ninja_deps(str(log_path))
+
+        assert log.version == version
+        assert log.dependencies("a.o") == ["../src/a.cpp"]
+        assert log.dependencies("b.o") == ["../src/b.cpp", "../src/a.h"]
+        assert log.dependencies("../src/a.h") is None
+        node = log.node_id("a.o")
+        assert node is not None and log.deps[node][0] == 3
+        assert log.to_mapping() == {"a.o": ["../src/a.cpp"], "b.o": ["../src/b.cpp", "../src/a.h"]}
+
+    def test_truncated_tail_is_ignored(self, tmp_path: Path) -> None:
+        """Test that records cut off by an interrupted build are dropped."""
+        log_path = tmp_path / ".ninja_deps"
+        write_ninja_deps(log_path, [("a.o", 1, ["a.cpp"]), ("b.o", 2, ["b.cpp", "b.h"])])
+        log_path.write_bytes(log_path.read_bytes()[:-6])
+
+        log = read_ninja_deps(str(log_path))
+
+        assert log.targets() == ["a.o"]
+
+    def test_unsupported_version(self, tmp_path: Path) -> None:
+        """Test that unknown versions and foreign files raise NinjaError."""
+        (tmp_path / "v5").write_bytes(NINJA_DEPS_SIGNATURE + struct.pack("<i", 5))
+        (tmp_path / "other").write_bytes(b"not a deps log")
+
+        with pytest.raises(NinjaError, match="version 5"):
+            read_ninja_deps(str(tmp_path / "v5"))
+        with pytest.raises(NinjaError):
+            read_ninja_deps(str(tmp_path / "other"))
+
+
+class TestLoadNinjaDeps:
+    """Tests for locating, caching and using the log."""
+
+    def test_builddir_variable(self, tmp_path: Path) -> None:
+        """Test that a top-level builddir relocates the log."""
+        (tmp_path / "build.ninja").write_text("builddir = out\n")
+
+        assert find_ninja_deps(str(tmp_path)) == str(tmp_path / "out" / ".ninja_deps")
+
+    def test_cached_until_changed(self, tmp_path: Path) -> None:
+        """Test that the log is decoded once and re-read after it changes."""
+        write_ninja_deps(tmp_path / ".ninja_deps", [("a.o", 1, ["a.cpp"])])
+        first = load_ninja_deps(str(tmp_path))
+
+        assert first is not None and load_ninja_deps(str(tmp_path)) is first
+
+        write_ninja_deps(tmp_path / ".ninja_deps", [("a.o", 1, ["a.cpp", "a.h"])])
+        second = load_ninja_deps(str(tmp_path))
+
+        assert second is not None and second.dependencies("a.o") == ["a.cpp", "a.h"]
+
+    def test_get_dependencies_reads_log_without_ninja(self, tmp_path: Path, monkeypatch: Any) -> None:
+        """Test that no subprocess runs when the log is readable."""
+        write_ninja_deps(tmp_path / ".ninja_deps", [("a.o", 1, ["a.cpp", "a.h"]), ("b.o", 1, ["b.cpp"])])
+
+        def fail(*args: Any, **kwargs: Any) -> Any:
+            raise AssertionError("ninja must not be spawned")
+
+        monkeypatch.setattr(subprocess, "run", fail)
+
+        assert get_dependencies(str(tmp_path), "a.o") == ["a.cpp", "a.h"]
+        assert get_dependencies(str(tmp_path), "missing.o") == []
+        assert get_dependencies_for_targets(str(tmp_path), ["a.o", "b.o"]) == {"a.o": ["a.cpp", "a.h"], "b.o": ["b.cpp"]}
+        # Targets are canonicalized like ninja -t deps does before the lookup
+        assert get_dependencies(str(tmp_path), "./a.o") == ["a.cpp", "a.h"]
+        assert get_dependencies_for_targets(str(tmp_path), ["obj/../b.o"]) == {"obj/../b.o": ["b.cpp"]}
+
+    @pytest.mark.usefixtures("ninja_found")
+    def test_falls_back_to_ninja_for_unknown_versions(self, tmp_path: Path, monkeypatch: Any) -> None:
+        """Test that an unsupported log falls back to ninja -t deps."""
+        (tmp_path / ".ninja_deps").write_bytes(NINJA_DEPS_SIGNATURE + struct.pack("<i", 9))
+
+        class MockResult:
+            stdout = "a.o: #deps 2, deps mtime 1 (VALID)\n    a.cpp\n    a.h\n\n"
+            stderr = ""
+            returncode = 0
+
+        monkeypatch.setattr(subprocess, "run", lambda *args, **kwargs: MockResult())
+
+        assert get_dependencies(str(tmp_path), "a.o") == ["a.cpp", "a.h"]
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""Tests for lib/ninja_dirty.py"""
+
+import os
+import subprocess
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import pytest
+
+from lib.ninja_deps import clear_ninja_deps_cache
+from lib.ninja_dirty import StatCache, canonicalize_path, explain_dirty, hash_commands, murmur_hash64a, parse_depfile
+from lib.ninja_log import clear_ninja_log_cache
+from lib.ninja_manifest import clear_ninja_manifest_cache
+from lib.ninja_utils import extract_rebuild_info, parse_ninja_explain_output
+from test.test_lib_ninja_deps import write_ninja_deps
+
+MANIFEST = """rule cc
+  command = cc -c $in -o $out
+  deps = gcc
+  depfile = $out.d
+rule link
+  command = cc $in -o $out
+build a.o: cc src/a.c
+build b.o: cc src/b.c
+build app: link a.o b.o
+default app
+"""
+
+COMMANDS = {"a.o": "cc -c src/a.c -o a.o", "b.o": "cc -c src/b.c -o b.o", "app": "cc a.o b.o -o app"}
+DEPS = {"a.o": ["src/a.c", "inc/a.h"], "b.o": ["src/b.c"]}
+SECOND = 10**9
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache() -> None:
+    """Each test starts without cached manifests or logs."""
+    clear_ninja_manifest_cache()
+    clear_ninja_log_cache()
+    clear_ninja_deps_cache()
+
+
+def touch(path: Path, mtime: int) -> None:
+    """Create path if needed and set its mtime (nanoseconds)."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if not path.exists():
+        path.write_text("")
+    os.utime(path, ns=(mtime, mtime))
+
+
+def write_log(build_dir: Path, mtimes: Dict[str, int], commands: Optional[Dict[str, str]] = None, version: int = 6) -> None:
+    """Write a .ninja_log whose hashes are ninja's for the given commands."""
+    commands = commands or COMMANDS
+    lines = [f"# ninja log v{version}\n"]
+    lines.extend(f"0\t100\t{mtimes[output]}\t{output}\t{murmur_hash64a(command.encode()):x}\n" for output, command in commands.items())
+    (build_dir / ".ninja_log").write_text("".join(lines))
+
+
+@pytest.fixture
+def built_tree(tmp_path: Path) -> Path:
+    """An up-to-date build: sources at t=1s, objects at t=2s, app at t=3s."""
+    (tmp_path / "build.ninja").write_text(MANIFEST)
+    for source in ("src/a.c", "src/b.c", "inc/a.h"):
+        touch(tmp_path / source, SECOND)
+    outputs = {"a.o": 2 * SECOND, "b.o": 2 * SECOND, "app": 3 * SECOND}
+    for output, mtime in outputs.items():
+        touch(tmp_path / output, mtime)
+    write_ninja_deps(tmp_path / ".ninja_deps", [(output, 2 * SECOND, inputs) for output, inputs in DEPS.items()])
+    write_log(tmp_path, outputs)
+    return tmp_path
+
+
+def explain_lines(build_dir: Path) -> List[str]:
+    """Return the in-process explain lines, asserting the scan was possible."""
+    explanation = explain_dirty(str(build_dir))
+    assert explanation is not None
+    return explanation.lines
+
+
+class TestMurmurHash:
+    """Tests for the build log command hash."""
+
+    def test_vectorised_matches_reference(self) -> None:
+        """Test that batch hashing agrees with the scalar implementation for every tail length."""
+        commands = [bytes(range(length)) for length in range(40)] + [b"cc -c src/a.c -o a.o" * 7]
+
+        assert hash_commands(commands) == [murmur_hash64a(command) for command in commands]
+        assert hash_commands([]) == []
+
+    def test_distinguishes_commands(self) -> None:
+        """Test that a one-byte change gives a different hash."""
+        assert murmur_hash64a(b"cc -O2 a.c") != murmur_hash64a(b"cc -O3 a.c")
+
+
+class TestHelpers:
+    """Tests for path and depfile handling."""
+
+    @pytest.mark.parametrize(
+        "path,expected",
+        [("a/b.h", "a/b.h"), ("./a/b.h", "a/b.h"), ("a/./b.h", "a/b.h"), ("a/../b.h", "b.h"), ("../x//y.h", "../x/y.h"), ("//abs/y.h", "/abs/y.h")],
+    )
+    def test_canonicalize_path(self, path: str, expected: str) -> None:
+        """Test that paths collapse like ninja's CanonicalizePath."""
+        assert canonicalize_path(path) == expected
+
+    def test_parse_depfile(self) -> None:
+        """Test continuations, escaped spaces and gcc -MP phony rules."""
+        content = "a.o: src/a.c \\\n  inc/my\\ file.h inc/x.h src/a.c\ninc/x.h:\n"
+
+        assert parse_depfile(content) == ["src/a.c", "inc/my file.h", "inc/x.h"]
+
+    def test_stat_cache_lists_directories(self, tmp_path: Path) -> None:
+        """Test that missing files and directories cost no stat() call."""
+        touch(tmp_path / "d1" / "x.h", 5 * SECOND)
+        for index in range(10):
+            touch(tmp_path / f"dir{index}" / "f.h", SECOND + index)
+        cache = StatCache(str(tmp_path), workers=4)
+
+        cache.prefetch(["d1/x.h", "d1/missing.h", "nodir/y.h"] + [f"dir{index}/f.h" for index in range(10)])
+
+        assert cache.mtime("d1/x.h") == 5 * SECOND
+        assert cache.mtime("d1/missing.h") == 0
+        assert cache.mtime("nodir/y.h") == 0
+        assert cache.mtime("dir7/f.h") == SECOND + 7
+        assert cache.stat_calls == 11
+        assert cache.mtime("d1/late.h") == 0
+        assert cache.stat_calls == 11
+
+
+class TestExplainDirty:
+    """Tests for the in-process `ninja -n -d explain`."""
+
+    def test_up_to_date_tree(self, built_tree: Path) -> None:
+        """Test that a fresh build explains nothing."""
+        explanation = explain_dirty(str(built_tree))
+
+        assert explanation is not None
+        assert explanation.lines == []
+        assert explanation.dirty_outputs == []
+        assert explanation.edges_checked == 3
+
+    def test_changed_header(self, built_tree: Path) -> None:
+        """Test that a touched recorded header dirties its object and everything downstream."""
+        touch(built_tree / "inc/a.h", 5 * SECOND)
+
+        lines = explain_lines(built_tree)
+
+        assert lines == [
+            f"ninja explain: output a.o older than most recent input inc/a.h ({2 * SECOND} vs {5 * SECOND})",
+            "ninja explain: a.o is dirty",
+        ]
+        assert parse_ninja_explain_output(lines) == (["a.o"], {"inc/a.h"})
+        explanation = explain_dirty(str(built_tree))
+        assert explanation is not None and explanation.dirty_outputs == ["a.o", "app"]
+
+    def test_missing_output_and_deps(self, built_tree: Path) -> None:
+        """Test missing objects and missing deps records."""
+        (built_tree / "b.o").unlink()
+        write_ninja_deps(built_tree / ".ninja_deps", [("a.o", 2 * SECOND, DEPS["a.o"])])
+
+        lines = explain_lines(built_tree)
+
+        assert "ninja explain: deps for 'b.o' are missing" in lines
+        assert "ninja explain: b.o is dirty" in lines
+        assert parse_ninja_explain_output(lines) == ([], set())
+
+    def test_command_line_changed(self, built_tree: Path) -> None:
+        """Test that a command hash mismatch rebuilds the edge."""
+        write_log(built_tree, {"a.o": 2 * SECOND, "b.o": 2 * SECOND, "app": 3 * SECOND}, dict(COMMANDS, **{"b.o": "cc -O0 -c src/b.c -o b.o"}))
+
+        lines = explain_lines(built_tree)
+
+        assert lines[0] == "ninja explain: command line changed for b.o"
+        assert parse_ninja_explain_output(lines)[0] == ["b.o"]
+
+    def test_never_built_output(self, built_tree: Path) -> None:
+        """Test that an output missing from the build log is rebuilt."""
+        write_log(built_tree, {"a.o": 2 * SECOND, "b.o": 2 * SECOND}, {"a.o": COMMANDS["a.o"], "b.o": COMMANDS["b.o"]})
+
+        assert explain_lines(built_tree) == ["ninja explain: command line not found in log for app"]
+
+    def test_deleted_header(self, built_tree: Path) -> None:
+        """Test that a recorded header that no longer exists rebuilds the object instead of failing."""
+        (built_tree / "inc/a.h").unlink()
+
+        lines = explain_lines(built_tree)
+
+        assert lines[:2] == ["ninja explain: output inc/a.h of phony edge with no inputs doesn't exist", "ninja explain: inc/a.h is dirty"]
+
+    def test_manifest_regeneration_stops_the_scan(self, built_tree: Path) -> None:
+        """Test that a dirty build.ninja is the only thing a dry run reports."""
+        manifest = MANIFEST + "rule regen\n  command = cmake .\n  generator = 1\nbuild build.ninja: regen CMakeLists.txt\n"
+        (built_tree / "build.ninja").write_text(manifest)
+        os.utime(built_tree / "build.ninja", ns=(2 * SECOND, 2 * SECOND))
+        touch(built_tree / "CMakeLists.txt", 4 * SECOND)
+        touch(built_tree / "inc/a.h", 5 * SECOND)
+
+        lines = explain_lines(built_tree)
+
+        assert lines == [f"ninja explain: output build.ninja older than most recent input CMakeLists.txt ({2 * SECOND} vs {4 * SECOND})"]
+
+    def test_unsupported_builds_defer_to_ninja(self, built_tree: Path) -> None:
+        """Test the cases where only ninja can answer."""
+        write_log(built_tree, {"a.o": 2 * SECOND, "b.o": 2 * SECOND, "app": 3 * SECOND}, version=7)
+        assert explain_dirty(str(built_tree)) is None
+
+        write_log(built_tree, {"a.o": 2 * SECOND, "b.o": 2 * SECOND, "app": 3 * SECOND})
+        (built_tree / "src/b.c").unlink()
+        (built_tree / ".ninja_deps").unlink()
+        assert explain_dirty(str(built_tree)) is None
+
+        (built_tree / ".ninja_log").unlink()
+        assert explain_dirty(str(built_tree)) is None
+
+    def test_extract_rebuild_info_does_not_run_ninja(self, built_tree: Path, monkeypatch: Any) -> None:
+        """Test that extract_rebuild_info answers from the in-process scan."""
+
+        def fail(*args: Any, **kwargs: Any) -> None:
+            raise AssertionError("ninja should not run")
+
+        monkeypatch.setattr(subprocess, "run", fail)
+        touch(built_tree / "inc/a.h", 5 * SECOND)
+
+        rebuild_entries, reasons, root_causes = extract_rebuild_info(str(built_tree))
+
+        assert rebuild_entries == [("a.o", "input source changed")]
+        assert reasons == {"input source changed": 1}
+        assert root_causes == {"inc/a.h": 1}
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""Tests for lib/ninja_log.py"""
+
+from pathlib import Path
+from typing import Iterable, Tuple
+
+import pytest
+
+from lib.constants import NinjaError
+from lib.ninja_log import CompileTimes, clear_ninja_log_cache, find_ninja_log, format_cpu_time, load_compile_times, load_ninja_log, read_ninja_log
+from lib.ninja_manifest import clear_ninja_manifest_cache
+
+
+def write_ninja_log(path: Path, entries: Iterable[Tuple[int, int, int, str]], version: int = 6) -> None:
+    """Write a build log with one (start_ms, end_ms, mtime, output) line per entry."""
+    lines = [f"# ninja log v{version}\n"]
+    lines.extend(f"{start}\t{end}\t{mtime}\t{output}\t{hash(output) & 0xFFFFFFFF:x}\n" for start, end, mtime, output in entries)
+    path.write_text("".join(lines))
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache() -> None:
+    """Each test starts without cached logs."""
+    clear_ninja_log_cache()
+    clear_ninja_manifest_cache()
+
+
+class TestReadNinjaLog:
+    """Tests for decoding the text log."""
+
+    @pytest.mark.parametrize("version", [5, 6, 7])
+    def test_latest_entry_wins(self, tmp_path: Path, version: int) -> None:
+        """Test that the last line for an output replaces earlier ones."""
+        log_path = tmp_path / ".ninja_log"
+        write_ninja_log(log_path, [(0, 1500, 10, "a.o"), (0, 700, 11, "b.o"), (20, 270, 12, "a.o")], version)
+
+        log = read_ninja_log(str(log_path))
+
+        assert log.version == version
+        assert set(log.entries) == {"a.o", "b.o"}
+        entry = log.entry("a.o")
+        assert entry is not None
+        assert entry.mtime == 12
+        assert entry.duration == pytest.approx(0.25)
+        assert log.entry("missing.o") is None
+
+    def test_malformed_lines_are_skipped(self, tmp_path: Path) -> None:
+        """Test that truncated lines and repeated headers do not end the log."""
+        log_path = tmp_path / ".ninja_log"
+        log_path.write_text("# ninja log v5\n0\t10\t1\ta.o\tdead\n0\t10\n# ninja log v5\nx\t10\t1\tb.o\tbeef\n0\t5\t2\tc.o\tf00d\n")
+
+        assert set(read_ninja_log(str(log_path)).entries) == {"a.o", "c.o"}
+
+    def test_unsupported_version(self, tmp_path: Path) -> None:
+        """Test that old versions and foreign files raise NinjaError."""
+        (tmp_path / "v4").write_text("# ninja log v4\n")
+        (tmp_path / "other").write_text("hello\n")
+
+        with pytest.raises(NinjaError, match="version 4"):
+            read_ninja_log(str(tmp_path / "v4"))
+        with pytest.raises(NinjaError, match="not a ninja build log"):
+            read_ninja_log(str(tmp_path / "other"))
+
+
+class TestLoadNinjaLog:
+    """Tests for locating and caching the log."""
+
+    def test_builddir_and_cache(self, tmp_path: Path) -> None:
+        """Test that $builddir is honoured and the cached log is reused until the file changes."""
+        (tmp_path / "build.ninja").write_text("builddir = state\n")
+        (tmp_path / "state").mkdir()
+        log_path = tmp_path / "state" / ".ninja_log"
+        write_ninja_log(log_path, [(0, 10, 1, "a.o")])
+
+        assert find_ninja_log(str(tmp_path)) == str(log_path)
+        first = load_ninja_log(str(tmp_path))
+        assert first is not None and load_ninja_log(str(tmp_path)) is first
+
+        write_ninja_log(log_path, [(0, 10, 1, "a.o"), (0, 10, 2, "b.o")])
+        second = load_ninja_log(str(tmp_path))
+        assert second is not None and set(second.entries) == {"a.o", "b.o"}
+
+    def test_missing_or_unreadable(self, tmp_path: Path) -> None:
+        """Test that a missing or unsupported log gives None."""
+        assert load_ninja_log(str(tmp_path)) is None
+        (tmp_path / ".ninja_log").write_text("# ninja log v4\n")
+        assert load_ninja_log(str(tmp_path)) is None
+
+
+class TestCompileTimes:
+    """Tests for mapping log durations back to sources."""
+
+    def test_load_compile_times(self, tmp_path: Path) -> None:
+        """Test that compile edges get their latest duration and unbuilt sources the median."""
+        build = tmp_path / "build"
+        build.mkdir()
+        (build / "build.ninja").write_text(
+            "rule CXX_COMPILER__app\n  command = c++ -c $in -o $out\n"
+            "rule CXX_EXECUTABLE_LINKER__app\n  command = c++ $in -o $out\n"
+            "build a.o: CXX_COMPILER__app ../src/a.cpp\n"
+            "build b.o: CXX_COMPILER__app ../src/b.cpp\n"
+            "build c.o: CXX_COMPILER__app ../src/c.cpp\n"
+            "build d.o: CXX_COMPILER__app ../src/d.cpp\n"
+            "build app: CXX_EXECUTABLE_LINKER__app a.o b.o c.o d.o\n"
+        )
+        write_ninja_log(build / ".ninja_log", [(0, 60000, 1, "a.o"), (0, 1000, 1, "b.o"), (0, 4000, 1, "c.o"), (0, 2000, 1, "b.o"), (60000, 65000, 2, "app")])
+        src = tmp_path / "src"
+
+        times = load_compile_times(str(build))
+
+        assert times is not None
+        assert times.seconds(str(src / "a.cpp")) == 60.0
+        assert times.seconds(str(src / "b.cpp")) == 2.0
+        assert times.lookup(str(src / "d.cpp")) is None
+        assert times.seconds(str(src / "d.cpp")) == times.default == 4.0
+        assert times.total([str(src / "a.cpp"), str(src / "d.cpp")]) == 64.0
+        assert list(times.weights([str(src / "b.cpp"), str(src / "c.cpp")])) == [2.0, 4.0]
+
+    def test_no_log(self, tmp_path: Path) -> None:
+        """Test that a build without a log has no compile times."""
+        (tmp_path / "build.ninja").write_text("")
+
+        assert load_compile_times(str(tmp_path)) is None
+
+    @pytest.mark.parametrize("seconds, expected", [(0.25, "0.2s"), (42, "42.0s"), (725, "12m 05s"), (12000, "3h 20m")])
+    def test_format_cpu_time(self, seconds: float, expected: str) -> None:
+        """Test compact CPU-time formatting."""
+        assert format_cpu_time(seconds) == expected
+
+    def test_symlinked_sources(self, tmp_path: Path) -> None:
+        """Test that lookups fall back to the resolved path."""
+        (tmp_path / "real.cpp").write_text("")
+        (tmp_path / "link.cpp").symlink_to(tmp_path / "real.cpp")
+
+        times = CompileTimes({str(tmp_path / "real.cpp"): 3.0}, default=1.0)
+
+        assert times.seconds(str(tmp_path / "link.cpp")) == 3.0
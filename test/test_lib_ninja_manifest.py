@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""Tests for lib/ninja_manifest.py"""
+
+import os
+from pathlib import Path
+from typing import List
+
+import pytest
+
+import lib.ninja_manifest as ninja_manifest
+from lib.constants import NinjaError
+from lib.ninja_manifest import NinjaManifest, clear_ninja_manifest_cache, load_ninja_manifest, parse_ninja_manifest
+
+MANIFEST = """# Top-level variables
+cflags = -O2
+builddir = out
+
+pool link_pool
+  depth = 2
+
+rule cc
+  command = gcc $cflags $extra -c $in -o $out
+  description = CC $out
+
+rule gen
+  command = python gen.py $in > $out
+  generator = 1
+
+build $builddir/a.o: cc a$ b.c | gen.h || order $
+    more_order
+  extra = -DX=$cflags
+
+build gen.h | gen2.h: gen gen.in |@ check
+  pool = link_pool
+
+default $builddir/a.o
+include rules.ninja
+subninja sub/build.ninja
+"""
+
+
+@pytest.fixture
+def build_dir(tmp_path: Path) -> Path:
+    """Build directory with a manifest, an include and a subninja."""
+    (tmp_path / "build.ninja").write_text(MANIFEST)
+    (tmp_path / "rules.ninja").write_text("build inc.o: cc inc.c\n")
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "sub" / "build.ninja").write_text("cflags = -O0\nbuild s.o: cc s.c\n")
+    clear_ninja_manifest_cache()
+    return tmp_path
+
+
+class TestParseNinjaManifest:
+    """Tests for the manifest model."""
+
+    def test_edges_and_sections(self, build_dir: Path) -> None:
+        """Test that continuations, escapes and input/output sections are parsed."""
+        manifest = parse_ninja_manifest(str(build_dir / "build.ninja"))
+        compile_edge, gen_edge = manifest.builds[:2]
+
+        assert compile_edge.outputs == ["out/a.o"]
+        assert compile_edge.inputs == ["a b.c"]
+        assert compile_edge.implicit_inputs == ["gen.h"]
+        assert compile_edge.order_only_inputs == ["order", "more_order"]
+        assert gen_edge.implicit_outputs == ["gen2.h"]
+        assert gen_edge.validations == ["check"]
+        assert manifest.pools == {"console": 1, "link_pool": 2}
+        assert manifest.defaults == ["out/a.o"]
+        assert manifest.producers()["gen2.h"] is gen_edge
+
+    def test_variable_scopes(self, build_dir: Path) -> None:
+        """Test edge, rule, file and subninja scopes when evaluating commands."""
+        manifest = parse_ninja_manifest(str(build_dir / "build.ninja"))
+        commands = {build.outputs[0]: manifest.command(build) for build in manifest.builds}
+
+        assert commands["out/a.o"] == "gcc -O2 -DX=-O2 -c 'a b.c' -o out/a.o"
+        assert commands["inc.o"] == "gcc -O2  -c inc.c -o inc.o"
+        assert commands["s.o"] == "gcc -O0  -c s.c -o s.o"
+        assert [manifest.is_generator(build) for build in manifest.builds[:2]] == [False, True]
+        assert manifest.evaluate(manifest.builds[1], "pool") == "link_pool"
+        assert len(manifest.files) == 3
+
+    def test_literal_edge_binding_in_path(self, tmp_path: Path) -> None:
+        """Test that paths see edge bindings even when the binding block has no $."""
+        (tmp_path / "build.ninja").write_text("cflags = -O2\nrule cc\n  command = gcc -c $in -o $out $cflags\nbuild $obj: cc foo.c\n  obj = foo.o\n")
+
+        manifest = parse_ninja_manifest(str(tmp_path / "build.ninja"))
+
+        assert manifest.builds[0].outputs == ["foo.o"]
+        assert manifest.command(manifest.builds[0]) == "gcc -c foo.c -o foo.o -O2"
+
+    def test_tolerates_undeclared_rules(self, tmp_path: Path) -> None:
+        """Test that fragments with undeclared rules and stray lines still parse."""
+        (tmp_path / "build.ninja").write_text("build lib.a: CXX_STATIC_LIBRARY_LINKER a.o || dep.a\n  stray\nnot a statement\n")
+
+        manifest = parse_ninja_manifest(str(tmp_path / "build.ninja"))
+
+        assert [(b.rule, b.outputs, b.order_only_inputs) for b in manifest.builds] == [("CXX_STATIC_LIBRARY_LINKER", ["lib.a"], ["dep.a"])]
+        assert manifest.command(manifest.builds[0]) == ""
+
+    def test_rule_variable_cycle(self, tmp_path: Path) -> None:
+        """Test that cyclic rule variables raise instead of recursing forever."""
+        (tmp_path / "build.ninja").write_text("rule r\n  command = $a\n  a = $command\nbuild x: r\n")
+
+        manifest = parse_ninja_manifest(str(tmp_path / "build.ninja"))
+
+        with pytest.raises(NinjaError):
+            manifest.command(manifest.builds[0])
+
+
+class TestLoadNinjaManifest:
+    """Tests for the parsed-model cache."""
+
+    def test_cached_until_a_manifest_file_changes(self, build_dir: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that one parse is shared and an edited include invalidates it."""
+        calls: List[str] = []
+        parse = ninja_manifest.parse_ninja_manifest
+
+        def counting_parse(path: str) -> NinjaManifest:
+            calls.append(path)
+            return parse(path)
+
+        monkeypatch.setattr(ninja_manifest, "parse_ninja_manifest", counting_parse)
+
+        first = load_ninja_manifest(str(build_dir / "build.ninja"))
+        assert load_ninja_manifest(str(build_dir / "build.ninja")) is first
+        assert len(calls) == 1
+
+        rules = build_dir / "rules.ninja"
+        rules.write_text("build inc.o other.o: cc inc.c\n")
+        os.utime(rules, ns=(1, 1))
+
+        second = load_ninja_manifest(str(build_dir / "build.ninja"))
+        assert second is not first
+        assert any(build.outputs == ["inc.o", "other.o"] for build in second.builds)
+        assert len(calls) == 2
+
+    def test_missing_manifest(self, tmp_path: Path) -> None:
+        """Test that a missing manifest raises OSError."""
+        with pytest.raises(OSError):
+            load_ninja_manifest(str(tmp_path / "build.ninja"))
@@ -47,9 +47,17 @@ from lib.ninja_utils import (
     save_generated_files_cache,
     check_generated_files_changed,
     update_generated_files_cache,
+    hash_files,
+    file_stat_key,
+    GeneratedFileInfo,
     clean_stale_cache_entries,
     get_relative_build_path,
     parse_ninja_explain_line,
+    chunk_arguments,
+    get_dependencies_for_targets,
+    list_build_outputs,
+    run_ninja_tool_batched,
+    split_ninja_deps_output,
 )
 
 
@@ -164,6 +172,7 @@ ninja explain: output utils.cpp.o older than most recent input src/utils.hpp
         assert len(rebuild_entries) == 1
 
 
+@pytest.mark.usefixtures("ninja_found")
 class TestGetDependencies:
     """Test the get_dependencies function."""
 
@@ -894,6 +903,71 @@ class TestCheckGeneratedFilesChanged:
         assert len(changed) == 0
 
 
+    def test_matching_stat_skips_hashing(self, tmp_path: Path, monkeypatch: Any) -> None:
+        """Test that files whose cached stat still matches are not read."""
+        gen_file = tmp_path / "gen.h"
+        gen_file.write_text("int x;")
+        os.utime(gen_file, (1_000_000, 1_000_000))
+        cache: Dict[str, Any] = {"build_ninja_mtime": 0.0, "files": {}, "dependencies": {}}
+        update_generated_files_cache(cache, [str(gen_file)], str(tmp_path / "cache.json"))
+        assert cache["stats"][str(gen_file)] == file_stat_key(str(gen_file))
+
+        def fail(path: str) -> str:
+            raise AssertionError(f"{path} should not be hashed")
+
+        monkeypatch.setattr("lib.ninja_utils.compute_file_hash", fail)
+        missing, changed, reasons = check_generated_files_changed(str(tmp_path), {"gen.h"}, cache)
+
+        assert (missing, changed, reasons) == ([], [], {})
+
+    def test_touched_file_refreshes_stat(self, tmp_path: Path) -> None:
+        """Test that a touched but identical file is unchanged and its new stat is recorded."""
+        gen_file = tmp_path / "gen.h"
+        gen_file.write_text("int x;")
+        os.utime(gen_file, (1_000_000, 1_000_000))
+        cache: Dict[str, Any] = {"build_ninja_mtime": 0.0, "files": {}, "dependencies": {}}
+        update_generated_files_cache(cache, [str(gen_file)], str(tmp_path / "cache.json"))
+        os.utime(gen_file, (2_000_000, 2_000_000))
+
+        refreshed: List[str] = []
+        missing, changed, reasons = check_generated_files_changed(str(tmp_path), {"gen.h"}, cache, None, refreshed)
+
+        assert changed == []
+        assert refreshed == [str(gen_file)]
+        assert cache["stats"][str(gen_file)] == file_stat_key(str(gen_file))
+
+    def test_changed_input_flags_its_outputs(self, tmp_path: Path) -> None:
+        """Test that a modified template marks every output generated from it, once."""
+        template = tmp_path / "schema.proto"
+        template.write_text("message A {}")
+        for name in ("a.pb.h", "a.pb.cc", "other.h"):
+            (tmp_path / name).write_text(name)
+        cache = {"build_ninja_mtime": 0.0, "files": {}, "dependencies": {}}
+        update_generated_files_cache(cache, [str(tmp_path / name) for name in ("schema.proto", "a.pb.h", "a.pb.cc", "other.h")], str(tmp_path / "c.json"))
+        template.write_text("message A { int32 x = 1; }")
+
+        def info(*inputs: str) -> GeneratedFileInfo:
+            return GeneratedFileInfo(outputs=set(), explicit_inputs=set(inputs), implicit_inputs={"gen.py"}, order_only_inputs=set(), rule_name="CUSTOM_COMMAND")
+
+        output_to_info = {"a.pb.h": info("schema.proto"), "a.pb.cc": info("schema.proto"), "other.h": info("other.in")}
+        generated = {"schema.proto", "a.pb.h", "a.pb.cc", "other.h"}
+        missing, changed, reasons = check_generated_files_changed(str(tmp_path), generated, cache, output_to_info)
+
+        assert missing == []
+        assert sorted(changed) == sorted([str(template), str(tmp_path / "a.pb.h"), str(tmp_path / "a.pb.cc")])
+        assert reasons[str(tmp_path / "a.pb.cc")] == "input modified: schema.proto"
+
+    def test_hash_files_parallel_matches_serial(self, tmp_path: Path) -> None:
+        """Test that batched parallel hashing gives the same hashes as compute_file_hash."""
+        paths = []
+        for index in range(40):
+            path = tmp_path / f"f{index}.h"
+            path.write_text(str(index) * index)
+            paths.append(str(path))
+
+        assert hash_files(paths) == {path: compute_file_hash(path) for path in paths}
+
+
 class TestUpdateGeneratedFilesCache:
     """Test the update_generated_files_cache function."""
 
@@ -1265,3 +1339,71 @@ class TestCleanStaleCacheEntriesAdditional:
 
         # All entries should be removed
         assert len(cleaned["files"]) == 0
+
+
+@pytest.mark.usefixtures("ninja_found")
+class TestBatchedNinjaTools:
+    """Tests for batched ninja -t queries."""
+
+    def test_chunk_arguments(self) -> None:
+        """Test that chunks respect the byte budget and keep order."""
+        chunks = chunk_arguments(["aaaa", "bbbb", "cc", "dddddddddddd"], max_bytes=10)
+
+        assert chunks == [["aaaa", "bbbb"], ["cc"], ["dddddddddddd"]]
+        assert chunk_arguments([]) == []
+
+    def test_split_deps_output(self) -> None:
+        """Test that sections map to targets by order, or by canonical path when counts differ."""
+        stdout = "a.o: #deps 2, deps mtime 1 (VALID)\n    a.cpp\n    a.h\n\nb.o: deps not found\n\n"
+
+        assert split_ninja_deps_output(stdout, ["./a.o", "b.o"]) == {"./a.o": ["a.cpp", "a.h"], "b.o": []}
+        assert split_ninja_deps_output(stdout, ["x.o", "b.o", "./a.o"]) == {"./a.o": ["a.cpp", "a.h"], "b.o": []}
+
+    def test_batched_deps_fallback(self, tmp_path: Path, monkeypatch: Any) -> None:
+        """Test that many targets share few ninja processes and an unknown target only drops itself."""
+        import lib.ninja_utils as ninja_utils
+
+        calls: List[List[str]] = []
+
+        class MockResult:
+            def __init__(self, targets: List[str]) -> None:
+                self.returncode = 1 if "bad.o" in targets else 0
+                self.stderr = "ninja: error: unknown target 'bad.o'" if self.returncode else ""
+                self.stdout = "".join(f"{t}: #deps 1, deps mtime 1 (VALID)\n    {t[:-2]}.cpp\n\n" for t in targets)
+
+        def mock_run(args: List[str], **kwargs: Any) -> MockResult:
+            calls.append(args[3:])
+            return MockResult(args[3:])
+
+        monkeypatch.setattr(subprocess, "run", mock_run)
+        monkeypatch.setattr(ninja_utils, "NINJA_TOOL_MAX_ARGS_BYTES", 200)
+        targets = [f"obj/t{i:03d}.o" for i in range(100)]
+
+        found = get_dependencies_for_targets(str(tmp_path), targets + ["bad.o"])
+
+        assert found["obj/t042.o"] == ["obj/t042.cpp"]
+        assert found["bad.o"] == []
+        assert all(len(" ".join(["ninja", "-t", "deps", *chunk])) <= 200 for chunk in calls)
+        assert len(calls) < 20  # 101 targets without one process each
+        assert {t for chunk in calls for t in chunk} == set(targets) | {"bad.o"}
+
+    def test_batched_tool_timeout(self, tmp_path: Path, monkeypatch: Any) -> None:
+        """Test that a timed-out chunk yields no results instead of raising."""
+
+        def mock_run(*args: Any, **kwargs: Any) -> Any:
+            raise subprocess.TimeoutExpired(cmd="ninja", timeout=1)
+
+        monkeypatch.setattr(subprocess, "run", mock_run)
+
+        assert run_ninja_tool_batched(str(tmp_path), "deps", ["a.o"], split_ninja_deps_output, timeout=1) == {}
+
+    def test_list_build_outputs_reads_manifest(self, tmp_path: Path, monkeypatch: Any) -> None:
+        """Test that outputs come from build.ninja without spawning ninja."""
+        (tmp_path / "build.ninja").write_text("rule cc\n  command = cc $in -o $out\nbuild a.o | a.d: cc a.c\nbuild app: cc a.o\n")
+
+        def fail(*args: Any, **kwargs: Any) -> Any:
+            raise AssertionError("ninja must not be spawned")
+
+        monkeypatch.setattr(subprocess, "run", fail)
+
+        assert list_build_outputs(str(tmp_path)) == ["a.o", "a.d", "app"]
@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""Tests for lib/phase_scheduler.py"""
+
+from typing import Dict, List
+
+from lib.phase_scheduler import run_phases
+
+
+def _total(context: Dict[str, List[int]]) -> int:
+    return sum(context["values"])
+
+
+def _largest(context: Dict[str, List[int]]) -> int:
+    return max(context["values"])
+
+
+class TestRunPhases:
+    """Tests for run_phases."""
+
+    def test_in_process(self) -> None:
+        """Test that a single worker runs every phase in this process."""
+        results, timings = run_phases({"total": _total, "largest": _largest}, {"values": [3, 9, 4]}, workers=1)
+
+        assert results == {"total": 16, "largest": 9}
+        assert [t.name for t in timings] == ["total", "largest"]
+        assert not any(t.in_worker for t in timings)
+
+    def test_in_workers(self) -> None:
+        """Test that phases run in worker processes sharing one context."""
+        results, timings = run_phases({"total": _total, "largest": _largest}, {"values": [3, 9, 4]}, workers=2)
+
+        assert results == {"total": 16, "largest": 9}
+        assert sorted(t.name for t in timings) == ["largest", "total"]
+        assert all(t.in_worker and t.wall_time >= 0 for t in timings)
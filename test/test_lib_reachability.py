@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""Tests for lib/reachability.py"""
+
+import random
+from pathlib import Path
+
+import networkx as nx
+import pytest
+
+from lib.analysis_graph import AnalysisGraph
+from lib.graph_utils import compute_reverse_transitive_closure, compute_transitive_closure, get_reachability_index
+from lib.reachability import build_reachability_index, load_or_build_reachability_index
+
+
+@pytest.fixture
+def cyclic_graph() -> "nx.DiGraph[str]":
+    """a -> b <-> c -> d, plus a self-loop on e and an isolated f."""
+    graph: "nx.DiGraph[str]" = nx.DiGraph([("a", "b"), ("b", "c"), ("c", "b"), ("c", "d"), ("e", "e")])
+    graph.add_node("f")
+    return graph
+
+
+class TestReachabilityIndex:
+    """Tests for ReachabilityIndex queries."""
+
+    def test_point_queries(self, cyclic_graph: "nx.DiGraph[str]") -> None:
+        """Test reaches() on paths, cycles, self-loops and unknown nodes."""
+        index = build_reachability_index(cyclic_graph)
+
+        assert index.reaches("a", "d")
+        assert not index.reaches("d", "a")
+        assert index.reaches("b", "b")
+        assert index.reaches("e", "e")
+        assert not index.reaches("a", "a")
+        assert not index.reaches("a", "f")
+        assert not index.reaches("a", "missing")
+
+    def test_closures_match_networkx(self, cyclic_graph: "nx.DiGraph[str]") -> None:
+        """Test descendants()/ancestors() against NetworkX."""
+        index = build_reachability_index(cyclic_graph)
+
+        for node in cyclic_graph:
+            assert index.descendants(node) == nx.descendants(cyclic_graph, node)
+            assert index.ancestors(node) == nx.ancestors(cyclic_graph, node)
+
+    @pytest.mark.parametrize("seed", [3, 4])
+    def test_dense_dag_uses_bitsets(self, seed: int) -> None:
+        """Test that scattered reachability falls back to bitset labels and stays exact."""
+        rng = random.Random(seed)
+        graph: "nx.DiGraph[int]" = nx.DiGraph()
+        graph.add_nodes_from(range(400))
+        for node in range(1, 400):
+            for _ in range(3):
+                graph.add_edge(node, rng.randrange(node))
+
+        index = build_reachability_index(graph)
+
+        assert index.stats.bitsets > 0
+        for source in rng.sample(range(400), 40):
+            descendants = nx.descendants(graph, source)
+            assert index.descendants(source) == descendants
+            for target in rng.sample(range(400), 20):
+                assert index.reaches(source, target) == (target in descendants)
+
+    def test_stats_reported(self, cyclic_graph: "nx.DiGraph[str]") -> None:
+        """Test that build statistics are filled in."""
+        stats = build_reachability_index(cyclic_graph).stats
+
+        assert stats.nodes == 6
+        assert stats.components == 5
+        assert stats.intervals > 0
+        assert stats.size_bytes > 0
+        assert stats.build_time >= 0.0
+
+
+class TestIntegration:
+    """Tests for graph_utils integration and persistence."""
+
+    def test_closure_helpers_use_index(self, cyclic_graph: "nx.DiGraph[str]") -> None:
+        """Test that the closure helpers give the same answer with an index."""
+        index = build_reachability_index(cyclic_graph)
+
+        assert compute_transitive_closure(cyclic_graph, "a", index=index) == compute_transitive_closure(cyclic_graph, "a")
+        assert compute_reverse_transitive_closure(cyclic_graph, "d", index=index) == compute_reverse_transitive_closure(cyclic_graph, "d")
+
+    def test_shared_graph_caches_index(self) -> None:
+        """Test that the index is built once per analysis graph."""
+        shared = AnalysisGraph({"a.hpp": {"b.hpp"}}, {"a.hpp", "b.hpp"})
+
+        index = get_reachability_index(shared)
+
+        assert index is get_reachability_index(shared)
+        assert index.reaches("a.hpp", "b.hpp")
+
+    def test_persisted_with_build_cache(self, tmp_path: Path, cyclic_graph: "nx.DiGraph[str]") -> None:
+        """Test that the index is saved to and reloaded from the build cache."""
+        filtered_db = tmp_path / "compile_commands.json"
+        filtered_db.write_text("[]")
+
+        first = load_or_build_reachability_index(cyclic_graph, str(tmp_path), str(filtered_db))
+        second = load_or_build_reachability_index(cyclic_graph, str(tmp_path), str(filtered_db))
+        changed = cyclic_graph.copy()
+        changed.add_edge("d", "a")
+        third = load_or_build_reachability_index(changed, str(tmp_path), str(filtered_db))
+
+        assert second is not first
+        assert second.fingerprint == first.fingerprint
+        assert second.reaches("a", "d")
+        assert third.fingerprint != first.fingerprint
+        assert third.reaches("d", "a")
+
+    def test_analysis_graph_index_persisted_in_build_dir(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that a run with a build directory reuses the index a previous run persisted there."""
+        import lib.reachability as reachability
+
+        (tmp_path / "build.ninja").write_text("")
+        mapping = {"a.hpp": {"b.hpp"}, "b.hpp": {"c.hpp"}}
+
+        get_reachability_index(AnalysisGraph(mapping, {"a.hpp", "b.hpp", "c.hpp"}), str(tmp_path))
+        monkeypatch.setattr(reachability, "build_reachability_index", lambda *args: pytest.fail("index rebuilt"))
+        shared = AnalysisGraph(mapping, {"a.hpp", "b.hpp", "c.hpp"})
+        index = get_reachability_index(shared, str(tmp_path))
+
+        assert index.descendants("a.hpp") == {"b.hpp", "c.hpp"}
+        assert "condensation" not in shared.cached_keys()
+
+    def test_ripple_impact_queries_index(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that precise ripple impact reads transitive dependents from the reachability indexes."""
+        from lib.dsm_analysis import compute_ripple_impact
+        from lib.graph_utils import DSMMetrics
+
+        graph: "nx.DiGraph[str]" = nx.DiGraph([("a.hpp", "b.hpp"), ("b.hpp", "c.hpp")])
+        index = build_reachability_index(graph)
+        metrics = {node: DSMMetrics(graph.out_degree(node), graph.in_degree(node), graph.out_degree(node), 0, graph.degree(node), 0.5) for node in graph}
+        monkeypatch.setattr(nx, "descendants", lambda *args: pytest.fail("graph traversed"))
+
+        impact = compute_ripple_impact(graph, graph, metrics, metrics, {"a.hpp"}, {}, baseline_index=index, current_index=index)
+
+        assert impact.precise_score == 2
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""Tests for lib/rebuild_impact.py"""
+
+import random
+from typing import Dict, List, Set, Tuple
+
+import pytest
+
+import lib.rebuild_impact as rebuild_impact
+from lib.dsm_analysis import compute_transitive_dependents
+from lib.rebuild_impact import DependentsClosure, build_rebuild_impact_index
+
+# Reverse dependencies, source_to_deps and the header list
+Project = Tuple[Dict[str, Set[str]], Dict[str, List[str]], List[str]]
+
+
+def _linear_count(affected: Set[str], source_to_deps: Dict[str, List[str]]) -> int:
+    """Count sources depending on any affected header by scanning every source."""
+    return sum(1 for deps in source_to_deps.values() if any(header in affected for header in deps))
+
+
+@pytest.fixture
+def random_project() -> Project:
+    """Random reverse dependency graph (with cycles) and source mapping."""
+    rng = random.Random(11)
+    headers = [f"h{i}.hpp" for i in range(200)]
+    reverse_deps: Dict[str, Set[str]] = {}
+    for _ in range(400):
+        header, dependent = rng.sample(headers, 2)
+        reverse_deps.setdefault(header, set()).add(dependent)
+    source_to_deps = {f"s{i}.cpp": [f"s{i}.cpp"] + rng.sample(headers, 8) for i in range(150)}
+    return reverse_deps, source_to_deps, headers
+
+
+class TestDependentsClosure:
+    """Tests for DependentsClosure bitsets."""
+
+    def test_matches_traversal(self, random_project: Project) -> None:
+        """Test that closures equal a traversal of reverse_deps, root included."""
+        reverse_deps, _, headers = random_project
+
+        closure = DependentsClosure(reverse_deps, headers[:40])
+
+        for header in headers[:40]:
+            assert closure.dependents(header) == compute_transitive_dependents(header, reverse_deps)
+
+    def test_unknown_root_is_its_own_closure(self) -> None:
+        """Test that a root absent from reverse_deps only contains itself."""
+        closure = DependentsClosure({"a.hpp": {"b.hpp"}}, ["z.hpp"])
+
+        assert closure.dependents("z.hpp") == {"z.hpp"}
+
+
+class TestRebuildImpactIndex:
+    """Tests for batched affected source counts."""
+
+    def test_counts_match_linear_scan(self, random_project: Project) -> None:
+        """Test that per-candidate counts agree with a BFS plus source scan."""
+        reverse_deps, source_to_deps, headers = random_project
+        candidates = headers[::5]
+
+        index = build_rebuild_impact_index(reverse_deps, source_to_deps, candidates)
+
+        for header in candidates:
+            expected = _linear_count(compute_transitive_dependents(header, reverse_deps), source_to_deps)
+            assert index.affected_count(header) == expected
+
+    def test_combined_is_union(self, random_project: Project) -> None:
+        """Test that combined impact counts overlapping sources once."""
+        reverse_deps, source_to_deps, headers = random_project
+        candidates = headers[:10]
+
+        index = build_rebuild_impact_index(reverse_deps, source_to_deps, candidates)
+
+        union: Set[str] = set()
+        for header in candidates:
+            union |= compute_transitive_dependents(header, reverse_deps)
+        assert index.combined_affected(candidates) == _linear_count(union, source_to_deps)
+
+    def test_counts_without_scipy(self, random_project: Project, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that the numpy fallback gives the same counts as the sparse product."""
+        reverse_deps, source_to_deps, headers = random_project
+        expected = build_rebuild_impact_index(reverse_deps, source_to_deps, headers[:20]).affected_counts
+
+        monkeypatch.setattr(rebuild_impact, "SCIPY_AVAILABLE", False)
+
+        assert build_rebuild_impact_index(reverse_deps, source_to_deps, headers[:20]).affected_counts == expected
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""Tests for lib/recorded_deps.py and the recorded-dependency backend of build_include_graph()"""
+
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pytest
+
+import lib.clang_utils as clang_utils
+from lib.clang_utils import build_include_graph
+from lib.ninja_deps import clear_ninja_deps_cache
+from lib.ninja_log import clear_ninja_log_cache
+from lib.ninja_manifest import clear_ninja_manifest_cache
+from lib.recorded_deps import collect_recorded_dependencies
+from lib.tool_detection import ToolInfo
+from test.test_lib_ninja_deps import write_ninja_deps
+from test.test_lib_ninja_log import write_ninja_log
+
+BUILD_NINJA = """\
+rule CXX_COMPILER__app_Release
+  command = c++ -MD -MF $out.d -c $in -o $out
+  deps = gcc
+rule CXX_EXECUTABLE_LINKER__app_Release
+  command = c++ $in -o $out
+build a.o: CXX_COMPILER__app_Release ../src/a.cpp
+build b.o: CXX_COMPILER__app_Release ../src/b.cpp
+build app: CXX_EXECUTABLE_LINKER__app_Release a.o b.o
+"""
+
+
+@pytest.fixture(autouse=True)
+def fresh_caches() -> None:
+    """Each test starts without cached manifests or logs."""
+    clear_ninja_manifest_cache()
+    clear_ninja_deps_cache()
+    clear_ninja_log_cache()
+
+
+@pytest.fixture
+def built_tree(tmp_path: Path) -> Path:
+    """A source tree whose build directory looks freshly built by ninja."""
+    src = tmp_path / "src"
+    src.mkdir()
+    (src / "a.h").write_text("#pragma once\n")
+    (src / "a.cpp").write_text('#include "a.h"\n')
+    (src / "b.cpp").write_text('#include "a.h"\n')
+
+    build = tmp_path / "build"
+    build.mkdir()
+    (build / "build.ninja").write_text(BUILD_NINJA)
+    for obj in ("a.o", "b.o", "app"):
+        (build / obj).write_text("")
+    for path in src.iterdir():
+        os.utime(path, ns=(1_000_000_000, 1_000_000_000))
+    for path in build.iterdir():
+        os.utime(path, ns=(2_000_000_000, 2_000_000_000))
+
+    write_ninja_deps(build / ".ninja_deps", [("a.o", 100, ["../src/a.cpp", "../src/a.h"]), ("b.o", 100, ["../src/b.cpp", "../src/a.h"])])
+    write_ninja_log(build / ".ninja_log", [(0, 900, 100, "a.o"), (0, 800, 100, "b.o"), (900, 950, 100, "app")])
+    return build
+
+
+class TestCollectRecordedDependencies:
+    """Tests for the freshness checks."""
+
+    def test_fresh_tree(self, built_tree: Path) -> None:
+        """Test that every compile edge of a freshly built tree is reused, with absolute paths."""
+        src = built_tree.parent / "src"
+
+        recorded = collect_recorded_dependencies(str(built_tree))
+
+        assert recorded is not None
+        assert recorded.stale == {}
+        assert recorded.source_to_deps == {str(src / "a.cpp"): [str(src / "a.cpp"), str(src / "a.h")], str(src / "b.cpp"): [str(src / "b.cpp"), str(src / "a.h")]}
+
+    def test_newer_input_makes_edge_stale(self, built_tree: Path) -> None:
+        """Test that a source edited after the build is stale while the others stay fresh."""
+        src = built_tree.parent / "src"
+        os.utime(src / "b.cpp", ns=(3_000_000_000, 3_000_000_000))
+
+        recorded = collect_recorded_dependencies(str(built_tree))
+
+        assert recorded is not None
+        assert list(recorded.source_to_deps) == [str(src / "a.cpp")]
+        assert recorded.stale == {str(src / "b.cpp"): [str(src / "b.cpp"), str(src / "a.h")]}
+
+    def test_outdated_or_missing_records(self, built_tree: Path) -> None:
+        """Test that a deps record older than the log entry, or no record at all, is stale."""
+        src = built_tree.parent / "src"
+        write_ninja_deps(built_tree / ".ninja_deps", [("a.o", 100, ["../src/a.cpp", "../src/a.h"])])
+        write_ninja_log(built_tree / ".ninja_log", [(0, 900, 100, "a.o"), (0, 800, 90, "b.o"), (0, 800, 120, "a.o")])
+
+        recorded = collect_recorded_dependencies(str(built_tree))
+
+        assert recorded is None  # Nothing fresh left: callers run a full scan
+
+        write_ninja_log(built_tree / ".ninja_log", [(0, 900, 100, "a.o"), (0, 800, 100, "b.o")])
+        recorded = collect_recorded_dependencies(str(built_tree))
+        assert recorded is not None
+        assert list(recorded.source_to_deps) == [str(src / "a.cpp")]
+        assert recorded.stale == {str(src / "b.cpp"): None}
+
+    def test_unbuilt_tree(self, built_tree: Path) -> None:
+        """Test that a build directory without ninja's logs gives None."""
+        (built_tree / ".ninja_log").unlink()
+
+        assert collect_recorded_dependencies(str(built_tree)) is None
+
+
+class TestBuildIncludeGraphBackend:
+    """Tests for build_include_graph(deps_source=...)"""
+
+    def test_fresh_tree_needs_no_scan(self, built_tree: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that a freshly built tree is analysed without clang-scan-deps."""
+
+        def fail(*_args: Any, **_kwargs: Any) -> None:
+            raise AssertionError("clang-scan-deps should not run")
+
+        monkeypatch.setattr(clang_utils, "find_clang_scan_deps", fail)
+        src = built_tree.parent / "src"
+
+        result = build_include_graph(str(built_tree), verbose=False, deps_source="ninja")
+
+        assert set(result.source_to_deps) == {str(src / "a.cpp"), str(src / "b.cpp")}
+        assert result.all_headers == {str(src / "a.h")}
+        assert str(src / "a.h") in result.file_types
+
+    def test_only_stale_sources_are_rescanned(self, built_tree: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that clang-scan-deps sees a compile database holding just the stale sources."""
+        src = built_tree.parent / "src"
+        (src / "b.h").write_text("#pragma once\n")
+        os.utime(src / "b.cpp", ns=(3_000_000_000, 3_000_000_000))
+        filtered_db = built_tree / "compile_commands_filtered.json"
+        filtered_db.write_text(
+            json.dumps([{"directory": str(built_tree), "file": f"../src/{name}.cpp", "command": f"c++ -c ../src/{name}.cpp -o {name}.o"} for name in "ab"])
+        )
+        scanned: List[Dict[str, Any]] = []
+
+        def scan(_command: str, compile_db: str, _build_dir: str, timeout: int) -> Any:
+            with open(compile_db, encoding="utf-8") as f:
+                scanned.extend(json.load(f))
+            return f"b.o: {src / 'b.cpp'} \\\n  {src / 'a.h'} \\\n  {src / 'b.h'}\n", 0.5
+
+        monkeypatch.setattr(clang_utils, "find_clang_scan_deps", lambda: ToolInfo("clang-scan-deps", "clang-scan-deps", "19"))
+        monkeypatch.setattr(clang_utils, "create_filtered_compile_commands", lambda _build_dir: str(filtered_db))
+        monkeypatch.setattr(clang_utils, "_invoke_clang_scan_deps", scan)
+
+        result = build_include_graph(str(built_tree), verbose=False)
+
+        assert [entry["file"] for entry in scanned] == ["../src/b.cpp"]
+        assert result.source_to_deps[str(src / "b.cpp")] == [str(src / "b.cpp"), str(src / "a.h"), str(src / "b.h")]
+        assert result.source_to_deps[str(src / "a.cpp")] == [str(src / "a.cpp"), str(src / "a.h")]
+        assert result.scan_time >= 0.5
+
+    def test_rescanned_paths_are_normalized(self, built_tree: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that relative or unnormalized scanner paths replace the recorded entry instead of adding another."""
+        src = built_tree.parent / "src"
+        os.utime(src / "b.cpp", ns=(3_000_000_000, 3_000_000_000))
+        filtered_db = built_tree / "compile_commands_filtered.json"
+        filtered_db.write_text(json.dumps([{"directory": str(built_tree), "file": "../src/b.cpp", "command": "c++ -c ../src/b.cpp -o b.o"}]))
+
+        def scan(_command: str, _compile_db: str, _build_dir: str, timeout: int) -> Any:
+            return f"b.o: ../src/b.cpp {built_tree}/../src/./a.h\n", 0.5
+
+        monkeypatch.setattr(clang_utils, "find_clang_scan_deps", lambda: ToolInfo("clang-scan-deps", "clang-scan-deps", "19"))
+        monkeypatch.setattr(clang_utils, "create_filtered_compile_commands", lambda _build_dir: str(filtered_db))
+        monkeypatch.setattr(clang_utils, "_invoke_clang_scan_deps", scan)
+
+        result = build_include_graph(str(built_tree), verbose=False)
+
+        assert set(result.source_to_deps) == {str(src / "a.cpp"), str(src / "b.cpp")}
+        assert result.source_to_deps[str(src / "b.cpp")] == [str(src / "b.cpp"), str(src / "a.h")]
+        assert result.all_headers == {str(src / "a.h")}
+
+    def test_stale_sources_without_scanner(self, built_tree: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that stale sources keep their last recorded dependencies when clang-scan-deps is missing."""
+        src = built_tree.parent / "src"
+        os.utime(src / "b.cpp", ns=(3_000_000_000, 3_000_000_000))
+        monkeypatch.setattr(clang_utils, "find_clang_scan_deps", lambda: ToolInfo(None, None, None, "not in PATH"))
+
+        result = build_include_graph(str(built_tree), verbose=False)
+
+        assert result.source_to_deps[str(src / "b.cpp")] == [str(src / "b.cpp"), str(src / "a.h")]
+
+    def test_deps_source_validation(self, built_tree: Path) -> None:
+        """Test that "ninja" requires ninja's logs and unknown sources are rejected."""
+        (built_tree / ".ninja_deps").unlink()
+
+        with pytest.raises(RuntimeError, match="No usable"):
+            build_include_graph(str(built_tree), verbose=False, deps_source="ninja")
+        with pytest.raises(ValueError, match="deps_source"):
+            build_include_graph(str(built_tree), verbose=False, deps_source="make")
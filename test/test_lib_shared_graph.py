@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""Tests for lib/shared_graph.py"""
+
+import os
+import pickle
+import subprocess
+import sys
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Set
+
+import numpy as np
+import pytest
+
+from lib.shared_graph import (
+    SEGMENT_PREFIX,
+    SHARED_MEMORY_AVAILABLE,
+    SharedGraph,
+    SharedGraphHandle,
+    attach_graph,
+    cleanup_stale_segments,
+    intern_graph,
+)
+
+requires_shared_memory = pytest.mark.skipif(not SHARED_MEMORY_AVAILABLE, reason="multiprocessing.shared_memory not available")
+
+
+def _worker_mapping(handle: SharedGraphHandle) -> Dict[str, Set[str]]:
+    """Attach in a worker process and rebuild the mapping."""
+    graph = attach_graph(handle)
+    try:
+        return graph.to_mapping()
+    finally:
+        graph.close()
+
+
+def _worker_in_degree(handle: SharedGraphHandle) -> List[int]:
+    """Attach in a worker process and compute in-degrees on the shared arrays."""
+    graph = attach_graph(handle)
+    try:
+        degrees: List[int] = graph.in_degree().tolist()
+        return degrees
+    finally:
+        graph.close()
+
+
+class TestInternGraph:
+    """Tests for interning mappings into CSR arrays."""
+
+    def test_round_trip(self) -> None:
+        """Test that the mapping survives interning, with the given nodes first."""
+        mapping = {"a.hpp": {"b.hpp", "c.hpp"}, "b.hpp": {"c.hpp"}, "c.hpp": set()}
+        graph = intern_graph(mapping, ["c.hpp", "z.hpp"])
+
+        assert graph.paths[:2] == ["c.hpp", "z.hpp"]
+        assert graph.to_mapping() == {"a.hpp": {"b.hpp", "c.hpp"}, "b.hpp": {"c.hpp"}}
+        ids = graph.node_ids()
+        assert graph.out_degree()[ids["a.hpp"]] == 2
+        assert graph.in_degree()[ids["c.hpp"]] == 2
+        assert sorted(graph.paths[i] for i in graph.successors(ids["a.hpp"])) == ["b.hpp", "c.hpp"]
+
+
+@requires_shared_memory
+class TestSharedGraph:
+    """Tests for publishing and attaching shared graphs."""
+
+    def test_attach_is_zero_copy_and_read_only(self) -> None:
+        """Test that attached arrays view the segment and string tables decode."""
+        graph = intern_graph({"a.hpp": {"b.hpp"}, "ü.hpp": {"a.hpp"}})
+        graph.arrays["flag"] = np.array([True, False, True])
+        with SharedGraph(graph) as shared:
+            attached = attach_graph(pickle.loads(pickle.dumps(shared.handle)))
+            try:
+                assert attached.paths == graph.paths
+                assert attached.to_mapping() == graph.to_mapping()
+                assert attached.arrays["flag"].tolist() == [True, False, True]
+                assert not attached.indices.flags.writeable
+                assert not attached.indices.flags.owndata
+            finally:
+                attached.close()
+
+    def test_close_unlinks_segment(self) -> None:
+        """Test that the owner unlinks the segment on exit."""
+        with SharedGraph(intern_graph({"a.hpp": {"b.hpp"}})) as shared:
+            handle = shared.handle
+            assert handle.segment is not None and handle.segment.startswith(f"{SEGMENT_PREFIX}{os.getpid()}_")
+        with pytest.raises(FileNotFoundError):
+            attach_graph(handle)
+
+    def test_empty_graph(self) -> None:
+        """Test that an empty graph can be published and attached."""
+        with SharedGraph(intern_graph({})) as shared:
+            attached = attach_graph(shared.handle)
+            assert attached.paths == [] and attached.to_mapping() == {}
+            attached.close()
+
+    def test_workers_attach(self) -> None:
+        """Test that worker processes read the published graph and leave it intact."""
+        mapping = {"a.hpp": {"b.hpp", "c.hpp"}, "b.hpp": {"c.hpp"}}
+        graph = intern_graph(mapping)
+        with SharedGraph(graph) as shared:
+            with ProcessPoolExecutor(max_workers=2) as executor:
+                assert executor.submit(_worker_mapping, shared.handle).result() == mapping
+                assert executor.submit(_worker_in_degree, shared.handle).result() == graph.in_degree().tolist()
+            # Worker exit must not unlink the owner's segment
+            attached = attach_graph(shared.handle)
+            assert attached.to_mapping() == mapping
+            attached.close()
+
+    def test_unrelated_process_attaches(self) -> None:
+        """Test that a process with its own resource tracker does not unlink the segment on exit."""
+        with SharedGraph(intern_graph({"a.hpp": {"b.hpp"}})) as shared:
+            code = "import pickle, sys; from lib.shared_graph import attach_graph; graph = attach_graph(pickle.load(sys.stdin.buffer)); print(graph.paths); graph.close()"
+            root = str(Path(__file__).resolve().parent.parent)
+            completed = subprocess.run([sys.executable, "-c", code], input=pickle.dumps(shared.handle), capture_output=True, cwd=root, check=True)
+
+            assert completed.stdout.decode().strip() == "['a.hpp', 'b.hpp']"
+            assert b"leaked" not in completed.stderr
+            attached = attach_graph(shared.handle)
+            attached.close()
+
+    def test_cleanup_stale_segments(self, tmp_path: Path) -> None:
+        """Test that only segments of dead owners are removed."""
+        dead_pid = 2**22 + 12345  # Above the default pid_max, so no such process
+        (tmp_path / f"{SEGMENT_PREFIX}{dead_pid}_abc").write_bytes(b"")
+        (tmp_path / f"{SEGMENT_PREFIX}{os.getpid()}_abc").write_bytes(b"")
+        (tmp_path / "unrelated").write_bytes(b"")
+
+        assert cleanup_stale_segments(str(tmp_path)) == 1
+        assert sorted(p.name for p in tmp_path.iterdir()) == [f"{SEGMENT_PREFIX}{os.getpid()}_abc", "unrelated"]
+        assert cleanup_stale_segments(str(tmp_path / "missing")) == 0
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""Tests for lib/source_index.py"""
+
+from collections import defaultdict
+from typing import Dict, List
+
+import numpy as np
+import pytest
+
+from lib.clang_utils import IncludeGraphScanResult
+from lib.source_index import SourceIndex, build_source_index
+
+
+@pytest.fixture
+def source_to_deps() -> Dict[str, List[str]]:
+    """Three TUs sharing some headers (with a duplicate dependency entry)."""
+    return {
+        "b.cpp": ["b.cpp", "common.hpp", "b.hpp"],
+        "a.cpp": ["a.cpp", "common.hpp", "a.hpp", "a.hpp"],
+        "c.cpp": ["c.cpp", "b.hpp"],
+    }
+
+
+class TestSourceIndex:
+    """Tests for the SourceIndex inverted index."""
+
+    def test_sources_interned_in_sorted_order(self, source_to_deps: Dict[str, List[str]]) -> None:
+        """Test that source IDs are dense and follow sorted path order."""
+        index = SourceIndex(source_to_deps)
+
+        assert index.sources == ["a.cpp", "b.cpp", "c.cpp"]
+        assert index.source_ids == {"a.cpp": 0, "b.cpp": 1, "c.cpp": 2}
+        assert index.num_sources == 3
+
+    def test_sources_of_header(self, source_to_deps: Dict[str, List[str]]) -> None:
+        """Test per-header source lists, including unknown headers and duplicates."""
+        index = SourceIndex(source_to_deps)
+
+        assert index.sources_of("common.hpp").tolist() == [0, 1]
+        assert index.sources_of("b.hpp").tolist() == [1, 2]
+        assert index.sources_of("a.hpp").tolist() == [0]
+        assert index.sources_of("missing.hpp").tolist() == []
+
+    def test_affected_queries_match_linear_scan(self, source_to_deps: Dict[str, List[str]]) -> None:
+        """Test that mask unions agree with scanning source_to_deps."""
+        index = SourceIndex(source_to_deps)
+
+        for headers in [set(), {"a.hpp"}, {"b.hpp", "a.hpp"}, {"common.hpp", "missing.hpp"}]:
+            expected = {source for source, deps in source_to_deps.items() if set(deps) & headers}
+            assert index.affected_sources(headers) == expected
+            assert index.count_affected(headers) == len(expected)
+
+        mask = index.affected_mask(["a.hpp"])
+        assert mask.dtype == np.bool_
+        assert mask.tolist() == [True, False, False]
+
+    def test_empty_mapping(self) -> None:
+        """Test that an empty mapping produces an empty index."""
+        index = build_source_index({})
+
+        assert index.num_sources == 0
+        assert index.count_affected(["a.hpp"]) == 0
+
+
+class TestScanResultSourceIndex:
+    """Tests for the index cached on IncludeGraphScanResult."""
+
+    def test_built_once_per_scan_result(self, source_to_deps: Dict[str, List[str]]) -> None:
+        """Test that the index is built on first use and then shared."""
+        scan_result = IncludeGraphScanResult(source_to_deps=source_to_deps, include_graph=defaultdict(set), all_headers=set(), scan_time=0.0, file_types={})
+
+        index = scan_result.source_index
+
+        assert scan_result.source_index is index
+        assert index.affected_sources(["b.hpp"]) == {"b.cpp", "c.cpp"}
+        other = IncludeGraphScanResult(source_to_deps=source_to_deps, include_graph=defaultdict(set), all_headers=set(), scan_time=0.0, file_types={})
+        assert other.source_index is not index
+        assert other == scan_result